@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from django.db import models, migrations
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+
+REVISION = '1.0.15'
+DOWN_REVISION = '1.0.14'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0014_add_node_uuid_unique_constraint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dbnode',
+            name='node_hash',
+            field=models.CharField(max_length=255, db_index=True, null=True)
+        ),
+        # Copy the hashes that were stored as the `_aiida_hash` extra into the new indexed column, such that existing
+        # nodes remain available as a source for caching
+        migrations.RunSQL("""
+            UPDATE db_dbnode SET node_hash = db_dbextra.tval
+            FROM db_dbextra
+            WHERE db_dbextra.dbnode_id = db_dbnode.id
+            AND db_dbextra.key = '_aiida_hash'
+            AND db_dbextra.datatype = 'txt';
+        """, reverse_sql=''),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
@@ -9,7 +9,7 @@
 ###########################################################################
 from __future__ import absolute_import
 
-LATEST_MIGRATION = '0014_add_node_uuid_unique_constraint'
+LATEST_MIGRATION = '0015_add_node_hash'
 
 
 def _update_schema_version(version, apps, schema_editor):
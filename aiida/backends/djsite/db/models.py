@@ -137,6 +137,8 @@ class DbNode(m.Model):
     # max_length required for index by MySql
     type = m.CharField(max_length=255, db_index=True)
     process_type = m.CharField(max_length=255, db_index=True, null=True)
+    # The hash of the node used for caching, stored in an indexed column such that equivalent nodes can be looked up fast
+    node_hash = m.CharField(max_length=255, db_index=True, null=True)
     label = m.CharField(max_length=255, db_index=True, blank=True)
     description = m.TextField(blank=True)
     # creation time
@@ -286,6 +288,9 @@ attrdatatype_choice = (
     ('list', 'list'),
     ('none', 'none'))
 
+# Maximum number of rows sent in a single INSERT statement when storing attributes in bulk
+BULK_INSERT_PAGE_SIZE = 1000
+
 from aiida.common.exceptions import AiidaException
 
 
@@ -576,6 +581,9 @@ class DbMultipleValueAttributeBaseClass(m.Model):
     # separator for subfields
     _sep = AIIDA_ATTRIBUTE_SEP
 
+    # columns storing a value, in the order of the tuples returned by serialize_value
+    _value_columns = ('key', 'datatype', 'tval', 'fval', 'ival', 'bval', 'dval')
+
     class Meta:
         abstract = True
         unique_together = (('key',),)
@@ -727,67 +735,80 @@ class DbMultipleValueAttributeBaseClass(m.Model):
           responsibility to store such entries (typically with a Django
           bulk_create() call).
         """
-        import json
-        import datetime
-        from aiida.utils.timezone import is_naive, make_aware, get_current_timezone
-
         if cls._subspecifier_field_name is None:
             if subspecifier_value is not None:
                 raise ValueError("You cannot specify a subspecifier value for "
                                  "class {} because it has no subspecifiers"
                                  "".format(cls.__name__))
-            new_entry = cls(key=key, **other_attribs)
+            further_params = other_attribs.copy()
+            subspecifier_params = {}
         else:
             if subspecifier_value is None:
                 raise ValueError("You also have to specify a subspecifier value "
                                  "for class {} (the {})".format(cls.__name__,
                                                                 cls._subspecifier_field_name))
             further_params = other_attribs.copy()
-            further_params.update({cls._subspecifier_field_name:
-                                       subspecifier_value})
-            new_entry = cls(key=key, **further_params)
+            subspecifier_params = {cls._subspecifier_field_name: subspecifier_value}
+            further_params.update(subspecifier_params)
+
+        list_to_return = []
+        for row in cls.serialize_value(key, value):
+            # NOTE: other_attribs are only set on the level-zero entry
+            params = further_params if not list_to_return else subspecifier_params
+            list_to_return.append(cls(**dict(zip(cls._value_columns, row), **params)))
 
-        list_to_return = [new_entry]
+        return list_to_return
+
+    @classmethod
+    def serialize_value(cls, key, value):
+        """
+        Flatten the given key/value pair in the rows of the table that store it,
+        without creating any model instance.
+
+        Lists and dicts are unpacked recursively: the level-zero row stores the
+        length in the ival column and each element is stored in a separate row, whose
+        key is obtained by joining the parent key and the index (or key) of the
+        element with the separator cls._sep.
+
+        :param key: a string with the key to create (can contain the separator
+          cls._sep if this is a sub-attribute)
+        :param value: the value to store (a basic data type or a list or a dict)
+        :return: a list of tuples with the values of the columns listed in
+          cls._value_columns, the level-zero entry being the first one
+        :raise ValueError: if the value is not of a basic datatype and not JSON-serializable
+        """
+        rows = []
+        cls._serialize_value(key, value, rows)
+        return rows
+
+    @classmethod
+    def _serialize_value(cls, key, value, rows):
+        """
+        Append the rows storing the given key/value pair to the given list.
+
+        :param key: the key of the value
+        :param value: the value to store
+        :param rows: the list to which the tuples of the rows are appended
+        """
+        import json
+        import datetime
+        from aiida.utils.timezone import is_naive, make_aware, get_current_timezone
 
+        # The order of the columns is (key, datatype, tval, fval, ival, bval, dval)
         if value is None:
-            new_entry.datatype = 'none'
-            new_entry.bval = None
-            new_entry.tval = ''
-            new_entry.ival = None
-            new_entry.fval = None
-            new_entry.dval = None
+            rows.append((key, 'none', '', None, None, None, None))
 
         elif isinstance(value, bool):
-            new_entry.datatype = 'bool'
-            new_entry.bval = value
-            new_entry.tval = ''
-            new_entry.ival = None
-            new_entry.fval = None
-            new_entry.dval = None
+            rows.append((key, 'bool', '', None, None, value, None))
 
         elif isinstance(value, six.integer_types):
-            new_entry.datatype = 'int'
-            new_entry.ival = value
-            new_entry.tval = ''
-            new_entry.bval = None
-            new_entry.fval = None
-            new_entry.dval = None
+            rows.append((key, 'int', '', None, value, None, None))
 
         elif isinstance(value, float):
-            new_entry.datatype = 'float'
-            new_entry.fval = value
-            new_entry.tval = ''
-            new_entry.ival = None
-            new_entry.bval = None
-            new_entry.dval = None
+            rows.append((key, 'float', '', value, None, None, None))
 
         elif isinstance(value, six.string_types):
-            new_entry.datatype = 'txt'
-            new_entry.tval = value
-            new_entry.bval = None
-            new_entry.ival = None
-            new_entry.fval = None
-            new_entry.dval = None
+            rows.append((key, 'txt', value, None, None, None, None))
 
         elif isinstance(value, datetime.datetime):
 
@@ -797,54 +818,24 @@ class DbMultipleValueAttributeBaseClass(m.Model):
             else:
                 value_to_set = value
 
-            new_entry.datatype = 'date'
             # TODO: time-aware and time-naive datetime objects, see
             # https://docs.djangoproject.com/en/dev/topics/i18n/timezones/#naive-and-aware-datetime-objects
-            new_entry.dval = value_to_set
-            new_entry.tval = ''
-            new_entry.bval = None
-            new_entry.ival = None
-            new_entry.fval = None
+            rows.append((key, 'date', '', None, None, None, value_to_set))
 
         elif isinstance(value, (list, tuple)):
 
-            new_entry.datatype = 'list'
-            new_entry.dval = None
-            new_entry.tval = ''
-            new_entry.bval = None
-            new_entry.ival = len(value)
-            new_entry.fval = None
+            rows.append((key, 'list', '', None, len(value), None, None))
 
             for i, subv in enumerate(value):
-                # I do not need get_or_create here, because
-                # above I deleted all children (and I
-                # expect no concurrency)
-                # NOTE: I do not pass other_attribs
-                list_to_return.extend(cls.create_value(
-                    key=("{}{}{:d}".format(key, cls._sep, i)),
-                    value=subv,
-                    subspecifier_value=subspecifier_value))
+                cls._serialize_value("{}{}{:d}".format(key, cls._sep, i), subv, rows)
 
         elif isinstance(value, dict):
 
-            new_entry.datatype = 'dict'
-            new_entry.dval = None
-            new_entry.tval = ''
-            new_entry.bval = None
-            new_entry.ival = len(value)
-            new_entry.fval = None
+            rows.append((key, 'dict', '', None, len(value), None, None))
 
             for subk, subv in value.items():
                 cls.validate_key(subk)
-
-                # I do not need get_or_create here, because
-                # above I deleted all children (and I
-                # expect no concurrency)
-                # NOTE: I do not pass other_attribs
-                list_to_return.extend(cls.create_value(
-                    key="{}{}{}".format(key, cls._sep, subk),
-                    value=subv,
-                    subspecifier_value=subspecifier_value))
+                cls._serialize_value("{}{}{}".format(key, cls._sep, subk), subv, rows)
         else:
             try:
                 jsondata = json.dumps(value)
@@ -852,13 +843,7 @@ class DbMultipleValueAttributeBaseClass(m.Model):
                 raise ValueError("Unable to store the value: it must be "
                                  "either a basic datatype, or json-serializable")
 
-            new_entry.datatype = 'json'
-            new_entry.tval = jsondata
-            new_entry.bval = None
-            new_entry.ival = None
-            new_entry.fval = None
-
-        return list_to_return
+            rows.append((key, 'json', jsondata, None, None, None, None))
 
     @classmethod
     def get_query_dict(cls, value):
@@ -1117,36 +1102,98 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
     @classmethod
     def reset_values_for_node(cls, dbnode, attributes, with_transaction=True,
                               return_not_store=False):
-        from django.db import transaction
+        """
+        Replace all the values of the given dbnode with the given attributes.
+
+        :param dbnode: the dbnode, or its PK
+        :param attributes: a dictionary with the level-zero attributes to store
+        :param with_transaction: if True (default), do this within a transaction
+        :param return_not_store: if True, do not touch the database, but return
+          the list of (unstored) class instances that would be stored
+        """
+        if return_not_store:
+            if isinstance(dbnode, six.integer_types):
+                dbnode_node = DbNode(id=dbnode)
+            else:
+                dbnode_node = dbnode
+
+            nodes_to_store = []
+            for k, v in attributes.items():
+                nodes_to_store.extend(cls.create_value(k, v, subspecifier_value=dbnode_node))
+            return nodes_to_store
+
+        dbnode_pk = dbnode if isinstance(dbnode, six.integer_types) else dbnode.pk
+        cls.reset_values_for_nodes({dbnode_pk: attributes}, with_transaction=with_transaction)
+
+    @classmethod
+    def reset_values_for_nodes(cls, attributes_by_node, with_transaction=True):
+        """
+        Replace all the values of many dbnodes at once.
+
+        The old values of all nodes are removed with a single query and the new
+        ones are written with multi-row inserts, serializing the values directly
+        to rows instead of going through one model instance per (sub)value.
 
-        # cls.validate_key(key)
+        :param attributes_by_node: a dictionary mapping the PK of each dbnode
+          onto the dictionary of its level-zero attributes
+        :param with_transaction: if True (default), do this within a transaction,
+           so that nothing gets stored if one of the values cannot be stored.
+        """
+        from django.db import transaction
 
-        nodes_to_store = []
+        rows = []
+        for dbnode_pk, attributes in attributes_by_node.items():
+            for k, v in attributes.items():
+                rows.extend((dbnode_pk,) + row for row in cls.serialize_value(k, v))
 
         try:
             if with_transaction:
                 sid = transaction.savepoint()
 
-            if isinstance(dbnode, six.integer_types):
-                dbnode_node = DbNode(id=dbnode)
-            else:
-                dbnode_node = dbnode
+            cls.objects.filter(dbnode_id__in=list(attributes_by_node.keys())).delete()
+            cls.bulk_insert_rows(rows)
 
-            # create_value returns a list of nodes to store
-            for k, v in attributes.items():
-                nodes_to_store.extend(
-                    cls.create_value(k, v,
-                                     subspecifier_value=dbnode_node,
-                                     ))
+            if with_transaction:
+                transaction.savepoint_commit(sid)
+        except:
+            if with_transaction:
+                transaction.savepoint_rollback(sid)
+            raise
 
-            if return_not_store:
-                return nodes_to_store
-            else:
-                # Reset. For set, use also a filter for key__in=attributes.keys()
-                cls.objects.filter(dbnode=dbnode_node).delete()
+    @classmethod
+    def set_values_for_nodes(cls, dbnode_pks, values, with_transaction=True):
+        """
+        Set the same level-zero values on many dbnodes at once, replacing the
+        existing values with the same keys and leaving the others untouched.
+
+        The old values are removed with one query and the new ones are written
+        with multi-row inserts, for every chunk of BULK_INSERT_PAGE_SIZE dbnodes.
+
+        :param dbnode_pks: a list of PKs of dbnodes
+        :param values: a dictionary with the level-zero values to set
+        :param with_transaction: if True (default), do this within a transaction,
+           so that nothing gets stored if one of the values cannot be stored.
+        """
+        from django.db import transaction
+        from django.db.models import Q
+
+        keys_query = Q()
+        serialized = []
+        for key, value in values.items():
+            cls.validate_key(key)
+            keys_query |= Q(key=key) | Q(key__startswith="{}{}".format(key, cls._sep))
+            serialized.extend(cls.serialize_value(key, value))
 
-                if nodes_to_store:
-                    cls.objects.bulk_create(nodes_to_store)
+        dbnode_pks = list(dbnode_pks)
+
+        try:
+            if with_transaction:
+                sid = transaction.savepoint()
+
+            for start in range(0, len(dbnode_pks), BULK_INSERT_PAGE_SIZE):
+                chunk = dbnode_pks[start:start + BULK_INSERT_PAGE_SIZE]
+                cls.objects.filter(Q(dbnode_id__in=chunk) & keys_query).delete()
+                cls.bulk_insert_rows([(dbnode_pk,) + row for dbnode_pk in chunk for row in serialized])
 
             if with_transaction:
                 transaction.savepoint_commit(sid)
@@ -1155,6 +1202,40 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
                 transaction.savepoint_rollback(sid)
             raise
 
+    @classmethod
+    def bulk_insert_rows(cls, rows, page_size=BULK_INSERT_PAGE_SIZE):
+        """
+        Insert the given rows in the table, without any check.
+
+        On PostgreSQL, the rows are sent with multi-row INSERT statements of at
+        most page_size rows each. On other databases, Django's bulk_create is used.
+
+        :param rows: a list of tuples with the PK of the dbnode followed by the
+          values of the columns listed in cls._value_columns, as returned by
+          serialize_value
+        :param page_size: the maximum number of rows per INSERT statement
+        """
+        from django.db import connection
+
+        if not rows:
+            return
+
+        if connection.vendor != 'postgresql':
+            columns = ('dbnode_id',) + cls._value_columns
+            cls.objects.bulk_create([cls(**dict(zip(columns, row))) for row in rows], batch_size=page_size)
+            return
+
+        from psycopg2.extras import execute_values
+
+        columns = ('dbnode_id',) + tuple(cls._meta.get_field(name).column for name in cls._value_columns)
+        sql = 'INSERT INTO {} ({}) VALUES %s'.format(
+            connection.ops.quote_name(cls._meta.db_table),
+            ', '.join(connection.ops.quote_name(column) for column in columns))
+
+        with connection.cursor() as cursor:
+            # execute_values needs the psycopg2 cursor wrapped by django
+            execute_values(cursor.cursor, sql, rows, page_size=page_size)
+
     @classmethod
     def set_value_for_node(cls, dbnode, key, value, with_transaction=True,
                            stop_if_existing=False):
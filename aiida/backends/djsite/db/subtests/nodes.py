@@ -340,6 +340,66 @@ class TestNodeBasicDjango(AiidaTestCase):
 
         self.assertEqual(s1.getvalue(), "a")
 
+    def test_reset_values_for_nodes(self):
+        """
+        Test that the bulk writing of attributes gives the same rows as the
+        creation of the model instances one value at a time.
+        """
+        import datetime
+        from aiida.backends.djsite.db.models import DbAttribute
+
+        attributes = {
+            'none': None,
+            'bool': True,
+            'integer': 12,
+            'float': 26.2,
+            'string': "a string",
+            'date': datetime.datetime.now(),
+            'dict': {"a": "b", "sublist": [1, 2, 3], "subdict": {"c": "d"}},
+            'list': [1, True, "ggg", {'h': 'j'}, [9, 8, 7]],
+        }
+
+        columns = ('key', 'datatype', 'tval', 'fval', 'ival', 'bval', 'dval')
+        first, second = Node().store(), Node().store()
+
+        expected = sorted(
+            tuple(getattr(entry, column) for column in columns)
+            for entry in DbAttribute.reset_values_for_node(first.pk, attributes, return_not_store=True))
+
+        DbAttribute.reset_values_for_nodes({first.pk: attributes, second.pk: {'other': 1}})
+
+        for node in [first, second]:
+            self.assertEquals(DbAttribute.objects.filter(dbnode=node.dbnode, key='other').count(),
+                              int(node is second))
+
+        stored = sorted(DbAttribute.objects.filter(dbnode=first.dbnode).values_list(*columns))
+        self.assertEquals(stored, expected)
+        self.assertEquals(DbAttribute.get_all_values_for_nodepk(first.pk)['dict'], attributes['dict'])
+
+        # Resetting replaces all the old rows
+        DbAttribute.reset_values_for_nodes({first.pk: {'list': [1]}})
+        self.assertEquals(DbAttribute.get_all_values_for_nodepk(first.pk), {'list': [1]})
+
+    def test_store_all_bulk_attributes(self):
+        """
+        Test that the attributes and hashes of the input nodes are written
+        correctly when they are stored in bulk by store_all.
+        """
+        from aiida.orm.data.parameter import ParameterData
+
+        node = Node()
+        parents = [ParameterData(dict={'index': index, 'values': list(range(index))}) for index in range(5)]
+        for index, parent in enumerate(parents):
+            node.add_link_from(parent, label='input_{}'.format(index))
+
+        node.store_all()
+
+        for index, parent in enumerate(parents):
+            self.assertTrue(parent.is_stored)
+            self.assertEquals(parent.get_dict(), {'index': index, 'values': list(range(index))})
+            self.assertEquals(parent.get_extra('_aiida_hash'), parent.get_hash())
+            self.assertEquals(parent.dbnode.node_hash, parent.get_hash())
+
     def test_load_nodes(self):
         """
         """
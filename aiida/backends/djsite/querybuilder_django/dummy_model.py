@@ -255,6 +255,7 @@ class DbNode(Base):
     uuid = Column(UUID(as_uuid=True), default=uuid_func)
     type = Column(String(255), index=True)
     process_type = Column(String(255), index=True)
+    node_hash = Column(String(255), index=True, nullable=True)
     label = Column(String(255), index=True, nullable=True)
     description = Column(Text(), nullable=True)
     ctime = Column(DateTime(timezone=True), default=timezone.now)
@@ -312,8 +313,8 @@ class DbNode(Base):
         # and instantiate an object that has the same attributes as self.
         from aiida.backends.djsite.db.models import DbNode as DjangoSchemaDbNode
         dbnode = DjangoSchemaDbNode(
-            id=self.id, type=self.type, process_type=self.process_type, uuid=self.uuid, ctime=self.ctime,
-            mtime=self.mtime, label=self.label, description=self.description, dbcomputer_id=self.dbcomputer_id,
+            id=self.id, type=self.type, process_type=self.process_type, node_hash=self.node_hash, uuid=self.uuid,
+            ctime=self.ctime, mtime=self.mtime, label=self.label, description=self.description, dbcomputer_id=self.dbcomputer_id,
             user_id=self.user_id, public=self.public, nodeversion=self.nodeversion
         )
         return dbnode.get_aiida_class()
@@ -11,6 +11,7 @@
 
 from __future__ import absolute_import
 import datetime
+import functools
 from datetime import datetime
 from json import loads as json_loads
 
@@ -539,76 +540,45 @@ class QueryBuilderImplDjango(QueryBuilderInterface):
         with transaction.atomic():
             return query.first()
 
+    def get_aiida_res_converters(self, query, keys):
+        """
+        Return for every column of the results of a query the function that converts its values with get_aiida_res,
+        or None for the plain columns, whose values are returned as they come from the database. The projected
+        entities, attributes, extras and the columns stored as serialized JSON need to be converted.
+
+        :param query: the query
+        :param keys: a dictionary mapping the index of every column in the results onto its projection key
+        :returns: a list with a function or None for every column
+        """
+        converters = []
+        for index in range(len(keys)):
+            key = keys[index]
+            if (key in ('*', 'attributes', 'extras', '_metadata', 'transport_params') or
+                    key.startswith('attributes.') or key.startswith('extras.')):
+                converters.append(functools.partial(self.get_aiida_res, key))
+            else:
+                converters.append(None)
+        return converters
+
     def iterall(self, query, batch_size, tag_to_index_dict):
         from django.db import transaction
 
-        if not tag_to_index_dict:
-            raise Exception("Got an empty dictionary: {}".format(tag_to_index_dict))
-
         with transaction.atomic():
-            results = query.yield_per(batch_size)
-
-            if len(tag_to_index_dict) == 1:
-                # Sqlalchemy, for some strange reason, does not return a list of lsits
-                # if you have provided an ormclass
-
-                if list(tag_to_index_dict.values()) == ['*']:
-                    for rowitem in results:
-                        yield [self.get_aiida_res(tag_to_index_dict[0], rowitem)]
-                else:
-                    for rowitem, in results:
-                        yield [self.get_aiida_res(tag_to_index_dict[0], rowitem)]
-            elif len(tag_to_index_dict) > 1:
-                for resultrow in results:
-                    yield [
-                        self.get_aiida_res(tag_to_index_dict[colindex], rowitem)
-                        for colindex, rowitem
-                        in enumerate(resultrow)
-                    ]
+            for row in self.iter_results(query, batch_size, tag_to_index_dict):
+                yield row
 
     def iterdict(self, query, batch_size, tag_to_projected_entity_dict):
         from django.db import transaction
 
-        nr_items = sum(len(v) for v in tag_to_projected_entity_dict.values())
+        # Wrapping everything in an atomic transaction:
+        with transaction.atomic():
+            for result in self.iter_result_dicts(query, batch_size, tag_to_projected_entity_dict):
+                yield result
 
-        if not nr_items:
-            raise Exception("Got an empty dictionary")
+    def iter_baked_results(self, baked_query, parameters, keys, converters):
+        from django.db import transaction
 
-        # Wrapping everything in an atomic transaction:
         with transaction.atomic():
-            results = query.yield_per(batch_size)
-            # Two cases: If one column was asked, the database returns a matrix of rows * columns:
-            if nr_items > 1:
-                for this_result in results:
-                    yield {
-                        tag: {
-                            attrkey: self.get_aiida_res(
-                                attrkey, this_result[index_in_sql_result]
-                            )
-                            for attrkey, index_in_sql_result
-                            in projected_entities_dict.items()
-                        }
-                        for tag, projected_entities_dict
-                        in tag_to_projected_entity_dict.items()
-                    }
-            elif nr_items == 1:
-                # I this case, sql returns a  list, where each listitem is the result
-                # for one row. Here I am converting it to a list of lists (of length 1)
-                if [v for entityd in tag_to_projected_entity_dict.values() for v in entityd.keys()] == ['*']:
-                    for this_result in results:
-                        yield {
-                            tag: {
-                                attrkey: self.get_aiida_res(attrkey, this_result)
-                                for attrkey, position in projected_entities_dict.items()
-                            }
-                            for tag, projected_entities_dict in tag_to_projected_entity_dict.items()
-                        }
-                else:
-                    for this_result, in results:
-                        yield {
-                            tag: {
-                                attrkey: self.get_aiida_res(attrkey, this_result)
-                                for attrkey, position in projected_entities_dict.items()
-                            }
-                            for tag, projected_entities_dict in tag_to_projected_entity_dict.items()
-                        }
+            for row in super(QueryBuilderImplDjango, self).iter_baked_results(
+                    baked_query, parameters, keys, converters):
+                yield row
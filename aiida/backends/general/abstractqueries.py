@@ -43,6 +43,88 @@ class AbstractQueryManager(object):
             """
         return self.raw(query)
 
+    def get_outgoing_closure(self, pks, link_types):
+        """
+        Return the pks of the given nodes and of all the nodes that can be reached from them by following, in the
+        direction of the links, only links of the given types.
+
+        The closure is computed by the database in a single recursive query, rather than by querying the outgoing
+        links one generation at a time. Since the recursive part discards rows that were already found, the query
+        terminates also on graphs that contain cycles.
+
+        :param pks: an iterable of node pks from which to start the traversal
+        :param link_types: an iterable of :class:`aiida.common.links.LinkType` values of the links to follow
+        :return: a set with the pks of the nodes in the closure, limited to nodes that exist in the database
+        """
+        from aiida.common.links import LinkType
+
+        pks = set(int(pk) for pk in pks)
+        if not pks:
+            return set()
+
+        valid_link_types = set(link_type.value for link_type in LinkType)
+        link_types = set(link_types)
+        if not link_types.issubset(valid_link_types):
+            raise ValueError('invalid link types: {}'.format(', '.join(sorted(link_types - valid_link_types))))
+
+        if link_types:
+            recursive_part = """
+                UNION
+                SELECT db_dblink.output_id FROM db_dblink
+                INNER JOIN closure ON db_dblink.input_id = closure.id
+                WHERE db_dblink.type IN ({link_types})
+                """.format(link_types=', '.join("'{}'".format(link_type) for link_type in sorted(link_types)))
+        else:
+            recursive_part = ''
+
+        query = """
+            WITH RECURSIVE closure(id) AS (
+                SELECT id FROM db_dbnode WHERE id IN ({pks})
+                {recursive_part}
+            )
+            SELECT id FROM closure
+            """.format(pks=', '.join(str(pk) for pk in sorted(pks)), recursive_part=recursive_part)
+
+        return set(pk for pk, in self.raw(query))
+
+    def get_call_descendants(self, pk, max_depth=None, type_prefix=None):
+        """
+        Return the given node and all the nodes that it called, directly or indirectly, through CALL links, together
+        with their nesting depth, computed by the database in a single recursive query.
+
+        :param pk: the pk of the node from which to start
+        :param max_depth: optional maximum depth; only nodes with a depth smaller than this value are returned
+        :param type_prefix: optional prefix of the type string of the called nodes to follow, for example to only
+            descend into work calculations
+        :return: a list of tuples (pk, depth), where the given node has depth zero, sorted by depth and pk
+        """
+        from aiida.common.links import LinkType
+
+        if max_depth is not None and max_depth < 1:
+            return []
+
+        conditions = ["db_dblink.type = '{}'".format(LinkType.CALL.value)]
+        if type_prefix is not None:
+            # Escape the characters that have a special meaning in a LIKE pattern or in a string literal
+            pattern = type_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace("'", "''")
+            conditions.append("db_dbnode.type LIKE '{}%'".format(pattern))
+        if max_depth is not None:
+            conditions.append('tree.depth + 1 < {}'.format(int(max_depth)))
+
+        query = """
+            WITH RECURSIVE tree(id, depth) AS (
+                SELECT id, 0 FROM db_dbnode WHERE id = {pk}
+                UNION
+                SELECT db_dblink.output_id, tree.depth + 1 FROM db_dblink
+                INNER JOIN tree ON db_dblink.input_id = tree.id
+                INNER JOIN db_dbnode ON db_dblink.output_id = db_dbnode.id
+                WHERE {conditions}
+            )
+            SELECT id, depth FROM tree ORDER BY depth, id
+            """.format(pk=int(pk), conditions=' AND '.join(conditions))
+
+        return [(node_pk, depth) for node_pk, depth in self.raw(query)]
+
     # This is an example of a query that could be overriden by a better implementation,
     # for performance reasons:
     def query_jobcalculations_by_computer_user_state(
@@ -9,8 +9,13 @@
 ###########################################################################
 from __future__ import absolute_import
 from abc import abstractmethod, ABCMeta
+import functools
+
 import six
 
+# The query that returns the current WAL insert location of the PostgreSQL server, which depends on its version
+_WAL_INSERT_LOCATION_QUERY = None
+
 @six.add_metaclass(ABCMeta)
 class QueryBuilderInterface:
     @abstractmethod
@@ -187,4 +192,139 @@ class QueryBuilderInterface:
         """
         pass
 
+    def get_aiida_res_converters(self, query, keys):
+        """
+        Return for every column of the results of a query the function that converts its values with
+        :meth:`get_aiida_res`, or None if the values are returned by the database as they are. Backends override this
+        to skip the conversion of plain columns.
+
+        :param query: the query
+        :param keys: a dictionary mapping the index of every column in the results onto its projection key
+        :returns: a list with a function or None for every column
+        """
+        return [functools.partial(self.get_aiida_res, keys[index]) for index in range(len(keys))]
+
+    @staticmethod
+    def stream(query, batch_size):
+        """
+        Return the query such that its results are streamed from the database in batches of the given size
+
+        The results are read through a server-side cursor, if the database driver supports it, instead of being
+        buffered in memory as a whole by the driver.
+
+        :param query: the query
+        :param int batch_size: the number of rows fetched at a time, or None to fetch all rows at once
+        :returns: the query
+        """
+        if batch_size is None:
+            return query
+        return query.yield_per(batch_size).execution_options(stream_results=True)
+
+    def iter_results(self, query, batch_size, keys):
+        """
+        Iterate over the rows of the results of a query, converting the values with :meth:`get_aiida_res`
+
+        If no column needs to be converted, which is the case when only plain columns are projected, the rows are
+        returned as they come from the database, without going through :meth:`get_aiida_res` for every value.
+
+        :param query: the query
+        :param int batch_size: the number of rows fetched at a time, or None to fetch all rows at once
+        :param keys: a dictionary mapping the index of every column in the results onto its projection key
+        :returns: an iterator over the rows as lists
+        """
+        if not keys:
+            raise Exception("Got an empty dictionary: {}".format(keys))
+
+        converters = self.get_aiida_res_converters(query, keys)
+        for row in self.convert_rows(self.stream(query, batch_size), keys, converters):
+            yield row
+
+    @staticmethod
+    def convert_rows(results, keys, converters):
+        """
+        Iterate over the rows of the results of a query, converting the values of the columns that need a conversion
+
+        :param results: an iterable over the results of the query
+        :param keys: a dictionary mapping the index of every column in the results onto its projection key
+        :param converters: a list with a function or None for every column, as returned by
+            :meth:`get_aiida_res_converters`
+        :returns: an iterator over the rows as lists
+        """
+        # When a single entity is projected, the database returns the entity itself instead of a row
+        if len(keys) == 1 and keys[0] == '*':
+            results = ((result,) for result in results)
+
+        if not any(converters):
+            for row in results:
+                yield list(row)
+        else:
+            for row in results:
+                yield [value if converter is None else converter(value) for converter, value in zip(converters, row)]
+
+    def iter_baked_results(self, baked_query, parameters, keys, converters):
+        """
+        Iterate over the rows of the results of a baked query, converting the values with :meth:`get_aiida_res`
+
+        :param baked_query: an instance of sqlalchemy.ext.baked.BakedQuery
+        :param parameters: a dictionary with the values of the bound parameters of the query
+        :param keys: a dictionary mapping the index of every column in the results onto its projection key
+        :param converters: a list with a function or None for every column, as returned by
+            :meth:`get_aiida_res_converters`
+        :returns: an iterator over the rows as lists
+        """
+        results = baked_query(self.get_session()).params(**parameters)
+        for row in self.convert_rows(results, keys, converters):
+            yield row
+
+    def iter_result_dicts(self, query, batch_size, tag_to_projected_entity_dict):
+        """
+        Iterate over the rows of the results of a query as dictionaries
+
+        :param query: the query
+        :param int batch_size: the number of rows fetched at a time, or None to fetch all rows at once
+        :param tag_to_projected_entity_dict: a dictionary mapping every tag onto a dictionary mapping the projection
+            keys of the tag onto the index of the column in the results
+        :returns: an iterator over dictionaries mapping every tag onto a dictionary of the projected values
+        """
+        keys = {
+            index_in_sql_result: attrkey
+            for projected_entities_dict in tag_to_projected_entity_dict.values()
+            for attrkey, index_in_sql_result in projected_entities_dict.items()
+        }
+        if not keys:
+            raise Exception("Got an empty dictionary")
+
+        for row in self.iter_results(query, batch_size, keys):
+            yield {
+                tag: {
+                    attrkey: row[index_in_sql_result]
+                    for attrkey, index_in_sql_result in projected_entities_dict.items()
+                }
+                for tag, projected_entities_dict in tag_to_projected_entity_dict.items()
+            }
+
+    def get_database_change_counter(self):
+        """
+        Return a value that changes whenever the content of the database may have changed
+
+        The current insert location of the PostgreSQL write-ahead log is used, which advances with every write to the
+        database, including deletions and in-place updates that change neither the largest ids nor the modification
+        times, and also with the uncommitted writes of the current transaction. It is read without touching any
+        table, so it is cheap to query. Since the log is shared by all the databases of the server, writes to other
+        databases also change the counter, which is safe but conservative.
+
+        :returns: an opaque value that can only be compared for equality
+        """
+        global _WAL_INSERT_LOCATION_QUERY  # pylint: disable=global-statement
+        from sqlalchemy import text
+
+        session = self.get_session()
+
+        if _WAL_INSERT_LOCATION_QUERY is None:
+            version = int(session.execute(text("SELECT current_setting('server_version_num')")).scalar())
+            if version >= 100000:
+                _WAL_INSERT_LOCATION_QUERY = text('SELECT pg_current_wal_insert_lsn()::text')
+            else:
+                _WAL_INSERT_LOCATION_QUERY = text('SELECT pg_current_xlog_insert_location()::text')
 
+        return session.execute(_WAL_INSERT_LOCATION_QUERY).scalar()
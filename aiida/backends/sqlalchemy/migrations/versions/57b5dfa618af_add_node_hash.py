@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Add the indexed node_hash column to DbNode
+
+Revision ID: 57b5dfa618af
+Revises: 62fe0d36de90
+Create Date: 2018-10-18 10:12:31.129731
+
+"""
+from __future__ import absolute_import
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '57b5dfa618af'
+down_revision = '62fe0d36de90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('db_dbnode',
+        sa.Column('node_hash', sa.VARCHAR(length=255), autoincrement=False, nullable=True),
+    )
+    op.create_index('ix_db_dbnode_node_hash', 'db_dbnode', ['node_hash'])
+
+    # Copy the hashes that were stored as the `_aiida_hash` extra into the new indexed column, such that existing
+    # nodes remain available as a source for caching
+    op.execute("""
+        UPDATE db_dbnode SET node_hash = extras->>'_aiida_hash'
+        WHERE extras ? '_aiida_hash' AND jsonb_typeof(extras->'_aiida_hash') = 'string'
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_db_dbnode_node_hash', table_name='db_dbnode')
+    op.drop_column('db_dbnode', 'node_hash')
@@ -9,7 +9,7 @@
 ###########################################################################
 
 from __future__ import absolute_import
-from sqlalchemy import ForeignKey, select, func, join, and_, case
+from sqlalchemy import ForeignKey, select, func, join, and_, case, cast, literal, literal_column
 from sqlalchemy.orm import (
     relationship, backref, Query, mapper,
     foreign, aliased
@@ -21,7 +21,7 @@ from sqlalchemy.types import Integer, String, Boolean, DateTime, Text
 # Specific to PGSQL. If needed to be agnostic
 # http://docs.sqlalchemy.org/en/rel_0_9/core/custom_types.html?highlight=guid#backend-agnostic-guid-type
 # Or maybe rely on sqlalchemy-utils UUID type
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy_utils.types.choice import ChoiceType
 
 from aiida.utils import timezone
@@ -75,6 +75,7 @@ class DbNode(Base):
     uuid = Column(UUID(as_uuid=True), default=uuid_func, unique=True)
     type = Column(String(255), index=True)
     process_type = Column(String(255), index=True)
+    node_hash = Column(String(255), index=True, nullable=True)
     label = Column(String(255), index=True, nullable=True,
                    default="")  # Does it make sense to be nullable and have a default?
     description = Column(Text(), nullable=True, default="")
@@ -186,15 +187,14 @@ class DbNode(Base):
             thistype = thistype[:-1]  # Strip final dot
             return thistype.rpartition('.')[2]
 
-    def set_attr(self, key, value):
-        DbNode._set_attr(self.attributes, key, value)
-        flag_modified(self, "attributes")
-        self.save()
+    def set_attr(self, key, value, increment_version=False):
+        self._update_json_column('attributes', to_set={key: value}, increment_version=increment_version)
 
-    def set_extra(self, key, value):
-        DbNode._set_attr(self.extras, key, value)
-        flag_modified(self, "extras")
-        self.save()
+    def set_extra(self, key, value, increment_version=False):
+        self._update_json_column('extras', to_set={key: value}, increment_version=increment_version)
+
+    def set_extras(self, extras, increment_version=False):
+        self._update_json_column('extras', to_set=extras, increment_version=increment_version)
 
     def reset_extras(self, new_extras):
         self.extras.clear()
@@ -202,15 +202,82 @@ class DbNode(Base):
         flag_modified(self, "extras")
         self.save()
 
-    def del_attr(self, key):
-        DbNode._del_attr(self.attributes, key)
-        flag_modified(self, "attributes")
-        self.save()
+    def del_attr(self, key, increment_version=False):
+        self._update_json_column('attributes', to_delete=key, increment_version=increment_version)
 
-    def del_extra(self, key):
-        DbNode._del_attr(self.extras, key)
-        flag_modified(self, "extras")
-        self.save()
+    def del_extra(self, key, increment_version=False):
+        self._update_json_column('extras', to_delete=key, increment_version=increment_version)
+
+    def _update_json_column(self, column, to_set=None, to_delete=None, increment_version=False):
+        """
+        Set or delete top-level keys of the attributes or extras of the node with a single UPDATE statement, which
+        only sends the keys that change instead of rewriting the whole JSONB column, and commit.
+
+        :param column: the name of the column, either 'attributes' or 'extras'
+        :param to_set: a dictionary of the keys to set and their values
+        :param to_delete: a key to delete
+        :param increment_version: if True, increment the nodeversion in the same statement
+        :raise ValueError: if a key contains a dot
+        :raise AttributeError: if the key to delete does not exist
+        """
+        from aiida.backends.sqlalchemy import get_scoped_session
+
+        keys = list(to_set or {}) + ([to_delete] if to_delete is not None else [])
+        for key in keys:
+            if '.' in key:
+                raise ValueError("We don't know how to treat key with dot in it yet")
+
+        # Pending changes are flushed first, such that they cannot overwrite the partial update when committing
+        session = get_scoped_session()
+        session.add(self)
+        session.flush()
+
+        table = DbNode.__table__
+        condition = table.c.id == self.id
+        value = func.coalesce(table.c[column], literal_column("'{}'::jsonb"))
+
+        if to_set:
+            value = value.op('||')(cast(literal(to_set, type_=JSONB), JSONB))
+
+        if to_delete is not None:
+            value = value.op('-')(cast(literal(to_delete), Text))
+            condition = and_(condition, table.c[column].has_key(to_delete))
+
+        values = {column: value}
+        if increment_version:
+            values['nodeversion'] = table.c.nodeversion + 1
+
+        result = session.execute(table.update().where(condition).values(**values))
+
+        if to_delete is not None and result.rowcount == 0:
+            raise AttributeError("Key {} does not exists".format(to_delete))
+
+        session.commit()
+
+    @classmethod
+    def set_extra_for_nodes(cls, pks, key, value):
+        """
+        Set an extra on many nodes with a single UPDATE statement, incrementing their nodeversion, and commit.
+
+        :param pks: a list of node pks
+        :param key: the key of the extra, which cannot contain a dot
+        :param value: the JSON-serializable value of the extra
+        :raise ValueError: if the key contains a dot
+        """
+        from aiida.backends.sqlalchemy import get_scoped_session
+
+        if '.' in key:
+            raise ValueError("We don't know how to treat key with dot in it yet")
+
+        session = get_scoped_session()
+        table = cls.__table__
+        value = func.coalesce(table.c.extras, literal_column("'{}'::jsonb")).op('||')(
+            cast(literal({key: value}, type_=JSONB), JSONB))
+
+        # The pks are sent as a single array parameter rather than as one parameter per pk
+        session.execute(table.update().where(literal(list(pks), type_=ARRAY(Integer)).any(table.c.id)).values(
+            extras=value, nodeversion=table.c.nodeversion + 1))
+        session.commit()
 
     @staticmethod
     def _set_attr(d, key, value):
@@ -10,6 +10,7 @@
 
 from __future__ import absolute_import
 from datetime import datetime
+import functools
 
 import six
 
@@ -21,7 +22,7 @@ from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql.expression import cast, ColumnClause
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.sql.elements import Cast, Label
-from sqlalchemy_utils.types.choice import Choice
+from sqlalchemy_utils.types.choice import Choice, ChoiceType
 from sqlalchemy.sql.elements import Cast
 from sqlalchemy.sql.expression import FunctionElement
 from sqlalchemy.ext.compiler import compiles
@@ -531,78 +532,48 @@ class QueryBuilderImplSQLA(QueryBuilderInterface):
             self.get_session().rollback()
             raise e
 
-    def iterall(self, query, batch_size, tag_to_index_dict):
-        if not tag_to_index_dict:
-            raise Exception("Got an empty dictionary: {}".format(tag_to_index_dict))
+    def get_aiida_res_converters(self, query, keys):
+        """
+        Return for every column of the results of a query the function that converts its values with get_aiida_res,
+        or None for the plain columns, whose values are returned as they come from the database. Only the projected
+        entities and the columns of Choice type need to be converted.
+
+        :param query: the query
+        :param keys: a dictionary mapping the index of every column in the results onto its projection key
+        :returns: a list with a function or None for every column
+        """
+        descriptions = query.column_descriptions
+        if len(descriptions) != len(keys):
+            return super(QueryBuilderImplSQLA, self).get_aiida_res_converters(query, keys)
+
+        converters = []
+        for index, description in enumerate(descriptions):
+            if keys[index] == '*' or isinstance(description['type'], ChoiceType):
+                converters.append(functools.partial(self.get_aiida_res, keys[index]))
+            else:
+                converters.append(None)
+        return converters
 
+    def iterall(self, query, batch_size, tag_to_index_dict):
         try:
-            results = query.yield_per(batch_size)
-
-            if len(tag_to_index_dict) == 1:
-                # Sqlalchemy, for some strange reason, does not return a list of lsits
-                # if you have provided an ormclass
-
-                if list(tag_to_index_dict.values()) == ['*']:
-                    for rowitem in results:
-                        yield [self.get_aiida_res(tag_to_index_dict[0], rowitem)]
-                else:
-                    for rowitem, in results:
-                        yield [self.get_aiida_res(tag_to_index_dict[0], rowitem)]
-            elif len(tag_to_index_dict) > 1:
-                for resultrow in results:
-                    yield [
-                        self.get_aiida_res(tag_to_index_dict[colindex], rowitem)
-                        for colindex, rowitem
-                        in enumerate(resultrow)
-                    ]
+            for row in self.iter_results(query, batch_size, tag_to_index_dict):
+                yield row
         except Exception:
             self.get_session().rollback()
             raise
 
     def iterdict(self, query, batch_size, tag_to_projected_entity_dict):
+        try:
+            for result in self.iter_result_dicts(query, batch_size, tag_to_projected_entity_dict):
+                yield result
+        except Exception:
+            self.get_session().rollback()
+            raise
 
-        nr_items = sum(len(v) for v in tag_to_projected_entity_dict.values())
-
-        if not nr_items:
-            raise Exception("Got an empty dictionary")
-
-        # Wrapping everything in an atomic transaction:
+    def iter_baked_results(self, baked_query, parameters, keys, converters):
         try:
-            results = query.yield_per(batch_size)
-            if nr_items > 1:
-                for this_result in results:
-                    yield {
-                        tag: {
-                            attrkey: self.get_aiida_res(
-                                attrkey, this_result[index_in_sql_result]
-                            )
-                            for attrkey, index_in_sql_result
-                            in projected_entities_dict.items()
-                        }
-                        for tag, projected_entities_dict
-                        in tag_to_projected_entity_dict.items()
-                    }
-            elif nr_items == 1:
-                # I this case, sql returns a  list, where each listitem is the result
-                # for one row. Here I am converting it to a list of lists (of length 1)
-                if [v for entityd in tag_to_projected_entity_dict.values() for v in entityd.keys()] == ['*']:
-                    for this_result in results:
-                        yield {
-                            tag: {
-                                attrkey: self.get_aiida_res(attrkey, this_result)
-                                for attrkey, position in projected_entities_dict.items()
-                            }
-                            for tag, projected_entities_dict in tag_to_projected_entity_dict.items()
-                        }
-                else:
-                    for this_result, in results:
-                        yield {
-                            tag: {
-                                attrkey: self.get_aiida_res(attrkey, this_result)
-                                for attrkey, position in projected_entities_dict.items()
-                            }
-                            for tag, projected_entities_dict in tag_to_projected_entity_dict.items()
-                        }
-        except Exception as e:
+            for row in super(QueryBuilderImplSQLA, self).iter_baked_results(baked_query, parameters, keys, converters):
+                yield row
+        except Exception:
             self.get_session().rollback()
-            raise e
+            raise
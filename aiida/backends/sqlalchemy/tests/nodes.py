@@ -296,6 +296,69 @@ class TestNodeBasicSQLA(AiidaTestCase):
         finally:
             session.rollback()
 
+    def test_node_read_consistency(self):
+        """
+        Test the read consistency modes of the attributes and extras of stored nodes, modifying the attributes in the
+        database directly, as another process would do.
+        """
+        import json
+        from sqlalchemy import event
+        from aiida.backends.sqlalchemy import get_scoped_session
+        from aiida.orm.implementation.sqlalchemy.node import node_read_consistency
+
+        node = Node()
+        node._set_attr('value', 1)
+        node.store()
+
+        session = get_scoped_session()
+        engine = session.get_bind()
+
+        def update_externally(value):
+            session.execute(
+                "UPDATE db_dbnode SET attributes = CAST(:attributes AS jsonb), nodeversion = nodeversion + 1 "
+                "WHERE id = :id", {'attributes': json.dumps({'value': value}), 'id': node.pk})
+            session.commit()
+
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record_statement)
+
+        try:
+            with node_read_consistency('snapshot'):
+                self.assertEqual(node.get_attr('value'), 1)
+                del statements[:]
+                for _ in range(10):
+                    self.assertEqual(node.get_attr('value'), 1)
+                self.assertEqual(statements, [])
+
+                # Changes by others are not seen, but those made through the node itself are
+                update_externally(2)
+                self.assertEqual(node.get_attr('value'), 1)
+                node.set_extra('extra', 1)
+                self.assertEqual(node.get_extra('extra'), 1)
+
+            with node_read_consistency('versioned'):
+                self.assertEqual(node.get_attr('value'), 2)
+                del statements[:]
+                for _ in range(10):
+                    self.assertEqual(node.get_attr('value'), 2)
+                # Only the nodeversion is queried to check that the cached attributes are up to date
+                self.assertEqual(len(statements), 10)
+                self.assertTrue(all('attributes' not in statement for statement in statements))
+
+            with node_read_consistency('strict'):
+                update_externally(3)
+                self.assertEqual(node.get_attr('value'), 3)
+
+            with self.assertRaises(ValueError):
+                with node_read_consistency('invalid'):
+                    pass
+        finally:
+            event.remove(engine, 'before_cursor_execute', record_statement)
+
     def test_multiple_node_creation(self):
         """
         This test checks that a node is not added automatically to the session
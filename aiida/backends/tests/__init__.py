@@ -91,7 +91,9 @@ db_test_list = {
         'orm.utils.loaders': ['aiida.backends.tests.orm.utils.loaders'],
         'work.class_loader': ['aiida.backends.tests.work.class_loader'],
         'work.daemon': ['aiida.backends.tests.work.daemon'],
+        'work.executors': ['aiida.backends.tests.work.test_executors'],
         'work.futures': ['aiida.backends.tests.work.test_futures'],
+        'work.job_calcs': ['aiida.backends.tests.work.test_job_calcs'],
         'work.launch': ['aiida.backends.tests.work.test_launch'],
         'work.persistence': ['aiida.backends.tests.work.persistence'],
         'work.process': ['aiida.backends.tests.work.process'],
@@ -8,6 +8,8 @@ from aiida.backends.testbase import AiidaTestCase
 from aiida.cmdline.commands.cmd_computer import computer_disable, computer_enable, computer_setup
 from aiida.cmdline.commands.cmd_computer import computer_show, computer_list, computer_rename, computer_delete
 from aiida.cmdline.commands.cmd_computer import computer_test, computer_configure, computer_duplicate
+from aiida.cmdline.commands.cmd_computer import computer_upload_cache_set, computer_upload_cache_unset
+from aiida.cmdline.commands.cmd_computer import computer_upload_cache_clean
 from aiida import orm
 
 
@@ -752,3 +754,31 @@ class TestVerdiComputerCommands(AiidaTestCase):
         self.assertEquals(self.comp.get_default_mpiprocs_per_machine(), new_computer.get_default_mpiprocs_per_machine())
         self.assertEquals(self.comp.get_prepend_text(), new_computer.get_prepend_text())
         self.assertEquals(self.comp.get_append_text(), new_computer.get_append_text())
+
+    def test_computer_upload_cache(self):
+        """Test setting, cleaning and unsetting the upload cache of a computer."""
+        import shutil
+        import tempfile
+
+        directory = tempfile.mkdtemp()
+        try:
+            result = self.runner.invoke(computer_upload_cache_set, [self.computer_name, 'relative/path'])
+            self.assertIsNotNone(result.exception)
+
+            result = self.runner.invoke(computer_upload_cache_set,
+                                        [self.computer_name, directory, '--link-mode', 'hardlink'])
+            self.assertIsNone(result.exception, result.output)
+            self.assertEquals(self.comp.get_upload_cache_directory(), directory)
+            self.assertEquals(self.comp.get_upload_cache_link_mode(), 'hardlink')
+
+            result = self.runner.invoke(computer_upload_cache_clean, [self.computer_name, '--dry-run'])
+            self.assertIsNone(result.exception, result.output)
+
+            result = self.runner.invoke(computer_upload_cache_unset, [self.computer_name])
+            self.assertIsNone(result.exception, result.output)
+            self.assertIsNone(self.comp.get_upload_cache_directory())
+
+            result = self.runner.invoke(computer_upload_cache_clean, [self.computer_name])
+            self.assertIsNotNone(result.exception)
+        finally:
+            shutil.rmtree(directory)
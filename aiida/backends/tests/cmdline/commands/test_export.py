@@ -139,6 +139,30 @@ class TestVerdiExport(AiidaTestCase):
         finally:
             delete_temporary_file(filename)
 
+    def test_create_incremental(self):
+        """Test that an incremental archive based on a previous archive contains only the new nodes."""
+        import json
+
+        filename = next(tempfile._get_candidate_names())  # pylint: disable=protected-access
+        delta_filename = next(tempfile._get_candidate_names())  # pylint: disable=protected-access
+        try:
+            options = ['-N', self.node.pk, '-F', 'tar.gz', filename]
+            result = self.cli_runner.invoke(cmd_export.create, options)
+            self.assertIsNone(result.exception)
+
+            options = ['-N', self.node.pk, '-F', 'tar.gz', '--previous', filename, delta_filename]
+            result = self.cli_runner.invoke(cmd_export.create, options)
+            self.assertIsNone(result.exception, result.output)
+
+            with tarfile.open(delta_filename, 'r:gz', format=tarfile.PAX_FORMAT) as archive:
+                data = json.loads(archive.extractfile('data.json').read().decode('utf-8'))
+                metadata = json.loads(archive.extractfile('metadata.json').read().decode('utf-8'))
+            self.assertNotIn('Node', data['export_data'])
+            self.assertIsNotNone(metadata['base_export_id'])
+        finally:
+            delete_temporary_file(filename)
+            delete_temporary_file(delta_filename)
+
     def test_migrate_versions_old(self):
         """Migrating archives with a version older than the current should work."""
         archives = [
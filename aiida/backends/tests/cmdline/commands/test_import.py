@@ -61,3 +61,17 @@ class TestVerdiImport(AiidaTestCase):
         result = self.cli_runner.invoke(cmd_import.cmd_import, options)
 
         self.assertIsNone(result.exception)
+
+    def test_import_archive_workers(self):
+        """Test import for archive files from disk with several threads moving the repository folders."""
+        archives = [get_archive_file('calculation/simpleplugins.arithmetic.add.aiida')]
+
+        options = ['--workers', '2'] + archives
+        result = self.cli_runner.invoke(cmd_import.cmd_import, options)
+
+        self.assertIsNone(result.exception)
+
+        options = ['--workers', '0'] + archives
+        result = self.cli_runner.invoke(cmd_import.cmd_import, options)
+
+        self.assertIsNotNone(result.exception)
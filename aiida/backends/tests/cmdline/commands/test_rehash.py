@@ -98,3 +98,11 @@ class TestVerdiRehash(AiidaTestCase):
         options = ['-e', 'aiida.data.structure']
         result = self.runner.invoke(cmd_rehash.rehash, options)
         self.assertIsNotNone(result.exception)
+
+    def test_rehash_parallel(self):
+        """Spreading the rehashing over multiple processes should rehash all 5 nodes."""
+        expected_node_count = 5
+        options = ['--parallel', '2']
+        result = self.runner.invoke(cmd_rehash.rehash, options)
+        self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
+        self.assertIsNone(result.exception)
@@ -134,6 +134,14 @@ class TestVerdiWork(AiidaTestCase):
         parent.logger.log(LOG_LEVEL_REPORT, 'parent_message')
         child.logger.log(LOG_LEVEL_REPORT, 'child_message')
 
+        query_manager = self.backend.query_manager
+        self.assertEquals(
+            query_manager.get_call_descendants(grandparent.pk), [(grandparent.pk, 0), (parent.pk, 1), (child.pk, 2)])
+        self.assertEquals(query_manager.get_call_descendants(grandparent.pk, max_depth=2), [(grandparent.pk, 0),
+                                                                                          (parent.pk, 1)])
+        self.assertEquals(query_manager.get_call_descendants(grandparent.pk, type_prefix='calculation.job.'),
+                          [(grandparent.pk, 0)])
+
         result = self.cli_runner.invoke(cmd_work.work_report, [str(grandparent.pk)])
         self.assertIsNone(result.exception)
         self.assertEquals(len(get_result_lines(result)), 3)
@@ -153,6 +161,11 @@ class TestVerdiWork(AiidaTestCase):
                 self.assertIsNone(result.exception)
                 self.assertEquals(len(get_result_lines(result)), flag_value)
 
+            # A max depth of zero does not limit the nesting level
+            result = self.cli_runner.invoke(cmd_work.work_report, [str(grandparent.pk), flag, '0'])
+            self.assertIsNone(result.exception)
+            self.assertEquals(len(get_result_lines(result)), 3)
+
         # Filtering for other level name such as WARNING should not have any hits and only print the no log message
         for flag in ['-l', '--levelname']:
             result = self.cli_runner.invoke(cmd_work.work_report, [str(grandparent.pk), flag, 'WARNING'])
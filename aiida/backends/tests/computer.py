@@ -57,3 +57,37 @@ class TestComputer(AiidaTestCase):
 
         with self.assertRaises(NotExistent):
             self.backend.computers.get(comp_pk)
+
+    def test_minimum_job_poll_interval(self):
+        """Test the getter and setter of the minimum job poll interval."""
+        new_comp = self.backend.computers.create(name='ccc', hostname='localhost', transport_type='local',
+                                                 scheduler_type='direct', workdir='/tmp/aiida')
+
+        default = new_comp.PROPERTY_MINIMUM_SCHEDULER_POLL_INTERVAL__DEFAULT
+        self.assertEquals(new_comp.get_minimum_job_poll_interval(), default)
+
+        new_comp.set_minimum_job_poll_interval(30)
+        self.assertEquals(new_comp.get_minimum_job_poll_interval(), 30.)
+
+        with self.assertRaises(ValueError):
+            new_comp.set_minimum_job_poll_interval(-1)
+
+    def test_upload_cache_directory(self):
+        """Test the getter and setter of the upload cache directory."""
+        new_comp = self.backend.computers.create(name='ddd', hostname='localhost', transport_type='local',
+                                                 scheduler_type='direct', workdir='/tmp/aiida')
+
+        self.assertIsNone(new_comp.get_upload_cache_directory())
+        self.assertEquals(new_comp.get_upload_cache_link_mode(), 'symlink')
+
+        new_comp.set_upload_cache_directory('/scratch/{username}/aiida_cache', link_mode='hardlink')
+        self.assertEquals(new_comp.get_upload_cache_directory(), '/scratch/{username}/aiida_cache')
+        self.assertEquals(new_comp.get_upload_cache_link_mode(), 'hardlink')
+
+        with self.assertRaises(ValueError):
+            new_comp.set_upload_cache_directory('aiida_cache')
+        with self.assertRaises(ValueError):
+            new_comp.set_upload_cache_directory('/scratch/aiida_cache', link_mode='copy')
+
+        new_comp.set_upload_cache_directory(None)
+        self.assertIsNone(new_comp.get_upload_cache_directory())
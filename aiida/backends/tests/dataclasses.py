@@ -2119,6 +2119,50 @@ Ag 0 0
                 StructureData()._parse_xyz(xyz_string)
 
 
+    def test_set_sites_from_arrays(self):
+        """
+        Test the bulk creation of the kinds and sites of a structure from arrays
+        """
+        from aiida.orm.data.structure import StructureData
+        import numpy
+
+        symbols = ['Ba', 'Ti', 'O', 'O', 'O'] * 4
+        kind_names = ['Ba', 'Ti', 'O1', 'O2', 'O2'] * 4
+        positions = numpy.random.rand(len(symbols), 3)
+
+        reference = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+        for symbol, kind_name, position in zip(symbols, kind_names, positions):
+            reference.append_atom(symbols=symbol, name=kind_name, position=position)
+
+        s = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+        s.append_atom(symbols='Fe', position=(0., 0., 0.))
+        s.set_sites_from_arrays(symbols, positions, kind_names=kind_names)
+
+        self.assertEqual([k.get_raw() for k in s.kinds], [k.get_raw() for k in reference.kinds])
+        self.assertEqual([site.get_raw() for site in s.sites], [site.get_raw() for site in reference.sites])
+        self.assertEqual(s.get_site_kindnames(), kind_names)
+        self.assertEqual(s.get_formula(), reference.get_formula())
+        self.assertEqual(s.get_formula(mode='count'), 'Ba4Ti4O12')
+        self.assertEqual(s.get_composition(), {'Ba': 4, 'Ti': 4, 'O': 12})
+        self.assertEqual(s._prepare_xyz(), reference._prepare_xyz())
+
+        # The kind names default to the symbols
+        s.set_sites_from_arrays(symbols, positions)
+        self.assertEqual(s.get_kind_names(), ['Ba', 'Ti', 'O'])
+
+        with self.assertRaises(ValueError):
+            s.set_sites_from_arrays(symbols, positions[:-1])
+        with self.assertRaises(ValueError):
+            s.set_sites_from_arrays(symbols, positions, kind_names=kind_names[:-1])
+        with self.assertRaises(ValueError):
+            s.set_sites_from_arrays(['Ba', 'Ti'], positions[:2], kind_names=['X', 'X'])
+
+        s.store()
+        self.assertEqual(s.get_formula(), reference.get_formula())
+        with self.assertRaises(ModificationNotAllowed):
+            s.set_sites_from_arrays(symbols, positions)
+
+
 class TestStructureDataLock(AiidaTestCase):
     """
     Tests that the structure is locked after storage
@@ -2310,6 +2354,29 @@ class TestStructureDataFromAse(AiidaTestCase):
 
         self.assertAlmostEqual(c[1].mass, 110.2)
 
+    @unittest.skipIf(not has_ase(), "Unable to import ase")
+    def test_ase_roundtrip_sites(self):
+        """
+        Tests roundtrip ASE -> StructureData -> ASE for many sites with tags and masses
+        """
+        from aiida.orm.data.structure import StructureData
+        import ase
+        import numpy
+
+        a = ase.Atoms('Si50Ge50', cell=(10., 10., 10.), pbc=True)
+        a.set_positions(numpy.random.rand(100, 3) * 10.)
+        a.set_tags([index % 3 for index in range(100)])
+        a[1].mass = 110.2
+
+        b = StructureData(ase=a)
+        c = b.get_ase()
+
+        self.assertEqual(len(b.sites), 100)
+        self.assertEqual(a.get_chemical_symbols(), c.get_chemical_symbols())
+        self.assertTrue(numpy.allclose(a.get_positions(), c.get_positions()))
+        self.assertTrue(numpy.allclose(a.get_masses(), c.get_masses()))
+        self.assertEqual(a.get_tags().tolist(), c.get_tags().tolist())
+
     @unittest.skipIf(not has_ase(), "Unable to import ase")
     def test_conversion_of_types_1(self):
         """
@@ -3067,6 +3134,122 @@ class TestArrayData(AiidaTestCase):
             if name == 'third':
                 self.assertAlmostEquals(abs(third - array).max(), 0.)
 
+    def test_partial_and_mmap_access(self):
+        """
+        Check that parts of arrays can be retrieved and that arrays can be memory mapped
+        """
+        from aiida.orm.data.array import ArrayData
+        import numpy
+
+        array = numpy.random.rand(100, 3)
+        objects = numpy.array([{'a': 1}, None, 'c'], dtype=object)
+
+        n = ArrayData()
+        n.set_array('array', array)
+        n.set_array('objects', objects)
+
+        def check_access(node):
+            """Verify partial and memory mapped access for the given node."""
+            self.assertTrue(numpy.array_equal(node.get_array('array', slice(10, 20)), array[10:20]))
+            self.assertTrue(numpy.array_equal(node.get_array('array', (slice(None), 1)), array[:, 1]))
+            self.assertEquals(node.get_array('objects', 1), objects[1])
+
+            mapped = node.get_array('array', mmap_mode='r')
+            self.assertIsInstance(mapped, numpy.memmap)
+            self.assertTrue(numpy.array_equal(mapped, array))
+            with self.assertRaises(ValueError):
+                mapped[0, 0] = 1.
+
+            for name, mapped in node.iterarrays(mmap_mode='r'):
+                if name == 'array':
+                    self.assertTrue(numpy.array_equal(mapped, array))
+
+            with self.assertRaises(ValueError):
+                node.get_array('array', mmap_mode='r+')
+
+            with self.assertRaises(KeyError):
+                node.get_array('nonexistent_array', slice(0, 1))
+
+        check_access(n)
+        n.store()
+        check_access(n)
+        check_access(load_node(n.pk))
+
+    def test_chunked_arrays(self):
+        """
+        Check that arrays stored in chunks can be appended to and read completely or partially
+        """
+        from aiida.orm.data.array import ArrayData
+        import numpy
+
+        array = numpy.random.rand(23, 4)
+
+        n = ArrayData()
+        n.set_array('chunked', array[:10], chunk_size=4)
+        n.set_array('compressed', array[:10], chunk_size=4, compress=True)
+        n.set_array('single', array[:10])
+
+        for name in ['chunked', 'compressed', 'single']:
+            n.append_to_array(name, array[10:17])
+            n.append_to_array(name, array[17:])
+
+        with self.assertRaises(ValueError):
+            n.append_to_array('chunked', numpy.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            n.set_array('chunked', array, chunk_size=0)
+
+        def check_arrays(node):
+            """Verify the content of the arrays of the given node."""
+            self.assertEquals(set(node.get_arraynames()), set(['chunked', 'compressed', 'single']))
+            for name in ['chunked', 'compressed', 'single']:
+                self.assertEquals(node.get_shape(name), array.shape)
+                self.assertTrue(numpy.array_equal(node.get_array(name), array))
+                for index in [5, -1, slice(3, 19), slice(None, None, -3), slice(5, 5), (slice(2, 9), 1), [1, 2]]:
+                    self.assertTrue(numpy.array_equal(node.get_array(name, index), array[index]))
+                with self.assertRaises(IndexError):
+                    node.get_array(name, 23)
+
+        check_arrays(n)
+        n.store()
+        check_arrays(load_node(n.pk))
+
+        with self.assertRaises(ModificationNotAllowed):
+            n.append_to_array('chunked', array)
+
+    def test_internal_cache_budget(self):
+        """
+        Check that the internal cache of a stored node respects its byte budget, evicting the least recently used arrays
+        """
+        from aiida.orm.data.array import ArrayData, ArrayCache
+        import numpy
+
+        n = ArrayData()
+        for name in ['first', 'second', 'third']:
+            n.set_array(name, numpy.zeros(100))
+        n.set_array('large', numpy.zeros(1000))
+        n.store()
+
+        # Room for exactly two of the small arrays
+        n._cached_arrays = ArrayCache(2 * numpy.zeros(100).nbytes)
+
+        n.get_array('first')
+        n.get_array('second')
+        n.get_array('first')
+        n.get_array('third')
+        self.assertIn('first', n._cached_arrays)
+        self.assertIn('third', n._cached_arrays)
+        self.assertNotIn('second', n._cached_arrays)
+        self.assertEquals(n._cached_arrays.nbytes, 2 * numpy.zeros(100).nbytes)
+
+        # Arrays larger than the budget are returned, but not cached
+        self.assertEquals(n.get_array('large').shape, (1000,))
+        self.assertNotIn('large', n._cached_arrays)
+        self.assertEquals(len(n._cached_arrays), 2)
+
+        n.clear_internal_cache()
+        self.assertEquals(len(n._cached_arrays), 0)
+        self.assertEquals(n._cached_arrays.nbytes, 0)
+
 
 class TestTrajectoryData(AiidaTestCase):
     """
@@ -3472,6 +3655,52 @@ class TestTrajectoryData(AiidaTestCase):
                     if os.path.exists(file):
                         os.remove(file)
 
+    def test_chunked_trajectory(self):
+        """
+        Check that a trajectory stored in chunks can be extended and that steps are retrieved correctly.
+        """
+        from aiida.orm.data.array.trajectory import TrajectoryData
+        import numpy
+
+        numsteps = 11
+        stepids = numpy.arange(numsteps) * 10
+        times = stepids * 0.01
+        cells = numpy.array([numpy.eye(3) * (2. + step) for step in range(numsteps)])
+        symbols = numpy.array(['H', 'O', 'C'])
+        positions = numpy.random.rand(numsteps, 3, 3)
+        velocities = numpy.random.rand(numsteps, 3, 3)
+
+        for compress in [False, True]:
+            n = TrajectoryData()
+            n.set_trajectory(stepids=stepids[:5], cells=cells[:5], symbols=symbols, positions=positions[:5],
+                             times=times[:5], velocities=velocities[:5], chunk_size=4, compress=compress)
+            n.append_steps(stepids=stepids[5:], cells=cells[5:], positions=positions[5:], times=times[5:],
+                           velocities=velocities[5:])
+
+            # The times and velocities have to be appended consistently with the trajectory
+            with self.assertRaises(ValueError):
+                n.append_steps(stepids=stepids[:1], cells=cells[:1], positions=positions[:1])
+
+            n.store()
+
+            for node in [n, load_node(n.pk)]:
+                self.assertEqual(node.numsteps, numsteps)
+                self.assertTrue(numpy.array_equal(node.get_stepids(), stepids))
+                self.assertTrue(numpy.array_equal(node.get_times(), times))
+                self.assertTrue(numpy.array_equal(node.get_cells(), cells))
+                self.assertTrue(numpy.array_equal(node.get_positions(), positions))
+                self.assertTrue(numpy.array_equal(node.get_velocities(), velocities))
+                self.assertTrue(numpy.array_equal(node.get_array('positions', slice(3, 9)), positions[3:9]))
+
+                for index in [0, 4, numsteps - 1]:
+                    data = node.get_step_data(index)
+                    self.assertEqual(data[0], stepids[index])
+                    self.assertAlmostEqual(data[1], times[index])
+                    self.assertTrue(numpy.array_equal(data[2], cells[index]))
+                    self.assertEqual(data[3].tolist(), symbols.tolist())
+                    self.assertTrue(numpy.array_equal(data[4], positions[index]))
+                    self.assertTrue(numpy.array_equal(data[5], velocities[index]))
+
 
 class TestKpointsData(AiidaTestCase):
     """
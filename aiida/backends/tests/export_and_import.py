@@ -216,6 +216,337 @@ class TestSimple(AiidaTestCase):
             # Deleting the created temporary folder
             shutil.rmtree(temp_folder, ignore_errors=True)
 
+    def test_streamed_data_layout(self):
+        """
+        Check that the data.json of an archive has one entry per line and is still a valid JSON document, for both
+        the tar and the zip archives, and that the archive can be imported.
+        """
+        import json
+        import os
+        import shutil
+        import tarfile
+        import tempfile
+        import zipfile
+
+        from aiida.common.links import LinkType
+        from aiida.orm import Group, load_node
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.base import Int
+        from aiida.orm.importexport import export, export_zip
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            calc = Calculation().store()
+            outputs = [Int(value) for value in range(3)]
+            for index, output in enumerate(outputs):
+                output.add_link_from(calc, label='output_{}'.format(index), link_type=LinkType.CREATE)
+                output.store()
+            group, _ = Group.get_or_create(name='streamed')
+            group.add_nodes(outputs)
+            uuids = [node.uuid for node in outputs]
+
+            tar_filename = os.path.join(temp_folder, "export.tar.gz")
+            zip_filename = os.path.join(temp_folder, "export.zip")
+            export([group, calc], outfile=tar_filename, silent=True)
+            export_zip([group, calc], outfile=zip_filename, silent=True)
+
+            with tarfile.open(tar_filename, "r:gz", format=tarfile.PAX_FORMAT) as tar:
+                tar_content = tar.extractfile('data.json').read().decode('utf-8')
+            with zipfile.ZipFile(zip_filename, 'r') as archive:
+                zip_content = archive.read('data.json').decode('utf-8')
+
+            for content in [tar_content, zip_content]:
+                data = json.loads(content)
+                self.assertEquals(len(data['export_data']['Node']), 4)
+                self.assertEquals(len(data['node_attributes']), 4)
+                self.assertEquals(len(data['links_uuid']), 3)
+                self.assertEquals(sorted(data['groups_uuid'][group.uuid]), sorted(uuids))
+
+                # Every link is written on a line of its own
+                lines = content.splitlines()
+                links = [line for line in lines if LinkType.CREATE.value in line]
+                self.assertEquals(len(links), 3)
+                for line in links:
+                    self.assertEquals(json.loads(line.rstrip(','))['type'], LinkType.CREATE.value)
+
+            self.clean_db()
+            self.insert_data()
+            import_data(tar_filename, silent=True)
+            for uuid, value in zip(uuids, range(3)):
+                self.assertEquals(load_node(uuid).value, value)
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def test_reader_and_parallel_import(self):
+        """
+        Check that the data.json is read the same way, entry by entry, in the line-delimited layout and in the layout
+        of a single JSON document, and that an archive can be imported moving the node folders with several threads.
+        """
+        import io
+        import json
+        import os
+        import shutil
+        import tarfile
+        import tempfile
+
+        from aiida.common.links import LinkType
+        from aiida.orm import Group, load_node
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.base import Int
+        from aiida.orm.importexport import ExportDataReader, export
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            calc = Calculation().store()
+            outputs = [Int(value) for value in range(5)]
+            for index, output in enumerate(outputs):
+                with io.open(os.path.join(temp_folder, 'file.txt'), 'w', encoding='utf8') as handle:
+                    handle.write(u'{}'.format(index))
+                output.add_path(os.path.join(temp_folder, 'file.txt'), 'file.txt')
+                output.add_link_from(calc, label='output_{}'.format(index), link_type=LinkType.CREATE)
+                output.store()
+            group, _ = Group.get_or_create(name='parallel')
+            group.add_nodes(outputs)
+            uuids = [node.uuid for node in outputs]
+
+            filename = os.path.join(temp_folder, "export.tar.gz")
+            export([group, calc], outfile=filename, silent=True)
+
+            streamed_filename = os.path.join(temp_folder, 'streamed.json')
+            with tarfile.open(filename, "r:gz", format=tarfile.PAX_FORMAT) as tar:
+                with io.open(streamed_filename, 'wb') as handle:
+                    handle.write(tar.extractfile('data.json').read())
+            with io.open(streamed_filename, 'r', encoding='utf8') as handle:
+                data = json.load(handle)
+            single_filename = os.path.join(temp_folder, 'single.json')
+            with open(single_filename, 'w') as handle:
+                json.dump(data, handle)
+
+            streamed = ExportDataReader(streamed_filename)
+            single = ExportDataReader(single_filename)
+            self.assertTrue(streamed.is_line_delimited)
+            self.assertFalse(single.is_line_delimited)
+
+            for reader in [streamed, single]:
+                for section in data:
+                    self.assertEquals(reader.get(section), data[section])
+                self.assertEquals(list(reader.iter_entries('links_uuid')), data['links_uuid'])
+                self.assertEquals(sorted(reader.iter_entries('node_attributes')), sorted(data['node_attributes'].items()))
+                self.assertEquals(sorted(node_uuid for _, node_uuid in reader.iter_group_members()), sorted(uuids))
+                for pk, attributes, conversion in reader.iter_node_attributes():
+                    self.assertEquals(attributes, data['node_attributes'][pk])
+                    self.assertEquals(conversion, data['node_attributes_conversion'][pk])
+
+            self.clean_db()
+            self.insert_data()
+            import_data(filename, silent=True, workers=2)
+
+            for index, uuid in enumerate(uuids):
+                node = load_node(uuid)
+                self.assertEquals(node.value, index)
+                self.assertEquals(node.get_inputs(link_type=LinkType.CREATE)[0].uuid, calc.uuid)
+                with io.open(node.get_abs_path('file.txt'), 'r', encoding='utf8') as handle:
+                    self.assertEquals(handle.read(), u'{}'.format(index))
+            imported_group = Group.get(name='parallel')
+            self.assertEquals(sorted(node.uuid for node in imported_group.nodes), sorted(uuids))
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def test_incremental_export(self):
+        """
+        Check that an incremental archive contains only the nodes and group memberships that are new or changed since
+        the previous export, and that a chain of archives is imported in the right order.
+        """
+        import json
+        import os
+        import shutil
+        import tarfile
+        import tempfile
+
+        from aiida.common.links import LinkType
+        from aiida.orm import Group, load_node
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.base import Int
+        from aiida.orm.importexport import export, get_export_chain, import_data_chain, load_export_manifest
+
+        def get_data(filename):
+            with tarfile.open(filename, "r:gz", format=tarfile.PAX_FORMAT) as tar:
+                return json.loads(tar.extractfile('data.json').read().decode('utf-8'))
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            calc = Calculation()
+            calc._set_process_status('initial')
+            calc.store()
+            outputs = [Int(value) for value in range(2)]
+            for index, output in enumerate(outputs):
+                output.add_link_from(calc, label='output_{}'.format(index), link_type=LinkType.CREATE)
+                output.store()
+            group, _ = Group.get_or_create(name='incremental')
+            group.add_nodes(outputs[:1])
+
+            full_filename = os.path.join(temp_folder, "full.tar.gz")
+            export([group, calc], outfile=full_filename, silent=True)
+            full_manifest = load_export_manifest(full_filename)
+            self.assertIsNone(full_manifest['base_export_id'])
+            self.assertEquals(set(full_manifest['nodes']), set([calc.uuid] + [node.uuid for node in outputs]))
+
+            # Add an output and a group member and change the calculation
+            new_output = Int(2)
+            new_output.add_link_from(calc, label='output_2', link_type=LinkType.CREATE)
+            new_output.store()
+            group.add_nodes([outputs[1], new_output])
+            calc._set_process_status('changed')
+
+            delta_filename = os.path.join(temp_folder, "delta.tar.gz")
+            export([group, calc], outfile=delta_filename, silent=True, previous_manifest=full_manifest)
+            delta_manifest = load_export_manifest(delta_filename)
+            self.assertEquals(delta_manifest['base_export_id'], full_manifest['export_id'])
+            self.assertEquals(set(delta_manifest['nodes']), set(full_manifest['nodes']) | set([new_output.uuid]))
+            self.assertEquals(sorted(delta_manifest['groups'][group.uuid]),
+                              sorted(node.uuid for node in outputs + [new_output]))
+
+            delta_data = get_data(delta_filename)
+            self.assertEquals(sorted(v['uuid'] for v in delta_data['export_data']['Node'].values()),
+                              sorted([calc.uuid, new_output.uuid]))
+            self.assertEquals(sorted(delta_data['groups_uuid'][group.uuid]), sorted([outputs[1].uuid, new_output.uuid]))
+            self.assertIn(new_output.uuid, [link['output'] for link in delta_data['links_uuid']])
+
+            # Nothing changed since the last export
+            empty_filename = os.path.join(temp_folder, "empty.tar.gz")
+            export([group, calc], outfile=empty_filename, silent=True, previous_manifest=delta_manifest)
+            empty_data = get_data(empty_filename)
+            self.assertNotIn('Node', empty_data['export_data'])
+            self.assertEquals(empty_data['groups_uuid'], {})
+
+            self.assertEquals(get_export_chain([empty_filename, full_filename, delta_filename]),
+                              [full_filename, delta_filename, empty_filename])
+            with self.assertRaises(ValueError):
+                get_export_chain([full_filename, empty_filename])
+
+            uuids = [node.uuid for node in outputs + [new_output]]
+            calc_uuid = calc.uuid
+            self.clean_db()
+            self.insert_data()
+            import_data_chain([empty_filename, delta_filename, full_filename], silent=True)
+
+            self.assertEquals(load_node(calc_uuid).get_attr(Calculation.PROCESS_STATUS_KEY), 'changed')
+            for value, uuid in enumerate(uuids):
+                node = load_node(uuid)
+                self.assertEquals(node.value, value)
+                self.assertEquals(node.get_inputs(link_type=LinkType.CREATE)[0].uuid, calc_uuid)
+            imported_group = Group.get(name='incremental')
+            self.assertEquals(sorted(node.uuid for node in imported_group.nodes), sorted(uuids))
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def test_incremental_import_unchanged_nodes(self):
+        """
+        Check that the links and group memberships of an incremental archive that refer to unchanged nodes, which are
+        only in the database and not in the archive, are imported.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.common.links import LinkType
+        from aiida.orm import Group, load_node
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.base import Int
+        from aiida.orm.importexport import export, load_export_manifest
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            calc = Calculation()
+            calc._set_process_status('initial')
+            calc.store()
+            output = Int(1)
+            output.add_link_from(calc, label='output', link_type=LinkType.CREATE)
+            output.store()
+            group, _ = Group.get_or_create(name='incremental_unchanged')
+            group.add_nodes([calc])
+
+            full_filename = os.path.join(temp_folder, "full.tar.gz")
+            export([group, calc], outfile=full_filename, silent=True)
+
+            # The calculation changes and the unchanged output joins the group
+            calc._set_process_status('changed')
+            group.add_nodes([output])
+            delta_filename = os.path.join(temp_folder, "delta.tar.gz")
+            export([group, calc], outfile=delta_filename, silent=True,
+                   previous_manifest=load_export_manifest(full_filename))
+
+            calc_uuid = calc.uuid
+            output_uuid = output.uuid
+            self.clean_db()
+            self.insert_data()
+            import_data(full_filename, silent=True)
+            import_data(delta_filename, silent=True)
+
+            self.assertEquals(load_node(calc_uuid).get_attr(Calculation.PROCESS_STATUS_KEY), 'changed')
+            inputs = load_node(output_uuid).get_inputs(link_type=LinkType.CREATE)
+            self.assertEquals([node.uuid for node in inputs], [calc_uuid])
+            imported_group = Group.get(name='incremental_unchanged')
+            self.assertEquals(sorted(node.uuid for node in imported_group.nodes), sorted([calc_uuid, output_uuid]))
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def test_incremental_import_updates_loaded_node(self):
+        """
+        Check that importing an incremental archive updates the attributes, columns and nodeversion of a changed node
+        that already exists, such that an instance of it loaded before the import reads the new attributes.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.orm import load_node
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.importexport import export, load_export_manifest
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            calc = Calculation()
+            calc.label = 'initial label'
+            calc.description = 'initial description'
+            calc._set_process_status('initial')
+            calc.store()
+
+            full_filename = os.path.join(temp_folder, "full.tar.gz")
+            export([calc], outfile=full_filename, silent=True)
+
+            calc.label = 'changed label'
+            calc.description = 'changed description'
+            calc._set_process_status('changed')
+            delta_filename = os.path.join(temp_folder, "delta.tar.gz")
+            export([calc], outfile=delta_filename, silent=True, previous_manifest=load_export_manifest(full_filename))
+
+            calc_uuid = calc.uuid
+            calc_mtime = calc.mtime
+            self.clean_db()
+            self.insert_data()
+            import_data(full_filename, silent=True)
+
+            # Read the values of the node, such that they are cached by the loaded instance
+            loaded = load_node(calc_uuid)
+            self.assertEquals(loaded.get_attr(Calculation.PROCESS_STATUS_KEY), 'initial')
+            self.assertEquals(loaded.label, 'initial label')
+            self.assertEquals(loaded.description, 'initial description')
+            nodeversion = loaded.nodeversion
+
+            import_data(delta_filename, silent=True)
+
+            self.assertEquals(loaded.get_attr(Calculation.PROCESS_STATUS_KEY), 'changed')
+
+            # The Django backend does not reload the columns of a loaded instance
+            reloaded = load_node(calc_uuid)
+            self.assertEquals(reloaded.label, 'changed label')
+            self.assertEquals(reloaded.description, 'changed description')
+            self.assertEquals(reloaded.mtime, calc_mtime)
+            self.assertEquals(reloaded.nodeversion, nodeversion + 1)
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
     def test_1(self):
         import os
         import shutil
@@ -441,6 +772,39 @@ class TestSimple(AiidaTestCase):
             export_tree([sd], folder=folder, silent=True,
                         forbidden_licenses=crashing_filter)
 
+    def test_failed_export_leaves_no_file(self):
+        """
+        Check that an export that fails while the archive is being written does not leave a truncated archive, or its
+        temporary file, behind and that it can be retried without overwriting.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.common.exceptions import LicensingException
+        from aiida.orm import DataFactory
+        from aiida.orm.importexport import export, export_zip
+
+        StructureData = DataFactory('structure')
+        sd = StructureData()
+        sd.source = {'license': 'GPL'}
+        sd.store()
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            for export_function, basename in [(export, 'export.tar.gz'), (export_zip, 'export.zip')]:
+                filename = os.path.join(temp_folder, basename)
+
+                with self.assertRaises(LicensingException):
+                    export_function([sd], outfile=filename, silent=True, forbidden_licenses=['GPL'])
+                self.assertEquals(os.listdir(temp_folder), [])
+
+                export_function([sd], outfile=filename, silent=True)
+                self.assertEquals(os.listdir(temp_folder), [basename])
+                os.remove(filename)
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
     def test_5(self):
         """
         This test checks that nodes belonging to different users are correctly
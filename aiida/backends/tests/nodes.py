@@ -183,6 +183,29 @@ class TestNodeHashing(AiidaTestCase):
         self.assertNotEquals(hash1, None)
         self.assertEquals(hash1, hash2)
 
+    def test_node_hash_column(self):
+        """
+        The hash should be stored in the indexed column of the node, which is used to find the same nodes.
+        """
+        from aiida.orm.querybuilder import QueryBuilder
+
+        node = self.create_simple_node(3.14, 'node_hash_column')
+        node.store()
+
+        def get_node_hash(pk):
+            return QueryBuilder().append(Node, filters={'id': pk}, project=['node_hash']).one()[0]
+
+        self.assertEquals(get_node_hash(node.pk), node.get_hash())
+        self.assertEquals(node.get_extra('_aiida_hash'), node.get_hash())
+
+        node.clear_hash()
+        self.assertEquals(get_node_hash(node.pk), None)
+        self.assertEquals(node._get_same_node(), None)
+
+        node.rehash()
+        self.assertEquals(get_node_hash(node.pk), node.get_hash())
+        self.assertEquals(node._get_same_node().uuid, node.uuid)
+
 
 class TestTransitiveNoLoops(AiidaTestCase):
     """
@@ -1082,6 +1105,48 @@ class TestNodeBasic(AiidaTestCase):
         a.description = 'test description'
         self.assertEquals(a.dbnode.nodeversion, 4)
 
+    def test_set_extras_many(self):
+        """
+        Set several extras at once on a node, and the same extra on many nodes.
+        """
+        from aiida.orm.utils import set_extra_for_nodes
+
+        a = Node().store()
+        a.set_extra('untouched', 1)
+        a.set_extra('dict', {'a': 1, 'b': [1, 2]})
+
+        extras_to_set = {
+            'bool': self.boolval,
+            'string': self.stringval,
+            'dict': {'c': 3},
+            'list': self.listval,
+        }
+
+        a.set_extras_many(extras_to_set)
+        self.assertEquals({k: v for k, v in a.iterextras()},
+                          dict(_aiida_hash=AnyValue(), untouched=1, **extras_to_set))
+        self.assertEquals(a.dbnode.nodeversion, 4)
+
+        with self.assertRaises(ModificationNotAllowed):
+            Node().set_extras_many({'a': 1})
+
+        nodes = [Node().store() for _ in range(5)]
+        set_extra_for_nodes([node.pk for node in nodes[:4]], 'tag', {'name': 'tagged', 'values': [1, 2]})
+        set_extra_for_nodes([node.pk for node in nodes[:3]], 'tag', 'replaced')
+
+        for node in nodes:
+            node = load_node(node.pk)
+            self.assertEquals(node.get_extra('_aiida_hash'), node.get_hash())
+            if node.pk in [n.pk for n in nodes[:3]]:
+                self.assertEquals(node.get_extra('tag'), 'replaced')
+                self.assertEquals(node.dbnode.nodeversion, 3)
+            elif node.pk == nodes[3].pk:
+                self.assertEquals(node.get_extra('tag'), {'name': 'tagged', 'values': [1, 2]})
+                self.assertEquals(node.dbnode.nodeversion, 2)
+            else:
+                self.assertEquals(node.get_extra('tag', None), None)
+                self.assertEquals(node.dbnode.nodeversion, 1)
+
     def test_delete_extras(self):
         """
         Checks the ability of deleting extras, also when they are dictionaries
@@ -2198,6 +2263,78 @@ class TestSubNodesAndLinks(AiidaTestCase):
         self.assertEquals(len(node_origin.get_inputs(link_type=LinkType.INPUT)), 1)
 
 
+class TestStoreMany(AiidaTestCase):
+    """
+    Test the storing of many nodes and links at once with store_many.
+    """
+
+    def test_store_many(self):
+        from aiida.orm.data.int import Int
+        from aiida.orm.data.parameter import ParameterData
+        from aiida.orm.utils import store_many
+
+        calc = Calculation()
+        inputs = [ParameterData(dict={'index': index}) for index in range(3)]
+        for index, node in enumerate(inputs):
+            calc.add_link_from(node, label='input_{}'.format(index), link_type=LinkType.INPUT)
+
+        outputs = [Int(index) for index in range(10)]
+        for index, node in enumerate(outputs[:5]):
+            node._get_folder_pathsubfolder.create_file_from_filelike(six.StringIO(u'{}'.format(index)), 'file.txt')
+
+        links = [(calc, node, 'output_{}'.format(index), LinkType.CREATE) for index, node in enumerate(outputs)]
+        result = store_many(inputs + [calc] + outputs, links=links)
+
+        self.assertEquals(result, inputs + [calc] + outputs)
+        self.assertTrue(all(node.is_stored for node in result))
+        self.assertEquals(len(set(node.pk for node in result)), len(result))
+
+        for index, node in enumerate(inputs):
+            reloaded = load_node(node.pk)
+            self.assertEquals(reloaded.get_dict(), {'index': index})
+            self.assertEquals(reloaded.get_extra('_aiida_hash'), reloaded.get_hash())
+            self.assertEquals(reloaded._get_same_node().uuid, node.uuid)
+
+        for index, node in enumerate(outputs):
+            reloaded = load_node(node.pk)
+            self.assertEquals(reloaded.value, index)
+            self.assertEquals(list(reloaded.get_inputs_dict(link_type=LinkType.CREATE)), ['output_{}'.format(index)])
+            self.assertEquals(reloaded.get_inputs()[0].uuid, calc.uuid)
+
+        for node in outputs[:5]:
+            self.assertEquals(load_node(node.pk).get_folder_list(), ['file.txt'])
+
+        self.assertEquals(
+            set(label for label, _ in load_node(calc.pk).get_inputs(also_labels=True, link_type=LinkType.INPUT)),
+            {'input_{}'.format(index) for index in range(3)})
+
+    def test_store_many_unstored_parent(self):
+        """Storing a node whose parent is unstored and not among the nodes to store should fail without storing."""
+        from aiida.orm.data.int import Int
+        from aiida.orm.utils import store_many
+
+        calc = Calculation()
+        node = Int(1)
+        node.add_link_from(calc, label='output', link_type=LinkType.CREATE)
+
+        with self.assertRaises(ModificationNotAllowed):
+            store_many([node])
+
+        self.assertFalse(node.is_stored)
+
+    def test_store_many_loop(self):
+        """Links between the nodes that would create a loop should be refused."""
+        from aiida.orm.utils import store_many
+
+        nodes = [Node() for _ in range(3)]
+        links = [(nodes[index - 1], node, 'link', LinkType.CREATE) for index, node in enumerate(nodes)]
+
+        with self.assertRaises(ValueError):
+            store_many(nodes, links=links)
+
+        self.assertFalse(any(node.is_stored for node in nodes))
+
+
 class AnyValue(object):
     """
     Helper class that compares equal to everything.
@@ -2372,3 +2509,49 @@ class TestNodeDeletion(AiidaTestCase):
             delete_nodes([called.pk], verbosity=2, force=True, follow_returns=True)
 
         self._check_existence(uuids_check_existence, uuids_check_deleted)
+
+    def test_outgoing_closure(self):
+        """
+        Check that the closure computed by the query manager follows only the requested link types and terminates
+        on graphs with loops.
+        """
+        in1, in2, wf, slave1, outp1, outp2, slave2, outp3, outp4 = self._create_calls_n_returns_graph()
+        # Returning one of its own inputs creates a loop in the graph
+        in1.add_link_from(wf, link_type=LinkType.RETURN)
+        query_manager = self.backend.query_manager
+
+        closure = query_manager.get_outgoing_closure([wf.pk], [LinkType.CREATE.value, LinkType.INPUT.value])
+        self.assertEqual(closure, set([wf.pk, outp3.pk]))
+
+        closure = query_manager.get_outgoing_closure(
+            [wf.pk], [LinkType.CREATE.value, LinkType.INPUT.value, LinkType.CALL.value])
+        self.assertEqual(closure, set([wf.pk, outp3.pk, slave1.pk, slave2.pk, outp1.pk, outp2.pk]))
+
+        closure = query_manager.get_outgoing_closure(
+            [wf.pk], [LinkType.CREATE.value, LinkType.INPUT.value, LinkType.CALL.value, LinkType.RETURN.value])
+        self.assertEqual(closure, set([wf.pk, outp3.pk, slave1.pk, slave2.pk, outp1.pk, outp2.pk, outp4.pk, in1.pk]))
+
+        self.assertEqual(query_manager.get_outgoing_closure([in1.pk, in2.pk], []), set([in1.pk, in2.pk]))
+        self.assertEqual(query_manager.get_outgoing_closure([], [LinkType.CREATE.value]), set())
+
+        with self.assertRaises(ValueError):
+            query_manager.get_outgoing_closure([wf.pk], ['invalidlink'])
+
+    def test_deletion_repository_folders(self):
+        """
+        Check that the repository folders of the deleted nodes are erased, including the checkpoint folder.
+        """
+        from aiida.work.persistence import get_checkpoint_folder
+
+        calc, output = [Calculation().store() for _ in range(2)]
+        output.add_link_from(calc, link_type=LinkType.CREATE)
+        checkpoint_folder = get_checkpoint_folder(calc)
+        checkpoint_folder.create()
+        folders = [calc.folder, output.folder, checkpoint_folder]
+        self.assertTrue(checkpoint_folder.exists())
+
+        with Capturing():
+            delete_nodes([calc.pk], verbosity=2, force=True)
+
+        self._check_existence([], [calc.uuid, output.uuid])
+        self.assertFalse(any(folder.exists() for folder in folders))
@@ -129,6 +129,30 @@ class TestBackendLog(AiidaTestCase):
         self.assertEquals(len(entries), 1)
         self.assertEquals(entries[0].objpk, target_pk)
 
+    def test_find_for_objects(self):
+        """
+        Test the retrieval of the entries of multiple objects, filtered by level name and ordered by time
+        """
+        from datetime import timedelta
+
+        start = now()
+        for pk in range(10):
+            for levelname in ['REPORT', 'WARNING']:
+                record = dict(self._record, objpk=pk, levelname=levelname, time=start - timedelta(seconds=pk))
+                self._backend.logs.create_entry(**record)
+
+        # A batch size smaller than the number of entries forces the retrieval in multiple pages
+        entries = list(self._backend.logs.find_for_objects([2, 3, 4], batch_size=4))
+        self.assertEquals(len(entries), 6)
+        self.assertEquals([entry.objpk for entry in entries], [4, 4, 3, 3, 2, 2])
+        self.assertEquals(len(set(entry.id for entry in entries)), 6)
+
+        entries = list(self._backend.logs.find_for_objects([2, 3, 4], levelnames=['WARNING'], batch_size=2))
+        self.assertEquals([(entry.objpk, entry.levelname) for entry in entries], [(4, 'WARNING'), (3, 'WARNING'),
+                                                                                  (2, 'WARNING')])
+
+        self.assertEquals(list(self._backend.logs.find_for_objects([])), [])
+
     def test_db_log_handler(self):
         """
         Verify that the db log handler is attached correctly
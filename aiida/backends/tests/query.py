@@ -361,6 +361,105 @@ class TestQueryBuilder(AiidaTestCase):
         self.assertEqual(len(list(QueryBuilder().append(Node, project=['*', 'id']).iterdict())), 4)
         self.assertEqual(len(list(QueryBuilder().append(Node, project=['id']).iterdict())), 4)
 
+    def test_iterall_streaming(self):
+        """
+        Test that streaming the results with iterall and iterdict gives the same results as all and dict,
+        both for projections of plain columns and of entities, and independently of the batch size.
+        """
+        from aiida.orm import Node
+        from aiida.orm.querybuilder import QueryBuilder
+
+        def normalize(value):
+            """Nodes do not compare equal if they are different instances, so compare their UUIDs instead."""
+            return value.uuid if isinstance(value, Node) else value
+
+        for i in range(7):
+            node = Node()
+            node._set_attr('index', i)
+            node.label = 'node_{}'.format(i)
+            node.store()
+
+        for project in (['id', 'uuid'], ['id', 'attributes.index'], ['*'], ['*', 'label'], ['attributes']):
+            query = QueryBuilder().append(Node, project=project, tag='node').order_by({'node': ['id']})
+            results = [[normalize(value) for value in row] for row in query.all(batch_size=1000)]
+            for batch_size in (None, 1, 3, 100):
+                self.assertEqual([[normalize(value) for value in row] for row in query.iterall(batch_size=batch_size)],
+                                 results)
+                self.assertEqual([[normalize(result['node'][key]) for key in project]
+                                  for result in query.iterdict(batch_size=batch_size)], results)
+
+        # Entities are still converted to their AiiDA class, plain columns are returned as is
+        for pk, node, label in QueryBuilder().append(Node, project=['id', '*', 'label']).iterall(batch_size=2):
+            self.assertIsInstance(node, Node)
+            self.assertEqual(node.pk, pk)
+            self.assertEqual(node.label, label)
+
+    def test_compile(self):
+        """Test that a compiled query gives the same results as the QueryBuilder for all values of its placeholders."""
+        from aiida.common.exceptions import InputValidationError
+        from aiida.common.links import LinkType
+        from aiida.orm import Node
+        from aiida.orm.querybuilder import QueryBuilder, Placeholder
+
+        parent = Node().store()
+        children = []
+        for i in range(3):
+            child = Node()
+            child.label = 'child_{}'.format(i)
+            child.add_link_from(parent, label='link_{}'.format(i), link_type=LinkType.CREATE)
+            child.store()
+            children.append(child)
+
+        def get_query(parent_filter):
+            query = QueryBuilder()
+            query.append(Node, filters={'id': parent_filter}, tag='parent')
+            query.append(Node, output_of='parent', project=['id', 'label'], tag='child')
+            return query.order_by({'child': ['id']})
+
+        compiled = get_query(Placeholder('pk')).compile()
+        self.assertEqual(compiled.placeholders, {'pk'})
+
+        for node in [parent] + children:
+            expected = get_query(node.pk).all()
+            self.assertEqual(compiled.execute(pk=node.pk), expected)
+            self.assertEqual(compiled.execute(pk=node.pk), expected)
+            self.assertEqual(list(compiled.iterall(batch_size=2, pk=node.pk)), expected)
+            self.assertEqual(compiled.count(pk=node.pk), len(expected))
+            self.assertEqual(compiled.execute_dict(pk=node.pk), get_query(node.pk).dict())
+
+        query = QueryBuilder().append(Node, filters={'id': {'in': Placeholder('pks')}}, project=['id'], tag='node')
+        compiled = query.order_by({'node': ['id']}).compile()
+        self.assertEqual(compiled.execute(pks=[children[0].pk, children[2].pk]), [[children[0].pk], [children[2].pk]])
+        self.assertEqual(compiled.execute(pks=[]), [])
+
+        # The values of an 'in' placeholder are bound with the type of the column, also for non integer columns
+        query = QueryBuilder().append(Node, filters={'uuid': {'in': Placeholder('uuids')}}, project=['id'], tag='node')
+        compiled = query.order_by({'node': ['id']}).compile()
+        uuids = [children[0].uuid, children[2].uuid]
+        self.assertEqual(compiled.execute(uuids=uuids), [[children[0].pk], [children[2].pk]])
+        self.assertEqual(compiled.execute(uuids=uuids), [[children[0].pk], [children[2].pk]])
+        self.assertEqual(compiled.execute(uuids=[children[1].uuid]), [[children[1].pk]])
+        self.assertEqual(compiled.execute(uuids=[]), [])
+
+        query = QueryBuilder().append(Node, filters={'uuid': {'!in': Placeholder('uuids')}, 'id': {'>=': parent.pk}})
+        self.assertEqual(query.compile().count(uuids=[parent.uuid, children[0].uuid]), 2)
+
+        query = QueryBuilder().append(Node, filters={'label': {'~like': Placeholder('label')}, 'id': {'>=': parent.pk}})
+        self.assertEqual(query.compile().count(label='child_%'), 1)
+
+        # All the values of the placeholders have to be given, and only those
+        with self.assertRaises(InputValidationError):
+            compiled.execute()
+        with self.assertRaises(InputValidationError):
+            compiled.execute(pks=[parent.pk], pk=parent.pk)
+
+        # A query with placeholders has to be compiled to be executed
+        with self.assertRaises(InputValidationError):
+            QueryBuilder().append(Node, filters={'id': Placeholder('pk')}).all()
+
+        with self.assertRaises(InputValidationError):
+            QueryBuilder().append(Node, filters={'attributes.a': Placeholder('a')}).compile()
+
     def test_append_validation(self):
         from aiida.orm.querybuilder import QueryBuilder
         from aiida.orm.data.structure import StructureData
@@ -941,6 +1040,74 @@ class TestConsistency(AiidaTestCase):
         self.assertTrue(len(QueryBuilder().append(Node, project=['id', 'label']).all(batch_size=10)) > 99)
 
 
+class TestQueryCache(AiidaTestCase):
+
+    def test_eviction_and_statistics(self):
+        """Test the least-recently-used eviction, the expiry and the invalidation of the query cache."""
+        from aiida.orm.querycache import QueryCache
+
+        counter = [0]
+        cache = QueryCache(max_size=2, ttl=3600)
+
+        def get(key):
+            return cache.get(key, lambda: [key, counter[0]], lambda: counter[0])
+
+        self.assertEqual(get('a'), ['a', 0])
+        self.assertEqual(get('b'), ['b', 0])
+        self.assertEqual(get('a'), ['a', 0])
+        self.assertEqual(get('c'), ['c', 0])  # Evicts 'b', the least recently used
+        self.assertEqual(cache.get_statistics(),
+                         {'hits': 1, 'misses': 3, 'evicted': 1, 'expired': 0, 'invalidations': 0, 'size': 2})
+
+        counter[0] = 1
+        self.assertEqual(get('a'), ['a', 1])
+        self.assertEqual(cache.get_statistics()['invalidations'], 1)
+        self.assertEqual(len(cache), 1)
+
+        expiring_cache = QueryCache(max_size=2, ttl=-1)
+        expiring_cache.get('a', lambda: 1, lambda: 0)
+        expiring_cache.get('a', lambda: 1, lambda: 0)
+        self.assertEqual(expiring_cache.get_statistics()['expired'], 1)
+        self.assertEqual(expiring_cache.get_statistics()['hits'], 0)
+
+        disabled_cache = QueryCache(max_size=0, ttl=3600)
+        disabled_cache.get('a', lambda: 1, lambda: 0)
+        self.assertEqual(len(disabled_cache), 0)
+
+    def test_querybuilder_use_cache(self):
+        """Test that cached query results are returned until the database changes."""
+        from aiida.orm import Node
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.orm.querycache import get_query_cache
+
+        cache = get_query_cache()
+        cache.clear()
+        cache.reset_statistics()
+
+        node = Node()
+        node.label = 'cached'
+        node.store()
+
+        query = QueryBuilder().append(Node, filters={'label': 'cached'}, project=['id'], tag='node')
+        self.assertEqual(query.all(use_cache=True), [[node.pk]])
+        self.assertEqual(QueryBuilder(**query.get_json_compatible_queryhelp()).all(use_cache=True), [[node.pk]])
+        self.assertEqual(query.count(use_cache=True), 1)
+        self.assertEqual(query.dict(use_cache=True), [{'node': {'id': node.pk}}])
+        self.assertEqual(cache.get_statistics()['hits'], 1)
+
+        other = Node()
+        other.label = 'cached'
+        other.store()
+        self.assertEqual(query.count(use_cache=True), 2)
+        self.assertEqual(cache.get_statistics()['hits'], 1)
+
+        # Queries that are modified outside of the queryhelp are not cached
+        query.distinct()
+        query.all(use_cache=True)
+        query.all(use_cache=True)
+        self.assertEqual(cache.get_statistics()['hits'], 1)
+
+
 class TestManager(AiidaTestCase):
     def test_statistics(self):
         """
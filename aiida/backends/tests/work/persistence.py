@@ -11,10 +11,8 @@
 from __future__ import absolute_import
 import tempfile
 
-import six
-
 from aiida.backends.testbase import AiidaTestCase
-from aiida.work.persistence import AiiDAPersister
+from aiida.work.persistence import AiiDAPersister, get_checkpoint_folder, get_checkpoint_serializer
 from aiida.work import Process
 from aiida.work.test_utils import DummyProcess
 from aiida import work
@@ -57,11 +55,39 @@ class TestAiiDAPersister(AiidaTestCase):
 
         self.assertEquals(bundle_saved, bundle_loaded)
 
+    def test_save_load_checkpoint_serializers(self):
+        """Test that a checkpoint can be loaded regardless of the serializer that was used to save it."""
+        for name in ['yaml', 'pickle']:
+            for compression in ['none', 'zlib', 'bz2']:
+                persister = AiiDAPersister(serializer=get_checkpoint_serializer(name, compression))
+                process = DummyProcess()
+                bundle_saved = persister.save_checkpoint(process)
+                bundle_loaded = self.persister.load_checkpoint(process.calc.pk)
+
+                self.assertEquals(bundle_saved, bundle_loaded)
+                filenames = get_checkpoint_folder(process.calc).get_content_list()
+                self.assertEquals(filenames, [persister.serializer.filename])
+
     def test_delete_checkpoint(self):
         process = DummyProcess()
 
         self.persister.save_checkpoint(process)
-        self.assertTrue(isinstance(process.calc.checkpoint, six.string_types))
+        self.assertTrue(get_checkpoint_folder(process.calc).exists())
+        self.assertEquals(process.calc.checkpoint, None)
 
         self.persister.delete_checkpoint(process.pid)
+        self.assertFalse(get_checkpoint_folder(process.calc).exists())
+
+    def test_load_legacy_checkpoint(self):
+        """Test that a legacy YAML checkpoint stored in the attributes is loaded and migrated to the repository."""
+        import yaml
+
+        process = DummyProcess()
+        bundle_saved = work.Bundle(process)
+        process.calc.set_checkpoint(yaml.dump(bundle_saved))
+
+        bundle_loaded = self.persister.load_checkpoint(process.calc.pk)
+        self.assertEquals(bundle_saved, bundle_loaded)
         self.assertEquals(process.calc.checkpoint, None)
+        self.assertEquals(
+            get_checkpoint_folder(process.calc).get_content_list(), [self.persister.serializer.filename])
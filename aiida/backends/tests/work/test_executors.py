@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import absolute_import
+from collections import namedtuple
+import threading
+import time
+
+from tornado.gen import coroutine, multi, sleep
+from tornado.ioloop import IOLoop
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.work.executors import LoopLagMonitor, TaskExecutor
+
+AuthInfo = namedtuple('AuthInfo', ['id'])
+
+
+class TestTaskExecutor(AiidaTestCase):
+    """Tests for the TaskExecutor."""
+
+    def setUp(self, *args, **kwargs):
+        super(TestTaskExecutor, self).setUp(*args, **kwargs)
+        self.loop = IOLoop()
+        self.executor = TaskExecutor(transport_pool_size=4, database_pool_size=2)
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self, *args, **kwargs):
+        self.executor.close()
+        self.loop.close()
+        super(TestTaskExecutor, self).tearDown(*args, **kwargs)
+
+    def transport_operation(self):
+        """Pretend to use a transport for a while and record the maximum number of concurrent operations."""
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.1)
+        with self.lock:
+            self.running -= 1
+
+    def test_inline(self):
+        """Test that pools of size zero run the tasks on the thread of the event loop."""
+        executor = TaskExecutor()
+
+        @coroutine
+        def test():
+            transport_thread = yield executor.run_transport_task(AuthInfo(1), threading.current_thread)
+            database_thread = yield executor.run_database_task(threading.current_thread)
+            self.assertIs(transport_thread, threading.current_thread())
+            self.assertIs(database_thread, threading.current_thread())
+
+        self.loop.run_sync(test)
+
+    def test_threads(self):
+        """Test that the tasks are run in other threads and that their results and exceptions are passed back."""
+
+        def fail():
+            raise RuntimeError('failed')
+
+        @coroutine
+        def test():
+            transport_thread = yield self.executor.run_transport_task(AuthInfo(1), threading.current_thread)
+            database_thread = yield self.executor.run_database_task(threading.current_thread)
+            self.assertIsNot(transport_thread, threading.current_thread())
+            self.assertIsNot(database_thread, threading.current_thread())
+
+            with self.assertRaises(RuntimeError):
+                yield self.executor.run_database_task(fail)
+
+        self.loop.run_sync(test)
+
+        statistics = self.executor.get_statistics()
+        self.assertEqual(statistics['transport'], {'size': 4, 'pending': 0, 'completed': 1})
+        self.assertEqual(statistics['database'], {'size': 2, 'pending': 0, 'completed': 2})
+
+    def test_same_authinfo(self):
+        """Test that the tasks of the same authinfo are run one at a time."""
+        authinfo = AuthInfo(1)
+
+        @coroutine
+        def test():
+            yield multi([self.executor.run_transport_task(authinfo, self.transport_operation) for _ in range(3)])
+
+        self.loop.run_sync(test)
+
+        self.assertEqual(self.max_running, 1)
+        self.assertEqual(self.executor.get_statistics()['transport_waits'], 2)
+
+    def test_different_authinfos(self):
+        """Test that the tasks of different authinfos are run at the same time, without blocking the loop."""
+        ticks = []
+
+        @coroutine
+        def tick():
+            for _ in range(5):
+                ticks.append(time.time())
+                yield sleep(0.01)
+
+        @coroutine
+        def test():
+            yield multi([self.executor.run_transport_task(AuthInfo(index), self.transport_operation)
+                         for index in range(3)] + [tick()])
+
+        self.loop.run_sync(test)
+
+        self.assertEqual(self.max_running, 3)
+        self.assertLess(ticks[-1] - ticks[0], 0.1)
+
+
+class TestLoopLagMonitor(AiidaTestCase):
+    """Tests for the LoopLagMonitor."""
+
+    def test_lag(self):
+        """Test that the time for which a callback blocks the loop is measured."""
+        loop = IOLoop()
+        monitor = LoopLagMonitor(loop, interval=0.05)
+
+        @coroutine
+        def test():
+            monitor.start()
+            yield sleep(0.1)
+            time.sleep(0.3)
+            yield sleep(0.1)
+            monitor.stop()
+
+        try:
+            loop.run_sync(test)
+        finally:
+            loop.close()
+
+        statistics = monitor.get_statistics()
+        self.assertFalse(monitor.is_running())
+        self.assertGreater(statistics['samples'], 1)
+        self.assertGreater(statistics['max'], 0.2)
+        self.assertLessEqual(statistics['mean'], statistics['max'])
+
+        monitor.reset_statistics()
+        self.assertEqual(monitor.get_statistics(), {'samples': 0, 'last': 0., 'mean': 0., 'max': 0.})
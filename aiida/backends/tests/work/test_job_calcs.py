@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import absolute_import
+import unittest
+
+import mock
+import six
+from tornado.gen import coroutine, multi, Return
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.scheduler.datastructures import JobInfo, JOB_STATES
+from aiida.work.job_calcs import JobManager
+from aiida.work.transports import TransportQueue
+
+
+@unittest.skipIf(six.PY3, "Broken on Python 3")
+class TestJobManager(AiidaTestCase):
+    """Tests for the JobManager and the JobsList."""
+
+    def setUp(self, *args, **kwargs):
+        """Set up a simple authinfo and a job manager for later use."""
+        super(TestJobManager, self).setUp(*args, **kwargs)
+        self.authinfo = self.backend.authinfos.create(
+            computer=self.computer,
+            user=self.backend.users.get_automatic_user())
+        self.authinfo.store()
+        self.transport_queue = TransportQueue()
+        self.job_manager = JobManager(self.transport_queue)
+
+    def tearDown(self, *args, **kwargs):
+        self.backend.authinfos.remove(self.authinfo.id)
+        super(TestJobManager, self).tearDown(*args, **kwargs)
+
+    def test_get_jobs_list(self):
+        """Test that the same jobs list is returned for the same authinfo."""
+        jobs_list = self.job_manager.get_jobs_list(self.authinfo)
+        self.assertIs(jobs_list, self.job_manager.get_jobs_list(self.authinfo))
+        self.assertIsNone(jobs_list.last_updated)
+
+    def test_request_job_info_update(self):
+        """Test that multiple update requests are served by a single call to the scheduler."""
+        job_info = JobInfo()
+        job_info.job_id = '1'
+        job_info.job_state = JOB_STATES.RUNNING
+
+        loop = self.transport_queue.loop()
+
+        @coroutine
+        def test():
+            results = yield multi([self._request(job_id) for job_id in ['1', '2']])
+            self.assertEqual(results[0].job_state, JOB_STATES.RUNNING)
+            self.assertIsNone(results[1])
+
+        scheduler_class = self.computer.get_scheduler().__class__
+        with mock.patch.object(scheduler_class, 'getJobs', return_value={'1': job_info}) as get_jobs:
+            loop.run_sync(test)
+            self.assertEqual(get_jobs.call_count, 1)
+
+        self.assertIsNotNone(self.job_manager.get_jobs_list(self.authinfo).last_updated)
+
+    @coroutine
+    def _request(self, job_id):
+        """Request an update for the given job id and return the JobInfo."""
+        with self.job_manager.request_job_info_update(self.authinfo, job_id) as update_request:
+            job_info = yield update_request
+
+        raise Return(job_info)
@@ -137,3 +137,49 @@ class TestTransportQueue(AiidaTestCase):
 
         finally:
             transport_class._DEFAULT_SAFE_OPEN_INTERVAL = original_interval
+
+    def test_idle_timeout(self):
+        """Verify that a transport is kept open for the idle timeout and reused by subsequent requests."""
+        queue = TransportQueue(idle_timeout=60.)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        trans1 = loop.run_sync(lambda: test())
+        self.assertTrue(trans1.is_open)
+
+        trans2 = loop.run_sync(lambda: test())
+        self.assertIs(trans1, trans2)
+
+        statistics = queue.get_statistics()
+        self.assertEqual(statistics['opens'], 1)
+        self.assertEqual(statistics['waits'], 1)
+        self.assertEqual(statistics['hits'], 1)
+
+        queue.close()
+        self.assertFalse(trans1.is_open)
+
+    def test_idle_transport_reconnect(self):
+        """Verify that an idle transport that is no longer alive is replaced by a new one."""
+        queue = TransportQueue(idle_timeout=60.)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        trans1 = loop.run_sync(lambda: test())
+        trans1.close()
+
+        trans2 = loop.run_sync(lambda: test())
+        self.assertIsNot(trans1, trans2)
+        self.assertTrue(trans2.is_open)
+        self.assertEqual(queue.get_statistics()['reconnects'], 1)
+
+        queue.close()
@@ -564,6 +564,73 @@ def computer_delete(computer):
     echo.echo_success("Computer '{}' deleted.".format(compname))
 
 
+@verdi_computer.group('upload-cache')
+def computer_upload_cache():
+    """Manage the cache of the files uploaded to a computer."""
+    pass
+
+
+@computer_upload_cache.command('set')
+@arguments.COMPUTER()
+@click.argument('directory', type=click.STRING)
+@click.option('--link-mode', type=click.Choice(['symlink', 'hardlink']), default=None,
+              help='Link the cached files into the working directories with symbolic or hard links.')
+@with_dbenv()
+def computer_upload_cache_set(computer, directory, link_mode):
+    """
+    Store the files uploaded to COMPUTER once in DIRECTORY, under the hash of their content.
+
+    The files shared by many calculations are then uploaded only once and linked into the working directory of
+    each calculation. DIRECTORY must be an absolute path and may contain the {username} field, like the work
+    directory of the computer.
+    """
+    try:
+        computer.set_upload_cache_directory(directory, link_mode=link_mode)
+    except ValueError as exception:
+        echo.echo_critical(str(exception))
+
+    echo.echo_success("Upload cache of computer '{}' set to {} ({}).".format(
+        computer.name, directory, computer.get_upload_cache_link_mode()))
+
+
+@computer_upload_cache.command('unset')
+@arguments.COMPUTER()
+@with_dbenv()
+def computer_upload_cache_unset(computer):
+    """Disable the upload cache of COMPUTER, the files already in the cache are not removed."""
+    computer.set_upload_cache_directory(None)
+    echo.echo_success("Upload cache of computer '{}' disabled.".format(computer.name))
+
+
+@computer_upload_cache.command('clean')
+@arguments.COMPUTER()
+@click.option('--max-age', type=click.INT, default=30, show_default=True,
+              help='Remove the files that were not used in a calculation for more than this number of days.')
+@click.option('-n', '--dry-run', is_flag=True, help='Only print the files that would be removed.')
+@with_dbenv()
+def computer_upload_cache_clean(computer, max_age, dry_run):
+    """Remove the files of the upload cache of COMPUTER that are no longer used."""
+    from aiida.transport.upload_cache import get_upload_cache
+
+    with computer.get_transport() as transport:
+        upload_cache = get_upload_cache(computer, transport)
+        if upload_cache is None:
+            echo.echo_critical("Computer '{}' does not have an upload cache.".format(computer.name))
+
+        try:
+            removed = upload_cache.clean(max_age, dry_run=dry_run)
+        except IOError as exception:
+            echo.echo_critical(str(exception))
+
+    for path in removed:
+        echo.echo(path)
+
+    if dry_run:
+        echo.echo_info('{} files would be removed from {}.'.format(len(removed), upload_cache.directory))
+    else:
+        echo.echo_success('{} files removed from {}.'.format(len(removed), upload_cache.directory))
+
+
 @verdi_computer.group('configure')
 def computer_configure():
     """Configure a computer with one of the available transport types."""
@@ -61,13 +61,20 @@ def verdi_export():
     default=False,
     show_default=True,
     help='Follow reverse CALL links (recursively) when calculating the node set to export.')
+@click.option(
+    '-p',
+    '--previous',
+    type=click.Path(exists=True, readable=True),
+    default=None,
+    help='Previous archive, or manifest file, of the same entities: write an incremental archive with only the nodes '
+    'and group memberships that are new or changed since then.')
 def create(output_file, codes, computers, groups, nodes, input_forward, create_reversed, return_reversed, call_reversed,
-           force, archive_format):
+           force, archive_format, previous):
     """
     Export various entities, such as Codes, Computers, Groups and Nodes, to an archive file for backup or
     sharing purposes.
     """
-    from aiida.orm.importexport import export, export_zip
+    from aiida.orm.importexport import export, export_zip, load_export_manifest
 
     entities = []
 
@@ -91,6 +98,12 @@ def create(output_file, codes, computers, groups, nodes, input_forward, create_r
         'overwrite': force,
     }
 
+    if previous is not None:
+        try:
+            kwargs['previous_manifest'] = load_export_manifest(previous)
+        except (IOError, ValueError) as exception:
+            echo.echo_critical('failed to read the manifest of the previous export: {}'.format(exception))
+
     if archive_format == 'zip':
         export_function = export_zip
         kwargs.update({'use_compression': True})
@@ -26,8 +26,21 @@ from aiida.common import exceptions
     cls=MultipleValueOption,
     help="Discover all URL targets pointing to files with the .aiida extension for these HTTP addresses. "
     "Automatically discovered archive URLs will be downloadeded and added to ARCHIVES for importing")
+@click.option(
+    '-W',
+    '--workers',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Number of threads moving the repository folders of the imported nodes at the same time.')
+@click.option(
+    '-c',
+    '--chain',
+    is_flag=True,
+    default=False,
+    help='The archive files form a chain of incremental archives: import them in the order of the chain.')
 @decorators.with_dbenv()
-def cmd_import(archives, webpages):
+def cmd_import(archives, webpages, workers, chain):
     """Import one or multiple exported AiiDA archives
 
     The ARCHIVES can be specified by their relative or absolute file path, or their HTTP URL.
@@ -37,7 +50,7 @@ def cmd_import(archives, webpages):
     from six.moves import urllib
 
     from aiida.common.folders import SandboxFolder
-    from aiida.orm.importexport import get_valid_import_links, import_data
+    from aiida.orm.importexport import get_export_chain, get_valid_import_links, import_data
 
     archives_url = []
     archives_file = []
@@ -64,12 +77,18 @@ def cmd_import(archives, webpages):
     if not archives_url + archives_file:
         echo.echo_critical('no valid exported archives were found')
 
+    if chain:
+        try:
+            archives_file = get_export_chain(archives_file)
+        except (IOError, ValueError) as exception:
+            echo.echo_critical('the archives cannot be imported as a chain: {}'.format(exception))
+
     for archive in archives_file:
 
         echo.echo_info('importing archive {}'.format(archive))
 
         try:
-            import_data(archive)
+            import_data(archive, workers=workers)
         except exceptions.IncompatibleArchiveVersionError as exception:
             echo.echo_warning('{} cannot be imported: {}'.format(archive, exception))
             echo.echo_warning('run `verdi export migrate {}` to update it'.format(archive))
@@ -96,7 +115,7 @@ def cmd_import(archives, webpages):
             echo.echo_success('archive downloaded, proceeding with import')
 
             try:
-                import_data(temp_folder.get_abs_path(temp_file))
+                import_data(temp_folder.get_abs_path(temp_file), workers=workers)
             except exceptions.IncompatibleArchiveVersionError as exception:
                 echo.echo_warning('{} cannot be imported: {}'.format(archive, exception))
                 echo.echo_warning('download the archive file and run `verdi export migrate` to update it')
@@ -16,6 +16,9 @@ from aiida.cmdline.params import arguments
 from aiida.cmdline.params.types.plugin import PluginParamType
 from aiida.cmdline.utils import decorators, echo
 
+# Number of nodes that is sent to a worker process at once when rehashing in parallel
+REHASH_CHUNK_SIZE = 100
+
 
 @verdi.command('rehash')
 @arguments.NODES()
@@ -25,8 +28,15 @@ from aiida.cmdline.utils import decorators, echo
     type=PluginParamType(group=('node', 'calculations', 'data'), load=True),
     default='node',
     help='Only include nodes that are class or sub class of the class identified by this entry point.')
+@click.option(
+    '-p',
+    '--parallel',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Number of processes over which to spread the computation of the hashes.')
 @decorators.with_dbenv()
-def rehash(nodes, entry_point):
+def rehash(nodes, entry_point, parallel):
     """Recompute the hash for nodes in the database
 
     The set of nodes that will be rehashed can be filtered by their identifier and/or based on their class.
@@ -34,24 +44,66 @@ def rehash(nodes, entry_point):
     from aiida.orm.querybuilder import QueryBuilder
 
     if nodes:
-        to_hash = [(node,) for node in nodes if isinstance(node, entry_point)]
+        to_hash = [node.pk for node in nodes if isinstance(node, entry_point)]
     else:
         builder = QueryBuilder()
-        builder.append(entry_point, tag='node')
-        to_hash = builder.all()
+        builder.append(entry_point, tag='node', project=['id'])
+        to_hash = [pk for pk, in builder.iterall()]
 
     if not to_hash:
         echo.echo_critical('no matching nodes found')
 
     count = 0
 
-    for i, (node,) in enumerate(to_hash):
+    if parallel > 1:
+        import multiprocessing
+
+        _close_database_connection()
+        pool = multiprocessing.Pool(processes=parallel)
+        results = pool.imap_unordered(_rehash_node, to_hash, chunksize=REHASH_CHUNK_SIZE)
+    else:
+        pool = None
+        results = (_rehash_node(pk) for pk in to_hash)
+
+    try:
+        for _ in results:
 
-        if i % 100 == 0:
-            echo.echo('.', nl=False)
+            if count % 100 == 0:
+                echo.echo('.', nl=False)
 
-        node.rehash()
-        count += 1
+            count += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     echo.echo('')
     echo.echo_success('{} nodes re-hashed'.format(count))
+
+
+def _rehash_node(pk):
+    """
+    Recompute the hash of the node with the given pk
+
+    :param pk: the pk of the node
+    :return: the pk of the node
+    """
+    from aiida.orm import load_node
+
+    load_node(pk).rehash()
+    return pk
+
+
+def _close_database_connection():
+    """
+    Close the database connection before forking the worker processes, such that they each open their own.
+
+    The SQLAlchemy backend already recreates its engine after a fork, but for Django the connection has to be closed
+    in the parent, as a connection that is shared between processes gets corrupted. It is reopened when needed.
+    """
+    from aiida.backends import settings
+    from aiida.backends.profile import BACKEND_DJANGO
+
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connection
+        connection.close()
@@ -74,73 +74,32 @@ def work_list(all_entries, process_state, exit_status, failed, past_days, limit,
     help='filter the results by name of the log level')
 @click.option('-m', '--max-depth', 'max_depth', type=int, default=None, help='limit the number of levels to be printed')
 def work_report(calculations, levelname, indent_size, max_depth):
-    # pylint: disable=too-many-locals
     """
     Return a list of recorded log messages for the WorkChain with pk=PK
     """
-    import itertools
     from aiida.orm.backend import construct_backend
-    from aiida.orm.querybuilder import QueryBuilder
     from aiida.orm.calculation.work import WorkCalculation
 
-    def get_report_messages(pk, depth, levelname):
-        """Return list of log messages with given levelname and their depth for a node with a given pk."""
-        backend = construct_backend()
-        filters = {
-            'objpk': pk,
-        }
-
-        entries = backend.logs.find(filter_by=filters)
-        entries = [entry for entry in entries if LOG_LEVELS[entry.levelname] >= LOG_LEVELS[levelname]]
-        return [(_, depth) for _ in entries]
-
-    def get_subtree(pk, level=0):
-        """Get a nested tree of work calculation nodes and their nesting level starting from this pk."""
-        builder = QueryBuilder()
-        builder.append(cls=WorkCalculation, filters={'id': pk}, tag='workcalculation')
-        builder.append(
-            cls=WorkCalculation,
-            project=['id'],
-            # In the future, we should specify here the type of link
-            # for now, CALL links are the only ones allowing calc-calc
-            # (we here really want instead to follow CALL links)
-            output_of='workcalculation',
-            tag='subworkchains')
-        result = list(itertools.chain(*builder.distinct().all()))
-
-        # This will return a single flat list of tuples, where the first element
-        # corresponds to the WorkChain pk and the second element is an integer
-        # that represents its level of nesting within the chain
-        return [(pk, level)] + list(itertools.chain(*[get_subtree(subpk, level=level + 1) for subpk in result]))
-
-    def print_subtree(tree, prepend=""):
-        echo.echo("{}{}".format(prepend, tree[0]))
-        for subtree in tree[1]:
-            print_subtree(subtree, prepend=prepend + "  ")
+    backend = construct_backend()
+    levelnames = [name for name, level in LOG_LEVELS.items() if level >= LOG_LEVELS[levelname]]
+    width_levelname = max(len(name) for name in levelnames)
 
     for calculation in calculations:
 
-        workchain_tree = get_subtree(calculation.pk)
-
-        if max_depth:
-            report_list = [
-                get_report_messages(pk, depth, levelname) for pk, depth in workchain_tree if depth < max_depth
-            ]
-        else:
-            report_list = [get_report_messages(pk, depth, levelname) for pk, depth in workchain_tree]
-
-        reports = list(itertools.chain(*report_list))
-        reports.sort(key=lambda r: r[0].time)
-
-        if not reports:
-            echo.echo("No log messages recorded for this work calculation")
-            return
-
-        object_ids = [entry[0].id for entry in reports]
-        levelnames = [len(entry[0].levelname) for entry in reports]
-        width_id = len(str(max(object_ids)))
-        width_levelname = max(levelnames)
-        for entry, depth in reports:
+        # The call tree and the log messages of all its nodes are retrieved with one query each, and the messages
+        # are printed as they are streamed from the database, instead of being collected first. A maximum depth of
+        # zero means that the levels are not limited
+        workchain_tree = backend.query_manager.get_call_descendants(
+            calculation.pk,
+            max_depth=max_depth or None,
+            type_prefix=WorkCalculation._query_type_string)  # pylint: disable=protected-access
+        depths = dict(workchain_tree)
+
+        width_id = 0
+        has_reports = False
+        for entry in backend.logs.find_for_objects(list(depths.keys()), levelnames=levelnames):
+            has_reports = True
+            width_id = max(width_id, len(str(entry.id)))
             echo.echo('{time:%Y-%m-%d %H:%M:%S} [{id:<{width_id}} | {levelname:>{width_levelname}}]:{indent} {message}'.
                       format(
                           id=entry.id,
@@ -149,7 +108,11 @@ def work_report(calculations, levelname, indent_size, max_depth):
                           time=entry.time,
                           width_id=width_id,
                           width_levelname=width_levelname,
-                          indent=' ' * (depth * indent_size)))
+                          indent=' ' * (depths[entry.objpk] * indent_size)))
+
+        if not has_reports:
+            echo.echo("No log messages recorded for this work calculation")
+            return
 
     return
 
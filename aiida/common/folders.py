@@ -8,6 +8,7 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 from __future__ import absolute_import
+import errno
 import os
 import shutil
 import fnmatch
@@ -24,7 +25,7 @@ from aiida.common.utils import get_repository_folder
 
 group_writable = True
 
-_valid_sections = ['node', 'workflow']
+_valid_sections = ['node', 'workflow', 'checkpoint']
 
 
 class Folder(object):
@@ -390,10 +391,15 @@ class Folder(object):
             raise IOError("Location {} already exists, and overwrite is set to "
                           "False".format(self.abspath))
 
-        # Create parent dir, if needed, with the right mode
+        # Create parent dir, if needed, with the right mode. Another thread or
+        # process may be creating the same parent dir at the same time
         pardir = os.path.dirname(self.abspath)
         if not os.path.exists(pardir):
-            os.makedirs(pardir, mode=self.mode_dir)
+            try:
+                os.makedirs(pardir, mode=self.mode_dir)
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    raise
 
         if move:
             shutil.move(srcdir, self.abspath)
@@ -11,7 +11,9 @@
 from __future__ import absolute_import
 import hashlib
 import numbers
+import os
 import random
+import sqlite3
 import time
 import uuid
 from datetime import datetime
@@ -48,6 +50,12 @@ UNUSABLE_PASSWORD_SUFFIX_LENGTH = 40
 
 HASHING_KEY="HashingKey"
 
+# Size of the chunks in which repository files are read when computing their hash
+FILE_HASH_CHUNK_SIZE = 2**20
+
+# Name of the file, in the root of the repository, that contains the persisted cache of file digests
+FILE_DIGEST_CACHE_FILENAME = 'file_digest_cache.sqlite'
+
 pwd_context = CryptContext(
     # The list of hashes that we support
     schemes=["pbkdf2_sha256", "des_crypt"],
@@ -290,11 +298,6 @@ def _(object_to_hash, **kwargs):
 
 @make_hash.register(Folder)
 def _(folder, **kwargs):
-    # make sure file is closed after being read
-    def _read_file(folder, name):
-        with folder.open(name, mode='rb') as f:
-            return f.read()
-
     ignored_folder_content = kwargs.get('ignored_folder_content', [])
 
     return make_hash_with_type(
@@ -303,13 +306,182 @@ def _(folder, **kwargs):
             (
                 name,
                 folder.get_subfolder(name) if folder.isdir(name) else
-                make_hash_with_type('pf', _read_file(folder, name))
+                make_file_hash(folder.get_abs_path(name))
             )
             for name in sorted(folder.get_content_list())
             if name not in ignored_folder_content
         ], **kwargs).encode('latin1')
     )
 
+
+def make_file_hash(filepath):
+    """
+    Get the hash digest of the content of a file, as it is used in the hash of a Folder
+
+    The file is read in chunks, such that the memory usage does not depend on the size of the file. The digest is
+    identical to `make_hash_with_type('pf', content)`. If the persistent file digest cache is available and the file
+    lives in the part of the repository it covers, the digest is looked up by the path, size and modification time of
+    the file, and only computed if it was not yet cached.
+
+    :param filepath: the absolute path of the file
+    :return: the hash digest
+    """
+    file_stat = os.stat(filepath)
+    cache = get_file_digest_cache()
+
+    if cache is not None and not cache.covers(filepath):
+        cache = None
+
+    if cache is not None:
+        digest = cache.get(filepath, file_stat.st_size, file_stat.st_mtime)
+        if digest is not None:
+            return digest
+
+    hasher = hashlib.sha224('pf'.encode('latin1'))
+
+    with open(filepath, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(FILE_HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+
+    digest = hasher.hexdigest()
+
+    if cache is not None:
+        cache.set(filepath, file_stat.st_size, file_stat.st_mtime, digest)
+
+    return digest
+
+
+class FileDigestCache(object):
+    """
+    A persistent cache of the hash digests of files, keyed on the path, size and modification time of the file.
+
+    The cache is stored in an SQLite database, such that it can be shared by multiple processes, for example the
+    daemon workers and the processes of `verdi rehash --parallel`. Since it is only a cache, any error in reading or
+    writing it is ignored and the digest will simply be recomputed.
+    """
+
+    def __init__(self, filepath, root):
+        """
+        :param filepath: the absolute path of the SQLite database file, which will be created if it does not exist
+        :param root: the absolute path of the folder whose files are cached. Files outside of it, for example in
+            temporary sandbox folders that are short lived, are not cached.
+        """
+        self._filepath = filepath
+        self._root = os.path.join(os.path.abspath(root), '')
+        self._connection = None
+        self._pid = None
+
+    @property
+    def filepath(self):
+        """Return the path of the database file of this cache."""
+        return self._filepath
+
+    def covers(self, path):
+        """
+        Return whether the given file is covered by this cache
+
+        :param path: the absolute path of the file
+        """
+        return path.startswith(self._root)
+
+    def _get_connection(self):
+        """
+        Return the connection to the database, which is reopened after a fork, as connections cannot be shared
+        """
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self._filepath, timeout=30)
+            self._connection.execute('PRAGMA synchronous=OFF')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS file_digest '
+                '(path TEXT PRIMARY KEY, size INTEGER, mtime REAL, digest TEXT)')
+            self._connection.commit()
+            self._pid = os.getpid()
+
+        return self._connection
+
+    def get(self, path, size, mtime):
+        """
+        Return the cached digest of a file
+
+        :param path: the absolute path of the file
+        :param size: the size of the file in bytes
+        :param mtime: the modification time of the file
+        :return: the digest or None if no digest is cached for the file in its current state
+        """
+        try:
+            row = self._get_connection().execute(
+                'SELECT digest FROM file_digest WHERE path = ? AND size = ? AND mtime = ?',
+                (path, size, mtime)).fetchone()
+        except sqlite3.Error:
+            return None
+
+        return row[0] if row is not None else None
+
+    def set(self, path, size, mtime, digest):
+        """
+        Store the digest of a file in the cache
+
+        :param path: the absolute path of the file
+        :param size: the size of the file in bytes
+        :param mtime: the modification time of the file
+        :param digest: the digest of the file
+        """
+        try:
+            connection = self._get_connection()
+            connection.execute(
+                'INSERT OR REPLACE INTO file_digest (path, size, mtime, digest) VALUES (?, ?, ?, ?)',
+                (path, size, mtime, digest))
+            connection.commit()
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        """Remove all the digests from the cache."""
+        try:
+            connection = self._get_connection()
+            connection.execute('DELETE FROM file_digest')
+            connection.commit()
+        except sqlite3.Error:
+            pass
+
+
+# Sentinel to distinguish a file digest cache that has not yet been loaded from one that has been disabled
+_NOT_LOADED = object()
+_FILE_DIGEST_CACHE = _NOT_LOADED
+
+
+def get_file_digest_cache():
+    """
+    Return the persistent file digest cache, which is stored in the root of the repository of the current profile
+
+    :return: the :class:`FileDigestCache` or None if no repository is configured or the cache was disabled
+    """
+    global _FILE_DIGEST_CACHE  # pylint: disable=global-statement
+
+    if _FILE_DIGEST_CACHE is _NOT_LOADED:
+        from aiida.common.exceptions import ConfigurationError
+        from aiida.common.utils import get_repository_folder
+
+        try:
+            filepath = os.path.join(get_repository_folder(), FILE_DIGEST_CACHE_FILENAME)
+            root = get_repository_folder('repository')
+        except ConfigurationError:
+            return None
+
+        _FILE_DIGEST_CACHE = FileDigestCache(filepath, root)
+
+    return _FILE_DIGEST_CACHE
+
+
+def set_file_digest_cache(cache):
+    """
+    Set the file digest cache, for example to use a different location or to disable it by passing None
+
+    :param cache: a :class:`FileDigestCache` instance or None to disable the cache
+    """
+    global _FILE_DIGEST_CACHE  # pylint: disable=global-statement
+    _FILE_DIGEST_CACHE = cache
+
 @make_hash.register(np.ndarray)
 def _(object_to_hash, **kwargs):
     if object_to_hash.dtype == np.float64:
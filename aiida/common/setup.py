@@ -67,6 +67,31 @@ TEST_KEYWORD = 'test_'
 # Default timeout in seconds for circus client calls
 DEFAULT_DAEMON_TIMEOUT = 20
 
+# Default time in seconds that the daemon keeps an unused transport open
+DEFAULT_DAEMON_TRANSPORT_IDLE_TIMEOUT = 60
+
+# Default number of threads of each daemon worker that run the blocking transport and database operations of the jobs
+DEFAULT_DAEMON_TRANSPORT_POOL_SIZE = 8
+DEFAULT_DAEMON_DATABASE_POOL_SIZE = 4
+
+# Default maximum number of processes that each daemon worker runs at the same time
+DEFAULT_DAEMON_WORKER_PROCESS_SLOTS = 20
+
+# Default maximum size in megabytes of the arrays that each stored ArrayData keeps cached in memory
+DEFAULT_ARRAYDATA_CACHE_SIZE = 256
+
+# Default maximum number of entries and time to live in seconds of the QueryBuilder result cache
+DEFAULT_QUERYBUILDER_CACHE_SIZE = 128
+DEFAULT_QUERYBUILDER_CACHE_TTL = 60
+
+# Read consistency modes of the attributes and extras of stored nodes in the SQLAlchemy backend
+NODE_READ_CONSISTENCY_STRICT = 'strict'
+NODE_READ_CONSISTENCY_VERSIONED = 'versioned'
+NODE_READ_CONSISTENCY_SNAPSHOT = 'snapshot'
+NODE_READ_CONSISTENCY_MODES = [
+    NODE_READ_CONSISTENCY_STRICT, NODE_READ_CONSISTENCY_VERSIONED, NODE_READ_CONSISTENCY_SNAPSHOT
+]
+
 
 def get_aiida_dir():
     return os.path.expanduser(AIIDA_CONFIG_FOLDER)
@@ -780,6 +805,75 @@ _property_table = {
         "The timeout in seconds for calls to the circus client",
         DEFAULT_DAEMON_TIMEOUT,
         None),
+    "daemon.transport_idle_timeout": (
+        "daemon_transport_idle_timeout",
+        "int",
+        "The time in seconds that the daemon keeps a transport open after its last use, such that it can be reused "
+        "without opening a new connection. Set to 0 to close transports as soon as they are no longer used",
+        DEFAULT_DAEMON_TRANSPORT_IDLE_TIMEOUT,
+        None),
+    "daemon.transport_pool_size": (
+        "daemon_transport_pool_size",
+        "int",
+        "The number of threads of each daemon worker that run the transport operations of the jobs, like submitting "
+        "and retrieving, outside of the event loop. The operations on the same computer with the same user are still "
+        "run one at a time. Set to 0 to run them on the event loop",
+        DEFAULT_DAEMON_TRANSPORT_POOL_SIZE,
+        None),
+    "daemon.database_pool_size": (
+        "daemon_database_pool_size",
+        "int",
+        "The number of threads of each daemon worker that run the database operations of the jobs that do not need a "
+        "transport outside of the event loop. Each thread uses its own database connection. Set to 0 to run them on "
+        "the event loop",
+        DEFAULT_DAEMON_DATABASE_POOL_SIZE,
+        None),
+    "daemon.worker_process_slots": (
+        "daemon_worker_process_slots",
+        "int",
+        "The maximum number of processes that each daemon worker runs at the same time. Since the transport and "
+        "database operations of the jobs do not block the event loop, it can be raised to hundreds if the pools of "
+        "threads are large enough",
+        DEFAULT_DAEMON_WORKER_PROCESS_SLOTS,
+        None),
+    "arraydata.cache_size": (
+        "arraydata_cache_size",
+        "int",
+        "The maximum size in megabytes of the arrays that each stored ArrayData node keeps cached in memory after "
+        "reading them from the repository. When the limit is exceeded, the least recently used arrays are evicted",
+        DEFAULT_ARRAYDATA_CACHE_SIZE,
+        None),
+    "querybuilder.cache_size": (
+        "querybuilder_cache_size",
+        "int",
+        "The maximum number of query results kept by the cache used when calling the QueryBuilder with "
+        "use_cache=True. When the limit is exceeded, the least recently used results are evicted",
+        DEFAULT_QUERYBUILDER_CACHE_SIZE,
+        None),
+    "querybuilder.cache_ttl": (
+        "querybuilder_cache_ttl",
+        "int",
+        "The time in seconds after which a result in the QueryBuilder cache expires, even if the database did not "
+        "change",
+        DEFAULT_QUERYBUILDER_CACHE_TTL,
+        None),
+    "querybuilder.cache_check_interval": (
+        "querybuilder_cache_check_interval",
+        "int",
+        "The minimum time in milliseconds between two checks of the database for changes by the QueryBuilder cache. "
+        "With the default of 0 the database is checked at every cached query, higher values make hits faster at the "
+        "expense of possibly returning results that are stale by up to this interval",
+        0,
+        None),
+    "sqlalchemy.node_read_consistency": (
+        "sqlalchemy_node_read_consistency",
+        "string",
+        "How the SQLAlchemy backend reads the attributes and extras of stored nodes: 'strict' reloads them from the "
+        "database at every access, 'versioned' keeps them cached and only reloads them when the nodeversion in the "
+        "database changed, and 'snapshot' reads them only once per node instance, which is only safe when they are "
+        "not modified by other processes",
+        NODE_READ_CONSISTENCY_VERSIONED,
+        NODE_READ_CONSISTENCY_MODES),
     "verdishell.modules": (
         "modules_for_verdi_shell",
         "string",
@@ -12,6 +12,7 @@ Unittests for aiida.common.hashing:make_hash with hardcoded hash values
 """
 
 from __future__ import absolute_import
+import os
 import unittest
 from datetime import datetime
 
@@ -122,3 +123,41 @@ class MakeHashTest(unittest.TestCase):
             np.save(fhandle, np.arange(10))
             fhandle.close()
             self.assertEqual(make_hash(folder), '18e28635210ec949097222567d0c8ecfbcd918af8721766e4aaecf73')
+
+    def test_file_hash_chunks(self):
+        """The streamed hash of a file larger than a chunk should equal the hash of its full content."""
+        from aiida.common import hashing
+
+        content = b'0123456789' * (hashing.FILE_HASH_CHUNK_SIZE // 5)
+        with SandboxFolder(sandbox_in_repo=False) as folder:
+            with folder.open('large_file', 'wb') as fhandle:
+                fhandle.write(content)
+
+            self.assertEqual(
+                hashing.make_file_hash(folder.get_abs_path('large_file')),
+                hashing.make_hash_with_type('pf', content))
+
+    def test_file_digest_cache(self):
+        """The digest of a file covered by the cache should be stored and invalidated when the file changes."""
+        from aiida.common import hashing
+
+        with SandboxFolder(sandbox_in_repo=False) as folder:
+            cache = hashing.FileDigestCache(folder.get_abs_path('cache.sqlite'), folder.abspath)
+            original_cache = hashing.get_file_digest_cache()
+            hashing.set_file_digest_cache(cache)
+
+            try:
+                filepath = folder.get_abs_path('file1')
+                with open(filepath, 'wb') as fhandle:
+                    fhandle.write(b'hello there!\n')
+
+                digest = hashing.make_file_hash(filepath)
+                file_stat = os.stat(filepath)
+                self.assertEqual(cache.get(filepath, file_stat.st_size, file_stat.st_mtime), digest)
+
+                with open(filepath, 'wb') as fhandle:
+                    fhandle.write(b'hello there again!\n')
+
+                self.assertNotEqual(hashing.make_file_hash(filepath), digest)
+            finally:
+                hashing.set_file_digest_cache(original_cache)
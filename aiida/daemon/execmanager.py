@@ -27,6 +27,7 @@ from aiida.common.log import get_dblogger_extra
 from aiida.orm import DataFactory
 from aiida.orm.data.folder import FolderData
 from aiida.scheduler.datastructures import JOB_STATES
+from aiida.transport.upload_cache import get_upload_cache
 
 
 execlogger = aiidalogger.getChild('execmanager')
@@ -78,38 +79,37 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
             "No remote_working_directory configured for computer "
             "'{}'".format(calculation.pk, computer.name))
 
-    # If it already exists, no exception is raised
-    try:
-        transport.chdir(remote_working_directory)
-    except IOError:
-        execlogger.debug(
-            "[submission of calculation {}] Unable to chdir in {}, trying to create it".format(
-                calculation.pk, remote_working_directory), extra=logger_extra)
-        try:
-            transport.makedirs(remote_working_directory)
-            transport.chdir(remote_working_directory)
-        except EnvironmentError as exc:
-            raise exceptions.ConfigurationError(
-                "[submission of calculation {}] "
-                "Unable to create the remote directory {} on "
-                "computer '{}': {}".format(
-                    calculation.pk, remote_working_directory, computer.name, exc))
     # Store remotely with sharding (here is where we choose
     # the folder structure of remote jobs; then I store this
     # in the calculation properties using _set_remote_dir
     # and I do not have to know the logic, but I just need to
     # read the absolute path from the calculation properties.
-    transport.mkdir(calc_info.uuid[:2], ignore_existing=True)
-    transport.chdir(calc_info.uuid[:2])
-    transport.mkdir(calc_info.uuid[2:4], ignore_existing=True)
-    transport.chdir(calc_info.uuid[2:4])
-    transport.mkdir(calc_info.uuid[4:])
-    transport.chdir(calc_info.uuid[4:])
+    # The working directory of the computer is created if it does not exist, while the folder of the
+    # calculation itself must not exist yet, all in a single batch of operations
+    shard_directory = os.path.join(remote_working_directory, calc_info.uuid[:2], calc_info.uuid[2:4])
+    try:
+        with transport.batch() as batch:
+            batch.makedirs(shard_directory)
+            batch.mkdir(os.path.join(shard_directory, calc_info.uuid[4:]))
+    except EnvironmentError as exc:
+        raise exceptions.ConfigurationError(
+            "[submission of calculation {}] "
+            "Unable to create the remote directory {} on "
+            "computer '{}': {}".format(
+                calculation.pk, os.path.join(shard_directory, calc_info.uuid[4:]), computer.name, exc))
+    transport.chdir(os.path.join(shard_directory, calc_info.uuid[4:]))
     workdir = transport.getcwd()
     # I store the workdir of the calculation for later file
     # retrieval
     calculation._set_remote_workdir(workdir)
 
+    # If the computer has an upload cache, the files are only uploaded if their content is not yet
+    # cached and are then linked into the working directory, all at once after the last one is added
+    upload_cache = get_upload_cache(computer, transport)
+
+    # The remote copies and symlinks, which follow the uploads, are executed at once at the end
+    batch = transport.batch()
+
     # I first create the code files, so that the code can put
     # default files to be overwritten by the plugin itself.
     # Still, beware! The code file itself could be overwritten...
@@ -118,15 +118,23 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
         if code.is_local():
             # Note: this will possibly overwrite files
             for f in code.get_folder_list():
-                transport.put(code.get_abs_path(f), f)
-            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
+                if upload_cache is not None:
+                    upload_cache.add(code.get_abs_path(f), f, executable=(f == code.get_local_executable()) or None)
+                else:
+                    transport.put(code.get_abs_path(f), f)
+            # The executable is made executable before the other files are uploaded, since they could overwrite it
+            if upload_cache is None:
+                transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
 
     # copy all files, recursively with folders
     for f in folder.get_content_list():
         execlogger.debug("[submission of calculation {}] "
                          "copying file/folder {}...".format(calculation.pk, f),
                          extra=logger_extra)
-        transport.put(folder.get_abs_path(f), f)
+        if upload_cache is not None:
+            upload_cache.add(folder.get_abs_path(f), f)
+        else:
+            transport.put(folder.get_abs_path(f), f)
 
     # local_copy_list is a list of tuples,
     # each with (src_abs_path, dest_rel_path)
@@ -142,7 +150,16 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
                              "copying local file/folder to {}".format(
                 calculation.pk, dest_rel_path),
                 extra=logger_extra)
-            transport.put(src_abs_path, dest_rel_path)
+            if upload_cache is not None:
+                upload_cache.add(src_abs_path, dest_rel_path)
+            else:
+                transport.put(src_abs_path, dest_rel_path)
+
+    if upload_cache is not None:
+        execlogger.debug("[submission of calculation {}] "
+                         "linking the files from the upload cache {}".format(calculation.pk, upload_cache.directory),
+                         extra=logger_extra)
+        upload_cache.commit()
 
     if remote_copy_list is not None:
         for (remote_computer_uuid, remote_abs_path,
@@ -151,15 +168,7 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
                 execlogger.debug("[submission of calculation {}] "
                                  "copying {} remotely, directly on the machine "
                                  "{}".format(calculation.pk, dest_rel_path, computer.name))
-                try:
-                    transport.copy(remote_abs_path, dest_rel_path)
-                except (IOError, OSError):
-                    execlogger.warning("[submission of calculation {}] "
-                                       "Unable to copy remote resource from {} to {}! "
-                                       "Stopping.".format(calculation.pk,
-                                                          remote_abs_path, dest_rel_path),
-                                       extra=logger_extra)
-                    raise
+                batch.copy(remote_abs_path, dest_rel_path)
             else:
                 # TODO: implement copy between two different
                 # machines!
@@ -175,20 +184,21 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
                 execlogger.debug("[submission of calculation {}] "
                                  "copying {} remotely, directly on the machine "
                                  "{}".format(calculation.pk, dest_rel_path, computer.name))
-                try:
-                    transport.symlink(remote_abs_path, dest_rel_path)
-                except (IOError, OSError):
-                    execlogger.warning("[submission of calculation {}] "
-                                       "Unable to create remote symlink from {} to {}! "
-                                       "Stopping.".format(calculation.pk,
-                                                          remote_abs_path, dest_rel_path),
-                                       extra=logger_extra)
-                    raise
+                batch.symlink(remote_abs_path, dest_rel_path)
             else:
                 raise IOError("It is not possible to create a symlink "
                               "between two different machines for "
                               "calculation {}".format(calculation.pk))
 
+    try:
+        batch.execute()
+    except (IOError, OSError):
+        execlogger.warning("[submission of calculation {}] "
+                           "Unable to copy or symlink the remote resources! "
+                           "Stopping.".format(calculation.pk),
+                           extra=logger_extra)
+        raise
+
     remotedata = RemoteData(computer=computer, remote_path=workdir)
     remotedata.add_link_from(calculation, label='remote_folder', link_type=LinkType.CREATE)
     remotedata.store()
@@ -196,34 +206,25 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
     scheduler = computer.get_scheduler()
     scheduler.set_transport(transport)
 
-    job_id = scheduler.submit_from_script(transport.getcwd(), script_filename)
+    job_id = scheduler.submit_from_script(workdir, script_filename)
     calculation._set_job_id(job_id)
 
 
-def update_calculation(calculation, transport):
+def update_calculation(calculation, transport, job_info):
     """
-    Update the scheduler state of a calculation
+    Update the scheduler state of a calculation from the job information retrieved from the scheduler
+
+    The job information is typically retrieved for many calculations at once by the JobsList of the daemon, such
+    that the scheduler does not have to be queried separately for each calculation. The transport is only used to
+    retrieve the detailed job information once the job is done.
 
     :param calculation: the instance of JobCalculation to update.
     :param transport: an already opened transport to use to query the scheduler
+    :param job_info: the JobInfo of the job as returned by the scheduler or None if the job was not found
+    :return: True if the job is done, False otherwise
     """
-    scheduler = calculation.get_computer().get_scheduler()
-    scheduler.set_transport(transport)
-
     job_id = calculation.get_job_id()
 
-    kwargs = {'as_dict': True}
-
-    if scheduler.get_feature('can_query_by_user'):
-        kwargs['user'] = "$USER"
-    else:
-        # In general schedulers can either query by user or by jobs, but not both
-        # (see also docs of the Scheduler class)
-        kwargs['jobs'] = [job_id]
-
-    found_jobs = scheduler.getJobs(**kwargs)
-    job_info = found_jobs.get(job_id, None)
-
     if job_info is None:
         # If the job is computed or not found assume it's done
         job_done = True
@@ -233,6 +234,9 @@ def update_calculation(calculation, transport):
         update_job_calc_from_job_info(calculation, job_info)
 
     if job_done:
+        scheduler = calculation.get_computer().get_scheduler()
+        scheduler.set_transport(transport)
+
         try:
             detailed_job_info = scheduler.get_detailed_jobinfo(job_id)
         except exceptions.FeatureNotAvailable:
@@ -503,6 +507,7 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
     :param folder: an absolute path to a folder to copy files in
     :param retrieve_list: the list of files to retrieve
     """
+    items = []
     for item in retrieve_list:
         if isinstance(item, list):
             tmp_rname, tmp_lname, depth = item
@@ -515,7 +520,7 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
                     local_names.append(os.path.sep.join([tmp_lname] + to_append))
             else:
                 remote_names = [tmp_rname]
-                to_append = remote_names.split(os.path.sep)[-depth:] if depth > 0 else []
+                to_append = tmp_rname.split(os.path.sep)[-depth:] if depth > 0 else []
                 local_names = [os.path.sep.join([tmp_lname] + to_append)]
             if depth > 1:  # create directories in the folder, if needed
                 for this_local_file in local_names:
@@ -534,4 +539,7 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
 
         for rem, loc in zip(remote_names, local_names):
             transport.logger.debug("[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem))
-            transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+            items.append((rem, os.path.join(folder, loc)))
+
+    # Retrieve all the files at once, such that transports supporting bulk transfers need a single round trip
+    transport.get_many(items, ignore_nonexisting=True)
@@ -13,6 +13,7 @@ import signal
 from functools import partial
 
 from aiida.common.log import configure_logging
+from aiida.common.setup import get_property
 from aiida.daemon.client import DaemonClient
 from aiida.work.rmq import get_rmq_config
 from aiida.work import DaemonRunner, set_runner
@@ -21,6 +22,7 @@ from aiida.work import DaemonRunner, set_runner
 logger = logging.getLogger(__name__)
 
 DAEMON_LEGACY_WORKFLOW_INTERVAL = 30
+DAEMON_STATISTICS_INTERVAL = 300
 
 
 def start_daemon():
@@ -30,7 +32,15 @@ def start_daemon():
     daemon_client = DaemonClient()
     configure_logging(daemon=True, daemon_log_file=daemon_client.daemon_log_file)
 
-    runner = DaemonRunner(rmq_config=get_rmq_config(), rmq_submit=False)
+    rmq_config = get_rmq_config()
+    rmq_config['task_prefetch_count'] = get_property('daemon.worker_process_slots')
+
+    runner = DaemonRunner(
+        rmq_config=rmq_config,
+        rmq_submit=False,
+        transport_idle_timeout=get_property('daemon.transport_idle_timeout'),
+        transport_pool_size=get_property('daemon.transport_pool_size'),
+        database_pool_size=get_property('daemon.database_pool_size'))
 
     def shutdown_daemon(num, frame):
         logger.info('Received signal to shut down the daemon runner')
@@ -43,6 +53,8 @@ def start_daemon():
 
     set_runner(runner)
     tick_legacy_workflows(runner)
+    runner.loop_monitor.start()
+    runner.loop.call_later(DAEMON_STATISTICS_INTERVAL, partial(report_statistics, runner))
 
     try:
         runner.start()
@@ -66,6 +78,29 @@ def tick_legacy_workflows(runner, interval=DAEMON_LEGACY_WORKFLOW_INTERVAL):
     runner.loop.call_later(interval, partial(tick_legacy_workflows, runner))
 
 
+def report_statistics(runner, interval=DAEMON_STATISTICS_INTERVAL):
+    """
+    Function that will log the lag of the event loop of the runner and the statistics of its pools of threads and
+    transports, and ask the runner to call the same function back after a certain interval
+
+    :param runner: the DaemonRunner instance to perform the callback
+    :param interval: the number of seconds to wait between callbacks
+    """
+    lag = runner.loop_monitor.get_statistics()
+    runner.loop_monitor.reset_statistics()
+    pools = runner.executor.get_statistics()
+
+    logger.info('Event loop lag over the last {} measures: mean {:.3f} s, max {:.3f} s'.format(
+        lag['samples'], lag['mean'], lag['max']))
+    logger.info('Transport pool: {transport[pending]} pending and {transport[completed]} completed tasks, '
+                '{transport_waits} waits for a busy transport; database pool: {database[pending]} pending and '
+                '{database[completed]} completed tasks'.format(**pools))
+    logger.info('Transports: {opens} opened, {hits} requests served by an open transport, {waits} waits for opening, '
+                '{reconnects} reconnections'.format(**runner.transport.get_statistics()))
+
+    runner.loop.call_later(interval, partial(report_statistics, runner, interval))
+
+
 def legacy_workflow_stepper():
     """
     Function to tick the legacy workflows
@@ -96,6 +96,12 @@ class Computer(CollectionEntry):
     """
     _logger = logging.getLogger(__name__)
 
+    PROPERTY_MINIMUM_SCHEDULER_POLL_INTERVAL = 'minimum_scheduler_poll_interval'  # pylint: disable=invalid-name
+    PROPERTY_MINIMUM_SCHEDULER_POLL_INTERVAL__DEFAULT = 10.  # pylint: disable=invalid-name
+    PROPERTY_UPLOAD_CACHE_DIRECTORY = 'upload_cache_directory'
+    PROPERTY_UPLOAD_CACHE_LINK_MODE = 'upload_cache_link_mode'
+    PROPERTY_UPLOAD_CACHE_LINK_MODE__DEFAULT = 'symlink'  # pylint: disable=invalid-name
+
     @staticmethod
     def get_schema():
         """
@@ -531,6 +537,71 @@ class Computer(CollectionEntry):
                 raise TypeError("def_cpus_per_machine must be an integer (or None)")
         self._set_property("default_mpiprocs_per_machine", def_cpus_per_machine)
 
+    def get_minimum_job_poll_interval(self):
+        """
+        Get the minimum interval between subsequent requests to update the list of jobs currently running on this
+        computer.
+
+        :return: the minimum interval (in seconds)
+        :rtype: float
+        """
+        return self._get_property(
+            self.PROPERTY_MINIMUM_SCHEDULER_POLL_INTERVAL, self.PROPERTY_MINIMUM_SCHEDULER_POLL_INTERVAL__DEFAULT)
+
+    def set_minimum_job_poll_interval(self, interval):
+        """
+        Set the minimum interval between subsequent requests to update the list of jobs currently running on this
+        computer.
+
+        :param interval: the minimum interval in seconds
+        :type interval: float
+        """
+        if not isinstance(interval, (float,) + six.integer_types) or interval < 0:
+            raise ValueError("the minimum job poll interval must be a non-negative number")
+        self._set_property(self.PROPERTY_MINIMUM_SCHEDULER_POLL_INTERVAL, float(interval))
+
+    def get_upload_cache_directory(self):
+        """
+        Get the directory of the content addressed cache of the files uploaded to this computer, in which the input
+        files of the calculations are stored once and from which they are linked into their working directories.
+
+        :return: the absolute path of the directory, which may contain the ``{username}`` field like the work
+            directory, or None if the upload cache is disabled
+        """
+        return self._get_property(self.PROPERTY_UPLOAD_CACHE_DIRECTORY, None)
+
+    def set_upload_cache_directory(self, directory, link_mode=None):
+        """
+        Set the directory of the content addressed cache of the files uploaded to this computer.
+
+        :param directory: the absolute path of the directory, which may contain the ``{username}`` field, or None to
+            disable the upload cache
+        :param link_mode: either 'symlink' or 'hardlink', the way in which the cached files are linked into the
+            working directories, or None to keep the current one
+        """
+        from aiida.transport.upload_cache import LINK_MODES
+
+        if directory is None:
+            self._del_property(self.PROPERTY_UPLOAD_CACHE_DIRECTORY, raise_exception=False)
+            return
+
+        if not isinstance(directory, six.string_types) or not os.path.isabs(directory):
+            raise ValueError("the upload cache directory must be an absolute path")
+        if link_mode is not None and link_mode not in LINK_MODES:
+            raise ValueError("the link mode must be one of {}".format(', '.join(LINK_MODES)))
+
+        self._set_property(self.PROPERTY_UPLOAD_CACHE_DIRECTORY, six.text_type(directory))
+        if link_mode is not None:
+            self._set_property(self.PROPERTY_UPLOAD_CACHE_LINK_MODE, link_mode)
+
+    def get_upload_cache_link_mode(self):
+        """
+        Get the way in which the files of the upload cache are linked into the working directories.
+
+        :return: either 'symlink' or 'hardlink'
+        """
+        return self._get_property(self.PROPERTY_UPLOAD_CACHE_LINK_MODE, self.PROPERTY_UPLOAD_CACHE_LINK_MODE__DEFAULT)
+
     @abc.abstractmethod
     def get_transport_params(self):
         pass
@@ -8,8 +8,108 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 from __future__ import absolute_import
+import collections
+import itertools
+import numbers
+
 from aiida.orm import Data
 
+#: The modes in which arrays can be memory mapped: the files in the repository should never be modified
+VALID_MMAP_MODES = ('r',)
+
+_CACHE_SIZE = None
+
+
+def get_array_cache_size():
+    """
+    Return the maximum number of bytes of arrays that each stored ArrayData keeps cached in memory, as configured by
+    the ``arraydata.cache_size`` property in megabytes. The property is read only once per interpreter.
+
+    :return: the byte budget of the cache
+    """
+    global _CACHE_SIZE  # pylint: disable=global-statement
+
+    if _CACHE_SIZE is None:
+        from aiida.common.setup import get_property
+        _CACHE_SIZE = get_property('arraydata.cache_size') * 1024 * 1024
+
+    return _CACHE_SIZE
+
+
+class ArrayCache(object):
+    """
+    A least-recently-used cache of arrays, bounded by the total number of bytes of the cached arrays.
+
+    Arrays that are larger than the budget by themselves are never cached.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        :param max_bytes: the maximum total size in bytes of the cached arrays
+        """
+        self._max_bytes = max_bytes
+        self._arrays = collections.OrderedDict()
+        self._nbytes = 0
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __len__(self):
+        return len(self._arrays)
+
+    @property
+    def nbytes(self):
+        """Return the total number of bytes of the arrays currently in the cache."""
+        return self._nbytes
+
+    def get(self, name):
+        """
+        Return the cached array with the given name, marking it as the most recently used one
+
+        :param name: the name of the array
+        :return: the array or None if it is not in the cache
+        """
+        try:
+            array = self._arrays.pop(name)
+        except KeyError:
+            return None
+
+        self._arrays[name] = array
+        return array
+
+    def add(self, name, array):
+        """
+        Add an array to the cache, evicting the least recently used arrays until the cache is within its budget
+
+        :param name: the name of the array
+        :param array: the numpy array
+        """
+        self.discard(name)
+
+        if array.nbytes > self._max_bytes:
+            return
+
+        self._arrays[name] = array
+        self._nbytes += array.nbytes
+
+        while self._nbytes > self._max_bytes:
+            _, evicted = self._arrays.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+
+    def discard(self, name):
+        """
+        Remove the array with the given name from the cache, if present
+
+        :param name: the name of the array
+        """
+        array = self._arrays.pop(name, None)
+        if array is not None:
+            self._nbytes -= array.nbytes
+
+    def clear(self):
+        """Remove all arrays from the cache."""
+        self._arrays.clear()
+        self._nbytes = 0
 
 
 class ArrayData(Data):
@@ -24,15 +124,27 @@ class ArrayData(Data):
       :py:meth:`.get_array` call, the array will be re-read from disk.
       If instead the ArrayData node has already been stored,
       the array is cached in memory after the first read, and the cached array
-      is used thereafter.
+      is used thereafter. The cache is bounded by the ``arraydata.cache_size``
+      property: when it is full, the least recently used arrays are evicted.
       If too much RAM memory is used, you can clear the
       cache with the :py:meth:`.clear_internal_cache` method.
+      Large arrays can also be read partially, by passing an index to
+      :py:meth:`.get_array`, or memory mapped with the ``mmap_mode`` argument,
+      neither of which loads the full array in memory.
+
+    :note: Arrays can optionally be stored in chunks of a fixed number of rows
+      along their first axis, each in its own (optionally compressed) file, by
+      passing a ``chunk_size`` to :py:meth:`.set_array`. Reading part of such
+      an array along its first axis only reads the relevant chunks, and rows
+      can be appended with :py:meth:`.append_to_array` without rewriting the
+      chunks that are already full.
     """
     array_prefix = "array|"
+    array_chunks_prefix = "array_chunks|"
 
     def __init__(self, *args, **kwargs):
         super(ArrayData, self).__init__(*args, **kwargs)
-        self._cached_arrays = {}
+        self._cached_arrays = ArrayCache(get_array_cache_size())
 
     def delete_array(self, name):
         """
@@ -40,22 +152,34 @@ class ArrayData(Data):
 
         :param name: The name of the array to delete from the node.
         """
-        import numpy
-
-        fname = '{}.npy'.format(name)
-        if fname not in self.get_folder_list():
+        if not self._delete_array_files(name):
             raise KeyError(
                 "Array with name '{}' not found in node pk= {}".format(
                     name, self.pk))
 
         # remove both file and attribute
-        self.remove_path(fname)
-        try:
-            self._del_attr("{}{}".format(self.array_prefix, name))
-        except (KeyError, AttributeError):
-            # Should not happen, but do not crash if for some reason the
-            # property was not set.
-            pass
+        for prefix in [self.array_prefix, self.array_chunks_prefix]:
+            try:
+                self._del_attr("{}{}".format(prefix, name))
+            except (KeyError, AttributeError):
+                # Should not happen, but do not crash if for some reason the
+                # property was not set.
+                pass
+
+    def _delete_array_files(self, name):
+        """
+        Delete the files of an array, stored either as a single file or in chunks.
+
+        :param name: The name of the array.
+        :return: True if any file was deleted, False otherwise
+        """
+        filenames = [filename for filename in self.get_folder_list()
+                     if filename == '{}.npy'.format(name) or filename.startswith('{}.chunk'.format(name))]
+
+        for filename in filenames:
+            self.remove_path(filename)
+
+        return bool(filenames)
 
     def arraynames(self):
         """
@@ -86,7 +210,8 @@ class ArrayData(Data):
         Return a list of all arrays stored in the node, listing the files (and
         not relying on the properties).
         """
-        return [i[:-4] for i in self.get_folder_list() if i.endswith('.npy')]
+        # The files of chunked arrays are named `name.chunkXXXXXX.npy` or `name.chunkXXXXXX.npz`
+        return list(set(i.split('.', 1)[0] for i in self.get_folder_list() if i.endswith('.npy') or i.endswith('.npz')))
 
     def _arraynames_from_properties(self):
         """
@@ -105,41 +230,273 @@ class ArrayData(Data):
         """
         return tuple(self.get_attr("{}{}".format(self.array_prefix, name)))
 
-    def iterarrays(self):
+    def iterarrays(self, mmap_mode=None):
         """
         Iterator that returns tuples (name, array) for each array stored in the
         node.
+
+        :param mmap_mode: if set to 'r', the arrays are returned as read-only
+            memory-mapped arrays instead of being loaded in memory
         """
         for name in self.get_arraynames():
-            yield (name, self.get_array(name))
+            yield (name, self.get_array(name, mmap_mode=mmap_mode))
 
-    def get_array(self, name):
+    def get_array(self, name, index=None, mmap_mode=None):
         """
         Return an array stored in the node
 
         :param name: The name of the array to return.
+        :param index: optional index, e.g. a slice, to select only part of the
+            array. Only the selected part is read from disk, unless the full
+            array is cached already.
+        :param mmap_mode: if set to 'r', a read-only memory-mapped array is
+            returned, whose content is only read from disk when accessed.
+            Memory-mapped arrays are not cached.
+        :raise KeyError: if no array with the given name exists
+        :raise ValueError: if the mmap_mode is not valid
         """
-        import numpy
+        if mmap_mode is not None and mmap_mode not in VALID_MMAP_MODES:
+            raise ValueError("invalid mmap_mode '{}', valid values are: {}".format(mmap_mode, VALID_MMAP_MODES))
 
-        # raw function used only internally
-        def get_array_from_file(self, name):
-            fname = '{}.npy'.format(name)
-            if fname not in self.get_folder_list():
-                raise KeyError(
-                    "Array with name '{}' not found in node pk= {}".format(
-                        name, self.pk))
+        chunks = self._get_chunks_info(name)
 
-            array = numpy.load(self.get_abs_path(fname))
-            return array
+        # Chunked arrays cannot be memory mapped and are read normally instead
+        if mmap_mode is not None and chunks is None:
+            array = self._get_array_from_file(name, mmap_mode=mmap_mode)
+            return array if index is None else array[index]
 
         # Return with proper caching, but only after storing. Before, instead,
         # always re-read from disk
-        if not self.is_stored:
-            return get_array_from_file(self, name)
+        if self.is_stored and name in self._cached_arrays:
+            array = self._cached_arrays.get(name)
+            return array if index is None else array[index]
+
+        if index is not None:
+            if chunks is not None:
+                return self._get_array_slice_from_chunks(name, index, chunks)
+            return self._get_array_slice_from_file(name, index)
+
+        if chunks is not None:
+            array = self._get_array_from_chunks(name, chunks)
+        else:
+            array = self._get_array_from_file(name)
+
+        if self.is_stored:
+            self._cached_arrays.add(name, array)
+
+        return array
+
+    def _get_array_from_file(self, name, mmap_mode=None):
+        """
+        Read an array from its file in the node folder, without any caching
+
+        :param name: The name of the array to return.
+        :param mmap_mode: the mmap_mode passed to numpy.load
+        :raise KeyError: if no array with the given name exists
+        """
+        import numpy
+
+        fname = '{}.npy'.format(name)
+        if fname not in self.get_folder_list():
+            raise KeyError(
+                "Array with name '{}' not found in node pk= {}".format(
+                    name, self.pk))
+
+        return numpy.load(self.get_abs_path(fname), mmap_mode=mmap_mode)
+
+    def _get_array_slice_from_file(self, name, index):
+        """
+        Read part of an array from its file in the node folder, reading from
+        disk only the selected elements.
+
+        :param name: The name of the array to return.
+        :param index: the index that selects part of the array
+        :return: an in-memory copy of the selected part of the array
+        """
+        import numpy
+
+        try:
+            array = self._get_array_from_file(name, mmap_mode='r')
+        except ValueError:
+            # Arrays of python objects cannot be memory mapped
+            return self._get_array_from_file(name)[index]
+
+        part = array[index]
+
+        # Indexing single elements gives a scalar, while otherwise the selected part still needs to be read in memory
+        return numpy.array(part) if isinstance(part, numpy.ndarray) else part
+
+    def _get_chunks_info(self, name):
+        """
+        Return the chunking information of an array that is stored in chunks
+
+        :param name: The name of the array.
+        :return: a dictionary with the keys `chunk_size` and `compressed` or
+            None if the array is not stored in chunks
+        """
+        return self.get_attr("{}{}".format(self.array_chunks_prefix, name), None)
+
+    @staticmethod
+    def _get_chunk_filename(name, chunk_index, compressed):
+        """
+        Return the filename of a chunk of an array
+
+        :param name: The name of the array.
+        :param chunk_index: the index of the chunk
+        :param compressed: whether the chunk is stored compressed
+        """
+        return '{}.chunk{:06d}.{}'.format(name, chunk_index, 'npz' if compressed else 'npy')
+
+    def _get_chunk_from_file(self, name, chunk_index, chunks):
+        """
+        Read a single chunk of an array from its file in the node folder
+
+        :param name: The name of the array.
+        :param chunk_index: the index of the chunk
+        :param chunks: the chunking information of the array
+        :raise KeyError: if the chunk does not exist
+        """
+        import numpy
+
+        fname = self._get_chunk_filename(name, chunk_index, chunks['compressed'])
+        if fname not in self.get_folder_list():
+            raise KeyError(
+                "Chunk {} of array with name '{}' not found in node pk= {}".format(
+                    chunk_index, name, self.pk))
+
+        if not chunks['compressed']:
+            return numpy.load(self.get_abs_path(fname))
+
+        with numpy.load(self.get_abs_path(fname)) as archive:
+            return archive['array']
+
+    def _get_array_from_chunks(self, name, chunks):
+        """
+        Read an array stored in chunks, by reading and concatenating all its chunks
+
+        :param name: The name of the array.
+        :param chunks: the chunking information of the array
+        """
+        import numpy
+
+        num_rows = self.get_shape(name)[0]
+        num_chunks = max(1, -(-num_rows // chunks['chunk_size']))
+
+        return numpy.concatenate([self._get_chunk_from_file(name, chunk_index, chunks)
+                                  for chunk_index in range(num_chunks)])
+
+    def _get_array_slice_from_chunks(self, name, index, chunks):
+        """
+        Read part of an array stored in chunks. If the index selects an integer
+        or a slice along the first axis, only the chunks that contain the
+        selected rows are read, otherwise the full array is read.
+
+        :param name: The name of the array.
+        :param index: the index that selects part of the array
+        :param chunks: the chunking information of the array
+        """
+        import numpy
+
+        if isinstance(index, tuple) and index:
+            first, rest = index[0], index[1:]
         else:
-            if name not in self._cached_arrays:
-                self._cached_arrays[name] = get_array_from_file(self, name)
-            return self._cached_arrays[name]
+            first, rest = index, ()
+
+        num_rows = self.get_shape(name)[0]
+        chunk_size = chunks['chunk_size']
+
+        if isinstance(first, numbers.Integral) and not isinstance(first, bool):
+            row = first + num_rows if first < 0 else first
+            if not 0 <= row < num_rows:
+                raise IndexError("index {} is out of bounds for axis 0 with size {}".format(first, num_rows))
+            chunk = self._get_chunk_from_file(name, row // chunk_size, chunks)
+            return chunk[(row % chunk_size,) + rest]
+
+        if isinstance(first, slice):
+            rows = range(*first.indices(num_rows))
+            if not rows:
+                return self._get_chunk_from_file(name, 0, chunks)[0:0][(slice(None),) + rest]
+
+            # Group consecutive selected rows by the chunk they belong to, which preserves the order of the rows
+            parts = []
+            for chunk_index, group in itertools.groupby(rows, key=lambda row: row // chunk_size):
+                chunk = self._get_chunk_from_file(name, chunk_index, chunks)
+                parts.append(chunk[[row - chunk_index * chunk_size for row in group]])
+
+            return numpy.concatenate(parts)[(slice(None),) + rest]
+
+        return self._get_array_from_chunks(name, chunks)[index]
+
+    def _write_chunks(self, name, array, first_row, chunks):
+        """
+        Write the rows of an array to chunk files, starting from the given row
+
+        :param name: The name of the array.
+        :param array: the rows to write
+        :param first_row: the index of the row in the full array of the first
+            row to write, which has to be the first row of a chunk
+        :param chunks: the chunking information of the array
+        """
+        import tempfile
+
+        import numpy
+
+        chunk_size = chunks['chunk_size']
+
+        # An empty array still gets a single empty chunk, which records the data type
+        for start in range(0, max(len(array), 1), chunk_size):
+            chunk_index = (first_row + start) // chunk_size
+            fname = self._get_chunk_filename(name, chunk_index, chunks['compressed'])
+
+            with tempfile.NamedTemporaryFile() as handle:
+                if chunks['compressed']:
+                    numpy.savez_compressed(handle, array=array[start:start + chunk_size])
+                else:
+                    numpy.save(handle, array[start:start + chunk_size])
+                handle.flush()
+                self.add_path(handle.name, fname)
+
+    def append_to_array(self, name, array):
+        """
+        Append rows to an array stored in the node, along its first axis. Can
+        only be called before storing.
+
+        For arrays stored in chunks only the last chunk, if not yet full, is
+        rewritten, while for arrays stored in a single file the whole file is
+        rewritten.
+
+        :param name: The name of the array.
+        :param array: The numpy array with the rows to append, whose shape
+            must match the one of the stored array apart from the first axis.
+        :raise KeyError: if no array with the given name exists
+        """
+        import numpy
+
+        if not isinstance(array, numpy.ndarray):
+            raise TypeError("ArrayData can only store numpy arrays. Convert "
+                            "the object to an array first")
+
+        shape = self.get_shape(name)
+        if not shape or array.shape[1:] != shape[1:]:
+            raise ValueError("Cannot append an array of shape {} to the array '{}' of shape {}".format(
+                array.shape, name, shape))
+
+        chunks = self._get_chunks_info(name)
+        if chunks is None:
+            self.set_array(name, numpy.concatenate([self.get_array(name), array]))
+            return
+
+        num_rows = shape[0]
+        chunk_size = chunks['chunk_size']
+
+        if num_rows % chunk_size:
+            last_chunk_index = num_rows // chunk_size
+            last_chunk = self._get_chunk_from_file(name, last_chunk_index, chunks)
+            self._write_chunks(name, numpy.concatenate([last_chunk, array]), last_chunk_index * chunk_size, chunks)
+        else:
+            self._write_chunks(name, array, num_rows, chunks)
+
+        self._set_attr("{}{}".format(self.array_prefix, name), [num_rows + array.shape[0]] + list(shape[1:]))
 
     def clear_internal_cache(self):
         """
@@ -149,17 +506,22 @@ class ArrayData(Data):
         This function is useful if you want to keep the node in memory, but you
         do not want to waste memory to cache the arrays in RAM.
         """
-        self._cached_arrays = {}
+        self._cached_arrays.clear()
 
-    def set_array(self, name, array):
+    def set_array(self, name, array, chunk_size=None, compress=False):
         """
         Store a new numpy array inside the node. Possibly overwrite the array
         if it already existed.
 
-        Internally, it stores a name.npy file in numpy format.
+        Internally, it stores a name.npy file in numpy format or, if a chunk
+        size is given, one file per chunk of rows along the first axis.
 
         :param name: The name of the array.
         :param array: The numpy array to store.
+        :param chunk_size: if specified, the array is stored in chunks of this
+            number of rows along its first axis.
+        :param compress: whether to compress the chunks, only used if a chunk
+            size is specified.
         """
         import re
         import tempfile
@@ -175,14 +537,33 @@ class ArrayData(Data):
             raise ValueError("The name assigned to the array ({}) is not valid,"
                              "it can only contain digits, letters or underscores")
 
-        fname = "{}.npy".format(name)
-
-        with tempfile.NamedTemporaryFile() as f:
-            # Store in a temporary file, and then add to the node
-            numpy.save(f, array)
-            f.flush()  # Important to flush here, otherwise the next copy command
-            # will just copy an empty file
-            self.add_path(f.name, fname)
+        if chunk_size is not None:
+            if not isinstance(chunk_size, numbers.Integral) or chunk_size < 1:
+                raise ValueError("The chunk size has to be a positive integer, got {}".format(chunk_size))
+            if array.ndim < 1:
+                raise ValueError("Only arrays with at least one dimension can be stored in chunks")
+
+        # Remove the files of a previous version of the array, which may have been stored in a different format
+        self._delete_array_files(name)
+
+        if chunk_size is None:
+            fname = "{}.npy".format(name)
+
+            with tempfile.NamedTemporaryFile() as f:
+                # Store in a temporary file, and then add to the node
+                numpy.save(f, array)
+                f.flush()  # Important to flush here, otherwise the next copy command
+                # will just copy an empty file
+                self.add_path(f.name, fname)
+
+            try:
+                self._del_attr("{}{}".format(self.array_chunks_prefix, name))
+            except (KeyError, AttributeError):
+                pass
+        else:
+            chunks = {'chunk_size': int(chunk_size), 'compressed': bool(compress)}
+            self._write_chunks(name, array, 0, chunks)
+            self._set_attr("{}{}".format(self.array_chunks_prefix, name), chunks)
 
         # Mainly for convenience, for querying purposes (both stores the fact
         # that there is an array with that name, and its shape)
@@ -87,7 +87,8 @@ class TrajectoryData(ArrayData):
                                  "have shape (s,n,3), "
                                  "with s=number of steps and n=number of symbols")
 
-    def set_trajectory(self, stepids, cells, symbols, positions, times=None, velocities=None):
+    def set_trajectory(self, stepids, cells, symbols, positions, times=None, velocities=None, chunk_size=None,
+                       compress=False):
         r"""
         Store the whole trajectory, after checking that types and dimensions
         are correct.
@@ -132,16 +133,23 @@ class TrajectoryData(ArrayData):
         :param velocities: if specified, must be a float array with the same
                       dimensions of the ``positions`` array.
                       The array contains the velocities in the atoms.
+        :param chunk_size: if specified, all arrays with one entry per step
+                      are stored in chunks of this number of steps, such that
+                      retrieving a single step or a window of steps only reads
+                      the relevant chunks and steps can be appended with
+                      :py:meth:`.append_steps` without rewriting the arrays.
+        :param compress: whether to compress the chunks, only used if
+                      ``chunk_size`` is specified.
 
         .. todo :: Choose suitable units for velocities
         """
         self._internal_validate(stepids, cells, symbols, positions, times, velocities)
-        self.set_array('steps', stepids)
-        self.set_array('cells', cells)
+        self.set_array('steps', stepids, chunk_size=chunk_size, compress=compress)
+        self.set_array('cells', cells, chunk_size=chunk_size, compress=compress)
         self.set_array('symbols', symbols)
-        self.set_array('positions', positions)
+        self.set_array('positions', positions, chunk_size=chunk_size, compress=compress)
         if times is not None:
-            self.set_array('times', times)
+            self.set_array('times', times, chunk_size=chunk_size, compress=compress)
         else:
             # Delete times array, if it was present
             try:
@@ -149,7 +157,7 @@ class TrajectoryData(ArrayData):
             except KeyError:
                 pass
         if velocities is not None:
-            self.set_array('velocities', velocities)
+            self.set_array('velocities', velocities, chunk_size=chunk_size, compress=compress)
         else:
             # Delete velocities array, if it was present
             try:
@@ -157,6 +165,39 @@ class TrajectoryData(ArrayData):
             except KeyError:
                 pass
 
+    def append_steps(self, stepids, cells, positions, times=None, velocities=None):
+        """
+        Append steps to the trajectory that has already been set, for instance
+        to add the steps of a long molecular dynamics run while it progresses.
+        Can only be called before storing.
+
+        If the trajectory was set with a ``chunk_size``, only the last chunk of
+        each array is rewritten, if it was not yet full, otherwise the arrays
+        are rewritten completely.
+
+        The arguments have the same meaning as in :py:meth:`.set_trajectory`,
+        where ``s`` is now the number of steps to append. The times and
+        velocities have to be passed if and only if they were set for the
+        trajectory.
+
+        :raises KeyError: if the trajectory has not been set yet.
+        """
+        symbols = self.get_symbols()
+        self._internal_validate(stepids, cells, symbols, positions, times, velocities)
+
+        if (times is None) != (self.get_times() is None):
+            raise ValueError("times have to be appended if and only if they were set for the trajectory")
+        if (velocities is None) != ('velocities' not in self.get_arraynames()):
+            raise ValueError("velocities have to be appended if and only if they were set for the trajectory")
+
+        self.append_to_array('steps', stepids)
+        self.append_to_array('cells', cells)
+        self.append_to_array('positions', positions)
+        if times is not None:
+            self.append_to_array('times', times)
+        if velocities is not None:
+            self.append_to_array('velocities', velocities)
+
     def set_structurelist(self, structurelist):
         """
         Create trajectory from the list of
@@ -353,14 +394,12 @@ class TrajectoryData(ArrayData):
             raise IndexError("You have only {} steps, but you are looking beyond"
                              " (index={})".format(self.numsteps, index))
 
-        vel = self.get_velocities()
-        if vel is not None:
-            vel = vel[index, :, :]
-        time = self.get_times()
-        if time is not None:
-            time = time[index]
-        return (self.get_stepids()[index], time, self.get_cells()[index, :, :],
-                self.get_symbols(), self.get_positions()[index, :, :], vel)
+        # Only read the requested step from the arrays, which for chunked arrays only reads the relevant chunk
+        arraynames = self.get_arraynames()
+        vel = self.get_array('velocities', index) if 'velocities' in arraynames else None
+        time = self.get_array('times', index) if 'times' in arraynames else None
+        return (self.get_array('steps', index), time, self.get_array('cells', index),
+                self.get_symbols(), self.get_array('positions', index), vel)
 
 
     def step_to_structure(self, index, custom_kinds=None):
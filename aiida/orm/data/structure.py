@@ -14,6 +14,7 @@ functions to operate on them.
 
 from __future__ import absolute_import
 from __future__ import division
+import collections
 import itertools
 import copy
 from functools import reduce
@@ -533,14 +534,15 @@ def get_formula(symbol_list, mode='hill', separator=""):
                 symbol_set.remove('H')
                 first_symbols.append('H')
         ordered_symbol_set = first_symbols + list(sorted(symbol_set))
-        the_symbol_list = [[symbol_list.count(elem), elem]
+        counts = collections.Counter(symbol_list)
+        the_symbol_list = [[counts[elem], elem]
                            for elem in ordered_symbol_set]
 
     elif mode in ['count', 'count_compact']:
-        ordered_symbol_indexes = sorted([symbol_list.index(elem)
-                                         for elem in set(symbol_list)])
-        ordered_symbol_set = [symbol_list[i] for i in ordered_symbol_indexes]
-        the_symbol_list = [[symbol_list.count(elem), elem]
+        # The keys of an ordered dictionary preserve the order of first appearance
+        ordered_symbol_set = list(collections.OrderedDict.fromkeys(symbol_list))
+        counts = collections.Counter(symbol_list)
+        the_symbol_list = [[counts[elem], elem]
                            for elem in ordered_symbol_set]
 
     elif mode == 'reduce':
@@ -711,6 +713,61 @@ def _get_cif_ase_inline(struct, parameters):
     return {'cif': cif}
 
 
+def get_ase_tags(kinds):
+    """
+    Return the ASE tags that correspond to a list of kinds. Kinds whose name is
+    the chemical symbol, and alloys and vacancies, get no tag. Kinds whose name
+    is the chemical symbol followed by a digit get that digit as tag, while
+    all other kinds get the first integer that is not yet used for the same
+    chemical symbol.
+
+    :param kinds: the list of kinds of a StructureData object.
+    :return: a list of tags, integers or None, one for each kind.
+    """
+    from collections import defaultdict
+
+    # I create the list of tags
+    tag_list = []
+    used_tags = defaultdict(list)
+    for k in kinds:
+        # Skip alloys and vacancies
+        if k.is_alloy() or k.has_vacancies():
+            tag_list.append(None)
+        # If the kind name is equal to the specie name,
+        # then no tag should be set
+        elif six.text_type(k.name) == six.text_type(k.symbols[0]):
+            tag_list.append(None)
+        else:
+            # Name is not the specie name
+            if k.name.startswith(k.symbols[0]):
+                try:
+                    new_tag = int(k.name[len(k.symbols[0])])
+                    tag_list.append(new_tag)
+                    used_tags[k.symbols[0]].append(new_tag)
+                    continue
+                except ValueError:
+                    pass
+            tag_list.append(k.symbols[0])  # I use a string as a placeholder
+
+    for i in range(len(tag_list)):
+        # If it is a string, it is the name of the element,
+        # and I have to generate a new integer for this element
+        # and replace tag_list[i] with this new integer
+        if isinstance(tag_list[i], six.string_types):
+            # I get a list of used tags for this element
+            existing_tags = used_tags[tag_list[i]]
+            if existing_tags:
+                new_tag = max(existing_tags) + 1
+            else:  # empty list
+                new_tag = 1
+            # I store it also as a used tag!
+            used_tags[tag_list[i]].append(new_tag)
+            # I update the tag
+            tag_list[i] = new_tag
+
+    return tag_list
+
+
 def atom_kinds_to_html(atom_kind):
     """
 
@@ -828,11 +885,26 @@ class StructureData(Data):
         """
         if is_ase_atoms(aseatoms):
             # Read the ase structure
+            import numpy
+
             self.cell = aseatoms.cell
             self.pbc = aseatoms.pbc
             self.clear_kinds()  # This also calls clear_sites
+
+            # Atoms with the same symbol, tag and mass end up in the same kind: only the first one of each is appended
+            # with `append_atom`, which takes care of creating the kind, while the others are added directly as sites
+            kind_names = {}
             for atom in aseatoms:
-                self.append_atom(ase=atom)
+                mass = None if numpy.isnan(atom.mass) else atom.mass
+                key = (atom.symbol, atom.tag, mass)
+                if key not in kind_names:
+                    self.append_atom(ase=atom)
+                    kind_names[key] = self.get_attr('sites')[-1]['kind_name']
+                else:
+                    self._append_to_attr('sites', {
+                        'position': [float(i) for i in atom.position],
+                        'kind_name': kind_names[key],
+                    }, clean=False)
         else:
             raise TypeError("The value is not an ase.Atoms object")
 
@@ -982,14 +1054,15 @@ class StructureData(Data):
             raise ValidationError(
                 "Unable to validate the sites: {}".format(exc))
 
+        kind_names = set(k.name for k in kinds)
         for site in sites:
-            if site.kind_name not in [k.name for k in kinds]:
+            if site.kind_name not in kind_names:
                 raise ValidationError(
                     "A site has kind {}, but no specie with that name exists"
                     "".format(site.kind_name))
 
         kinds_without_sites = (
-            set(k.name for k in kinds) - set(s.kind_name for s in sites))
+            kind_names - set(s.kind_name for s in sites))
         if kinds_without_sites:
             raise ValidationError("The following kinds are defined, but there "
                                   "are no sites with that kind: {}".format(
@@ -1116,22 +1189,23 @@ class StructureData(Data):
             raise NotImplementedError("XYZ for alloys or systems with "
                                       "vacancies not implemented.")
 
-        sites = self.sites
+        kind_names = self.get_site_kindnames()
+        positions = self._get_site_positions()
+        symbols = {kind.name: kind.symbols[0] for kind in self.kinds}
         cell = self.cell
 
-        return_list = ["{}".format(len(sites))]
+        return_list = ["{}".format(len(kind_names))]
         return_list.append('Lattice="{} {} {} {} {} {} {} {} {}" pbc="{} {} {}"'.format(
             cell[0][0], cell[0][1], cell[0][2],
             cell[1][0], cell[1][1], cell[1][2],
             cell[2][0], cell[2][1], cell[2][2],
             self.pbc[0], self.pbc[1], self.pbc[2]
         ))
-        for site in sites:
+        for kind_name, position in zip(kind_names, positions):
             # I checked above that it is not an alloy, therefore I take the
             # first symbol
             return_list.append("{:6s} {:18.10f} {:18.10f} {:18.10f}".format(
-                self.get_kind(site.kind_name).symbols[0],
-                site.position[0], site.position[1], site.position[2]))
+                symbols[kind_name], position[0], position[1], position[2]))
 
         return_string = "\n".join(return_list)
         return return_string.encode('utf-8'), {}
@@ -1262,8 +1336,8 @@ class StructureData(Data):
             used to group and/or order the symbols in the formula
         """
 
-        symbol_list = [self.get_kind(s.kind_name).get_symbols_string()
-                       for s in self.sites]
+        symbols = {kind.name: kind.get_symbols_string() for kind in self.kinds}
+        symbol_list = [symbols[kind_name] for kind_name in self.get_site_kindnames()]
 
         return get_formula(symbol_list, mode=mode, separator=separator)
 
@@ -1278,7 +1352,24 @@ class StructureData(Data):
 
         :return: a list of strings
         """
-        return [this_site.kind_name for this_site in self.sites]
+        try:
+            raw_sites = self.get_attr('sites')
+        except AttributeError:
+            raw_sites = []
+        return [six.text_type(raw_site['kind_name']) for raw_site in raw_sites]
+
+    def _get_site_positions(self):
+        """
+        Return the positions of all sites, read directly from the stored sites
+        without creating the Site objects.
+
+        :return: a list of lists of three floats, in angstrom
+        """
+        try:
+            raw_sites = self.get_attr('sites')
+        except AttributeError:
+            raw_sites = []
+        return [[float(i) for i in raw_site['position']] for raw_site in raw_sites]
 
     def get_composition(self):
         """
@@ -1290,14 +1381,8 @@ class StructureData(Data):
 
         :returns: a dictionary with the composition
         """
-        symbols_list = [self.get_kind(s.kind_name).get_symbols_string()
-                        for s in self.sites]
-        composition = {
-            symbol: symbols_list.count(symbol)
-            for symbol
-            in set(symbols_list)
-            }
-        return composition
+        symbols = {kind.name: kind.get_symbols_string() for kind in self.kinds}
+        return dict(collections.Counter(symbols[kind_name] for kind_name in self.get_site_kindnames()))
 
     def get_ase(self):
         """
@@ -1593,6 +1678,57 @@ class StructureData(Data):
     #             append_int += 1
     #         new_site.type = new_typename
 
+    def set_sites_from_arrays(self, symbols, positions, kind_names=None):
+        """
+        Replace all kinds and sites of the structure in a single operation,
+        which is much faster than appending the sites one by one for
+        structures with many sites.
+
+        :param symbols: a list with the chemical symbol of each site.
+        :param positions: an array-like with shape ``(n, 3)``, where ``n`` is
+            the number of sites, with the positions in angstrom.
+        :param kind_names: optional list with the kind name of each site. By
+            default the chemical symbol is used. All sites with the same kind
+            name must have the same chemical symbol.
+        :raise ValueError: if the lengths of the arguments do not match or if a
+            kind name is used for different chemical symbols.
+        """
+        import numpy
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+        symbols = [six.text_type(symbol) for symbol in symbols]
+        if kind_names is None:
+            kind_names = symbols
+        else:
+            kind_names = [six.text_type(kind_name) for kind_name in kind_names]
+
+        positions = numpy.array(positions, dtype=float)
+        if positions.shape != (len(symbols), 3):
+            raise ValueError("positions must have shape ({}, 3), got {}".format(len(symbols), positions.shape))
+        if len(kind_names) != len(symbols):
+            raise ValueError("the number of kind names ({}) differs from the number of symbols ({})".format(
+                len(kind_names), len(symbols)))
+
+        # The distinct pairs of kind name and symbol, in order of first appearance
+        kinds = collections.OrderedDict()
+        for kind_name, symbol in collections.OrderedDict.fromkeys(zip(kind_names, symbols)):
+            if kinds.setdefault(kind_name, symbol) != symbol:
+                raise ValueError("The kind name '{}' is used for different symbols: '{}' and '{}'".format(
+                    kind_name, kinds[kind_name], symbol))
+
+        self.clear_kinds()  # This also calls clear_sites
+        for kind_name, symbol in kinds.items():
+            self.append_kind(Kind(symbols=symbol, name=kind_name))
+
+        raw_sites = [{'position': position, 'kind_name': kind_name}
+                     for kind_name, position in zip(kind_names, positions.tolist())]
+        self._set_attr('sites', raw_sites, clean=False)
+
     def clear_kinds(self):
         """
         Removes all kinds for the StructureData object.
@@ -1922,12 +2058,29 @@ class StructureData(Data):
         """
         import ase
 
-        asecell = ase.Atoms(cell=self.cell, pbc=self.pbc)
         _kinds = self.kinds
-
-        for site in self.sites:
-            asecell.append(site.get_ase(kinds=_kinds))
-        return asecell
+        kinds = {kind.name: (kind, tag) for kind, tag in zip(_kinds, get_ase_tags(_kinds))}
+        kind_names = self.get_site_kindnames()
+
+        for kind_name in set(kind_names):
+            if kind_name not in kinds:
+                raise ValueError("No kind '{}' has been found in the list of kinds".format(kind_name))
+            kind = kinds[kind_name][0]
+            if kind.is_alloy() or kind.has_vacancies():
+                raise ValueError("Cannot convert to ASE if the kind represents an alloy or it has vacancies.")
+
+        if not kind_names:
+            return ase.Atoms(cell=self.cell, pbc=self.pbc)
+
+        # Create all atoms at once, as appending atoms one by one copies all the arrays of the Atoms every time
+        tags = [kinds[kind_name][1] or 0 for kind_name in kind_names]
+        return ase.Atoms(
+            symbols=[str(kinds[kind_name][0].symbols[0]) for kind_name in kind_names],
+            positions=self._get_site_positions(),
+            masses=[kinds[kind_name][0].mass for kind_name in kind_names],
+            tags=tags if any(tags) else None,
+            cell=self.cell,
+            pbc=self.pbc)
 
     def _get_object_pymatgen(self,**kwargs):
         """
@@ -1978,14 +2131,16 @@ class StructureData(Data):
 
         species = []
         additional_kwargs = {}
+        kinds = {kind.name: kind for kind in self.kinds}
+        kind_names = self.get_site_kindnames()
 
         if (kwargs.pop('add_spin',False) and 
             any([n.endswith('1') or n.endswith('2') for n in self.get_kind_names()])):
             # case when spins are defined -> no partial occupancy allowed
             from pymatgen.core.structure import Specie
             oxidation_state = 0 # now I always set the oxidation_state to zero
-            for s in self.sites:
-                k = self.get_kind(s.kind_name)
+            for kind_name in kind_names:
+                k = kinds[kind_name]
                 if len(k.symbols)!=1 or (len(k.weights)!=1 or sum(k.weights)<1.):
                     raise ValueError("Cannot set partial occupancies and spins "
                                      "at the same time")
@@ -1994,20 +2149,20 @@ class StructureData(Data):
                                             else 1 if k.name.endswith('2') else 0}))
         else:
             # case when no spin are defined
-            for s in self.sites:
-                k = self.get_kind(s.kind_name)
-                species.append({s: w for s, w in zip(k.symbols, k.weights)})
-            if any([create_automatic_kind_name(self.get_kind(name).symbols,self.get_kind(name).weights)!=name
-                    for name in self.get_site_kindnames()]):
+            kind_species = {name: {s: w for s, w in zip(k.symbols, k.weights)} for name, k in kinds.items()}
+            for kind_name in kind_names:
+                species.append(dict(kind_species[kind_name]))
+            if any([create_automatic_kind_name(kinds[name].symbols,kinds[name].weights)!=name
+                    for name in set(kind_names)]):
                     # add "kind_name" as a properties to each site, whenever
                     # the kind_name cannot be automatically obtained from the symbols
-                additional_kwargs['site_properties'] = {'kind_name': self.get_site_kindnames()}
+                additional_kwargs['site_properties'] = {'kind_name': kind_names}
         
         if kwargs:
             raise ValueError("Unrecognized parameters passed to pymatgen "
                              "converter: {}".format(kwargs.keys()))
 
-        positions = [list(x.position) for x in self.sites]
+        positions = self._get_site_positions()
         return Structure(self.cell, species, positions,
                          coords_are_cartesian=True,**additional_kwargs)
 
@@ -2030,12 +2185,13 @@ class StructureData(Data):
             raise ValueError("Unrecognized parameters passed to pymatgen "
                              "converter: {}".format(kwargs.keys()))
 
+        kinds = {kind.name: kind for kind in self.kinds}
         species = []
-        for s in self.sites:
-            k = self.get_kind(s.kind_name)
+        for kind_name in self.get_site_kindnames():
+            k = kinds[kind_name]
             species.append({s: w for s, w in zip(k.symbols, k.weights)})
 
-        positions = [list(x.position) for x in self.sites]
+        positions = self._get_site_positions()
         return Molecule(species, positions)
 
 
@@ -2517,47 +2673,9 @@ class Site(object):
         .. note:: If any site is an alloy or has vacancies, a ValueError
             is raised (from the site.get_ase() routine).
         """
-        from collections import defaultdict
         import ase
 
-        # I create the list of tags
-        tag_list = []
-        used_tags = defaultdict(list)
-        for k in kinds:
-            # Skip alloys and vacancies
-            if k.is_alloy() or k.has_vacancies():
-                tag_list.append(None)
-            # If the kind name is equal to the specie name,
-            # then no tag should be set
-            elif six.text_type(k.name) == six.text_type(k.symbols[0]):
-                tag_list.append(None)
-            else:
-                # Name is not the specie name
-                if k.name.startswith(k.symbols[0]):
-                    try:
-                        new_tag = int(k.name[len(k.symbols[0])])
-                        tag_list.append(new_tag)
-                        used_tags[k.symbols[0]].append(new_tag)
-                        continue
-                    except ValueError:
-                        pass
-                tag_list.append(k.symbols[0])  # I use a string as a placeholder
-
-        for i in range(len(tag_list)):
-            # If it is a string, it is the name of the element,
-            # and I have to generate a new integer for this element
-            # and replace tag_list[i] with this new integer
-            if isinstance(tag_list[i], six.string_types):
-                # I get a list of used tags for this element
-                existing_tags = used_tags[tag_list[i]]
-                if existing_tags:
-                    new_tag = max(existing_tags) + 1
-                else:  # empty list
-                    new_tag = 1
-                # I store it also as a used tag!
-                used_tags[tag_list[i]].append(new_tag)
-                # I update the tag
-                tag_list[i] = new_tag
+        tag_list = get_ase_tags(kinds)
 
         found = False
         for k, t in zip(kinds, tag_list):
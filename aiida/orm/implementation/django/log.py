@@ -9,6 +9,9 @@
 ###########################################################################
 from __future__ import absolute_import
 import json
+
+from django.db.models import Q
+
 from aiida.orm.log import LogCollection, Log
 from aiida.orm.log import ASCENDING
 from aiida.backends.djsite.db.models import DbLog
@@ -69,6 +72,31 @@ class DjangoLogCollection(LogCollection):
 
         return [DjangoLog(entry) for entry in entries]
 
+    def find_for_objects(self, objpks, levelnames=None, batch_size=1000):
+        """
+        Iterate over the entries of the given objects, ordered by time, retrieving them from the database in batches
+        with a single query, rather than one query per object.
+        """
+        objpks = list(objpks)
+        if not objpks:
+            return
+
+        entries = DbLog.objects.filter(objpk__in=objpks)
+        if levelnames is not None:
+            entries = entries.filter(levelname__in=list(levelnames))
+
+        # Fetch the entries in pages, continuing after the last entry of the previous page, such that the database
+        # does not have to skip over the entries that were already returned, as it would with an offset
+        entries = entries.order_by('time', 'id')
+        page = list(entries[:batch_size])
+        while page:
+            for entry in page:
+                yield DjangoLog(entry)
+            if len(page) < batch_size:
+                return
+            last = page[-1]
+            page = list(entries.filter(Q(time__gt=last.time) | Q(time=last.time, id__gt=last.id))[:batch_size])
+
     def delete_many(self, filter):
         """
         Delete all log entries in the table
@@ -9,6 +9,8 @@
 ###########################################################################
 
 from __future__ import absolute_import
+import contextlib
+import threading
 from functools import reduce
 
 import six
@@ -28,6 +30,38 @@ from aiida.orm.implementation.general.node import AbstractNode, _NO_DEFAULT, _HA
 from . import computer as computers
 from . import user as users
 
+# Thread local storage of the list of nodes whose attributes are to be written in bulk, see _deferred_attribute_writes
+_DEFERRED_ATTRIBUTES = threading.local()
+
+
+@contextlib.contextmanager
+def _deferred_attribute_writes():
+    """
+    Context manager that defers the writing of the attributes of the nodes that are stored within it, such that the
+    attributes of all of them are written with a single bulk insert when leaving the context. Their hashes are only
+    computed and stored after that, since computing the hash of a stored node requires its attributes.
+
+    If the context is entered while another one is active, the writes are deferred to the outermost one. If an
+    exception is raised in the context nothing is written: this should always be used within a transaction.
+    """
+    from aiida.backends.djsite.db.models import DbAttribute
+
+    if getattr(_DEFERRED_ATTRIBUTES, 'nodes', None) is not None:
+        yield
+        return
+
+    _DEFERRED_ATTRIBUTES.nodes = nodes = []
+
+    try:
+        yield
+    finally:
+        _DEFERRED_ATTRIBUTES.nodes = None
+
+    DbAttribute.reset_values_for_nodes({node.pk: attributes for node, attributes in nodes}, with_transaction=False)
+
+    for node, _ in nodes:
+        node._store_hash()  # pylint: disable=protected-access
+
 
 class Node(AbstractNode):
 
@@ -353,6 +387,27 @@ class Node(AbstractNode):
                                    stop_if_existing=exclusive)
         self._increment_version_number_db()
 
+    def _set_db_extras_many(self, extras):
+        from aiida.backends.djsite.db.models import DbExtra
+
+        with transaction.atomic():
+            DbExtra.set_values_for_nodes([self._dbnode.pk], extras, with_transaction=False)
+            self._increment_version_number_db()
+
+    @classmethod
+    def _set_db_extra_for_nodes(cls, pks, key, value):
+        from aiida.backends.djsite.db.models import DbNode, DbExtra, BULK_INSERT_PAGE_SIZE
+        from aiida.utils import timezone
+
+        pks = list(pks)
+
+        with transaction.atomic():
+            DbExtra.set_values_for_nodes(pks, {key: value}, with_transaction=False)
+            # The version is incremented as in _increment_version_number_db, which also updates the modification time
+            for start in range(0, len(pks), BULK_INSERT_PAGE_SIZE):
+                DbNode.objects.filter(pk__in=pks[start:start + BULK_INSERT_PAGE_SIZE]).update(
+                    nodeversion=F('nodeversion') + 1, mtime=timezone.now())
+
     def _reset_db_extras(self, new_extras):
         raise NotImplementedError("Reset of extras has not been implemented"
                                   "for Django backend.")
@@ -491,6 +546,12 @@ class Node(AbstractNode):
         # otherwise I only get the Django Field F object as a result!
         self._dbnode = DbNode.objects.get(pk=self._dbnode.pk)
 
+    def _set_db_node_hash(self, hash_):
+        from aiida.backends.djsite.db.models import DbNode
+        # Update only the hash column, without touching the modification time or the nodeversion
+        DbNode.objects.filter(pk=self._dbnode.pk).update(node_hash=hash_)
+        self._dbnode.node_hash = hash_
+
     @property
     def uuid(self):
         return six.text_type(self._dbnode.uuid)
@@ -530,8 +591,10 @@ class Node(AbstractNode):
 
         with context_man:
             # Always without transaction: either it is the context_man here,
-            # or it is managed outside
-            self._store_input_nodes()
+            # or it is managed outside. The attributes of all the input nodes
+            # are written at once, instead of one node at a time
+            with _deferred_attribute_writes():
+                self._store_input_nodes()
             self.store(with_transaction=False, use_cache=use_cache)
             self._store_cached_input_links(with_transaction=False)
 
@@ -632,8 +695,9 @@ class Node(AbstractNode):
         # I assume that if a node exists in the DB, its folder is in place.
         # On the other hand, periodically the user might need to run some
         # bookkeeping utility to check for lone folders.
-        self._repository_folder.replace_with_folder(
-            self._get_temp_folder().abspath, move=True, overwrite=True)
+        self._move_to_repository()
+
+        deferred_nodes = getattr(_DEFERRED_ATTRIBUTES, 'nodes', None)
 
         # I do the transaction only during storage on DB to avoid timeout
         # problems, especially with SQLite
@@ -642,10 +706,14 @@ class Node(AbstractNode):
                 # Save the row
                 self._dbnode.save()
                 # Save its attributes 'manually' without incrementing
-                # the version for each add.
-                DbAttribute.reset_values_for_node(self._dbnode,
-                                                  attributes=self._attrs_cache,
-                                                  with_transaction=False)
+                # the version for each add, unless they are to be written
+                # in bulk together with those of other nodes
+                if deferred_nodes is None:
+                    DbAttribute.reset_values_for_node(self._dbnode,
+                                                      attributes=self._attrs_cache,
+                                                      with_transaction=False)
+                else:
+                    deferred_nodes.append((self, self._attrs_cache))
                 # This should not be used anymore: I delete it to
                 # possibly free memory
                 del self._attrs_cache
@@ -662,12 +730,109 @@ class Node(AbstractNode):
         except:
             # I put back the files in the sandbox folder since the
             # transaction did not succeed
-            self._get_temp_folder().replace_with_folder(
-                self._repository_folder.abspath, move=True, overwrite=True)
+            self._move_back_to_sandbox()
             raise
 
-        from aiida.backends.djsite.db.models import DbExtra
-        # I store the hash without cleaning and without incrementing the nodeversion number
-        DbExtra.set_value_for_node(self._dbnode, _HASH_EXTRA_KEY, self.get_hash())
+        # The hash depends on the attributes: if their writing is deferred, so is the storing of the hash
+        if deferred_nodes is None:
+            self._store_hash()
 
         return self
+
+    def _store_hash(self):
+        """
+        Store the hash of a node that was just stored, without cleaning and without incrementing the nodeversion.
+        """
+        from aiida.backends.djsite.db.models import DbExtra
+        hash_ = self.get_hash()
+        DbExtra.set_value_for_node(self._dbnode, _HASH_EXTRA_KEY, hash_)
+        self._set_db_node_hash(hash_)
+
+    @classmethod
+    def _db_store_many(cls, nodes, hashes, individual_nodes, stored_targets, with_transaction=True):
+        """
+        Store many new nodes in the DB in a single transaction, inserting the nodes, their attributes and their cached
+        input links in bulk.
+
+        :param nodes: a list of validated unstored nodes to store in bulk
+        :param hashes: the list of the hashes of the nodes
+        :param individual_nodes: a list of unstored nodes to store through their own store method, after the others
+        :param stored_targets: a list of stored nodes with cached input links from the nodes being stored
+        :param with_transaction: if False, no transaction is used. This is meant to be used ONLY if the outer calling
+            function has already a transaction open!
+        """
+        from aiida.backends.djsite.db.models import DbNode, DbAttribute, DbExtra, BULK_INSERT_PAGE_SIZE
+        from aiida.common.utils import EmptyContextManager
+
+        if with_transaction:
+            context_man = transaction.atomic()
+        else:
+            context_man = EmptyContextManager()
+
+        # As in _db_store, the files are moved to the repository before the rows are written
+        moved = []
+        try:
+            for node in nodes:
+                node._move_to_repository()
+                moved.append(node)
+
+            with context_man:
+                for node, hash_ in zip(nodes, hashes):
+                    node._dbnode.node_hash = hash_
+
+                DbNode.objects.bulk_create([node._dbnode for node in nodes], batch_size=BULK_INSERT_PAGE_SIZE)
+
+                # bulk_create does not set the primary keys, they are retrieved through the UUIDs
+                pks = {
+                    six.text_type(uuid): pk for uuid, pk in
+                    DbNode.objects.filter(uuid__in=[node.uuid for node in nodes]).values_list('uuid', 'id')
+                }
+                for node in nodes:
+                    node._dbnode.pk = pks[node.uuid]
+                    node._dbnode._state.adding = False
+                    node._dbnode._state.db = DbNode.objects.db
+
+                DbAttribute.reset_values_for_nodes(
+                    {node.pk: node._attrs_cache for node in nodes}, with_transaction=False)
+                DbExtra.bulk_insert_rows([
+                    (node.pk,) + row for node, hash_ in zip(nodes, hashes)
+                    for row in DbExtra.serialize_value(_HASH_EXTRA_KEY, hash_)
+                ])
+
+                for node in nodes:
+                    node._to_be_stored = False
+
+                for node in individual_nodes:
+                    node.store(with_transaction=False)
+
+                links = []
+                for node in nodes:
+                    for label, (source, link_type) in node._inputlinks_cache.items():
+                        links.append(DbLink(input_id=source.pk, output_id=node.pk, label=label, type=link_type.value))
+
+                try:
+                    with transaction.atomic():
+                        DbLink.objects.bulk_create(links, batch_size=BULK_INSERT_PAGE_SIZE)
+                except IntegrityError as exc:
+                    raise UniquenessError("There is already a link with the same name (raw message was {})"
+                                          "".format(exc))
+
+                for node in stored_targets:
+                    node._store_cached_input_links(with_transaction=False)
+
+        # This is one of the few cases where it is ok to do a 'global'
+        # except, also because I am re-raising the exception
+        except:
+            for node in nodes:
+                node._to_be_stored = True
+                node._dbnode.pk = None
+                node._dbnode._state.adding = True
+            for node in moved:
+                node._move_back_to_sandbox()
+            raise
+
+        for node in nodes:
+            # These should not be used anymore: I delete them to possibly free memory
+            del node._attrs_cache
+            node._temp_folder = None
+            node._inputlinks_cache.clear()
@@ -1132,11 +1132,58 @@ class AbstractNode(object):
         """
 
         try:
-            for key, value in the_dict.items():
-                self.set_extra(key, value)
+            extras = dict(the_dict.items())
         except AttributeError:
             raise AttributeError("set_extras takes a dictionary as argument")
 
+        self.set_extras_many(extras)
+
+    def set_extras_many(self, extras):
+        """
+        Set several extras at once, with a single write to the DB, rather than
+        one per extra. The other extras are left untouched.
+        Can be used *only* after saving.
+
+        :param extras: a dictionary of key:value to be set as extras
+        :raise ModificationNotAllowed: if the node is not stored yet
+        """
+        if not extras:
+            return
+
+        for key in extras:
+            validate_attribute_key(key)
+
+        if self._to_be_stored:
+            raise ModificationNotAllowed(
+                "The extras of a node can be set only after "
+                "storing the node")
+
+        self._set_db_extras_many({key: clean_value(value) for key, value in extras.items()})
+
+    @abstractmethod
+    def _set_db_extras_many(self, extras):
+        """
+        Set several extras directly in the DB, without checks.
+
+        DO NOT USE DIRECTLY.
+
+        :param extras: a dictionary of key:value to be set as extras
+        """
+        pass
+
+    @abstractclassmethod
+    def _set_db_extra_for_nodes(cls, pks, key, value):
+        """
+        Set the same extra on many stored nodes directly in the DB, without checks.
+
+        DO NOT USE DIRECTLY, see :py:func:`aiida.orm.utils.set_extra_for_nodes`.
+
+        :param pks: a list of pks of stored nodes
+        :param key: key name
+        :param value: key value
+        """
+        pass
+
     def reset_extras(self, new_extras):
         """
         Deletes existing extras and creates new ones.
@@ -1686,25 +1733,149 @@ class AbstractNode(object):
                 self._db_store(with_transaction)
 
             # Set up autogrouping used by verdi run
-            from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
-            from aiida.orm import Group
-
-            if current_autogroup is not None:
-                if not isinstance(current_autogroup, Autogroup):
-                    raise ValidationError(
-                        "current_autogroup is not an AiiDA Autogroup")
-
-                if current_autogroup.is_to_be_grouped(self):
-                    group_name = current_autogroup.get_group_name()
-                    if group_name is not None:
-                        g = Group.get_or_create(
-                            name=group_name, type_string=VERDIAUTOGROUP_TYPE)[0]
-                        g.add_nodes(self)
+            self._add_to_autogroup([self])
 
         # This is useful because in this way I can do
         # n = Node().store()
         return self
 
+    @staticmethod
+    def _add_to_autogroup(nodes):
+        """
+        Add the given nodes that were just stored to the current autogroup used by verdi run, if any.
+
+        :param nodes: a list of stored nodes
+        """
+        from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
+        from aiida.orm import Group
+
+        if current_autogroup is None:
+            return
+
+        if not isinstance(current_autogroup, Autogroup):
+            raise ValidationError("current_autogroup is not an AiiDA Autogroup")
+
+        group_name = current_autogroup.get_group_name()
+        to_be_grouped = [node for node in nodes if current_autogroup.is_to_be_grouped(node)]
+
+        if group_name is not None and to_be_grouped:
+            group = Group.get_or_create(name=group_name, type_string=VERDIAUTOGROUP_TYPE)[0]
+            group.add_nodes(to_be_grouped)
+
+    @classmethod
+    def _store_many(cls, nodes, links=None, with_transaction=True):
+        """
+        Store many nodes, together with their cached input links and the given links, in a single transaction.
+
+        See :py:func:`aiida.orm.utils.store_many` for the details.
+
+        :param nodes: an iterable of nodes; those that are already stored are skipped
+        :param links: an optional iterable of tuples ``(source, target, label)`` or
+            ``(source, target, label, link_type)`` of links to add before storing
+        :param with_transaction: if False, no transaction is used. This is meant to be used ONLY if the outer calling
+            function has already a transaction open!
+        :return: the list of the nodes
+        :raise ModificationNotAllowed: if one of the nodes has an unstored input node that is not being stored
+        :raise ValueError: if the links would create a loop
+        """
+        nodes = list(nodes)
+
+        # Links are added through add_link_from, such that all the checks of the node classes apply
+        stored_targets = []
+        for link in links or []:
+            source, target, label = link[:3]
+            if len(link) > 3:
+                target.add_link_from(source, label=label, link_type=link[3])
+            else:
+                target.add_link_from(source, label=label)
+            if target.is_stored and not source.is_stored and target not in stored_targets:
+                stored_targets.append(target)
+
+        to_store = []
+        batch = set()
+        for node in nodes:
+            if not node.is_stored and id(node) not in batch:
+                to_store.append(node)
+                batch.add(id(node))
+
+        for node in to_store + stored_targets:
+            for label, (source, _) in node._inputlinks_cache.items():
+                if not source.is_stored and id(source) not in batch:
+                    raise ModificationNotAllowed(
+                        "Cannot store the input link '{}' of node {} because its source is not stored and is not "
+                        "among the nodes to store".format(label, node.uuid))
+
+        cls._check_no_loops(to_store + stored_targets)
+
+        # Nodes whose class defines its own store method are stored through it, the others in bulk
+        bulk, individual = [], []
+        for node in to_store:
+            if six.get_unbound_function(type(node).store) is six.get_unbound_function(AbstractNode.store):
+                bulk.append(node)
+            else:
+                individual.append(node)
+
+        for node in bulk:
+            node._validate()
+
+        # The hashes are computed from the unstored nodes, as it is done when looking for equivalent nodes in store
+        hashes = [node.get_hash() for node in bulk]
+
+        cls._db_store_many(bulk, hashes, individual, stored_targets, with_transaction=with_transaction)
+        cls._add_to_autogroup(bulk)
+
+        return nodes
+
+    @staticmethod
+    def _check_no_loops(nodes):
+        """
+        Check that the cached links of the given nodes of type CREATE or INPUT do not form a loop.
+
+        Since a node that is not yet stored does not have any outgoing link in the database, this is a complete check
+        for the links whose target is unstored. Links whose target is already stored are checked against the database
+        when they are stored.
+
+        :param nodes: a list of nodes
+        :raise ValueError: if a loop is found
+        """
+        children = collections.defaultdict(list)
+        for node in nodes:
+            for source, link_type in node._inputlinks_cache.values():
+                if link_type is LinkType.CREATE or link_type is LinkType.INPUT:
+                    children[id(source)].append(node)
+
+        # Iterative depth-first search, where a node that is found again while it is being visited closes a loop
+        visiting, visited = set(), set()
+        for root in nodes:
+            if id(root) in visited:
+                continue
+            stack = [(root, iter(children[id(root)]))]
+            visiting.add(id(root))
+            while stack:
+                node, iterator = stack[-1]
+                child = next(iterator, None)
+                if child is None:
+                    stack.pop()
+                    visiting.discard(id(node))
+                    visited.add(id(node))
+                elif id(child) in visiting:
+                    raise ValueError("The links you are attempting to create would generate a loop")
+                elif id(child) not in visited:
+                    visiting.add(id(child))
+                    stack.append((child, iter(children[id(child)])))
+
+    def _move_to_repository(self):
+        """
+        Move the content of the temporary folder of an unstored node to its permanent repository folder.
+        """
+        self._repository_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
+
+    def _move_back_to_sandbox(self):
+        """
+        Move back the content of the repository folder of a node to a temporary folder, when its storing failed.
+        """
+        self._get_temp_folder().replace_with_folder(self._repository_folder.abspath, move=True, overwrite=True)
+
     def _store_from_cache(self, cache_node, with_transaction):
         from aiida.orm.mixins import Sealable
         assert self.type == cache_node.type
@@ -1755,6 +1926,21 @@ class AbstractNode(object):
         """
         pass
 
+    @abstractclassmethod
+    def _db_store_many(cls, nodes, hashes, individual_nodes, stored_targets, with_transaction=True):
+        """
+        Store many new nodes in the DB in a single transaction, inserting the nodes, their attributes and their cached
+        input links in bulk.
+
+        :param nodes: a list of validated unstored nodes to store in bulk
+        :param hashes: the list of the hashes of the nodes
+        :param individual_nodes: a list of unstored nodes to store through their own store method, after the others
+        :param stored_targets: a list of stored nodes with cached input links from the nodes being stored
+        :param with_transaction: if False, no transaction is used. This is meant to be used ONLY if the outer calling
+            function has already a transaction open!
+        """
+        pass
+
     def __del__(self):
         """
         Called only upon real object destruction from memory
@@ -1801,17 +1987,36 @@ class AbstractNode(object):
         """
         Re-generates the stored hash of the Node.
         """
-        self.set_extra(_HASH_EXTRA_KEY, self.get_hash())
+        self._set_hash(self.get_hash())
 
     def clear_hash(self):
         """
         Sets the stored hash of the Node to None.
         """
-        self.set_extra(_HASH_EXTRA_KEY, None)
+        self._set_hash(None)
+
+    def _set_hash(self, hash_):
+        """
+        Store the hash of the Node, both as the ``_aiida_hash`` extra and in the indexed hash column of the database
+        model, which is the one that is used to look up equivalent nodes for caching.
+
+        :param hash_: the hash string or None
+        """
+        self.set_extra(_HASH_EXTRA_KEY, hash_)
+        self._set_db_node_hash(hash_)
+
+    @abstractmethod
+    def _set_db_node_hash(self, hash_):
+        """
+        Set the value of the indexed hash column of the database model of a stored node.
+
+        :param hash_: the hash string or None
+        """
+        pass
 
     def _get_same_node(self):
         """
-        Returns a stored node from which the current Node can be cached, meaning that the returned Node is a valid cache, and its ``_aiida_hash`` attribute matches ``self.get_hash()``.
+        Returns a stored node from which the current Node can be cached, meaning that the returned Node is a valid cache, and its stored hash matches ``self.get_hash()``.
 
         If there are multiple valid matches, the first one is returned. If no matches are found, ``None`` is returned.
 
@@ -1842,7 +2047,7 @@ class AbstractNode(object):
         hash_ = self.get_hash()
         if hash_:
             qb = QueryBuilder()
-            qb.append(self.__class__, filters={'extras._aiida_hash': hash_}, project='*', subclassing=False)
+            qb.append(self.__class__, filters={'node_hash': hash_}, project='*', subclassing=False)
             same_nodes = (n[0] for n in qb.iterall())
         return (n for n in same_nodes if n._is_valid_cache())
 
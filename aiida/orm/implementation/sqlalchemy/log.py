@@ -76,6 +76,22 @@ class SqlaLogCollection(LogCollection):
 
         return [SqlaLog(entry) for entry in entries]
 
+    def find_for_objects(self, objpks, levelnames=None, batch_size=1000):
+        """
+        Iterate over the entries of the given objects, ordered by time, retrieving them from the database in batches
+        with a single query, rather than one query per object.
+        """
+        objpks = list(objpks)
+        if not objpks:
+            return
+
+        query = session.query(DbLog).filter(DbLog.objpk.in_(objpks))
+        if levelnames is not None:
+            query = query.filter(DbLog.levelname.in_(list(levelnames)))
+
+        for entry in query.order_by(DbLog.time.asc(), DbLog.id.asc()).yield_per(batch_size):
+            yield SqlaLog(entry)
+
     def delete_many(self, filter):
         """
         Delete all log entries in the table
@@ -11,6 +11,8 @@
 SQL Alchemy Node concrete implementation
 """
 from __future__ import absolute_import
+import contextlib
+import threading
 
 import six
 
@@ -23,6 +25,8 @@ from aiida.backends.sqlalchemy.models.computer import DbComputer
 
 from aiida.common.utils import get_new_uuid
 from aiida.common.folders import RepositoryFolder
+from aiida.common.setup import (NODE_READ_CONSISTENCY_MODES, NODE_READ_CONSISTENCY_SNAPSHOT,
+                                NODE_READ_CONSISTENCY_STRICT)
 from aiida.common.exceptions import (InternalError, ModificationNotAllowed, NotExistent, UniquenessError)
 from aiida.common.links import LinkType
 from aiida.common.utils import type_check
@@ -32,6 +36,64 @@ from aiida.orm.implementation.sqlalchemy.utils import get_attr
 
 from . import user as users
 
+# The read consistency mode configured in the profile, which is read only once
+_DEFAULT_READ_CONSISTENCY = None
+
+# Thread local storage of the read consistency mode set with the node_read_consistency context manager
+_READ_CONSISTENCY = threading.local()
+
+
+def get_node_read_consistency():
+    """
+    Return the current read consistency mode of the attributes and extras of stored nodes: the one set with the
+    :py:func:`node_read_consistency` context manager if any, or the one configured by the
+    ``sqlalchemy.node_read_consistency`` property otherwise, which is read only once per interpreter.
+
+    :return: one of the modes in NODE_READ_CONSISTENCY_MODES
+    """
+    global _DEFAULT_READ_CONSISTENCY  # pylint: disable=global-statement
+
+    mode = getattr(_READ_CONSISTENCY, 'mode', None)
+
+    if mode is None:
+        if _DEFAULT_READ_CONSISTENCY is None:
+            from aiida.common.setup import get_property
+            _DEFAULT_READ_CONSISTENCY = get_property('sqlalchemy.node_read_consistency')
+        mode = _DEFAULT_READ_CONSISTENCY
+
+    return mode
+
+
+@contextlib.contextmanager
+def node_read_consistency(mode):
+    """
+    Context manager to set the read consistency mode of the attributes and extras of stored nodes in this thread, for
+    example to read many attributes of many nodes in a read-only analysis without any staleness check::
+
+        with node_read_consistency('snapshot'):
+            values = [node.get_attr('energy') for node in nodes]
+
+    :param mode: one of the modes in NODE_READ_CONSISTENCY_MODES:
+
+        * 'strict': the attributes are reloaded from the database at every access
+        * 'versioned': the attributes are cached and reloaded only if the nodeversion in the database changed
+        * 'snapshot': the attributes are read only once per node instance and reloaded only after being modified
+          through that same instance
+
+    :raise ValueError: if the mode is not valid
+    """
+    if mode not in NODE_READ_CONSISTENCY_MODES:
+        raise ValueError('invalid read consistency mode {}, valid modes are {}'.format(
+            mode, NODE_READ_CONSISTENCY_MODES))
+
+    previous = getattr(_READ_CONSISTENCY, 'mode', None)
+    _READ_CONSISTENCY.mode = mode
+
+    try:
+        yield
+    finally:
+        _READ_CONSISTENCY.mode = previous
+
 
 class Node(AbstractNode):
     """
@@ -44,6 +106,10 @@ class Node(AbstractNode):
 
         self._temp_folder = None
 
+        # Cache of the attributes and extras read from the database, as a mapping of the column name onto a tuple of
+        # the nodeversion at which it was read and its value, see _get_db_column
+        self._db_column_cache = {}
+
         dbnode = kwargs.pop('dbnode', None)
 
         # Set the internal parameters
@@ -348,9 +414,9 @@ class Node(AbstractNode):
         :param str key: key name
         :param value: its value
         """
+        self._clear_db_column_cache()
         try:
-            self._dbnode.set_attr(key, value)
-            self._increment_version_number_db()
+            self._dbnode.set_attr(key, value, increment_version=True)
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
@@ -358,9 +424,9 @@ class Node(AbstractNode):
             raise
 
     def _del_db_attr(self, key):
+        self._clear_db_column_cache()
         try:
-            self._dbnode.del_attr(key)
-            self._increment_version_number_db()
+            self._dbnode.del_attr(key, increment_version=True)
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
@@ -377,9 +443,29 @@ class Node(AbstractNode):
         if exclusive:
             raise NotImplementedError("exclusive=True not implemented yet in SQLAlchemy backend")
 
+        self._clear_db_column_cache()
         try:
-            self._dbnode.set_extra(key, value)
-            self._increment_version_number_db()
+            self._dbnode.set_extra(key, value, increment_version=True)
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
+    def _set_db_extras_many(self, extras):
+        self._clear_db_column_cache()
+        try:
+            self._dbnode.set_extras(extras, increment_version=True)
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
+    @classmethod
+    def _set_db_extra_for_nodes(cls, pks, key, value):
+        try:
+            DbNode.set_extra_for_nodes(pks, key, value)
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
@@ -387,6 +473,7 @@ class Node(AbstractNode):
             raise
 
     def _reset_db_extras(self, new_extras):
+        self._clear_db_column_cache()
         try:
             self._dbnode.reset_extras(new_extras)
             self._increment_version_number_db()
@@ -403,9 +490,9 @@ class Node(AbstractNode):
             raise AttributeError("DbExtra {} does not exist".format(key))
 
     def _del_db_extra(self, key):
+        self._clear_db_column_cache()
         try:
-            self._dbnode.del_extra(key)
-            self._increment_version_number_db()
+            self._dbnode.del_extra(key, increment_version=True)
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
@@ -539,6 +626,16 @@ class Node(AbstractNode):
             session.rollback()
             raise
 
+    def _set_db_node_hash(self, hash_):
+        self._dbnode.node_hash = hash_
+        try:
+            self._dbnode.save()
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
     @property
     def pk(self):
         return self._dbnode.id
@@ -669,7 +766,7 @@ class Node(AbstractNode):
         # I assume that if a node exists in the DB, its folder is in place.
         # On the other hand, periodically the user might need to run some
         # bookkeeping utility to check for lone folders.
-        self._repository_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
+        self._move_to_repository()
 
         try:
             session.add(self._dbnode)
@@ -703,23 +800,149 @@ class Node(AbstractNode):
         except:
             # I put back the files in the sandbox folder since the
             # transaction did not succeed
-            self._get_temp_folder().replace_with_folder(self._repository_folder.abspath, move=True, overwrite=True)
+            self._move_back_to_sandbox()
             raise
 
-        self._dbnode.set_extra(_HASH_EXTRA_KEY, self.get_hash())
+        # The hash column is set before the extra, such that both are committed in a single transaction
+        hash_ = self.get_hash()
+        self._dbnode.node_hash = hash_
+        self._dbnode.set_extra(_HASH_EXTRA_KEY, hash_)
         return self
 
+    @classmethod
+    def _db_store_many(cls, nodes, hashes, individual_nodes, stored_targets, with_transaction=True):
+        """
+        Store many new nodes in the DB in a single transaction, inserting the nodes, their attributes and their cached
+        input links in bulk.
+
+        :param nodes: a list of validated unstored nodes to store in bulk
+        :param hashes: the list of the hashes of the nodes
+        :param individual_nodes: a list of unstored nodes to store through their own store method, after the others
+        :param stored_targets: a list of stored nodes with cached input links from the nodes being stored
+        :param with_transaction: if False, no transaction is used. This is meant to be used ONLY if the outer calling
+            function has already a transaction open!
+        """
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+
+        # As in _db_store, the files are moved to the repository before the rows are written
+        moved = []
+        try:
+            for node in nodes:
+                node._move_to_repository()
+                moved.append(node)
+
+            for node, hash_ in zip(nodes, hashes):
+                node._dbnode.attributes = node._attrs_cache
+                node._dbnode.extras = {_HASH_EXTRA_KEY: hash_}
+                node._dbnode.node_hash = hash_
+
+            # A single flush inserts all the nodes, which assigns their ids
+            session.add_all([node._dbnode for node in nodes])
+            session.flush()
+
+            for node in nodes:
+                node._to_be_stored = False
+
+            for node in individual_nodes:
+                node.store(with_transaction=False)
+
+            links = []
+            for node in nodes:
+                for label, (source, link_type) in node._inputlinks_cache.items():
+                    links.append({'input_id': source.id, 'output_id': node.id, 'label': label, 'type': link_type.value})
+
+            try:
+                with session.begin_nested():
+                    session.bulk_insert_mappings(DbLink, links)
+            except SQLAlchemyError as exc:
+                raise UniquenessError("There is already a link with the same name (raw message was {})".format(exc))
+
+            for node in stored_targets:
+                node._store_cached_input_links(with_transaction=False)
+
+            if with_transaction:
+                session.commit()
+
+        # This is one of the few cases where it is ok to do a 'global'
+        # except, also because I am re-raising the exception
+        except:
+            if with_transaction:
+                session.rollback()
+            for node in nodes:
+                node._to_be_stored = True
+            for node in moved:
+                node._move_back_to_sandbox()
+            raise
+
+        for node in nodes:
+            # These should not be used anymore: I delete them to possibly free memory
+            del node._attrs_cache
+            node._temp_folder = None
+            node._inputlinks_cache.clear()
+
     @property
     def uuid(self):
         return six.text_type(self._dbnode.uuid)
 
     def _attributes(self):
-        self._ensure_model_uptodate(['attributes'])
-        return self._dbnode.attributes
+        return self._get_db_column('attributes')
 
     def _extras(self):
-        self._ensure_model_uptodate(['extras'])
-        return self._dbnode.extras
+        return self._get_db_column('extras')
+
+    def _get_db_column(self, name):
+        """
+        Return the value of the attributes or extras column of the database model, respecting the current read
+        consistency mode (see :py:func:`node_read_consistency`).
+
+        Except in the 'strict' mode, the value is cached together with the nodeversion at which it was read. Since all
+        the modifications of the attributes and extras increment the nodeversion, in the 'versioned' mode the cached
+        value is up to date as long as the nodeversion in the database did not change, which only requires to query a
+        single integer instead of the whole column. In the 'snapshot' mode this check is skipped.
+
+        :param name: the name of the column, either 'attributes' or 'extras'
+        :return: the value of the column
+        """
+        if not self.is_stored:
+            return getattr(self._dbnode, name)
+
+        mode = get_node_read_consistency()
+
+        if mode == NODE_READ_CONSISTENCY_STRICT:
+            self._ensure_model_uptodate([name])
+            return getattr(self._dbnode, name)
+
+        cached = self._db_column_cache.get(name, None)
+
+        if cached is not None:
+            version, value = cached
+            if mode == NODE_READ_CONSISTENCY_SNAPSHOT or version == self._get_db_nodeversion():
+                return value
+
+        # Expired attributes are reloaded together, so the column and its version are read with a single query
+        self._ensure_model_uptodate([name, 'nodeversion'])
+        value = getattr(self._dbnode, name)
+        self._db_column_cache[name] = (self._dbnode.nodeversion, value)
+
+        return value
+
+    def _get_db_nodeversion(self):
+        """
+        Query the current nodeversion of the node in the database, without reloading the database model.
+
+        :return: the nodeversion
+        """
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+        return session.query(DbNode.nodeversion).filter(DbNode.id == self._dbnode.id).scalar()
+
+    def _clear_db_column_cache(self):
+        """
+        Clear the cache of the attributes and extras read from the database, which has to be done before modifying
+        them through the database model, since the cached values are the same objects that are modified in place.
+        """
+        self._db_column_cache.clear()
 
     def _ensure_model_uptodate(self, attribute_names=None):
         if self.is_stored:
@@ -9,13 +9,17 @@
 ###########################################################################
 from __future__ import absolute_import
 from __future__ import print_function
+from contextlib import contextmanager
+import itertools
+import json
 import sys
+import tempfile
 
 import six
 from six.moves import zip
 from six.moves.html_parser import HTMLParser
 from aiida.common import exceptions
-from aiida.common.utils import (export_shard_uuid, get_class_string,
+from aiida.common.utils import (export_shard_uuid, get_class_string, get_new_uuid,
                                 get_object_from_string, grouper)
 from aiida.orm.computer import Computer
 from aiida.orm.group import Group
@@ -24,7 +28,15 @@ from aiida.orm.user import User
 
 
 IMPORTGROUP_TYPE = 'aiida.import'
+# Number of rows fetched at a time from the database when exporting
+EXPORT_BATCH_SIZE = 1000
+# Number of entries looked up or inserted at a time when importing (below the SQLite limit of variables in a query)
+IMPORT_BATCH_SIZE = 999
 COMP_DUPL_SUFFIX = ' (Imported #{})'
+# The file of an export archive with the fingerprints of the exported nodes, used to write incremental archives
+MANIFEST_FILENAME = 'manifest.json'
+# The columns of the nodes of an incremental archive that already exist that are updated when it is imported
+UPDATED_NODE_FIELDS = ('label', 'description', 'mtime')
 
 # Giving names to the various entities. Attributes and links are not AiiDA
 # entities but we will refer to them as entities in the file (to simplify
@@ -310,31 +322,228 @@ def deserialize_field(k, v, fields_info, import_unique_ids_mappings,
             return ("{}_id".format(k), None)
 
 
+def deserialize_updated_node_fields(entry_data, fields_info):
+    """
+    Deserialize the columns of a node that may change after it is stored, to update an existing node from the entry of
+    an incremental archive
+
+    :param entry_data: the entry of the node in the export data of the archive
+    :param fields_info: the information on the fields of the nodes in the metadata of the archive
+    :return: dictionary with the deserialized values of the columns
+    """
+    return dict(deserialize_field(k, entry_data[k], fields_info=fields_info, import_unique_ids_mappings=None,
+                                  foreign_ids_reverse_mappings=None)
+                for k in UPDATED_NODE_FIELDS if k in entry_data)
+
+
+def import_node_folders(folder, uuids, workers=1, nodes_export_subfolder='nodes'):
+    """
+    Move the repository folders of the given nodes from the extracted archive to the repository
+
+    :param folder: the folder in which the archive was extracted
+    :param uuids: the UUIDs of the nodes whose folders are to be moved
+    :param workers: the number of threads moving the folders at the same time
+    :param nodes_export_subfolder: the name of the subfolder of the archive in which the node folders are stored
+    :raise ValueError: if the folder of one of the nodes is not in the archive
+    """
+    import os
+    from multiprocessing.pool import ThreadPool
+    from aiida.common.folders import RepositoryFolder
+
+    def import_node_folder(uuid):
+        subfolder = folder.get_subfolder(os.path.join(nodes_export_subfolder, export_shard_uuid(uuid)))
+        if not subfolder.exists():
+            raise ValueError("Unable to find the repository folder for node with UUID={} in the exported "
+                             "file".format(uuid))
+        destdir = RepositoryFolder(section=Node._section_name, uuid=uuid)
+        # Replace the folder, possibly destroying existing previous folders, and move the files (faster if we
+        # are on the same filesystem, and in any case the source is a SandboxFolder)
+        destdir.replace_with_folder(subfolder.abspath, move=True, overwrite=True)
+
+    if workers <= 1:
+        for uuid in uuids:
+            import_node_folder(uuid)
+        return
+
+    pool = ThreadPool(workers)
+    try:
+        # Consuming the results raises the first exception of the workers, if any
+        for _ in pool.imap_unordered(import_node_folder, uuids, chunksize=16):
+            pass
+    finally:
+        pool.terminate()
+        pool.join()
+
+
 def import_data(in_path, ignore_unknown_nodes=False,
-                silent=False):
+                silent=False, workers=1):
+    """
+    Import an export archive or folder in the database of the current backend
+
+    :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param ignore_unknown_nodes: if True, links and group memberships referring to unknown nodes are skipped
+    :param silent: if True, do not print the progress
+    :param workers: the number of threads used to move the repository folders of the imported nodes
+    """
     from aiida.backends.settings import BACKEND
     from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
 
     if BACKEND == BACKEND_SQLA:
         return import_data_sqla(in_path, ignore_unknown_nodes=ignore_unknown_nodes,
-                                silent=silent)
+                                silent=silent, workers=workers)
     elif BACKEND == BACKEND_DJANGO:
         return import_data_dj(in_path, ignore_unknown_nodes=ignore_unknown_nodes,
-                              silent=silent)
+                              silent=silent, workers=workers)
     else:
         raise Exception("Unknown settings.BACKEND: {}".format(
             BACKEND))
 
 
+def read_archive_file(in_path, filename):
+    """
+    Read a single file of an export archive, without extracting the rest of the archive
+
+    :param in_path: the path of the archive, which can be a folder, a (possibly compressed) tar file or a zip file
+    :param filename: the name of the file in the archive, e.g. 'metadata.json'
+    :return: the content of the file
+    :raise IOError: if the file is not in the archive
+    :raise ValueError: if the format of the archive cannot be detected
+    """
+    import io
+    import os
+    import tarfile
+    import zipfile
+
+    if os.path.isdir(in_path):
+        with io.open(os.path.join(in_path, filename), 'r', encoding='utf8') as handle:
+            return handle.read()
+
+    if tarfile.is_tarfile(in_path):
+        with tarfile.open(in_path, 'r:*', format=tarfile.PAX_FORMAT) as archive:
+            for name in [filename, os.path.join('.', filename)]:
+                try:
+                    return archive.extractfile(name).read().decode('utf8')
+                except KeyError:
+                    pass
+
+    elif zipfile.is_zipfile(in_path):
+        with zipfile.ZipFile(in_path, 'r') as archive:
+            try:
+                return archive.read(filename).decode('utf8')
+            except KeyError:
+                pass
+
+    else:
+        raise ValueError("Unable to detect the format of {}, it is neither a folder, nor a (possibly compressed) tar "
+                         "file, nor a zip file.".format(in_path))
+
+    raise IOError("Unable to find the file {} in the archive {}".format(filename, in_path))
+
+
+def load_export_manifest(path):
+    """
+    Load the manifest of an export, to be passed to :func:`export_tree` to write an incremental archive
+
+    The manifest of an incremental archive includes the nodes of the manifest it was based on, so the manifest of the
+    last archive of a chain is sufficient to write the next one.
+
+    :param path: the path of an export archive, or of a manifest file extracted from one
+    :return: a dictionary with the export id, the base export id, the fingerprints of the nodes by UUID and the
+        members of the groups by UUID
+    :raise IOError: if the archive has no manifest, because it was written before manifests were introduced
+    :raise ValueError: if the manifest is not valid
+    """
+    import io
+    import os
+    import tarfile
+    import zipfile
+
+    if os.path.isdir(path) or tarfile.is_tarfile(path) or zipfile.is_zipfile(path):
+        content = read_archive_file(path, MANIFEST_FILENAME)
+    else:
+        with io.open(path, 'r', encoding='utf8') as handle:
+            content = handle.read()
+
+    manifest = json.loads(content)
+    if not isinstance(manifest, dict) or not all(key in manifest for key in ['export_id', 'nodes', 'groups']):
+        raise ValueError("The manifest {} is not valid".format(path))
+
+    return manifest
+
+
+def get_export_chain(in_paths):
+    """
+    Sort export archives in the order in which they have to be imported, following their base export ids
+
+    The first archive of the chain can be either a complete archive or an incremental one, whose base is assumed to
+    have been imported already. Every other archive has to be an increment of the previous one.
+
+    :param in_paths: the paths of the archives
+    :return: the list of the paths in the order of the chain
+    :raise ValueError: if the archives do not form a single chain
+    """
+    export_ids = {}
+    base_export_ids = {}
+    for in_path in in_paths:
+        metadata = json.loads(read_archive_file(in_path, 'metadata.json'))
+        if metadata.get('export_id', None) is None:
+            raise ValueError("The archive {} has no export id and cannot be part of a chain".format(in_path))
+        export_ids[metadata['export_id']] = in_path
+        base_export_ids[in_path] = metadata.get('base_export_id', None)
+
+    increments = {}
+    roots = []
+    for in_path in in_paths:
+        base_export_id = base_export_ids[in_path]
+        if base_export_id not in export_ids:
+            roots.append(in_path)
+        elif base_export_id in increments:
+            raise ValueError("The archives {} and {} are both increments of the same archive".format(
+                increments[base_export_id], in_path))
+        else:
+            increments[base_export_id] = in_path
+
+    if len(roots) != 1:
+        raise ValueError("The archives do not form a single chain, as {} of them do not follow another "
+                         "one".format(len(roots)))
+
+    chain = roots
+    inverse_export_ids = {in_path: export_id for export_id, in_path in export_ids.items()}
+    while inverse_export_ids[chain[-1]] in increments:
+        chain.append(increments[inverse_export_ids[chain[-1]]])
+
+    if len(chain) != len(in_paths):
+        raise ValueError("The archives do not form a single chain")
+
+    return chain
+
+
+def import_data_chain(in_paths, **kwargs):
+    """
+    Import a chain of archives, made of a complete or incremental archive followed by its increments
+
+    :param in_paths: the paths of the archives, in any order
+    :param kwargs: the keyword arguments passed to :func:`import_data`
+    :return: the list of the results of :func:`import_data` for every archive, in the order of the chain
+    :raise ValueError: if the archives do not form a single chain
+    """
+    return [import_data(in_path, **kwargs) for in_path in get_export_chain(in_paths)]
+
+
 def import_data_dj(in_path, ignore_unknown_nodes=False,
-                   silent=False):
+                   silent=False, workers=1):
     """
     Import exported AiiDA environment to the AiiDA database.
     If the 'in_path' is a folder, calls export_tree; otherwise, tries to
     detect the compression format (zip, tar.gz, tar.bz2, ...) and calls the
     correct function.
 
+    The attributes, links and group memberships are read from the data.json
+    and stored in batches, such that they are never all in memory at once.
+
     :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param workers: the number of threads used to move the repository folders
+        of the imported nodes
     """
     import json
     import os
@@ -343,13 +552,14 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
     from itertools import chain
 
     from django.db import transaction
+    from django.db.models import F
     from aiida.utils import timezone
 
     from aiida.orm import Node, Group
     from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
     from aiida.common.links import LinkType
     from aiida.common.exceptions import UniquenessError
-    from aiida.common.folders import SandboxFolder, RepositoryFolder
+    from aiida.common.folders import SandboxFolder
     from aiida.backends.djsite.db import models
     from aiida.common.utils import get_class_string, get_object_from_string
     from aiida.common.datastructures import calc_states
@@ -398,8 +608,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
             with open(folder.get_abs_path('metadata.json')) as f:
                 metadata = json.load(f)
 
-            with open(folder.get_abs_path('data.json')) as f:
-                data = json.load(f)
+            data = ExportDataReader(folder.get_abs_path('data.json'))
         except IOError as e:
             raise ValueError("Unable to find the file {} in the import "
                              "file or folder".format(e.filename))
@@ -411,31 +620,35 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
             raise exceptions.IncompatibleArchiveVersionError('Archive schema version {} is incompatible with the '
                 'currently supported schema version {}'.format(metadata['export_version'], expected_export_version))
 
+        # The nodes of an incremental archive that already exist have changed
+        # since the previous export: their attributes, files and mutable
+        # columns are replaced and their nodeversion incremented
+        is_incremental = metadata.get('base_export_id', None) is not None
+
         ##########################################################################
         # CREATE UUID REVERSE TABLES AND CHECK IF I HAVE ALL NODES FOR THE LINKS #
         ##########################################################################
+        export_data = data.get('export_data')
+
         linked_nodes = set(chain.from_iterable((l['input'], l['output'])
-                                               for l in data['links_uuid']))
-        group_nodes = set(chain.from_iterable(six.itervalues(data['groups_uuid'])))
+                                               for l in data.iter_entries('links_uuid')))
+        group_nodes = set(node_uuid for _, node_uuid in data.iter_group_members())
 
-        # I preload the nodes, I need to check each of them later, and I also
-        # store them in a reverse table
+        # I check which of the linked nodes and group members are already in
+        # the database, and keep their PKs for the nodes that are not in the
+        # archive, like the unchanged nodes of an incremental archive
         # I break up the query due to SQLite limitations..
-        relevant_db_nodes = {}
-        for group in grouper(999, linked_nodes):
-            relevant_db_nodes.update({n.uuid: n for n in
-                                      models.DbNode.objects.filter(
-                                          uuid__in=group)})
+        db_nodes_pks = {}
+        for group in grouper(IMPORT_BATCH_SIZE, linked_nodes.union(group_nodes)):
+            db_nodes_pks.update(models.DbNode.objects.filter(
+                uuid__in=group).values_list('uuid', 'pk'))
 
-        db_nodes_uuid = set(relevant_db_nodes.keys())
-        # ~ dbnode_model = get_class_string(models.DbNode)
-        # ~ print(dbnode_model)
-        import_nodes_uuid = set(v['uuid'] for v in data['export_data'][NODE_ENTITY_NAME].values())
+        import_nodes_uuid = set(v['uuid'] for v in export_data.get(NODE_ENTITY_NAME, {}).values())
 
         # the combined set of linked_nodes and group_nodes was obtained from looking at all the links
-        # the combined set of db_nodes_uuid and import_nodes_uuid was received from the staff actually referred to in export_data
-        unknown_nodes = linked_nodes.union(group_nodes) - db_nodes_uuid.union(
-            import_nodes_uuid)
+        # the combined set of db_nodes_pks and import_nodes_uuid was received from the staff actually referred to in export_data
+        unknown_nodes = linked_nodes.union(group_nodes) - import_nodes_uuid.union(
+            db_nodes_pks)
 
         if unknown_nodes and not ignore_unknown_nodes:
             raise ValueError(
@@ -482,7 +695,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
         # CREATE IMPORT DATA DIRECT UNIQUE_FIELD MAPPINGS #
         ###################################################
         import_unique_ids_mappings = {}
-        for model_name, import_data in data['export_data'].items():
+        for model_name, import_data in export_data.items():
             if model_name in metadata['unique_identifiers']:
                 # I have to reconvert the pk to integer
                 import_unique_ids_mappings[model_name] = {
@@ -512,28 +725,28 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                 foreign_ids_reverse_mappings[model_name] = {}
 
                 # Not necessarily all models are exported
-                if model_name in data['export_data']:
+                if model_name in export_data:
 
                     if unique_identifier is not None:
                         import_unique_ids = set(v[unique_identifier] for v in
-                                                data['export_data'][model_name].values())
+                                                export_data[model_name].values())
 
-                        relevant_db_entries = {getattr(n, unique_identifier): n
-                                               for n in Model.objects.filter(
-                            **{'{}__in'.format(unique_identifier):
-                                   import_unique_ids})}
+                        # Only the primary keys of the entries that are already
+                        # in the database are needed, looked up in batches
+                        for group in grouper(IMPORT_BATCH_SIZE, import_unique_ids):
+                            foreign_ids_reverse_mappings[model_name].update(
+                                Model.objects.filter(**{'{}__in'.format(unique_identifier): group}).values_list(
+                                    unique_identifier, 'pk'))
 
-                        foreign_ids_reverse_mappings[model_name] = {
-                            k: v.pk for k, v in relevant_db_entries.items()}
-                        for k, v in data['export_data'][model_name].items():
-                            if v[unique_identifier] in relevant_db_entries.keys():
+                        for k, v in export_data[model_name].items():
+                            if v[unique_identifier] in foreign_ids_reverse_mappings[model_name]:
                                 # Already in DB
                                 existing_entries[model_name][k] = v
                             else:
                                 # To be added
                                 new_entries[model_name][k] = v
                     else:
-                        new_entries[model_name] = data['export_data'][model_name].copy()
+                        new_entries[model_name] = export_data[model_name].copy()
 
             # I import data from the given model
             for model_name in model_order:
@@ -606,36 +819,24 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                     import_entry_ids[unique_id] = import_entry_id
 
                 # Before storing entries in the DB, I store the files (if these
-                # are nodes). Note: only for new entries!
+                # are nodes). Note: only for new entries, or for the changed
+                # entries of an incremental archive!
                 if model_name == NODE_ENTITY_NAME:
                     if not silent:
                         print("STORING NEW NODE FILES...")
-                    for o in objects_to_create:
-
-                        subfolder = folder.get_subfolder(os.path.join(
-                            nodes_export_subfolder, export_shard_uuid(o.uuid)))
-                        if not subfolder.exists():
-                            raise ValueError("Unable to find the repository "
-                                             "folder for node with UUID={} " \
-                                             "in the exported "
-                                             "file".format(o.uuid))
-                        destdir = RepositoryFolder(
-                            section=Node._section_name,
-                            uuid=o.uuid)
-                        # Replace the folder, possibly destroying existing
-                        # previous folders, and move the files (faster if we
-                        # are on the same filesystem, and
-                        # in any case the source is a SandboxFolder)
-                        destdir.replace_with_folder(subfolder.abspath,
-                                                    move=True, overwrite=True)
+                    updated_node_uuids = [v['uuid'] for v in existing_entries[model_name].values()] \
+                        if is_incremental else []
+                    import_node_folders(folder, [o.uuid for o in objects_to_create] + updated_node_uuids,
+                                        workers=workers, nodes_export_subfolder=nodes_export_subfolder)
 
                 # Store them all in once; however, the PK are not set in this way...
-                Model.objects.bulk_create(objects_to_create)
+                Model.objects.bulk_create(objects_to_create, batch_size=IMPORT_BATCH_SIZE)
 
                 # Get back the just-saved entries
-                just_saved = dict(Model.objects.filter(
-                    **{"{}__in".format(unique_identifier):
-                           import_entry_ids.keys()}).values_list(unique_identifier, 'pk'))
+                just_saved = {}
+                for group in grouper(IMPORT_BATCH_SIZE, import_entry_ids.keys()):
+                    just_saved.update(Model.objects.filter(
+                        **{"{}__in".format(unique_identifier): group}).values_list(unique_identifier, 'pk'))
 
                 imported_states = []
                 if model_name == NODE_ENTITY_NAME:
@@ -647,7 +848,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                         imported_states.append(
                             models.DbCalcState(dbnode_id=new_pk,
                                                state=calc_states.IMPORTED))
-                    models.DbCalcState.objects.bulk_create(imported_states)
+                    models.DbCalcState.objects.bulk_create(imported_states, batch_size=IMPORT_BATCH_SIZE)
 
                 # Now I have the PKs, print the info
                 # Moreover, set the foreing_ids_reverse_mappings
@@ -668,44 +869,77 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                 if model_name == NODE_ENTITY_NAME:
                     if not silent:
                         print("STORING NEW NODE ATTRIBUTES...")
-                    for unique_id, new_pk in just_saved.items():
-                        import_entry_id = import_entry_ids[unique_id]
-                        # Get attributes from import file
-                        try:
-                            attributes = data['node_attributes'][
-                                str(import_entry_id)]
-                            attributes_conversion = data[
-                                'node_attributes_conversion'][
-                                str(import_entry_id)]
-                        except KeyError:
-                            raise ValueError("Unable to find attribute info "
-                                             "for DbNode with UUID = {}".format(
-                                unique_id))
+                    # The attributes are read from the import file one node
+                    # at a time and stored in batches
+                    new_node_pks = {str(import_entry_ids[unique_id]): new_pk
+                                    for unique_id, new_pk in just_saved.items()}
+                    updated_node_pks = {str(k): foreign_ids_reverse_mappings[model_name][v['uuid']]
+                                        for k, v in existing_entries[model_name].items()} if is_incremental else {}
+                    attributes_batch = {}
+                    for import_entry_id, attributes, attributes_conversion in data.iter_node_attributes():
+                        if import_entry_id in new_node_pks:
+                            node_pk = new_node_pks.pop(import_entry_id)
+                        elif import_entry_id in updated_node_pks:
+                            node_pk = updated_node_pks[import_entry_id]
+                        else:
+                            # The node already existed
+                            continue
 
                         # Here I have to deserialize the attributes
-                        deserialized_attributes = deserialize_attributes(
+                        attributes_batch[node_pk] = deserialize_attributes(
                             attributes, attributes_conversion)
-                        models.DbAttribute.reset_values_for_node(
-                            dbnode=new_pk,
-                            attributes=deserialized_attributes,
-                            with_transaction=False)
+                        if len(attributes_batch) >= IMPORT_BATCH_SIZE:
+                            models.DbAttribute.reset_values_for_nodes(
+                                attributes_batch, with_transaction=False)
+                            attributes_batch = {}
+
+                    if attributes_batch:
+                        models.DbAttribute.reset_values_for_nodes(
+                            attributes_batch, with_transaction=False)
+
+                    # The updated nodes get the columns of the archive, and a
+                    # new nodeversion such that cached values are not reused
+                    for import_entry_id, entry_data in (existing_entries[model_name].items()
+                                                        if is_incremental else []):
+                        models.DbNode.objects.filter(pk=updated_node_pks[str(import_entry_id)]).update(
+                            nodeversion=F('nodeversion') + 1,
+                            **deserialize_updated_node_fields(entry_data, fields_info))
+
+                    if new_node_pks:
+                        import_entry_id = next(iter(new_node_pks))
+                        raise ValueError("Unable to find attribute info "
+                                         "for DbNode with UUID = {}".format(
+                            import_unique_ids_mappings[NODE_ENTITY_NAME][int(import_entry_id)]))
 
             if not silent:
                 print("STORING NODE LINKS...")
             ## TODO: check that we are not creating input links of an already
             ##       existing node...
-            import_links = data['links_uuid']
             links_to_store = []
+            number_of_new_links = 0
 
-            # Needed for fast checks of existing links
-            existing_links_raw = models.DbLink.objects.all().values_list(
-                'input', 'output', 'label', 'type')
-            existing_links_labels = {(l[0], l[1]): l[2] for l in existing_links_raw}
-            existing_input_links = {(l[1], l[2]): l[0] for l in existing_links_raw}
-
-            # ~ print(foreign_ids_reverse_mappings)
+            # The links and group memberships can refer to nodes that are
+            # already in the database without being in the archive
             dbnode_reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
-            for link in import_links:
+            referenced_node_pks = {node_uuid: pk for node_uuid, pk in db_nodes_pks.items()
+                                   if node_uuid not in dbnode_reverse_mappings}
+            dbnode_reverse_mappings.update(referenced_node_pks)
+
+            # Needed for fast checks of existing links. Only the nodes that
+            # were already in the database can have links, so only their
+            # incoming links are loaded
+            existing_links_labels = {}
+            existing_input_links = {}
+            existing_node_pks = [foreign_ids_reverse_mappings[NODE_ENTITY_NAME][v['uuid']]
+                                 for v in six.itervalues(existing_entries.get(NODE_ENTITY_NAME, {}))]
+            existing_node_pks.extend(referenced_node_pks.values())
+            for group in grouper(IMPORT_BATCH_SIZE, existing_node_pks):
+                for l in models.DbLink.objects.filter(output_id__in=group).values_list(
+                        'input', 'output', 'label', 'type'):
+                    existing_links_labels[l[0], l[1]] = l[2]
+                    existing_input_links[l[1], l[2]] = l[0]
+
+            for link in data.iter_entries('links_uuid'):
                 try:
                     in_id = dbnode_reverse_mappings[link['input']]
                     out_id = dbnode_reverse_mappings[link['output']]
@@ -760,26 +994,32 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                             ret_dict[LINK_ENTITY_NAME] = {'new': []}
                         ret_dict[LINK_ENTITY_NAME]['new'].append((in_id, out_id))
 
-            # Store new links
-            if links_to_store:
-                if not silent:
-                    print("   ({} new links...)".format(len(links_to_store)))
+                        # Store the new links in batches
+                        if len(links_to_store) >= IMPORT_BATCH_SIZE:
+                            models.DbLink.objects.bulk_create(links_to_store)
+                            number_of_new_links += len(links_to_store)
+                            links_to_store = []
 
+            # Store the remaining new links
+            if links_to_store:
                 models.DbLink.objects.bulk_create(links_to_store)
-            else:
-                if not silent:
-                    print("   (0 new links...)")
+                number_of_new_links += len(links_to_store)
+
+            if not silent:
+                print("   ({} new links...)".format(number_of_new_links))
 
             if not silent:
                 print("STORING GROUP ELEMENTS...")
-            import_groups = data['groups_uuid']
-            for groupuuid, groupnodes in import_groups.items():
-                # TODO: cache these to avoid too many queries
+            # The members of a group are contiguous in the import file, and
+            # are added to the group in batches
+            for groupuuid, groupmembers in itertools.groupby(data.iter_group_members(), key=lambda member: member[0]):
                 group = models.DbGroup.objects.get(uuid=groupuuid)
-                nodes_to_store = [dbnode_reverse_mappings[node_uuid]
-                                  for node_uuid in groupnodes]
-                if nodes_to_store:
-                    group.dbnodes.add(*nodes_to_store)
+                for members in grouper(IMPORT_BATCH_SIZE, groupmembers):
+                    nodes_to_store = [dbnode_reverse_mappings[node_uuid]
+                                      for _, node_uuid in members
+                                      if node_uuid in dbnode_reverse_mappings or not ignore_unknown_nodes]
+                    if nodes_to_store:
+                        group.dbnodes.add(*nodes_to_store)
 
             ######################################################
             # Put everything in a specific group
@@ -850,33 +1090,39 @@ def validate_uuid(given_uuid):
     return str(parsed_uuid) == given_uuid
 
 
-def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
+def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False, workers=1):
     """
     Import exported AiiDA environment to the AiiDA database.
     If the 'in_path' is a folder, calls export_tree; otherwise, tries to
     detect the compression format (zip, tar.gz, tar.bz2, ...) and calls the
     correct function.
 
+    The attributes, links and group memberships are read from the data.json
+    and stored in batches, such that they are never all in memory at once.
+
     :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param workers: the number of threads used to move the repository folders
+        of the imported nodes
     """
     import json
     import os
     import tarfile
     import zipfile
     from itertools import chain
+    from uuid import UUID
 
     from aiida.utils import timezone
 
     from aiida.orm import Node, Group
     from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
-    from aiida.common.folders import SandboxFolder, RepositoryFolder
+    from aiida.common.folders import SandboxFolder
     from aiida.common.utils import get_object_from_string
     from aiida.common.datastructures import calc_states
     from aiida.orm.querybuilder import QueryBuilder
     from aiida.common.links import LinkType
 
     # Backend specific imports
-    from aiida.backends.sqlalchemy.models.node import DbCalcState
+    from aiida.backends.sqlalchemy.models.node import DbCalcState, DbLink, DbNode
 
     # This is the export version expected by this function
     expected_export_version = '0.3'
@@ -917,8 +1163,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
             with open(folder.get_abs_path('metadata.json')) as f:
                 metadata = json.load(f)
 
-            with open(folder.get_abs_path('data.json')) as f:
-                data = json.load(f)
+            data = ExportDataReader(folder.get_abs_path('data.json'))
         except IOError as e:
             raise ValueError("Unable to find the file {} in the import "
                              "file or folder".format(e.filename))
@@ -930,37 +1175,43 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
             raise exceptions.IncompatibleArchiveVersionError('Archive schema version {} is incompatible with the '
                 'currently supported schema version {}'.format(metadata['export_version'], expected_export_version))
 
+        # The nodes of an incremental archive that already exist have changed
+        # since the previous export: their attributes, files and mutable
+        # columns are replaced and their nodeversion incremented
+        is_incremental = metadata.get('base_export_id', None) is not None
+
         ###################################################################
         #           CREATE UUID REVERSE TABLES AND CHECK IF               #
         #              I HAVE ALL NODES FOR THE LINKS                     #
         ###################################################################
+        export_data = data.get('export_data')
+
         linked_nodes = set(chain.from_iterable((l['input'], l['output'])
-                                               for l in data['links_uuid']))
-        group_nodes = set(chain.from_iterable(
-            six.itervalues(data['groups_uuid'])))
+                                               for l in data.iter_entries('links_uuid')))
+        group_nodes = set(node_uuid for _, node_uuid in data.iter_group_members())
 
         # Check that UUIDs are valid
         linked_nodes = set(x for x in linked_nodes if validate_uuid(x))
         group_nodes = set(x for x in group_nodes if validate_uuid(x))
 
-        # I preload the nodes, I need to check each of them later, and I also
-        # store them in a reverse table
-        # I break up the query due to SQLite limitations..
-        # relevant_db_nodes = {}
-        db_nodes_uuid = set()
+        # I check which of the linked nodes and group members are already in
+        # the database, in batches to keep the queries small, and keep their
+        # PKs for the nodes that are not in the archive, like the unchanged
+        # nodes of an incremental archive
+        db_nodes_pks = {}
         import_nodes_uuid = set()
-        if linked_nodes:
+        for group in grouper(IMPORT_BATCH_SIZE, linked_nodes.union(group_nodes)):
             qb = QueryBuilder()
-            qb.append(Node, filters={"uuid": {"in": linked_nodes}},
-                      project=["uuid"])
-            for res in qb.iterall():
-                db_nodes_uuid.add(res[0])
+            qb.append(Node, filters={"uuid": {"in": group}},
+                      project=["uuid", "id"])
+            for uuid, pk in qb.iterall(batch_size=IMPORT_BATCH_SIZE):
+                db_nodes_pks[str(uuid)] = pk
 
-        for v in data['export_data'][NODE_ENTITY_NAME].values():
+        for v in export_data.get(NODE_ENTITY_NAME, {}).values():
             import_nodes_uuid.add(v['uuid'])
 
-        unknown_nodes = linked_nodes.union(group_nodes) - db_nodes_uuid.union(
-            import_nodes_uuid)
+        unknown_nodes = linked_nodes.union(group_nodes) - import_nodes_uuid.union(
+            db_nodes_pks)
 
         if unknown_nodes and not ignore_unknown_nodes:
             raise ValueError(
@@ -1026,7 +1277,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
         # }
         import_unique_ids_mappings = {}
         # Export data since v0.3 contains the keys entity_name
-        for entity_name, import_data in data['export_data'].items():
+        for entity_name, import_data in export_data.items():
             # Again I need the entity_name since that's what's being stored since 0.3
             if entity_name in metadata['unique_identifiers']:
                 # I have to reconvert the pk to integer
@@ -1062,28 +1313,27 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                 foreign_ids_reverse_mappings[entity_name] = {}
 
                 # Not necessarily all models are exported
-                if entity_name in data['export_data']:
+                if entity_name in export_data:
 
                     if unique_identifier is not None:
-                        import_unique_ids = set(v[unique_identifier] for v in data['export_data'][entity_name].values())
+                        import_unique_ids = set(v[unique_identifier] for v in export_data[entity_name].values())
 
-                        relevant_db_entries = dict()
-                        if len(import_unique_ids) > 0:
+                        # Only the primary keys of the entries that are already
+                        # in the database are needed, looked up in batches
+                        relevant_db_entries = foreign_ids_reverse_mappings[entity_name]
+                        for group in grouper(IMPORT_BATCH_SIZE, import_unique_ids):
                             qb = QueryBuilder()
                             qb.append(entity, filters={
-                                unique_identifier: {"in": import_unique_ids}},
-                                      project=["*"], tag="res")
-                            relevant_db_entries = {
-                                getattr(v[0], unique_identifier):
-                                    v[0] for v in qb.all()}
-
-                            foreign_ids_reverse_mappings[entity_name] = {
-                                k: v.pk for k, v in
-                                relevant_db_entries.items()}
+                                unique_identifier: {"in": group}},
+                                      project=[unique_identifier, "id"], tag="res")
+                            for unique_id, pk in qb.iterall(batch_size=IMPORT_BATCH_SIZE):
+                                if isinstance(unique_id, UUID):
+                                    unique_id = str(unique_id)
+                                relevant_db_entries[unique_id] = pk
 
                         dupl_counter = 0
                         imported_comp_names = set()
-                        for k, v in data['export_data'][entity_name].items():
+                        for k, v in export_data[entity_name].items():
                             if entity_name == COMPUTER_ENTITY_NAME:
                                 # The following is done for compatibility
                                 # reasons in case the export file was generated
@@ -1127,7 +1377,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
                                 imported_comp_names.add(v["name"])
 
-                            if v[unique_identifier] in (relevant_db_entries.keys()):
+                            if v[unique_identifier] in relevant_db_entries:
                                 # Already in DB
                                 # again, switched to entity_name in v0.3
                                 existing_entries[entity_name][k] = v
@@ -1136,7 +1386,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                                 new_entries[entity_name][k] = v
                     else:
                         # Why the copy:
-                        new_entries[entity_name] = data['export_data'][entity_name].copy()
+                        new_entries[entity_name] = export_data[entity_name].copy()
 
             # I import data from the given model
             for entity_sig in entity_sig_order:
@@ -1193,56 +1443,16 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                     import_entry_ids[unique_id] = import_entry_id
 
                 # Before storing entries in the DB, I store the files (if these
-                # are nodes). Note: only for new entries!
+                # are nodes). Note: only for new entries, or for the changed
+                # entries of an incremental archive!
                 if entity_sig == entity_names_to_signatures[NODE_ENTITY_NAME]:
 
                     if not silent:
-                        print("STORING NEW NODE FILES & ATTRIBUTES...")
-                    for o in objects_to_create:
-
-                        # Creating the needed files
-                        subfolder = folder.get_subfolder(os.path.join(
-                            nodes_export_subfolder, export_shard_uuid(o.uuid)))
-                        if not subfolder.exists():
-                            raise ValueError("Unable to find the repository "
-                                             "folder for node with UUID={} "
-                                             "in the exported file"
-                                             .format(o.uuid))
-                        destdir = RepositoryFolder(
-                            section=Node._section_name,
-                            uuid=o.uuid)
-                        # Replace the folder, possibly destroying existing
-                        # previous folders, and move the files (faster if we
-                        # are on the same filesystem, and
-                        # in any case the source is a SandboxFolder)
-                        destdir.replace_with_folder(subfolder.abspath,
-                                                    move=True, overwrite=True)
-
-                        # For DbNodes, we also have to store Attributes!
-                        import_entry_id = import_entry_ids[str(o.uuid)]
-                        # Get attributes from import file
-                        try:
-                            attributes = data['node_attributes'][
-                                str(import_entry_id)]
-
-                            attributes_conversion = data[
-                                'node_attributes_conversion'][
-                                str(import_entry_id)]
-                        except KeyError:
-                            raise ValueError(
-                                "Unable to find attribute info "
-                                "for DbNode with UUID = {}".format(
-                                    unique_id))
-
-                        # Here I have to deserialize the attributes
-                        deserialized_attributes = deserialize_attributes(
-                            attributes, attributes_conversion)
-
-                        if deserialized_attributes:
-                            from sqlalchemy.dialects.postgresql import JSONB
-                            o.attributes = dict()
-                            for k, v in deserialized_attributes.items():
-                                o.attributes[k] = v
+                        print("STORING NEW NODE FILES...")
+                    updated_node_uuids = [v['uuid'] for v in existing_entries[entity_name].values()] \
+                        if is_incremental else []
+                    import_node_folders(folder, [str(o.uuid) for o in objects_to_create] + updated_node_uuids,
+                                        workers=workers, nodes_export_subfolder=nodes_export_subfolder)
 
                 # Store them all in once; However, the PK
                 # are not set in this way...
@@ -1251,14 +1461,70 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
                 session.flush()
 
-                if import_entry_ids.keys():
+                just_saved = dict()
+                for group in grouper(IMPORT_BATCH_SIZE, import_entry_ids.keys()):
                     qb = QueryBuilder()
                     qb.append(entity, filters={
-                        unique_identifier: {"in": list(import_entry_ids.keys())}},
+                        unique_identifier: {"in": group}},
                               project=[unique_identifier, "id"], tag="res")
-                    just_saved = {v[0]: v[1] for v in qb.all()}
-                else:
-                    just_saved = dict()
+                    just_saved.update(qb.iterall(batch_size=IMPORT_BATCH_SIZE))
+
+                # For DbNodes, we also have to store Attributes! They are read
+                # from the import file one node at a time and written with bulk
+                # updates
+                if entity_sig == entity_names_to_signatures[NODE_ENTITY_NAME]:
+                    if not silent:
+                        print("STORING NEW NODE ATTRIBUTES...")
+                    new_node_pks = {str(import_entry_ids[str(unique_id)]): new_pk
+                                    for unique_id, new_pk in just_saved.items()}
+                    updated_node_pks = {str(k): foreign_ids_reverse_mappings[entity_name][v['uuid']]
+                                        for k, v in existing_entries[entity_name].items()} if is_incremental else {}
+                    # The updated nodes also get the columns of the archive,
+                    # and a new nodeversion such that cached values are not
+                    # reused
+                    updated_node_versions = {}
+                    for group in grouper(IMPORT_BATCH_SIZE, updated_node_pks.values()):
+                        updated_node_versions.update(
+                            session.query(DbNode.id, DbNode.nodeversion).filter(DbNode.id.in_(group)))
+                    attributes_batch = []
+                    for import_entry_id, attributes, attributes_conversion in data.iter_node_attributes():
+                        if import_entry_id in new_node_pks:
+                            node_pk = new_node_pks.pop(import_entry_id)
+                        elif import_entry_id in updated_node_pks:
+                            node_pk = updated_node_pks[import_entry_id]
+                        else:
+                            # The node already existed
+                            continue
+
+                        # Here I have to deserialize the attributes
+                        deserialized_attributes = deserialize_attributes(
+                            attributes, attributes_conversion)
+                        if import_entry_id in updated_node_pks:
+                            mapping = deserialize_updated_node_fields(
+                                existing_entries[entity_name][import_entry_id], fields_info)
+                            mapping.update({'id': node_pk, 'attributes': deserialized_attributes,
+                                            'nodeversion': updated_node_versions[node_pk] + 1})
+                            attributes_batch.append(mapping)
+                        elif deserialized_attributes:
+                            attributes_batch.append({'id': node_pk, 'attributes': deserialized_attributes})
+                        if len(attributes_batch) >= IMPORT_BATCH_SIZE:
+                            session.bulk_update_mappings(DbNode, attributes_batch)
+                            attributes_batch = []
+
+                    if attributes_batch:
+                        session.bulk_update_mappings(DbNode, attributes_batch)
+
+                    if new_node_pks:
+                        import_entry_id = next(iter(new_node_pks))
+                        raise ValueError(
+                            "Unable to find attribute info "
+                            "for DbNode with UUID = {}".format(
+                                import_unique_ids_mappings[NODE_ENTITY_NAME][int(import_entry_id)]))
+
+                    # The bulk updates bypass the session, so the attributes of
+                    # the new nodes have to be reloaded when accessed
+                    for o in objects_to_create:
+                        session.expire(o, ['attributes'])
 
                 imported_states = []
                 if entity_sig == entity_names_to_signatures[NODE_ENTITY_NAME]:
@@ -1298,20 +1564,31 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                 print("STORING NODE LINKS...")
             ## TODO: check that we are not creating input links of an already
             ##       existing node...
-            import_links = data['links_uuid']
             links_to_store = []
+            number_of_new_links = 0
 
-            # Needed for fast checks of existing links
-            from aiida.backends.sqlalchemy.models.node import DbLink
-            existing_links_raw = session.query(
-                DbLink.input_id, DbLink.output_id,DbLink.label).all()
-            existing_links_labels = {(l[0], l[1]): l[2]
-                                     for l in existing_links_raw}
-            existing_input_links = {(l[1], l[2]): l[0]
-                                    for l in existing_links_raw}
-
+            # The links and group memberships can refer to nodes that are
+            # already in the database without being in the archive
             dbnode_reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
-            for link in import_links:
+            referenced_node_pks = {node_uuid: pk for node_uuid, pk in db_nodes_pks.items()
+                                   if node_uuid not in dbnode_reverse_mappings}
+            dbnode_reverse_mappings.update(referenced_node_pks)
+
+            # Needed for fast checks of existing links. Only the nodes that
+            # were already in the database can have links, so only their
+            # incoming links are loaded
+            existing_links_labels = {}
+            existing_input_links = {}
+            existing_node_pks = [foreign_ids_reverse_mappings[NODE_ENTITY_NAME][v['uuid']]
+                                 for v in six.itervalues(existing_entries.get(NODE_ENTITY_NAME, {}))]
+            existing_node_pks.extend(referenced_node_pks.values())
+            for group in grouper(IMPORT_BATCH_SIZE, existing_node_pks):
+                for l in session.query(DbLink.input_id, DbLink.output_id, DbLink.label).filter(
+                        DbLink.output_id.in_(group)):
+                    existing_links_labels[l[0], l[1]] = l[2]
+                    existing_input_links[l[1], l[2]] = l[0]
+
+            for link in data.iter_entries('links_uuid'):
                 try:
                     in_id = dbnode_reverse_mappings[link['input']]
                     out_id = dbnode_reverse_mappings[link['output']]
@@ -1360,36 +1637,43 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                                             link['input'], existing_input))
                     except KeyError:
                         # New link
-                        links_to_store.append(DbLink(
+                        links_to_store.append(dict(
                             input_id=in_id, output_id=out_id,
                             label=link['label'], type=LinkType(link['type']).value))
                         if LINK_ENTITY_NAME not in ret_dict:
                             ret_dict[LINK_ENTITY_NAME] = {'new': []}
                         ret_dict[LINK_ENTITY_NAME]['new'].append((in_id, out_id))
 
-            # Store new links
+                        # Store the new links in batches
+                        if len(links_to_store) >= IMPORT_BATCH_SIZE:
+                            session.bulk_insert_mappings(DbLink, links_to_store)
+                            number_of_new_links += len(links_to_store)
+                            links_to_store = []
+
+            # Store the remaining new links
             if links_to_store:
-                if not silent:
-                    print("   ({} new links...)".format(len(links_to_store)))
-                session.add_all(links_to_store)
-            else:
-                if not silent:
-                    print("   (0 new links...)")
+                session.bulk_insert_mappings(DbLink, links_to_store)
+                number_of_new_links += len(links_to_store)
+
+            if not silent:
+                print("   ({} new links...)".format(number_of_new_links))
 
             if not silent:
                 print("STORING GROUP ELEMENTS...")
-            import_groups = data['groups_uuid']
-            for groupuuid, groupnodes in import_groups.items():
-                # # TODO: cache these to avoid too many queries
+            # The members of a group are contiguous in the import file, and
+            # are added to the group in batches
+            for groupuuid, groupmembers in itertools.groupby(data.iter_group_members(), key=lambda member: member[0]):
                 qb_group = QueryBuilder().append(
                     Group, filters={'uuid': {'==': groupuuid}})
                 group = qb_group.first()[0]
-                nodes_ids_to_add = [dbnode_reverse_mappings[node_uuid]
-                                    for node_uuid in groupnodes]
-                qb_nodes = QueryBuilder().append(
-                    Node, filters={'id': {'in': nodes_ids_to_add}})
-                nodes_to_add = [n[0] for n in qb_nodes.all()]
-                group.add_nodes(nodes_to_add)
+                for members in grouper(IMPORT_BATCH_SIZE, groupmembers):
+                    nodes_ids_to_add = [dbnode_reverse_mappings[node_uuid]
+                                        for _, node_uuid in members
+                                        if node_uuid in dbnode_reverse_mappings or not ignore_unknown_nodes]
+                    qb_nodes = QueryBuilder().append(
+                        Node, filters={'id': {'in': nodes_ids_to_add}})
+                    nodes_to_add = [n[0] for n in qb_nodes.all()]
+                    group.add_nodes(nodes_to_add)
 
             ######################################################
             # Put everything in a specific group
@@ -1428,7 +1712,6 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
                 # Add all the nodes to the new group
                 # TODO: decide if we want to return the group name
-                from aiida.backends.sqlalchemy.models.node import DbNode
                 group.add_nodes(session.query(DbNode).filter(
                     DbNode.id.in_(pks_for_group)).distinct().all())
 
@@ -1681,7 +1964,7 @@ def fill_in_query(partial_query, originating_entity_str, current_entity_str,
 
 def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
                 silent=False, input_forward=False, create_reversed=True,
-                return_reversed=False, call_reversed=False, **kwargs):
+                return_reversed=False, call_reversed=False, previous_manifest=None, **kwargs):
     """
     Export the entries passed in the 'what' list to a file tree.
     :todo: limit the export to finished or failed calculations.
@@ -1705,6 +1988,10 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
     then calls function for licenses of Data nodes expecting True if
     license is allowed, False otherwise.
     :param silent: suppress debug prints
+    :param previous_manifest: the manifest of a previous export, as returned
+    by :func:`load_export_manifest`. If given, an incremental archive is
+    written, with only the nodes that are new or changed since that export,
+    and only the group memberships that are new.
     :raises LicensingException: if any node is licensed under forbidden
     license
     """
@@ -1938,6 +2225,32 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
             given_calculation_entry_ids.update(res - to_be_exported)
 
 
+    # The manifest records a fingerprint of every node of the exported set,
+    # such that a later export can be restricted to the nodes that changed.
+    # The manifest of an incremental archive includes the nodes of the
+    # previous manifest, so that it can be the base of the next increment.
+    previous_nodes = previous_manifest['nodes'] if previous_manifest is not None else {}
+    previous_groups = previous_manifest['groups'] if previous_manifest is not None else {}
+    manifest_nodes = dict(previous_nodes)
+    manifest_groups = {group_uuid: set(members) for group_uuid, members in previous_groups.items()}
+
+    changed_nodes = set()
+    for group in grouper(EXPORT_BATCH_SIZE, to_be_exported):
+        fingerprint_qb = QueryBuilder()
+        fingerprint_qb.append(Node, filters={'id': {'in': group}},
+                              project=['id', 'uuid', 'nodeversion', 'mtime'])
+        for pk, uuid, nodeversion, mtime in fingerprint_qb.iterall(batch_size=EXPORT_BATCH_SIZE):
+            fingerprint = get_node_fingerprint(nodeversion, mtime)
+            if previous_nodes.get(str(uuid)) != fingerprint:
+                changed_nodes.add(pk)
+            manifest_nodes[str(uuid)] = fingerprint
+
+    if previous_manifest is not None:
+        if not silent:
+            print("{} of the {} nodes are new or changed since the previous export"
+                  .format(len(changed_nodes), len(to_be_exported)))
+        to_be_exported = changed_nodes
+
     # Here we get all the columns that we plan to project per entity that we
     # would like to extract
     given_entities = list()
@@ -1994,7 +2307,11 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
     if not silent:
         print("STORING DATABASE ENTRIES...")
 
-    export_data = dict()
+    # The entries of every entity are written to a temporary file, one entry per line, as they are retrieved, such
+    # that they do not have to be kept in memory. Only the pks are kept, to skip entries that are returned more than
+    # once, for example the user of many nodes.
+    entity_files = dict()
+    entity_pks = dict()
     entity_separator = '_'
     for entity_name, partial_query in entries_to_add.items():
 
@@ -2008,7 +2325,7 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
             fill_in_query(partial_query, entity_name, ref_model_name,
                           [entity_name], entity_separator)
 
-        for temp_d in partial_query.iterdict():
+        for temp_d in partial_query.iterdict(batch_size=EXPORT_BATCH_SIZE):
             for k in temp_d.keys():
                 # Get current entity
                 current_entity = k.split(entity_separator)[-1]
@@ -2018,348 +2335,206 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
                 if temp_d[k]["id"] is None:
                     continue
 
-                temp_d2 = {
-                    temp_d[k]["id"]:
-                        serialize_dict(temp_d[k],
-                                       remove_fields=['id'],
-                                       rename_fields=
-                                       model_fields_to_file_fields[current_entity])}
-                try:
-                    export_data[current_entity].update(temp_d2)
-                except KeyError:
-                    export_data[current_entity] = temp_d2
+                pks = entity_pks.setdefault(current_entity, set())
+                if temp_d[k]["id"] in pks:
+                    continue
+                pks.add(temp_d[k]["id"])
+
+                if current_entity not in entity_files:
+                    entity_files[current_entity] = tempfile.TemporaryFile(mode='w+')
+
+                entry = serialize_dict(temp_d[k], remove_fields=['id'],
+                                       rename_fields=model_fields_to_file_fields[current_entity])
+                entity_files[current_entity].write(
+                    _json_entry_line(entry, key=temp_d[k]["id"]))
 
     ######################################
     # Manually manage links and attributes
     ######################################
     # I use .get because there may be no nodes to export
-    all_nodes_pk = list()
-    if NODE_ENTITY_NAME in export_data:
-        all_nodes_pk.extend(export_data.get(NODE_ENTITY_NAME).keys())
+    all_nodes_pk = list(entity_pks.get(NODE_ENTITY_NAME, []))
 
-    if sum(len(model_data) for model_data in export_data.values()) == 0:
+    total_entries = sum(len(pks) for pks in entity_pks.values())
+    # An incremental archive is written even if nothing changed, to keep the
+    # chain of archives unbroken
+    if total_entries == 0 and previous_manifest is None:
         if not silent:
             print("No nodes to store, exiting...")
-        return
+        return 0
 
     if not silent:
         print("Exporting a total of {} db entries, of which {} nodes."
-              .format(sum(len(model_data) for model_data in export_data.values()),
-                      len(all_nodes_pk)))
+              .format(total_entries, len(all_nodes_pk)))
 
-    ## ATTRIBUTES
     if not silent:
-        print("STORING NODE ATTRIBUTES...")
-    node_attributes = {}
-    node_attributes_conversion = {}
+        print("STORING DATA...")
 
-    # A second QueryBuilder query to get the attributes. See if this can be
-    # optimized
-    if len(all_nodes_pk) > 0:
-        all_nodes_query = QueryBuilder()
-        all_nodes_query.append(Node, filters={"id": {"in": all_nodes_pk}},
-                               project=["*"])
-        for res in all_nodes_query.iterall():
-            n = res[0]
-            (node_attributes[str(n.pk)],
-             node_attributes_conversion[str(n.pk)]) = serialize_dict(
-                n.get_attrs(), track_conversion=True)
+    # The data.json is written in a line-delimited layout: every entry of the entities, of the attributes, of the
+    # links and of the group memberships is on a line of its own. The file is still a valid JSON document, but it can
+    # also be read one entry at a time.
+    with folder.open('data.json', 'w') as handle:
+
+        handle.write('{\n')
+        handle.write('"export_data": {\n')
+        for index, entity_name in enumerate(sorted(entity_files.keys())):
+            handle.write('{}: {{\n'.format(json.dumps(entity_name)))
+            entity_files[entity_name].seek(0)
+            _write_json_entries(handle, entity_files[entity_name])
+            entity_files[entity_name].close()
+            handle.write('},\n' if index < len(entity_files) - 1 else '}\n')
+        handle.write('},\n')
+
+        ## ATTRIBUTES
+        if not silent:
+            print("STORING NODE ATTRIBUTES...")
 
-    if not silent:
-        print("STORING NODE LINKS...")
+        handle.write('"node_attributes": {\n')
+        with tempfile.TemporaryFile(mode='w+') as conversions_file:
+            if all_nodes_pk:
+                all_nodes_query = QueryBuilder()
+                all_nodes_query.append(Node, filters={"id": {"in": all_nodes_pk}},
+                                       project=["*"])
 
-    links_uuid_dict = dict()
-    if len(all_nodes_pk) > 0:
-        # INPUT (Data, Calculation) - Forward, by the Calculation node
+                def iter_attributes():
+                    for n, in all_nodes_query.iterall(batch_size=EXPORT_BATCH_SIZE):
+                        attributes, conversion = serialize_dict(n.get_attrs(), track_conversion=True)
+                        conversions_file.write(_json_entry_line(conversion, key=n.pk))
+                        yield _json_entry_line(attributes, key=n.pk)
+
+                _write_json_entries(handle, iter_attributes())
+            handle.write('},\n')
+
+            handle.write('"node_attributes_conversion": {\n')
+            conversions_file.seek(0)
+            _write_json_entries(handle, conversions_file)
+            handle.write('},\n')
+
+        if not silent:
+            print("STORING NODE LINKS...")
+
+        # Every link query is given as: the class of the input node, the class of the output node, the link type and
+        # whether the exported nodes are the inputs or the outputs of the links. The Code class is listed separately
+        # until Code becomes a subclass of Data.
+        link_queries = []
         if input_forward:
-            # INPUT (Data, Calculation)
-            links_qb = QueryBuilder()
-            links_qb.append(Data,
-                            project=['uuid'], tag='input',
-                            filters = {'id': {'in': all_nodes_pk}})
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type':{'==':LinkType.INPUT.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-            # INPUT (Code, Calculation)
-            # The same as above until Code becomes a subclass of Data
-            links_qb = QueryBuilder()
-            links_qb.append(Code,
-                            project=['uuid'], tag='input',
-                            filters = {'id': {'in': all_nodes_pk}})
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type':{'==':LinkType.INPUT.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-        # INPUT (Data, Calculation) - Backward, by the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Data,
-                        project=['uuid'], tag='input')
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='output',
-                        filters={'id': {'in': all_nodes_pk}},
-                        edge_filters={'type':{'==':LinkType.INPUT.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-        # INPUT (Data, Calculation) - Backward, by the Calculation node
-        # The same as above until Code becomes a subclass of Data
-        links_qb = QueryBuilder()
-        links_qb.append(Code,
-                        project=['uuid'], tag='input')
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='output',
-                        filters={'id': {'in': all_nodes_pk}},
-                        edge_filters={
-                            'type': {'==': LinkType.INPUT.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type': str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-        # CREATE (Calculation, Data) - Forward, by the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Data,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.CREATE.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-        # CREATE (Calculation, Code) - Forward, by the Calculation node
-        # The same as above until Code becomes a subclass of Data
-        # This case will not happen (with the current setup - a code is not
-        # created by a calculation) but it is addded for completeness
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Code,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.CREATE.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type': str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-
-        # CREATE (Calculation, Data) - Backward, by the Data node
-        if create_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input',
-                            filters={'id': {'in': all_nodes_pk}})
-            links_qb.append(Data,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type': {'==': LinkType.CREATE.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-        # CREATE (Calculation, Code) - Backward, by the Code node
-        # The same as above until Code becomes a subclass of Data
-        # This case will not happen (with the current setup - a code is not
-        # created by a calculation) but it is addded for completeness
+            link_queries.append((Data, Calculation, LinkType.INPUT, 'input'))
+            link_queries.append((Code, Calculation, LinkType.INPUT, 'input'))
+        link_queries.append((Data, Calculation, LinkType.INPUT, 'output'))
+        link_queries.append((Code, Calculation, LinkType.INPUT, 'output'))
+        link_queries.append((Calculation, Data, LinkType.CREATE, 'input'))
+        link_queries.append((Calculation, Code, LinkType.CREATE, 'input'))
         if create_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input',
-                            filters={'id': {'in': all_nodes_pk}})
-            links_qb.append(Data,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type': {'==': LinkType.CREATE.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-        # RETURN (Calculation, Data) - Forward, by the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Data,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.RETURN.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-        # RETURN (Calculation, Data) - Backward, by the Data node
+            link_queries.append((Calculation, Data, LinkType.CREATE, 'output'))
+            link_queries.append((Calculation, Code, LinkType.CREATE, 'output'))
+        link_queries.append((Calculation, Data, LinkType.RETURN, 'input'))
         if return_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input')
-            links_qb.append(Data,
-                            project=['uuid'], tag='output',
-                            filters={'id': {'in': all_nodes_pk}},
-                            edge_filters={'type': {'==': LinkType.RETURN.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-        # CALL (Calculation [caller], Calculation [called]) - Forward, by
-        # the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.CALL.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-        # CALL (Calculation [caller], Calculation [called]) - Backward,
-        # by the Calculation [called] node
+            link_queries.append((Calculation, Data, LinkType.RETURN, 'output'))
+        link_queries.append((Calculation, Calculation, LinkType.CALL, 'input'))
         if call_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input')
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='output',
-                            filters={'id': {'in': all_nodes_pk}},
-                            edge_filters={'type': {'==': LinkType.CALL.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-    links_uuid = list(links_uuid_dict.values())
+            link_queries.append((Calculation, Calculation, LinkType.CALL, 'output'))
+
+        def iter_links():
+            # The same link can be returned by more than one query, so the ids of the written links are kept
+            written_link_ids = set()
+            for input_cls, output_cls, link_type, exported_side in link_queries:
+                node_filters = {'id': {'in': all_nodes_pk}}
+                links_qb = QueryBuilder()
+                links_qb.append(input_cls, project=['uuid'], tag='input',
+                                filters=node_filters if exported_side == 'input' else {})
+                links_qb.append(output_cls, project=['uuid'], tag='output',
+                                filters=node_filters if exported_side == 'output' else {},
+                                edge_filters={'type': {'==': link_type.value}},
+                                edge_project=['id', 'label', 'type'], output_of='input')
+                for input_uuid, output_uuid, link_id, link_label, link_type_value in links_qb.iterall(
+                        batch_size=EXPORT_BATCH_SIZE):
+                    if link_id in written_link_ids:
+                        continue
+                    written_link_ids.add(link_id)
+                    yield _json_entry_line({
+                        'input': str(input_uuid),
+                        'output': str(output_uuid),
+                        'label': str(link_label),
+                        'type': str(link_type_value)
+                    })
+
+        handle.write('"links_uuid": [\n')
+        if all_nodes_pk:
+            _write_json_entries(handle, iter_links())
+        handle.write('],\n')
 
-    if not silent:
-        print("STORING GROUP ELEMENTS...")
-    groups_uuid = dict()
-    # If a group is in the exported date, we export the group/node correlation
-    if GROUP_ENTITY_NAME in export_data:
-        for curr_group in export_data[GROUP_ENTITY_NAME]:
+        if not silent:
+            print("STORING GROUP ELEMENTS...")
+
+        # If a group is in the exported date, we export the group/node correlation. Groups without nodes are not
+        # listed, and the members of a group are written one per line.
+        def iter_new_members(results):
+            # In an incremental archive only the members that are not in the manifest yet are written
+            for group_uuid, member_uuid in results:
+                manifest_members = manifest_groups.setdefault(str(group_uuid), set())
+                if str(member_uuid) not in manifest_members:
+                    manifest_members.add(str(member_uuid))
+                    yield group_uuid, member_uuid
+
+        handle.write('"groups_uuid": {\n')
+        first_group = True
+        for curr_group in sorted(entity_pks.get(GROUP_ENTITY_NAME, [])):
             group_uuid_qb = QueryBuilder()
             group_uuid_qb.append(entity_names_to_entities[GROUP_ENTITY_NAME],
                                  filters={'id': {'==': curr_group}},
                                  project=['uuid'], tag='group')
             group_uuid_qb.append(entity_names_to_entities[NODE_ENTITY_NAME],
                                  project=['uuid'], member_of='group')
-            for res in group_uuid_qb.iterall():
-                if str(res[0]) in groups_uuid:
-                    groups_uuid[str(res[0])].append(str(res[1]))
-                else:
-                    groups_uuid[str(res[0])] = [str(res[1])]
-
-    ######################################
-    # Now I store
-    ######################################
-    # subfolder inside the export package
-    nodesubfolder = folder.get_subfolder('nodes', create=True,
-                                         reset_limit=True)
-
-    # Add the proper signatures to the exported data
-    for entity_name in export_data.keys():
-        export_data[entity_name] = (
-            export_data.pop(entity_name))
-
-    if not silent:
-        print("STORING DATA...")
-
-    with folder.open('data.json', 'w') as f:
-        json.dump({
-            'node_attributes': node_attributes,
-            'node_attributes_conversion': node_attributes_conversion,
-            'export_data': export_data,
-            'links_uuid': links_uuid,
-            'groups_uuid': groups_uuid,
-        }, f)
+            members = iter_new_members(group_uuid_qb.iterall(batch_size=EXPORT_BATCH_SIZE))
+            try:
+                group_uuid, first_member = next(members)
+            except StopIteration:
+                continue
+            if not first_group:
+                handle.write(',\n')
+            first_group = False
+            handle.write('{}: [\n'.format(json.dumps(str(group_uuid))))
+            _write_json_entries(handle, itertools.chain(
+                [_json_entry_line(str(first_member))],
+                (_json_entry_line(str(member)) for _, member in members)))
+            handle.write(']')
+        handle.write('\n}\n' if not first_group else '}\n')
+        handle.write('}\n')
 
     # Add proper signature to unique identifiers & all_fields_info
     # Ignore if a key doesn't exist in any of the two dictionaries
 
+    export_id = get_new_uuid()
+    base_export_id = previous_manifest['export_id'] if previous_manifest is not None else None
+
     metadata = {
         'aiida_version': aiida.get_version(),
         'export_version': EXPORT_VERSION,
         'all_fields_info': all_fields_info,
         'unique_identifiers': unique_identifiers,
+        'export_id': export_id,
+        'base_export_id': base_export_id,
     }
 
     with folder.open('metadata.json', 'w') as f:
         json.dump(metadata, f)
 
+    manifest = {
+        'export_id': export_id,
+        'base_export_id': base_export_id,
+        'nodes': manifest_nodes,
+        'groups': {group_uuid: sorted(members) for group_uuid, members in manifest_groups.items()},
+    }
+
+    with folder.open(MANIFEST_FILENAME, 'w') as f:
+        json.dump(manifest, f)
+
     if silent is not True:
         print("STORING FILES...")
 
+    # subfolder inside the export package
+    nodesubfolder = folder.get_subfolder('nodes', create=True,
+                                         reset_limit=True)
+
     # If there are no nodes, there are no files to store
     if len(all_nodes_pk) > 0:
         # Large speed increase by not getting the node itself and looping in memory
@@ -2367,7 +2542,7 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
         uuid_query = QueryBuilder()
         uuid_query.append(Node, filters={"id": {"in": all_nodes_pk}},
                           project=["uuid"])
-        for res in uuid_query.all():
+        for res in uuid_query.iterall(batch_size=EXPORT_BATCH_SIZE):
             uuid = str(res[0])
             sharded_uuid = export_shard_uuid(uuid)
 
@@ -2382,6 +2557,220 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
                 section=Node._section_name, uuid=uuid).abspath,
                                        dest_name='.')
 
+    return len(all_nodes_pk)
+
+
+def get_node_fingerprint(nodeversion, mtime):
+    """
+    Return the fingerprint of a node recorded in the manifest of an export, which changes whenever the node changes
+
+    :param nodeversion: the version of the node, incremented at every change of the attributes or extras
+    :param mtime: the modification time of the node
+    :return: the fingerprint as a string
+    """
+    return '{}:{}'.format(nodeversion, mtime.isoformat() if mtime is not None else None)
+
+
+def _json_entry_line(value, key=None):
+    """
+    Serialize an entry of a JSON object or list of the line-delimited layout of the data.json of an export archive
+
+    :param value: the JSON serializable value of the entry
+    :param key: the key of the entry, if it is an entry of an object
+    :return: the serialized entry, terminated by a newline
+    """
+    if key is None:
+        return '{}\n'.format(json.dumps(value))
+    return '{}: {}\n'.format(json.dumps(six.text_type(key)), json.dumps(value))
+
+
+def _write_json_entries(handle, lines):
+    """
+    Write the serialized entries of a JSON object or list, separating them with commas at the end of the lines
+
+    :param handle: the file handle to write to
+    :param lines: an iterable of entries as returned by :func:`_json_entry_line`
+    """
+    first = True
+    for line in lines:
+        if not first:
+            handle.write(',\n')
+        handle.write(line.rstrip('\n'))
+        first = False
+    if not first:
+        handle.write('\n')
+
+
+class ExportDataReader(object):
+    """
+    Reader of the data.json of an export archive, that iterates over the entries of its sections.
+
+    If the file has the line-delimited layout written by :func:`export_tree`, with every entry on a line of its own,
+    the entries are parsed one at a time while the file is read, such that the file never has to be loaded in memory
+    as a whole. Otherwise, as for the archives written by older versions, the file is loaded completely.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: the absolute path of the data.json file
+        :raise IOError: if the file cannot be opened
+        """
+        self._path = path
+        self._data = None
+
+        with open(path) as handle:
+            first_line = handle.readline()
+
+        if first_line.strip() != '{':
+            with open(path) as handle:
+                self._data = json.load(handle)
+
+    @property
+    def is_line_delimited(self):
+        """Return whether the file has the line-delimited layout and is read one entry at a time."""
+        return self._data is None
+
+    def _iter_lines(self, prefix):
+        """
+        Iterate over the entries contained, at any depth, in the section with the given path of the line-delimited file
+
+        :param prefix: a tuple with the keys of the section, e.g. ('export_data', 'Node')
+        :return: an iterator over tuples (path, key, value), where path is the tuple of the keys of the containers
+            of the entry relative to the section, and key is None for the entries of a list
+        """
+        path = []
+        kinds = []
+        inside = False
+
+        with open(self._path) as handle:
+            for line in handle:
+                line = line.strip()
+                if line.endswith(','):
+                    line = line[:-1]
+                if not line:
+                    continue
+
+                # Entries are always complete JSON values, so only the lines of the containers open or close them
+                if line in ('}', ']'):
+                    if inside and len(path) == len(prefix) + 1:
+                        return
+                    path.pop()
+                    kinds.pop()
+                    continue
+                if line in ('{', '['):
+                    path.append(None)
+                    kinds.append(line)
+                    continue
+                if line[-1] in ('{', '['):
+                    path.append(json.loads(line[:-1].rstrip()[:-1]))
+                    kinds.append(line[-1])
+                    inside = tuple(path[1:len(prefix) + 1]) == prefix
+                    continue
+
+                if not inside:
+                    continue
+
+                relative_path = tuple(path[len(prefix) + 1:])
+                if kinds[-1] == '{':
+                    (key, value), = json.loads('{' + line + '}').items()
+                    yield relative_path, key, value
+                else:
+                    yield relative_path, None, json.loads(line)
+
+    def get(self, section):
+        """
+        Return the complete content of a top level section
+
+        :param section: the name of the section, e.g. 'export_data'
+        :return: the content of the section
+        """
+        if self._data is not None:
+            return self._data[section]
+
+        content = None
+        for relative_path, key, value in self._iter_lines((section,)):
+            if content is None:
+                content = [] if key is None and not relative_path else {}
+            container = content
+            for part in relative_path:
+                container = container.setdefault(part, {} if key is not None else [])
+            if key is None:
+                container.append(value)
+            else:
+                container[key] = value
+
+        if content is None:
+            # The section is empty: determine whether it is an object or a list from its opening line
+            with open(self._path) as handle:
+                for line in handle:
+                    if line.startswith('{}:'.format(json.dumps(section))):
+                        return [] if line.rstrip().endswith('[') else {}
+            raise KeyError(section)
+
+        return content
+
+    def iter_entries(self, section):
+        """
+        Iterate over the entries of a top level section, one at a time
+
+        :param section: the name of the section, e.g. 'links_uuid'
+        :return: an iterator over the tuples (key, value) of the entries for an object, or over the values for a list
+        """
+        if self._data is not None:
+            content = self._data[section]
+            for entry in (six.iteritems(content) if isinstance(content, dict) else content):
+                yield entry
+            return
+
+        for relative_path, key, value in self._iter_lines((section,)):
+            if not relative_path:
+                yield value if key is None else (key, value)
+
+    def iter_group_members(self):
+        """
+        Iterate over the memberships of the groups
+
+        :return: an iterator over the tuples (group uuid, node uuid)
+        """
+        if self._data is not None:
+            for group_uuid, node_uuids in self._data['groups_uuid'].items():
+                for node_uuid in node_uuids:
+                    yield group_uuid, node_uuid
+            return
+
+        for relative_path, key, value in self._iter_lines(('groups_uuid',)):
+            if relative_path:
+                yield relative_path[0], value
+            else:
+                for node_uuid in value:
+                    yield key, node_uuid
+
+    def iter_node_attributes(self):
+        """
+        Iterate over the attributes of the nodes together with their conversion information
+
+        The export writes the attributes and their conversion information in the same order, in which case both are
+        read at the same time. Otherwise the conversion information is loaded completely, to be looked up by node.
+
+        :return: an iterator over the tuples (pk, attributes, conversion), with the pk of the node in the archive
+        :raise ValueError: if the conversion information of a node is missing
+        """
+        conversions = self.iter_entries('node_attributes_conversion')
+        conversions_by_pk = None
+
+        for pk, attributes in self.iter_entries('node_attributes'):
+            if conversions_by_pk is None:
+                conversion_pk, conversion = next(conversions, (None, None))
+                if conversion_pk == pk:
+                    yield pk, attributes, conversion
+                    continue
+                conversions_by_pk = dict(self.iter_entries('node_attributes_conversion'))
+            try:
+                yield pk, attributes, conversions_by_pk[pk]
+            except KeyError:
+                raise ValueError("Unable to find the attribute conversion info for the node with pk {} in the "
+                                 "archive".format(pk))
+
 
 def check_licences(node_licenses, allowed_licenses, forbidden_licenses):
     from aiida.common.exceptions import LicensingException
@@ -2447,24 +2836,32 @@ def get_all_parents_dj(node_pks):
 
 
 class MyWritingZipFile(object):
+    """
+    A file opened for writing in a ZipFolder. The content is written to a temporary file on disk, rather than kept in
+    memory, and added to the zip file when the file is closed.
+    """
+
     def __init__(self, zipfile, fname):
         self._zipfile = zipfile
         self._fname = fname
         self._buffer = None
 
     def open(self):
-        from six.moves import cStringIO as StringIO
-
         if self._buffer is not None:
             raise IOError("Cannot open again!")
-        self._buffer = StringIO()
+        self._buffer = tempfile.NamedTemporaryFile(mode='w', delete=False)
 
     def write(self, data):
         self._buffer.write(data)
 
     def close(self):
-        self._buffer.seek(0)
-        self._zipfile.writestr(self._fname, self._buffer.read())
+        import os
+
+        self._buffer.close()
+        try:
+            self._zipfile.write(self._buffer.name, self._fname)
+        finally:
+            os.remove(self._buffer.name)
         self._buffer = None
 
     def __enter__(self):
@@ -2475,6 +2872,105 @@ class MyWritingZipFile(object):
         self.close()
 
 
+class MyWritingTarFile(MyWritingZipFile):
+    """
+    A file opened for writing in a TarFolder. The content is written to a temporary file on disk and added to the tar
+    file when the file is closed.
+    """
+
+    def close(self):
+        import os
+
+        self._buffer.close()
+        try:
+            self._zipfile.add(self._buffer.name, arcname=self._fname)
+        finally:
+            os.remove(self._buffer.name)
+        self._buffer = None
+
+
+class TarFolder(object):
+    """
+    A folder-like interface to write a (possibly compressed) tar file, mirroring the ZipFolder, such that an export
+    can be written straight into the tar file, without first copying all the files in a temporary folder.
+    """
+
+    def __init__(self, tarfolder_or_fname, mode=None, subfolder='.'):
+        """
+        :param tarfolder_or_fname: either another TarFolder instance, of which you want to get a subfolder, or a
+          filename to create.
+        :param mode: the file mode; see the tarfile.open docs for valid strings, for example 'w:gz'. Can be specified
+          only if tarfolder_or_fname is a string (the filename to generate)
+        :param subfolder: the subfolder that specified the "current working directory" in the tar file. If
+          tarfolder_or_fname is a TarFolder, subfolder is a relative path from tarfolder_or_fname.pwd
+        """
+        import os
+        import tarfile
+
+        if isinstance(tarfolder_or_fname, six.string_types):
+            self._tarfile = tarfile.open(tarfolder_or_fname, mode or 'w:gz', format=tarfile.PAX_FORMAT,
+                                         dereference=True)
+            self._pwd = subfolder
+        else:
+            if mode is not None:
+                raise ValueError("Cannot specify 'mode' when passing a TarFolder")
+            self._tarfile = tarfolder_or_fname._tarfile
+            self._pwd = os.path.join(tarfolder_or_fname.pwd, subfolder)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        self._tarfile.close()
+
+    @property
+    def pwd(self):
+        return self._pwd
+
+    def open(self, fname, mode='r'):
+        if mode != 'w':
+            raise ValueError("A TarFolder can only be opened for writing")
+        return MyWritingTarFile(self._tarfile, fname=self._get_internal_path(fname))
+
+    def _get_internal_path(self, filename):
+        import os
+        return os.path.normpath(os.path.join(self.pwd, filename))
+
+    def get_subfolder(self, subfolder, create=False, reset_limit=False):
+        # reset_limit: ignored
+        import tarfile
+        import time
+
+        subfolder = TarFolder(self, subfolder=subfolder)
+        if create:
+            # Add an entry for the directory, such that it is present also if no files are inserted in it
+            tarinfo = tarfile.TarInfo(subfolder._get_internal_path('.'))
+            tarinfo.type = tarfile.DIRTYPE
+            tarinfo.mode = 0o755
+            tarinfo.mtime = time.time()
+            self._tarfile.addfile(tarinfo)
+        return subfolder
+
+    def insert_path(self, src, dest_name=None, overwrite=True):
+        # overwrite: ignored, the entries of a tar file are only ever appended
+        import os
+
+        if dest_name is None:
+            base_filename = six.text_type(os.path.basename(src))
+        else:
+            base_filename = six.text_type(dest_name)
+
+        src = six.text_type(src)
+        if not os.path.isabs(src):
+            raise ValueError("src must be an absolute path in insert_file")
+
+        # Directories are added recursively
+        self._tarfile.add(src, arcname=self._get_internal_path(base_filename))
+
+
 class ZipFolder(object):
     """
     To improve: if zipfile is closed, do something
@@ -2586,6 +3082,47 @@ class ZipFolder(object):
             self._zipfile.write(src, base_filename)
 
 
+def print_export_throughput(number_of_nodes, outfile, elapsed):
+    """
+    Print the rate at which nodes and bytes were written to an export file
+
+    :param number_of_nodes: the number of exported nodes
+    :param outfile: the path of the written export file
+    :param elapsed: the time it took to write the file, in seconds
+    """
+    import os
+
+    megabytes = os.path.getsize(outfile) / 1024. / 1024.
+    elapsed = max(elapsed, 1e-9)
+    print("Exported {} nodes ({:.1f} MB) in {:6.2g}s: {:.1f} nodes/s, {:.2f} MB/s."
+          .format(number_of_nodes, megabytes, elapsed, number_of_nodes / elapsed, megabytes / elapsed))
+
+
+@contextmanager
+def _temporary_outfile(outfile):
+    """
+    Context manager that yields a temporary path, in the same folder as the output file, into which an archive is
+    written. The temporary file is renamed onto the output file only if the context exits without an exception, and is
+    removed otherwise, such that a failed export does not leave a truncated archive behind.
+
+    :param outfile: the path of the output file
+    :return: the path of the temporary file
+    """
+    import os
+    import uuid
+
+    folder, basename = os.path.split(os.path.abspath(outfile))
+    temporary = os.path.join(folder, '.{}.{}.tmp'.format(basename, uuid.uuid4().hex))
+    try:
+        yield temporary
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    else:
+        os.rename(temporary, outfile)
+
+
 def export_zip(what, outfile='testzip', overwrite=False,
                silent=False, use_compression=True, **kwargs):
     import os
@@ -2595,10 +3132,11 @@ def export_zip(what, outfile='testzip', overwrite=False,
 
     import time
     t = time.time()
-    with ZipFolder(outfile, mode='w', use_compression=use_compression) as folder:
-        export_tree(what, folder=folder, silent=silent, **kwargs)
+    with _temporary_outfile(outfile) as temporary:
+        with ZipFolder(temporary, mode='w', use_compression=use_compression) as folder:
+            number_of_nodes = export_tree(what, folder=folder, silent=silent, **kwargs)
     if not silent:
-        print("File written in {:10.3g} s.".format(time.time() - t))
+        print_export_throughput(number_of_nodes or 0, outfile, time.time() - t)
 
 
 def export(what, outfile='export_data.aiida.tar.gz', overwrite=False,
@@ -2632,37 +3170,22 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False,
     :raise IOError: if overwrite==False and the filename already exists.
     """
     import os
-    import tarfile
     import time
 
-    from aiida.common.folders import SandboxFolder
-
     if not overwrite and os.path.exists(outfile):
         raise IOError("The output file '{}' already "
                       "exists".format(outfile))
 
-    folder = SandboxFolder()
+    # The data and the repository files are compressed into the tar file as they are exported, without copying them
+    # to a temporary folder first. The tar file is only moved onto the output file once it is complete.
     t1 = time.time()
-    export_tree(what, folder=folder, silent=silent, **kwargs)
-
+    with _temporary_outfile(outfile) as temporary:
+        with TarFolder(temporary, mode='w:gz') as folder:
+            number_of_nodes = export_tree(what, folder=folder, silent=silent, **kwargs)
     t2 = time.time()
 
     if not silent:
-        print("COMPRESSING...")
-
-    t3 = time.time()
-    with tarfile.open(outfile, "w:gz", format=tarfile.PAX_FORMAT,
-                      dereference=True) as tar:
-        tar.add(folder.abspath, arcname="")
-    t4 = time.time()
-
-    if not silent:
-        filecr_time = t2 - t1
-        filecomp_time = t4 - t3
-        print("Exported in {:6.2g}s, compressed in {:6.2g}s, total: {:6.2g}s."
-              .format(filecr_time, filecomp_time, filecr_time + filecomp_time))
-
-    if not silent:
+        print_export_throughput(number_of_nodes or 0, outfile, t2 - t1)
         print("DONE.")
 
 # Following code: to serialize the date directly when dumping into JSON.
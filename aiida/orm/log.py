@@ -99,6 +99,21 @@ class LogCollection(Collection):
         """
         pass
 
+    @abstractmethod
+    def find_for_objects(self, objpks, levelnames=None, batch_size=1000):
+        """
+        Iterate over the entries of the given objects, ordered by time, retrieving them from the database in batches
+        with a single query, rather than one query per object.
+
+        :param objpks: an iterable of the ids of the objects whose entries to retrieve
+        :param levelnames: optional iterable of log level names; if given, only entries with one of these levels
+            are returned
+        :type levelnames: list
+        :param batch_size: the number of entries to fetch from the database at a time
+        :return: an iterator over the matching entries
+        """
+        pass
+
     @abstractmethod
     def delete_many(self, filter):
         """
@@ -22,6 +22,7 @@ when instantiated by the user.
 # Warnings are issued for deprecations:
 from __future__ import absolute_import
 from __future__ import print_function
+import uuid
 import warnings
 # Checking for correct input with the inspect module
 from inspect import isclass as inspect_isclass
@@ -32,18 +33,23 @@ from six.moves import range, zip
 from aiida.orm.node import Node
 
 # The SQLAlchemy functionalities:
-from sqlalchemy import and_, or_, not_, func as sa_func, select, join
+from sqlalchemy import and_, or_, not_, func as sa_func, select, join, bindparam
+from sqlalchemy.ext import baked
 from sqlalchemy.types import Integer
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import cast
-from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.dialects.postgresql import array, ARRAY
 ## AIIDA modules:
 # For exception handling
 from aiida.common.exceptions import InputValidationError, ConfigurationError
 # The way I get column as a an attribute to the orm class
 from aiida.backends.utils import _get_column
+from aiida.common.hashing import make_hash
 from aiida.common.links import LinkType
 
+# The cache of the baked queries of compiled QueryBuilders, see QueryBuilder.compile
+_BAKERY = baked.bakery()
+
 
 def get_querybuilder_classifiers_from_cls(cls, obj):
     """
@@ -151,6 +157,134 @@ def get_querybuilder_classifiers_from_type(ormclasstype, obj):
 
 
 
+class Placeholder(object):
+    """
+    A named placeholder for the value of a filter on a column, whose value is only given when executing the compiled
+    query, see :meth:`QueryBuilder.compile`::
+
+        qb = QueryBuilder().append(Node, filters={'id': Placeholder('pk')}, project=['uuid'])
+        compiled = qb.compile()
+        compiled.execute(pk=1)
+        compiled.execute(pk=2)
+
+    Placeholders can be used with the operators ``==``, ``>``, ``<``, ``>=``, ``<=``, ``like``, ``ilike`` and ``in``
+    and their negations, but not in filters on attributes or extras, since the type of the value is needed to build
+    those filters.
+    """
+
+    def __init__(self, name):
+        """
+        :param str name: the name of the parameter with which the value is passed when executing the query
+        """
+        if not isinstance(name, six.string_types):
+            raise InputValidationError("The name of a placeholder has to be a string, got {}".format(name))
+        self.name = name
+
+    def __repr__(self):
+        return "Placeholder('{}')".format(self.name)
+
+
+@make_hash.register(Placeholder)
+def _(placeholder, **kwargs):
+    return make_hash('Placeholder:{}'.format(placeholder.name))
+
+
+class CompiledQuery(object):
+    """
+    A QueryBuilder query that is built once and can be executed many times with different values for its placeholders.
+
+    The query is executed as a SQLAlchemy baked query: the SQL statement is only generated the first time the query
+    is executed, and reused afterwards. Create it with :meth:`QueryBuilder.compile`.
+    """
+
+    def __init__(self, querybuilder):
+        """
+        :param querybuilder: the QueryBuilder to compile
+        """
+        query = querybuilder.get_query()
+
+        self._impl = querybuilder._impl
+        self._query = query
+        self._placeholders = frozenset(querybuilder._placeholders)
+        self._attrkeys_as_in_sql_result = dict(querybuilder._attrkeys_as_in_sql_result)
+        self._tag_to_projected_entity_dict = {
+            tag: dict(projected_entities_dict)
+            for tag, projected_entities_dict in querybuilder.tag_to_projected_entity_dict.items()
+        }
+        self._converters = self._impl.get_aiida_res_converters(query, self._attrkeys_as_in_sql_result)
+
+        # The baked queries are cached by the code of the function that creates the query and by the given arguments,
+        # which therefore need to identify this query uniquely
+        self._baked_query = _BAKERY(lambda session: query.with_session(session), uuid.uuid4().hex)
+
+    @property
+    def placeholders(self):
+        """
+        :returns: the set of the names of the placeholders of the query
+        """
+        return self._placeholders
+
+    def _check_parameters(self, parameters):
+        """
+        Check that the parameters give a value for all the placeholders of the query, and for nothing else
+
+        :param parameters: a dictionary with the values of the placeholders
+        :raises InputValidationError: if a placeholder is missing or an unknown one was given
+        """
+        if set(parameters) != self._placeholders:
+            raise InputValidationError(
+                "The query expects values for the placeholders {}, got {}".format(
+                    sorted(self._placeholders), sorted(parameters)))
+
+    def execute(self, **parameters):
+        """
+        Execute the query with the given values for the placeholders
+
+        :param parameters: the values of the placeholders, passed by name
+        :returns: a list of lists of all projected entities, as :meth:`QueryBuilder.all`
+        """
+        self._check_parameters(parameters)
+        return list(self._impl.iter_baked_results(
+            self._baked_query, parameters, self._attrkeys_as_in_sql_result, self._converters))
+
+    def execute_dict(self, **parameters):
+        """
+        Execute the query with the given values for the placeholders
+
+        :param parameters: the values of the placeholders, passed by name
+        :returns: a list of dictionaries of all projected entities, as :meth:`QueryBuilder.dict`
+        """
+        return [{
+            tag: {
+                attrkey: row[index_in_sql_result]
+                for attrkey, index_in_sql_result in projected_entities_dict.items()
+            }
+            for tag, projected_entities_dict in self._tag_to_projected_entity_dict.items()
+        } for row in self.execute(**parameters)]
+
+    def iterall(self, batch_size=100, **parameters):
+        """
+        Execute the query with the given values for the placeholders, streaming the results as
+        :meth:`QueryBuilder.iterall`. The SQL statement is generated at every call.
+
+        :param int batch_size: the number of rows fetched at a time
+        :param parameters: the values of the placeholders, passed by name
+        :returns: a generator of lists
+        """
+        self._check_parameters(parameters)
+        return self._impl.iterall(self._query.params(**parameters), batch_size, self._attrkeys_as_in_sql_result)
+
+    def count(self, **parameters):
+        """
+        Count the number of rows returned by the query with the given values for the placeholders
+
+        :param parameters: the values of the placeholders, passed by name
+        :returns: the number of rows as an integer
+        """
+        self._check_parameters(parameters)
+        return self._impl.count(self._query.params(**parameters))
+
+
 class QueryBuilder(object):
     """
     The class to query the AiiDA database. 
@@ -275,6 +409,11 @@ class QueryBuilder(object):
         # The user can inject a query, this keyword stores whether this was done.
         # Check QueryBuilder.inject_query
         self._injected = False
+        # Modifying the query with distinct or except_if_input_to is not reflected in the queryhelp, so the hash of
+        # the queryhelp for which the query was modified is recorded, such that its results are not cached
+        self._modified_hash = None
+        # The names of the placeholders in the filters, whose values are only given when executing a compiled query
+        self._placeholders = set()
 
         # Setting debug levels:
         self.set_debug(kwargs.pop('debug', False))
@@ -1273,20 +1412,67 @@ class QueryBuilder(object):
                 # ~ is_attribute = bool(attr_key)
                 if not isinstance(filter_operation_dict, dict):
                     filter_operation_dict = {'==': filter_operation_dict}
-                [
-                    expressions.append(
-                        self._impl.get_filter_expr(
-                            operator, value, attr_key,
-                            is_attribute=is_attribute,
-                            column=column, column_name=column_name,
-                            alias=alias
+                for operator, value in filter_operation_dict.items():
+                    if isinstance(value, Placeholder):
+                        if is_attribute:
+                            raise InputValidationError(
+                                "Placeholders cannot be used in filters on attributes or extras ({})".format(path_spec))
+                        expressions.append(self._build_placeholder_filter(operator, value, column))
+                    else:
+                        expressions.append(
+                            self._impl.get_filter_expr(
+                                operator, value, attr_key,
+                                is_attribute=is_attribute,
+                                column=column, column_name=column_name,
+                                alias=alias
+                            )
                         )
-                    )
-                    for operator, value
-                    in filter_operation_dict.items()
-                ]
         return and_(*expressions)
 
+    def _build_placeholder_filter(self, operator, placeholder, column):
+        """
+        Build the filter expression on a column whose value is given by a placeholder, as a bound parameter
+
+        :param operator: the operator of the filter, possibly negated with ~ or !
+        :param placeholder: the Placeholder instance
+        :param column: the column to filter on
+
+        :returns: an instance of *sqlalchemy.sql.elements.BinaryExpression*.
+        """
+        negation = operator.startswith(('~', '!'))
+        operator = operator.lstrip('~!')
+        parameter = bindparam(placeholder.name)
+
+        if operator == '==':
+            expr = column == parameter
+        elif operator == '>':
+            expr = column > parameter
+        elif operator == '<':
+            expr = column < parameter
+        elif operator == '>=':
+            expr = column >= parameter
+        elif operator == '<=':
+            expr = column <= parameter
+        elif operator == 'like':
+            expr = column.like(parameter)
+        elif operator == 'ilike':
+            expr = column.ilike(parameter)
+        elif operator == 'in':
+            # The values are passed as a single array parameter, such that their number can change between executions.
+            # The array is cast to the type of the column, since a list of strings would otherwise be bound as a text
+            # array, which cannot be compared with columns like the uuids.
+            array_type = ARRAY(column.type)
+            parameter = cast(bindparam(placeholder.name, type_=array_type), array_type)
+            expr = column == sa_func.any(parameter)
+        else:
+            raise InputValidationError("Operator {} cannot be used with a placeholder".format(operator))
+
+        self._placeholders.add(placeholder.name)
+
+        if negation:
+            return not_(expr)
+        return expr
+
     @staticmethod
     def _check_dbentities(entities_cls_joined, entities_cls_to_join, relationship):
         """
@@ -1844,6 +2030,9 @@ class QueryBuilder(object):
         build the query and return a sqlalchemy.Query instance
         """
 
+        # The names of the placeholders in the filters, which are collected while building the filters
+        self._placeholders = set()
+
         # self.tags_location_dict is a dictionary that
         # maps the tag to its index in the list
         # this is basically the mapping between the count
@@ -2045,6 +2234,7 @@ class QueryBuilder(object):
 
         self._query = self.get_query()
         self._query = self._query.except_(build_counterquery(calc_class))
+        self._modified_hash = self._hash
         return self
 
     def get_aliases(self):
@@ -2128,6 +2318,38 @@ class QueryBuilder(object):
                 self._hash = queryhelp_hash
         return query
 
+    def _get_query_without_placeholders(self):
+        """
+        Return the query as :meth:`get_query`, for executing it directly
+
+        :raises InputValidationError: if the filters contain placeholders, which require to compile the query
+        """
+        query = self.get_query()
+        if self._placeholders:
+            raise InputValidationError(
+                "The filters contain the placeholders {}: compile the query and pass their values to "
+                "execute".format(sorted(self._placeholders)))
+        return query
+
+    def compile(self):
+        """
+        Build the query once, such that it can be executed many times without building it again, with different values
+        for the placeholders in its filters::
+
+            qb = QueryBuilder()
+            qb.append(Node, filters={'id': Placeholder('pk')}, tag='node')
+            qb.append(Node, output_of='node', project=['id', 'label'])
+            compiled = qb.compile()
+
+            for pk in pks:
+                outputs = compiled.execute(pk=pk)
+
+        Later changes to this QueryBuilder do not affect the compiled query.
+
+        :returns: a :class:`CompiledQuery`
+        """
+        return CompiledQuery(self)
+
     def inject_query(self, query):
         """
         Manipulate the query an inject it back.
@@ -2163,6 +2385,7 @@ class QueryBuilder(object):
         :returns: self
         """
         self._query = self.get_query().distinct()
+        self._modified_hash = self._hash
         return self
 
     def first(self):
@@ -2176,7 +2399,7 @@ class QueryBuilder(object):
         :returns:
             One row of results as a list
         """
-        query = self.get_query()
+        query = self._get_query_without_placeholders()
         resultrow = self._impl.first(query)
         try:
             returnval = [
@@ -2212,13 +2435,47 @@ class QueryBuilder(object):
             raise NotExistent("No result was found")
         return res[0]
 
-    def count(self):
+    def _get_cached(self, method, compute):
+        """
+        Return the results of the query from the query cache, computing them if they are not cached
+
+        Queries that were injected or modified in ways that are not reflected by the queryhelp are never cached.
+
+        :param method: the name of the method whose results are cached, which is part of the key
+        :param compute: a function without arguments that executes the query and returns its results
+        :returns: the results
+        """
+        from aiida.common.hashing import make_hash
+        from aiida.orm.querycache import get_query_cache
+
+        if self._injected:
+            return compute()
+
+        try:
+            queryhelp_hash = make_hash(self.get_json_compatible_queryhelp())
+        except ValueError:
+            # The filters contain values that cannot be hashed
+            return compute()
+
+        if self._modified_hash is not None and self._modified_hash == queryhelp_hash:
+            return compute()
+
+        key = '{}:{}'.format(method, queryhelp_hash)
+        return get_query_cache().get(key, compute, self._impl.get_database_change_counter)
+
+    def count(self, use_cache=False):
         """
         Counts the number of rows returned by the backend.
 
+        :param bool use_cache: if True, return the count from the query cache if the same query was
+            counted before and the database did not change since, see :py:mod:`aiida.orm.querycache`
+
         :returns: the number of rows as an integer
         """
-        query = self.get_query()
+        if use_cache:
+            return self._get_cached('count', self.count)
+
+        query = self._get_query_without_placeholders()
         return self._impl.count(query)
 
     def iterall(self, batch_size=100):
@@ -2228,6 +2485,10 @@ class QueryBuilder(object):
         transaction. You might also want to read the SQLAlchemy documentation on
         http://docs.sqlalchemy.org/en/latest/orm/query.html#sqlalchemy.orm.query.Query.yield_per
 
+        The results are streamed from the database through a server-side cursor,
+        so the memory used does not grow with the number of rows. If only columns
+        are projected, and no entities, the rows are returned as they come from
+        the database without further conversion, which is considerably faster.
 
         :param int batch_size:
             The size of the batches to ask the backend to batch results in subcollections.
@@ -2236,7 +2497,7 @@ class QueryBuilder(object):
         :returns: a generator of lists
         """
 
-        query = self.get_query()
+        query = self._get_query_without_placeholders()
 
         for item in self._impl.iterall(query, batch_size, self._attrkeys_as_in_sql_result):
             yield item
@@ -2249,6 +2510,8 @@ class QueryBuilder(object):
         transaction. You might also want to read the SQLAlchemy documentation on
         http://docs.sqlalchemy.org/en/latest/orm/query.html#sqlalchemy.orm.query.Query.yield_per
 
+        The results are streamed as for :meth:`.iterall`.
+
 
         :param int batch_size:
             The size of the batches to ask the backend to batch results in subcollections.
@@ -2257,11 +2520,11 @@ class QueryBuilder(object):
         :returns: a generator of dictionaries
         """
 
-        query = self.get_query()
+        query = self._get_query_without_placeholders()
         for item in self._impl.iterdict(query, batch_size, self.tag_to_projected_entity_dict):
             yield item
 
-    def all(self, batch_size=None):
+    def all(self, batch_size=None, use_cache=False):
         """
         Executes the full query with the order of the rows as returned by the backend.
         the order inside each row is given by the order of the vertices in the path
@@ -2272,13 +2535,20 @@ class QueryBuilder(object):
             You can optimize the speed of the query by tuning this parameter.
             Leave the default (*None*) if speed is not critical or if you don't know
             what you're doing!
+        :param bool use_cache:
+            If True, return the results from the query cache if the same query was executed
+            before and the database did not change since, see :py:mod:`aiida.orm.querycache`.
+            Note that the projected entities are then the same instances for all the callers.
 
         :returns: a list of lists of all projected entities.
         """
+        if use_cache:
+            results = self._get_cached('all', lambda: self.all(batch_size=batch_size))
+            return [list(row) for row in results]
 
         return list(self.iterall(batch_size=batch_size))
 
-    def dict(self, batch_size=None):
+    def dict(self, batch_size=None, use_cache=False):
         """
         Executes the full query with the order of the rows as returned by the backend.
         the order inside each row is given by the order of the vertices in the path
@@ -2289,6 +2559,8 @@ class QueryBuilder(object):
             You can optimize the speed of the query by tuning this parameter.
             Leave the default (*None*) if speed is not critical or if you don't know
             what you're doing!
+        :param bool use_cache:
+            If True, return the results from the query cache, as for :meth:`.all`.
 
         :returns:
             a list of dictionaries of all projected entities.
@@ -2330,6 +2602,10 @@ class QueryBuilder(object):
                 }
 
         """
+        if use_cache:
+            results = self._get_cached('dict', lambda: self.dict(batch_size=batch_size))
+            return [{tag: dict(values) for tag, values in result.items()} for result in results]
+
         return list(self.iterdict(batch_size=batch_size))
 
     def get_results_dict(self):
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Cache of the results of QueryBuilder queries, used when a query is executed with ``use_cache=True``::
+
+    qb = QueryBuilder().append(JobCalculation, project=['id', 'attributes.process_state'])
+    qb.all(use_cache=True)  # executes the query
+    qb.all(use_cache=True)  # returns the cached results, if the database did not change in the meantime
+
+    get_query_cache().get_statistics()  # {'hits': 1, 'misses': 1, ...}
+"""
+from __future__ import absolute_import
+import collections
+import threading
+import time
+
+__all__ = ['QueryCache', 'get_query_cache']
+
+_QUERY_CACHE = None
+
+
+def get_query_cache():
+    """
+    Return the cache used by the QueryBuilder when executing a query with ``use_cache=True``. Its size, time to live
+    and check interval are configured by the ``querybuilder.cache_size``, ``querybuilder.cache_ttl`` and
+    ``querybuilder.cache_check_interval`` properties, which are read only once per interpreter.
+
+    :return: the QueryCache instance
+    """
+    global _QUERY_CACHE  # pylint: disable=global-statement
+
+    if _QUERY_CACHE is None:
+        from aiida.common.setup import get_property
+        _QUERY_CACHE = QueryCache(
+            max_size=get_property('querybuilder.cache_size'),
+            ttl=get_property('querybuilder.cache_ttl'),
+            check_interval=get_property('querybuilder.cache_check_interval') / 1000.)
+
+    return _QUERY_CACHE
+
+
+class QueryCache(object):
+    """
+    A least-recently-used cache of query results, bounded by the number of results and by their time to live.
+
+    The results are only valid as long as the database does not change: before every lookup, the change counter of
+    the database is compared to the one at which the cached results were computed and, if it differs, the whole
+    cache is invalidated. The counter is read from the database before executing a query, such that a change made
+    while the query is running invalidates its results at the next lookup.
+    """
+
+    def __init__(self, max_size, ttl, check_interval=0.):
+        """
+        :param max_size: the maximum number of results kept in the cache, 0 disables the cache
+        :param ttl: the time in seconds after which a result expires
+        :param check_interval: the minimum time in seconds between two reads of the change counter of the database
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._check_interval = check_interval
+        self._entries = collections.OrderedDict()  # Mapping: {key: (expiry time, results)}
+        self._counter = None
+        self._last_checked = None
+        self._lock = threading.Lock()
+        self._statistics = collections.Counter()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_statistics(self):
+        """
+        Return the statistics of the cache since its creation or the last call of :py:meth:`reset_statistics`
+
+        :return: a dictionary with the number of ``hits`` and ``misses`` of the lookups, of the results that were
+            ``evicted`` to respect the maximum size or ``expired``, of the ``invalidations`` of the cache because the
+            database changed, and the current ``size`` of the cache
+        """
+        with self._lock:
+            statistics = {key: self._statistics[key] for key in
+                          ('hits', 'misses', 'evicted', 'expired', 'invalidations')}
+            statistics['size'] = len(self._entries)
+        return statistics
+
+    def reset_statistics(self):
+        """Reset the counts of the statistics of the cache."""
+        with self._lock:
+            self._statistics.clear()
+
+    def clear(self):
+        """Remove all the results from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._counter = None
+            self._last_checked = None
+
+    def get(self, key, compute, get_counter):
+        """
+        Return the cached results for the given key or compute and cache them
+
+        :param key: the key of the query, as a string
+        :param compute: a function without arguments that executes the query and returns its results
+        :param get_counter: a function without arguments that returns the current change counter of the database
+        :return: the results
+        """
+        if self._max_size <= 0:
+            return compute()
+
+        now = time.time()
+        counter = self._check_counter(now, get_counter)
+
+        with self._lock:
+            try:
+                expiry, results = self._entries.pop(key)
+            except KeyError:
+                pass
+            else:
+                if expiry > now:
+                    self._entries[key] = (expiry, results)
+                    self._statistics['hits'] += 1
+                    return results
+                self._statistics['expired'] += 1
+
+            self._statistics['misses'] += 1
+
+        results = compute()
+
+        with self._lock:
+            # Another lookup may have found that the database changed in the meantime, if so the results are stale
+            if counter == self._counter:
+                self._entries[key] = (now + self._ttl, results)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                    self._statistics['evicted'] += 1
+
+        return results
+
+    def _check_counter(self, now, get_counter):
+        """
+        Read the change counter of the database, unless it was read less than the check interval ago, and invalidate
+        the cache if it changed
+
+        :param now: the current time
+        :param get_counter: a function without arguments that returns the current change counter of the database
+        :return: the counter
+        """
+        with self._lock:
+            if self._last_checked is not None and now - self._last_checked < self._check_interval:
+                return self._counter
+
+        counter = get_counter()
+
+        with self._lock:
+            if counter != self._counter:
+                if self._entries:
+                    self._statistics['invalidations'] += 1
+                self._entries.clear()
+                self._counter = counter
+            self._last_checked = now
+
+        return counter
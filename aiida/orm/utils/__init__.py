@@ -17,7 +17,7 @@ from aiida.common.utils import abstractclassmethod
 from aiida.plugins.factory import BaseFactory
 
 __all__ = ['CalculationFactory', 'DataFactory', 'WorkflowFactory', 'load_group', 
-           'load_node', 'load_workflow', 'BackendDelegateWithDefault']
+           'load_node', 'load_workflow', 'store_many', 'set_extra_for_nodes', 'BackendDelegateWithDefault']
 
 
 def CalculationFactory(entry_point):
@@ -153,6 +153,56 @@ def load_node(identifier=None, pk=None, uuid=None, sub_class=None, query_with_da
     return NodeEntityLoader.load_entity(identifier, identifier_type, sub_class, query_with_dashes)
 
 
+def store_many(nodes, links=None, with_transaction=True):
+    """
+    Store many nodes and the links between them in a single transaction.
+
+    Compared to calling store() on each node, the nodes, their attributes and their links are inserted in bulk,
+    instead of with several queries per node, which makes a big difference when creating thousands of nodes::
+
+        outputs = [Int(value) for value in range(1000)]
+        links = [(calculation, node, 'output_{}'.format(index), LinkType.CREATE) for index, node in enumerate(outputs)]
+        store_many(outputs, links=links)
+
+    The nodes are validated before anything is written. Links can be passed as tuples of the form
+    ``(source, target, label)`` or ``(source, target, label, link_type)`` and are added with ``add_link_from``, such
+    that the same checks apply. The links that were already added to unstored nodes are stored as well, as long as
+    their sources are stored or among the nodes being stored.
+
+    :note: no equivalent node is looked up for caching: all the nodes are stored as new nodes.
+
+    :note: nodes of classes that define their own store method are stored through it, after the other nodes, in the
+        order in which they are given.
+
+    :param nodes: an iterable of nodes; those that are already stored are skipped
+    :param links: an optional iterable of links to add before storing
+    :param with_transaction: if False, no transaction is used. This is meant to be used ONLY if the outer calling
+        function has already a transaction open!
+    :return: the list of the given nodes, all of them stored
+    :raise ModificationNotAllowed: if one of the nodes has an unstored input node that is not being stored
+    :raise ValueError: if the links would create a loop
+    """
+    from aiida.orm.implementation import Node
+    return Node._store_many(nodes, links=links, with_transaction=with_transaction)  # pylint: disable=protected-access
+
+
+def set_extra_for_nodes(pks, key, value):
+    """
+    Set the same extra on many stored nodes at once, for example to tag them, with a single update of the database
+    instead of one per node. The nodeversion of the nodes is incremented, as when calling set_extra on each of them.
+
+    :param pks: an iterable of pks of stored nodes
+    :param key: the key of the extra
+    :param value: the value of the extra
+    """
+    from aiida.backends.utils import validate_attribute_key
+    from aiida.orm.implementation import Node
+    from aiida.orm.implementation.general.node import clean_value
+
+    validate_attribute_key(key)
+    Node._set_db_extra_for_nodes(list(pks), key, clean_value(value))  # pylint: disable=protected-access
+
+
 def load_workflow(wf_id=None, pk=None, uuid=None):
     """
     Return an AiiDA workflow given PK or UUID.
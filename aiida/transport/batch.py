@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Batches of operations on the remote file system, returned by :py:meth:`aiida.transport.Transport.batch`.
+
+The operations are collected and executed together, in the order in which they were added, either one at a time with
+the methods of the transport, which is fine when they are cheap, or as a single shell script executed on the remote,
+which takes a single round trip however many operations there are::
+
+    with transport.batch() as batch:
+        batch.makedirs('/scratch/aiida/ab/cd')
+        batch.chmod('code.x', 0o755)
+        batch.symlink('/scratch/pseudos/Si.upf', 'Si.upf')
+
+Relative paths are relative to the current directory of the transport when the batch is executed.
+"""
+from __future__ import absolute_import
+import re
+
+from aiida.common.utils import escape_for_bash
+
+__all__ = ['OperationBatch', 'SequentialOperationBatch', 'ShellOperationBatch']
+
+# The parts of a path that are pathname patterns: wildcards and bracket expressions
+_MAGIC_RE = re.compile(r'(\*|\?|\[[^\]]*\])')
+
+
+def _escape_pattern_part(part):
+    """
+    Escape a pathname pattern part for bash: wildcards are left as they are, while the characters of a bracket
+    expression are quoted one by one, except for the leading negation and the dashes of the ranges, such that they
+    are only matched literally and cannot be interpreted by the shell
+
+    :param part: a wildcard or a bracket expression
+    :return: the escaped part
+    """
+    if not part.startswith('['):
+        return part
+
+    content = part[1:-1]
+    if not content:
+        return escape_for_bash(part)
+
+    negation = content[0] if content[0] in '!^' else ''
+    return '[{}{}]'.format(negation, ''.join(
+        char if char == '-' else escape_for_bash(char) for char in content[len(negation):]))
+
+
+class OperationBatch(object):
+    """
+    A batch of operations on the remote file system, executed with :py:meth:`execute` or when leaving the context.
+    """
+
+    def __init__(self, transport):
+        """
+        :param transport: the open transport on which the operations are executed
+        """
+        self._transport = transport
+        self._operations = []
+
+    def __len__(self):
+        return len(self._operations)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+
+    def makedirs(self, path):
+        """
+        Create a directory and its missing parents, if they do not exist
+
+        :param path: the remote path
+        """
+        self._operations.append(('makedirs', (path,)))
+
+    def mkdir(self, path):
+        """
+        Create a directory, which must not exist yet
+
+        :param path: the remote path
+        """
+        self._operations.append(('mkdir', (path,)))
+
+    def copy(self, remotesource, remotedestination, dereference=False):
+        """
+        Copy a file or folder recursively, like :py:meth:`aiida.transport.Transport.copy`
+
+        :param remotesource: the remote source, which can contain a pattern
+        :param remotedestination: the remote destination
+        :param dereference: if True, copy the content of the symbolic links instead of the links
+        """
+        if not remotesource or not remotedestination:
+            raise ValueError('The source and destination of a copy must be non empty strings')
+        if self._transport.has_magic(remotedestination):
+            raise ValueError('Pathname patterns are not allowed in the destination')
+        self._operations.append(('copy', (remotesource, remotedestination, dereference)))
+
+    def symlink(self, remotesource, remotedestination):
+        """
+        Create a symbolic link, like :py:meth:`aiida.transport.Transport.symlink`
+
+        :param remotesource: the remote source, which can contain a pattern, in which case the links are created in
+            the destination folder
+        :param remotedestination: the remote destination
+        """
+        if self._transport.has_magic(remotedestination):
+            raise ValueError('Pathname patterns are not allowed in the destination')
+        self._operations.append(('symlink', (remotesource, remotedestination)))
+
+    def chmod(self, path, mode):
+        """
+        Change the permissions of a file
+
+        :param path: the remote path
+        :param mode: the new permissions, as an integer
+        """
+        self._operations.append(('chmod', (path, mode)))
+
+    def execute(self):
+        """
+        Execute the operations in the order in which they were added and clear the batch
+
+        :raise IOError: if an operation failed, in which case the following operations are not executed
+        """
+        raise NotImplementedError
+
+
+class SequentialOperationBatch(OperationBatch):
+    """
+    A batch whose operations are executed one at a time with the methods of the transport.
+    """
+
+    def execute(self):
+        operations, self._operations = self._operations, []
+        for name, args in operations:
+            if name == 'makedirs':
+                self._transport.makedirs(args[0], ignore_existing=True)
+            else:
+                getattr(self._transport, name)(*args)
+
+
+class ShellOperationBatch(OperationBatch):
+    """
+    A batch whose operations are executed on the remote as a single shell script, with one ``exec_command_wait``.
+    """
+
+    def execute(self):
+        operations, self._operations = self._operations, []
+        if not operations:
+            return
+
+        script = ['set -e', 'shopt -s nullglob']
+        for name, args in operations:
+            script.extend(getattr(self, '_get_{}_commands'.format(name))(*args))
+
+        retval, stdout, stderr = self._transport.exec_command_wait('bash -s', stdin='\n'.join(script) + '\n')
+        if retval != 0:
+            self._transport.logger.error("Problem executing a batch of {} operations. Exit code: {}, stdout: '{}', "
+                                         "stderr: '{}'".format(len(operations), retval, stdout, stderr))
+            raise IOError('Error while executing a batch of {} operations. Exit code: {}, stderr: {}'.format(
+                len(operations), retval, stderr.strip()))
+        if stderr.strip():
+            self._transport.logger.warning('There was nonempty stderr in the batch of operations: {}'.format(stderr))
+
+    def _escape(self, path):
+        """
+        Escape a path for bash, such that its pathname patterns are still expanded
+
+        :param path: the path
+        :return: the escaped path
+        """
+        if not self._transport.has_magic(path):
+            return escape_for_bash(path)
+        return ''.join(_escape_pattern_part(part) if index % 2 else escape_for_bash(part) if part else ''
+                       for index, part in enumerate(_MAGIC_RE.split(path)))
+
+    @staticmethod
+    def _get_makedirs_commands(path):
+        return ['mkdir -p {}'.format(escape_for_bash(path))]
+
+    @staticmethod
+    def _get_mkdir_commands(path):
+        return ['mkdir {}'.format(escape_for_bash(path))]
+
+    def _get_copy_commands(self, remotesource, remotedestination, dereference):
+        flags = '-r -f -L' if dereference else '-r -f'
+        destination = escape_for_bash(remotedestination)
+        if not self._transport.has_magic(remotesource):
+            return ['cp {} {} {}'.format(flags, escape_for_bash(remotesource), destination)]
+
+        # The matches of a pattern can only be copied into a folder if there are more than one, and none is copied
+        # if the pattern does not match anything
+        return [
+            'set -- {}'.format(self._escape(remotesource)),
+            'if [ $# -gt 1 ] && [ ! -d {} ]; then '
+            'echo "Can\'t copy more than one file in the same destination file" >&2; exit 1; fi'.format(destination),
+            'if [ $# -gt 0 ]; then cp {} "$@" {}; fi'.format(flags, destination),
+        ]
+
+    def _get_symlink_commands(self, remotesource, remotedestination):
+        if not self._transport.has_magic(remotesource):
+            return ['ln -s {} {}'.format(escape_for_bash(remotesource), escape_for_bash(remotedestination))]
+
+        # Like the transports, link every match of the pattern into the destination folder, with its own name
+        return ['for f in {}; do ln -s "$f" {}/"$(basename "$f")"; done'.format(
+            self._escape(remotesource), escape_for_bash(remotedestination))]
+
+    @staticmethod
+    def _get_chmod_commands(path, mode):
+        return ['chmod {:o} {}'.format(mode, escape_for_bash(path))]
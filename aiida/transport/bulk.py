@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Transfer of many files and folders at once, through a tar stream piped over a command executed on the remote.
+
+Instead of transferring the files one at a time, which costs at least one round trip per file, the files are packed
+into a tar archive on the fly on one side and unpacked on the other side, such that the number of round trips does not
+depend on the number of files. This only requires ``bash`` and a ``tar`` supporting ``--null -T -`` (GNU or BSD tar)
+on the remote, and works with any transport that can execute commands with ``_exec_command_internal``.
+"""
+from __future__ import absolute_import
+import os
+import posixpath
+import shutil
+import tarfile
+import threading
+
+from aiida.common.utils import escape_for_bash
+
+__all__ = ['BULK_TRANSFER_MODES', 'BulkTransferError', 'get_bulk', 'put_bulk']
+
+#: The bulk transfer modes: disabled, uncompressed tar stream or gzip compressed tar stream
+BULK_TRANSFER_NONE = 'none'
+BULK_TRANSFER_TAR = 'tar'
+BULK_TRANSFER_TAR_GZ = 'tar.gz'
+BULK_TRANSFER_MODES = (BULK_TRANSFER_NONE, BULK_TRANSFER_TAR, BULK_TRANSFER_TAR_GZ)
+
+
+class BulkTransferError(Exception):
+    """Raised when a bulk transfer fails, in which case the files should be transferred one at a time instead."""
+    pass
+
+
+def get_bulk(transport, items, mode=BULK_TRANSFER_TAR):
+    """
+    Retrieve files and folders from the remote through a single tar stream
+
+    Each local path is the exact destination of the corresponding remote file or folder, and the content of the remote
+    folders is copied recursively inside them. Symbolic links are followed. Remote paths that do not exist are skipped.
+
+    :param transport: an open transport
+    :param items: a list of tuples (remotepath, localpath), with the remote paths either absolute or relative to the
+        current working directory of the transport and the local paths absolute
+    :param mode: either 'tar' or 'tar.gz'
+    :return: the set of the remote paths that were retrieved
+    :raise BulkTransferError: if the files could not be retrieved through a tar stream
+    """
+    destinations = {}
+    for remotepath, localpath in items:
+        if not os.path.isabs(localpath):
+            raise ValueError('The localpath must be an absolute path: {}'.format(localpath))
+
+        # The names of the members of the archive are the normalized remote paths, with the leading slash stripped
+        name = posixpath.normpath(remotepath)
+        member_name = name.lstrip('/')
+        if member_name == '.' or member_name.split('/')[0] == '..' or member_name in destinations:
+            raise BulkTransferError('cannot retrieve {} through a tar stream'.format(remotepath))
+        destinations[member_name] = (remotepath, name, localpath)
+
+    if not destinations:
+        return set()
+
+    # The list of paths is sent through stdin, since it may be too long for a command line, and the paths that do not
+    # exist are filtered out on the remote since tar fails on them
+    command = ("while IFS= read -r -d '' f; do if [ -e \"$f\" ]; then printf '%s\\0' \"$f\"; fi; done | "
+               "tar -c -h -f - --null -T -{}".format(' -z' if mode == BULK_TRANSFER_TAR_GZ else ''))
+    names = b''.join(name.encode('utf-8') + b'\0' for _, name, _ in destinations.values())
+
+    retrieved = set()
+    extracted = {}  # Mapping of the names of the members that are files onto their local path, to resolve hard links
+    with _RemoteCommand(transport, command) as remote_command:
+        remote_command.write_stdin_async(names)
+        try:
+            archive = tarfile.open(fileobj=remote_command.stdout, mode='r|gz' if mode == BULK_TRANSFER_TAR_GZ else 'r|')
+            for member in archive:
+                member_name, localpath = _get_destination(member.name, destinations)
+                if localpath is None:
+                    continue
+                retrieved.add(destinations[member_name][0])
+                if member.isdir():
+                    if not os.path.isdir(localpath):
+                        os.makedirs(localpath)
+                    continue
+                if not os.path.isdir(os.path.dirname(localpath)):
+                    os.makedirs(os.path.dirname(localpath))
+                if member.isfile():
+                    with open(localpath, 'wb') as handle:
+                        shutil.copyfileobj(archive.extractfile(member), handle)
+                    extracted[posixpath.normpath(member.name)] = localpath
+                elif member.islnk() and posixpath.normpath(member.linkname) in extracted:
+                    # Files that are reached more than once, or hard linked, are only stored once in the archive
+                    shutil.copyfile(extracted[posixpath.normpath(member.linkname)], localpath)
+            archive.close()
+        except (tarfile.TarError, EnvironmentError) as exception:
+            raise BulkTransferError('reading the tar stream failed: {}'.format(exception))
+
+    return retrieved
+
+
+def put_bulk(transport, localpath, remotepath, mode=BULK_TRANSFER_TAR):
+    """
+    Copy the content of a local folder recursively into a remote folder through a single tar stream
+
+    The remote folder is created if it does not exist. Symbolic links are followed.
+
+    :param transport: an open transport
+    :param localpath: the absolute path of the local folder
+    :param remotepath: the path of the remote folder, either absolute or relative to the current working directory of
+        the transport
+    :param mode: either 'tar' or 'tar.gz'
+    :raise BulkTransferError: if the files could not be copied through a tar stream
+    """
+    if not os.path.isabs(localpath):
+        raise ValueError('The localpath must be an absolute path: {}'.format(localpath))
+
+    command = 'mkdir -p {path} && tar -x -f - -C {path}{compress}'.format(
+        path=escape_for_bash(remotepath), compress=' -z' if mode == BULK_TRANSFER_TAR_GZ else '')
+
+    with _RemoteCommand(transport, command) as remote_command:
+        archive = tarfile.open(
+            fileobj=remote_command.stdin, mode='w|gz' if mode == BULK_TRANSFER_TAR_GZ else 'w|', dereference=True)
+        try:
+            for name in sorted(os.listdir(localpath)):
+                archive.add(os.path.join(localpath, name), arcname=name)
+            archive.close()
+        except (tarfile.TarError, EnvironmentError) as exception:
+            # Mark the stream as closed, otherwise it tries to write the end of the archive when garbage collected
+            archive.fileobj.closed = True
+            raise BulkTransferError('writing the tar stream failed: {}'.format(exception))
+        remote_command.close_stdin()
+
+
+def _get_destination(member_name, destinations):
+    """
+    Return the local destination of a member of the archive, from the destination of the item it belongs to
+
+    :param member_name: the name of the member of the archive
+    :param destinations: a dictionary mapping the member names of the items onto tuples
+        (remotepath, name, localpath)
+    :return: a tuple with the member name of the item and the local path, or (None, None) if the member does not
+        belong to any item
+    """
+    parts = []
+    candidate = posixpath.normpath(member_name)
+    while candidate and candidate not in ('.', '/'):
+        if candidate in destinations:
+            if '..' in parts:
+                break
+            return candidate, os.path.join(destinations[candidate][2], *parts)
+        candidate, tail = posixpath.split(candidate)
+        parts.insert(0, tail)
+    return None, None
+
+
+class _RemoteCommand(object):
+    """
+    A command executed on the remote with ``_exec_command_internal``, whose stdout and stdin are used as streams.
+
+    The stderr is read in a separate thread to avoid blocking the command, and the exit status of the command is
+    checked when leaving the context.
+    """
+
+    def __init__(self, transport, command):
+        self._transport = transport
+        self._command = command
+        self._stdin = None
+        self._stdout = None
+        self._session = None
+        self._stdin_closed = False
+        self._stderr = []
+        self._threads = []
+
+    @property
+    def stdin(self):
+        return self._stdin
+
+    @property
+    def stdout(self):
+        return self._stdout
+
+    def __enter__(self):
+        self._transport.logger.debug('Executing bulk transfer command: {}'.format(self._command))
+        self._stdin, self._stdout, stderr, self._session = self._transport._exec_command_internal(self._command)  # pylint: disable=protected-access
+        self._start_thread(lambda: self._stderr.append(stderr.read()))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            # Make sure the command terminates, such that the exit status can be collected
+            self.close_stdin()
+            self._close_session()
+        else:
+            self.close_stdin()
+
+        exit_status = self._get_exit_status()
+        for thread in self._threads:
+            thread.join()
+
+        # A failure of the command typically also breaks the streams, in which case its error is more informative
+        if exit_status != 0 and (exc_type is None or issubclass(exc_type, BulkTransferError)):
+            stderr = b''.join(self._stderr).decode('utf-8', 'replace')
+            raise BulkTransferError('the command exited with status {}: {}'.format(exit_status, stderr.strip()))
+
+    def write_stdin_async(self, content):
+        """
+        Write the content to the stdin of the command and close it, in a separate thread, such that the output can be
+        read at the same time.
+
+        :param content: the bytes to write
+        """
+
+        def write():
+            try:
+                self._stdin.write(content)
+            except EnvironmentError:
+                pass
+            finally:
+                self.close_stdin()
+
+        self._start_thread(write)
+
+    def close_stdin(self):
+        """Signal the end of the input to the command."""
+        if self._stdin_closed:
+            return
+        self._stdin_closed = True
+        try:
+            self._stdin.flush()
+            # The stdin of a command executed through SSH is a file of a paramiko channel, whose write side has to be
+            # shut down for the remote to receive the end of the input, while closing the file is enough for a pipe
+            channel = getattr(self._stdin, 'channel', None)
+            if channel is not None:
+                channel.shutdown_write()
+            else:
+                self._stdin.close()
+        except EnvironmentError:
+            pass
+
+    def _close_session(self):
+        """Terminate the command, either a paramiko channel or a subprocess."""
+        try:
+            if hasattr(self._session, 'recv_exit_status'):
+                self._session.close()
+            else:
+                self._session.kill()
+        except EnvironmentError:
+            pass
+
+    def _get_exit_status(self):
+        """Wait for the command to finish and return its exit status."""
+        if hasattr(self._session, 'recv_exit_status'):
+            return self._session.recv_exit_status()
+        self._stdout.read()
+        return self._session.wait()
+
+    def _start_thread(self, target):
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        self._threads.append(thread)
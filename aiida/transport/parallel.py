@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Concurrent transfer of files over several SFTP channels of the same SSH connection.
+
+A single SFTP channel transfers one file at a time and, for large files, is limited by the latency of the requests
+rather than by the bandwidth of the link. Here the files larger than a threshold are split into ranges that are read
+and written at the same time over several channels, with the requests of each range pipelined, while the smaller files
+are transferred whole, several at a time.
+"""
+from __future__ import absolute_import
+import collections
+import contextlib
+import os
+import threading
+import time
+
+from six.moves import queue
+
+__all__ = ['SftpChannelPool', 'ParallelSftpTransfer', 'TransferStatistics']
+
+#: The size of the ranges into which the large files are split
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+#: The size above which a file is split into ranges
+DEFAULT_PARALLEL_THRESHOLD = 64 * 1024 * 1024
+#: The size of a single read or write request, the largest one served by all SFTP servers
+_BLOCK_SIZE = 32768
+
+#: The statistics of the transfer of a file: its size in bytes and the time in seconds it took
+TransferStatistics = collections.namedtuple('TransferStatistics', ['source', 'destination', 'size', 'elapsed'])
+
+
+class SftpChannelPool(object):
+    """
+    A pool of SFTP channels opened on the same SSH connection, each one used by a single thread at a time.
+
+    The channels are opened when they are first needed, up to the size of the pool, and kept open until
+    :py:meth:`close` is called.
+    """
+
+    def __init__(self, sshclient, size):
+        """
+        :param sshclient: the open paramiko SSHClient on which the channels are opened
+        :param size: the maximum number of channels
+        """
+        self._sshclient = sshclient
+        self._size = size
+        self._channels = []
+        self._available = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._size
+
+    @contextlib.contextmanager
+    def channel(self):
+        """
+        Context manager that reserves a channel of the pool, waiting for one to be released if they are all in use
+
+        :return: a paramiko SFTPClient
+        """
+        sftp = None
+        try:
+            sftp = self._available.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._channels) < self._size:
+                    sftp = self._sshclient.open_sftp()
+                    self._channels.append(sftp)
+            if sftp is None:
+                sftp = self._available.get()
+
+        try:
+            yield sftp
+        finally:
+            self._available.put(sftp)
+
+    def close(self):
+        """Close all the channels of the pool."""
+        with self._lock:
+            for sftp in self._channels:
+                sftp.close()
+            self._channels = []
+            self._available = queue.Queue()
+
+
+class ParallelSftpTransfer(object):
+    """
+    Transfer of many, possibly large, files over the channels of a :py:class:`SftpChannelPool`.
+
+    The callback, if given, is called as ``callback(bytes_transferred, total_bytes)`` for each file, like the callback
+    of paramiko, every time a block of that file was transferred. The throughput of every file is logged once it is
+    transferred and the statistics are returned.
+    """
+
+    def __init__(self, pool, chunk_size=DEFAULT_CHUNK_SIZE, threshold=DEFAULT_PARALLEL_THRESHOLD, logger=None):
+        """
+        :param pool: the SftpChannelPool whose channels are used
+        :param chunk_size: the size of the ranges into which the large files are split
+        :param threshold: the size above which a file is split into ranges
+        :param logger: the logger on which the throughput of the files is reported
+        """
+        import logging
+
+        self._pool = pool
+        self._chunk_size = chunk_size
+        self._threshold = threshold
+        self._logger = logger or logging.getLogger(__name__)
+
+    def is_parallel(self, size):
+        """
+        Return whether a file of the given size is split into ranges transferred at the same time
+
+        :param size: the size of the file in bytes
+        """
+        return size > self._threshold
+
+    def get(self, items, callback=None):
+        """
+        Retrieve remote files
+
+        :param items: a list of tuples (remotepath, localpath, size), with absolute remote and local paths and the
+            size of the remote file in bytes
+        :param callback: an optional function called with the number of bytes transferred and the size of the file
+        :return: a list of TransferStatistics
+        """
+
+        def create(localpath, size):
+            with open(localpath, 'wb') as handle:
+                handle.truncate(size)
+
+        return self._transfer(items, self._get_range, create, os.remove, callback)
+
+    def put(self, items, callback=None):
+        """
+        Copy local files to the remote
+
+        :param items: a list of tuples (localpath, remotepath, size), with absolute local and remote paths and the
+            size of the local file in bytes
+        :param callback: an optional function called with the number of bytes transferred and the size of the file
+        :return: a list of TransferStatistics
+        """
+
+        def create(remotepath, size):
+            with self._pool.channel() as sftp:
+                with sftp.open(remotepath, 'wb') as handle:
+                    handle.truncate(size)
+
+        def remove(remotepath):
+            with self._pool.channel() as sftp:
+                sftp.remove(remotepath)
+
+        return self._transfer(items, self._put_range, create, remove, callback)
+
+    def _transfer(self, items, transfer_range, create, remove, callback):
+        """
+        Transfer the files, splitting the large ones into ranges
+
+        :param items: a list of tuples (source, destination, size)
+        :param transfer_range: the function transferring a range of a file
+        :param create: the function creating a destination file of a given size, before its ranges are transferred
+        :param remove: the function removing a destination file, if its transfer failed
+        :param callback: an optional function called with the number of bytes transferred and the size of the file
+        :return: a list of TransferStatistics
+        """
+        from multiprocessing.pool import ThreadPool
+
+        if not items:
+            return []
+
+        tasks = []
+        progress = {}
+        for source, destination, size in items:
+            if self.is_parallel(size):
+                create(destination, size)
+                ranges = [(start, min(start + self._chunk_size, size)) for start in range(0, size, self._chunk_size)]
+                tasks.extend((source, destination, start, end, True) for start, end in ranges)
+            else:
+                ranges = [(0, size)]
+                tasks.append((source, destination, 0, size, False))
+            progress[destination] = _Progress(size, len(ranges), callback)
+
+        # The large files are transferred first, such that the small ones fill the channels at the end
+        tasks.sort(key=lambda task: task[3] - task[2], reverse=True)
+
+        def run(task):
+            source, destination, start, end, exists = task
+            progress[destination].start()
+            transfer_range(source, destination, start, end, exists, progress[destination].update)
+            progress[destination].finish_range()
+
+        pool = ThreadPool(self._pool.size)
+        try:
+            # Consuming the results raises the first exception of the workers, if any
+            for _ in pool.imap_unordered(run, tasks):
+                pass
+        except Exception:
+            pool.terminate()
+            pool.join()
+            for _, destination, _ in items:
+                if not progress[destination].done:
+                    try:
+                        remove(destination)
+                    except EnvironmentError:
+                        pass
+            raise
+        else:
+            pool.close()
+            pool.join()
+
+        statistics = []
+        for source, destination, size in items:
+            elapsed = progress[destination].elapsed
+            statistics.append(TransferStatistics(source, destination, size, elapsed))
+            self._logger.debug('Transferred {} to {}: {} bytes in {:.3f} s ({:.2f} MB/s)'.format(
+                source, destination, size, elapsed, size / max(elapsed, 1e-6) / 1e6))
+
+        return statistics
+
+    def _get_range(self, remotepath, localpath, start, end, exists, update):
+        """
+        Retrieve a range of a remote file, with the read requests of the range pipelined
+
+        :param remotepath: the remote file
+        :param localpath: the local file
+        :param start: the offset of the start of the range
+        :param end: the offset of the end of the range
+        :param exists: whether the local file was already created with its final size
+        :param update: the function called with the number of bytes transferred
+        """
+        blocks = [(offset, min(_BLOCK_SIZE, end - offset)) for offset in range(start, end, _BLOCK_SIZE)]
+        with self._pool.channel() as sftp:
+            with sftp.open(remotepath, 'rb') as remote, open(localpath, 'r+b' if exists else 'wb') as local:
+                local.seek(start)
+                for data in remote.readv(blocks) if blocks else []:
+                    local.write(data)
+                    update(len(data))
+
+    def _put_range(self, localpath, remotepath, start, end, exists, update):
+        """
+        Copy a range of a local file to the remote, with the write requests of the range pipelined
+
+        :param localpath: the local file
+        :param remotepath: the remote file
+        :param start: the offset of the start of the range
+        :param end: the offset of the end of the range
+        :param exists: whether the remote file was already created with its final size
+        :param update: the function called with the number of bytes transferred
+        """
+        with self._pool.channel() as sftp:
+            with open(localpath, 'rb') as local, sftp.open(remotepath, 'r+b' if exists else 'wb') as remote:
+                remote.set_pipelined(True)
+                local.seek(start)
+                remote.seek(start)
+                offset = start
+                while offset < end:
+                    data = local.read(min(_BLOCK_SIZE, end - offset))
+                    if not data:
+                        raise IOError('The local file {} is shorter than expected'.format(localpath))
+                    remote.write(data)
+                    offset += len(data)
+                    update(len(data))
+
+
+class _Progress(object):
+    """The number of bytes of a file that were transferred, over all its ranges."""
+
+    def __init__(self, size, ranges, callback):
+        """
+        :param size: the size of the file
+        :param ranges: the number of ranges of the file
+        :param callback: an optional function called with the number of bytes transferred and the size of the file
+        """
+        self._size = size
+        self._ranges = ranges
+        self._callback = callback
+        self._transferred = 0
+        self._start = None
+        self._end = None
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self._end is not None
+
+    @property
+    def elapsed(self):
+        return self._end - self._start if self.done else 0.
+
+    def start(self):
+        """Record the start of the transfer of a range, the first one being the start of the file."""
+        with self._lock:
+            if self._start is None:
+                self._start = time.time()
+
+    def finish_range(self):
+        """Record the end of the transfer of a range, the last one being the end of the file."""
+        with self._lock:
+            self._ranges -= 1
+            if self._ranges == 0:
+                self._end = time.time()
+
+    def update(self, transferred):
+        """
+        Add the bytes transferred and call the callback
+
+        :param transferred: the number of bytes transferred
+        """
+        with self._lock:
+            self._transferred += transferred
+            transferred = self._transferred
+        if self._callback is not None:
+            self._callback(transferred, self._size)
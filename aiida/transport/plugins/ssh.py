@@ -8,7 +8,7 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 from __future__ import absolute_import
-from stat import S_ISDIR, S_ISREG
+from stat import S_ISDIR, S_ISLNK, S_ISREG
 import os
 import click
 import glob
@@ -26,6 +26,10 @@ from aiida.cmdline.utils import echo
 from aiida.common import aiidalogger
 from aiida.common.utils import escape_for_bash
 from aiida.common.exceptions import NotExistent
+from aiida.transport.batch import ShellOperationBatch
+from aiida.transport.bulk import BULK_TRANSFER_MODES, BULK_TRANSFER_NONE, BULK_TRANSFER_TAR
+from aiida.transport.bulk import BulkTransferError, get_bulk, put_bulk
+from aiida.transport.parallel import ParallelSftpTransfer, SftpChannelPool
 
 
 __all__ = ["parse_sshconfig", "convert_to_bool", "SshTransport"]
@@ -55,6 +59,20 @@ def convert_to_bool(string):
         raise ValueError("Invalid boolean value provided")
 
 
+def _remove_local_path(path):
+    """
+    Remove a local file or folder, if it exists, like the partial destination of a failed bulk transfer
+
+    :param path: the local path
+    """
+    import shutil
+
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
 
 class SshTransport(aiida.transport.Transport):
     """
@@ -93,7 +111,9 @@ class SshTransport(aiida.transport.Transport):
     # instance
     _valid_auth_options = _valid_connect_options + [
         ('load_system_host_keys', {'switch': True, 'prompt': 'Load system host keys', 'help': 'switch loading system host keys on / off', 'non_interactive_default': True}),
-        ('key_policy', {'type': click.Choice(['RejectPolicy', 'WarningPolicy', 'AutoAddPolicy']), 'prompt': 'Key policy', 'help': 'SSH key policy', 'non_interactive_default': True})
+        ('key_policy', {'type': click.Choice(['RejectPolicy', 'WarningPolicy', 'AutoAddPolicy']), 'prompt': 'Key policy', 'help': 'SSH key policy', 'non_interactive_default': True}),
+        ('bulk_transfer', {'type': click.Choice(BULK_TRANSFER_MODES), 'prompt': 'Bulk transfer mode', 'help': 'transfer folders through a single tar stream, optionally compressed, instead of one file at a time over SFTP', 'non_interactive_default': True}),
+        ('transfer_channels', {'type': int, 'prompt': 'Number of SFTP channels', 'help': 'number of SFTP channels used to transfer ranges of large files and several files at the same time, 1 transfers one file at a time', 'non_interactive_default': True})
     ]
 
     # I set the (default) value here to 5 secs between consecutive SSH checks.
@@ -332,6 +352,48 @@ class SshTransport(aiida.transport.Transport):
         """
         return "RejectPolicy"
 
+    @classmethod
+    def _convert_bulk_transfer_fromstring(cls, string):
+        """
+        Convert the bulk transfer mode from string.
+        """
+        from aiida.common.exceptions import ValidationError
+
+        if string not in BULK_TRANSFER_MODES:
+            raise ValidationError("bulk_transfer must be one of {}".format(', '.join(BULK_TRANSFER_MODES)))
+        return string
+
+    @classmethod
+    def _get_bulk_transfer_suggestion_string(cls, computer):
+        """
+        Return a suggestion for the specific field.
+        """
+        return BULK_TRANSFER_NONE
+
+    @classmethod
+    def _convert_transfer_channels_fromstring(cls, string):
+        """
+        Convert the number of SFTP channels from string.
+        """
+        from aiida.common.exceptions import ValidationError
+
+        try:
+            channels = int(string)
+        except ValueError:
+            raise ValidationError("The number of transfer channels must be an integer")
+        if channels < 1:
+            raise ValidationError("The number of transfer channels must be at least 1")
+        return channels
+
+    @classmethod
+    def _get_transfer_channels_suggestion_string(cls, computer):
+        """
+        Return a suggestion for the specific field.
+
+        Transfer one file at a time over a single channel by default.
+        """
+        return "1"
+
     @classmethod
     def _convert_gss_auth_fromstring(cls, string):
         """
@@ -422,6 +484,12 @@ class SshTransport(aiida.transport.Transport):
            if False, do not load the system host keys
         :param key_policy: (optional, default = paramiko.RejectPolicy())
            the policy to use for unknown keys
+        :param bulk_transfer: (optional, default = 'none') if 'tar' or 'tar.gz',
+           folders are transferred through a single, optionally compressed, tar
+           stream, falling back to SFTP if that fails
+        :param transfer_channels: (optional, default = 1) the number of SFTP
+           channels over which the ranges of large files, and several files,
+           are transferred at the same time
 
         Other parameters valid for the ssh connect function (see the
         self._valid_connect_params list) are passed to the connect
@@ -454,6 +522,16 @@ class SshTransport(aiida.transport.Transport):
             raise ValueError("Unknown value of the key policy, allowed values "
                              "are: RejectPolicy, WarningPolicy, AutoAddPolicy")
 
+        self._bulk_transfer = kwargs.pop('bulk_transfer', BULK_TRANSFER_NONE)
+        if self._bulk_transfer not in BULK_TRANSFER_MODES:
+            raise ValueError("Unknown value of the bulk transfer mode, allowed values "
+                             "are: {}".format(', '.join(BULK_TRANSFER_MODES)))
+
+        self._transfer_channels = kwargs.pop('transfer_channels', 1)
+        if self._transfer_channels < 1:
+            raise ValueError("The number of transfer channels must be at least 1")
+        self._transfer_pool = None
+
         self._connect_args = {}
         for k in self._valid_connect_params:
             try:
@@ -516,10 +594,29 @@ class SshTransport(aiida.transport.Transport):
         if not self._is_open:
             raise InvalidOperation("Cannot close the transport: " "it is already closed")
 
+        if self._transfer_pool is not None:
+            self._transfer_pool.close()
+            self._transfer_pool = None
         self._sftp.close()
         self._client.close()
         self._is_open = False
 
+    def is_alive(self):
+        """
+        Check whether the SSH connection and the SFTP channel are still active, without a round trip to the server.
+
+        :return: True if the transport can be used, False otherwise
+        """
+        if not self._is_open:
+            return False
+
+        ssh_transport = self._client.get_transport()
+        if ssh_transport is None or not ssh_transport.is_active():
+            return False
+
+        channel = self._sftp.get_channel()
+        return channel is not None and not channel.closed
+
     @property
     def sshclient(self):
         if not self._is_open:
@@ -552,6 +649,14 @@ class SshTransport(aiida.transport.Transport):
 
         return "{} [{}]".format("OPEN" if self._is_open else "CLOSED", conn_info)
 
+    def batch(self):
+        """
+        Return a batch of operations on the remote file system, executed as a single shell script.
+
+        :return: an instance of :py:class:`aiida.transport.batch.ShellOperationBatch`
+        """
+        return ShellOperationBatch(self)
+
     def chdir(self, path):
         """
         Change directory of the SFTP session. Emulated internally by paramiko.
@@ -846,9 +951,16 @@ class SshTransport(aiida.transport.Transport):
         if self.isfile(remotepath) and not overwrite:
             raise OSError('Destination already exists: not overwriting it')
 
+        transfer = self._get_parallel_transfer()
+        if transfer is not None:
+            size = os.path.getsize(localpath)
+            if transfer.is_parallel(size):
+                transfer.put([(localpath, self._get_remote_abspath(remotepath), size)], callback=callback)
+                return
+
         return self.sftp.put(localpath, remotepath, callback=callback)
 
-    def puttree(self, localpath, remotepath, callback=None, dereference=True, overwrite=True):  # by default overwrite
+    def puttree(self, localpath, remotepath, callback=None, dereference=True, overwrite=True, bulk=None):  # by default overwrite
         """
         Put a folder recursively from local to remote.
 
@@ -858,6 +970,9 @@ class SshTransport(aiida.transport.Transport):
             Default = True (default behaviour in paramiko). False is not implemented.
         :param overwrite: if True overwrites files and folders (boolean).
             Default = True
+        :param bulk: if True, transfer the files through a single tar stream, falling back to
+            SFTP if that fails, if False use SFTP. Default = None, which uses the bulk transfer
+            mode the transport was configured with.
 
         :raise ValueError: if local path is invalid
         :raise OSError: if the localpath does not exist, or trying to overwrite
@@ -893,6 +1008,18 @@ class SshTransport(aiida.transport.Transport):
             remotepath = os.path.join(remotepath, os.path.split(localpath)[1])
             self.mkdir(remotepath)  # create a nested folder
 
+        bulk_transfer = self._get_bulk_transfer_mode(bulk)
+        if bulk_transfer != BULK_TRANSFER_NONE:
+            try:
+                put_bulk(self, localpath, remotepath, bulk_transfer)
+                return
+            except BulkTransferError as exception:
+                self.logger.warning("Bulk transfer of '{}' failed, falling back to SFTP: {}".format(
+                    localpath, exception))
+
+        transfer = self._get_parallel_transfer()
+        items = []
+
         # TODO, NOTE: we are not using 'onerror' because we checked above that
         # the folder exists, but it would be better to use it
         for this_source in os.walk(localpath):
@@ -911,7 +1038,14 @@ class SshTransport(aiida.transport.Transport):
             for this_file in this_source[2]:
                 this_local_file = os.path.join(localpath, this_basename, this_file)
                 this_remote_file = os.path.join(remotepath, this_basename, this_file)
-                self.putfile(this_local_file, this_remote_file)
+                if transfer is not None:
+                    items.append((this_local_file, self._get_remote_abspath(this_remote_file),
+                                  os.path.getsize(this_local_file)))
+                else:
+                    self.putfile(this_local_file, this_remote_file)
+
+        if transfer is not None:
+            transfer.put(items, callback=callback)
 
     def get(self, remotepath, localpath, callback=None, dereference=True, overwrite=True, ignore_nonexisting=False):
         """
@@ -1002,6 +1136,13 @@ class SshTransport(aiida.transport.Transport):
         if not dereference:
             raise NotImplementedError
 
+        transfer = self._get_parallel_transfer()
+        if transfer is not None:
+            size = self.sftp.stat(remotepath).st_size
+            if transfer.is_parallel(size):
+                transfer.get([(self._get_remote_abspath(remotepath), localpath, size)], callback=callback)
+                return
+
         # Workaround for bug #724 in paramiko -- remove localpath on IOError
         try:
             return self.sftp.get(remotepath, localpath, callback)
@@ -1012,7 +1153,7 @@ class SshTransport(aiida.transport.Transport):
                 pass
             raise
 
-    def gettree(self, remotepath, localpath, callback=None, dereference=True, overwrite=True):
+    def gettree(self, remotepath, localpath, callback=None, dereference=True, overwrite=True, bulk=None):
         """
         Get a folder recursively from remote to local.
 
@@ -1023,6 +1164,9 @@ class SshTransport(aiida.transport.Transport):
             False is not implemented.
         :param  overwrite: if True overwrites files and folders.
             Default = False
+        :param bulk: if True, transfer the files through a single tar stream, falling back to
+            SFTP if that fails, if False use SFTP. Default = None, which uses the bulk transfer
+            mode the transport was configured with.
 
         :raise ValueError: if local path is invalid
         :raise IOError: if the remotepath is not found
@@ -1054,6 +1198,23 @@ class SshTransport(aiida.transport.Transport):
             localpath = os.path.join(localpath, os.path.split(remotepath)[1])
             os.mkdir(localpath)  # create a nested folder
 
+        bulk_transfer = self._get_bulk_transfer_mode(bulk)
+        if bulk_transfer != BULK_TRANSFER_NONE:
+            try:
+                get_bulk(self, [(remotepath, localpath)], bulk_transfer)
+                return
+            except BulkTransferError as exception:
+                self.logger.warning("Bulk transfer of '{}' failed, falling back to SFTP: {}".format(
+                    remotepath, exception))
+                # Start again from an empty folder, since the failed transfer may have written part of the tree
+                _remove_local_path(localpath)
+                os.mkdir(localpath)
+
+        transfer = self._get_parallel_transfer()
+        if transfer is not None:
+            transfer.get(self._list_remote_files(remotepath, localpath), callback=callback)
+            return
+
         item_list = self.listdir(remotepath)
         dest = str(localpath)
 
@@ -1061,10 +1222,112 @@ class SshTransport(aiida.transport.Transport):
             item = str(item)
 
             if self.isdir(os.path.join(remotepath, item)):
-                self.gettree(os.path.join(remotepath, item), os.path.join(dest, item))
+                self.gettree(os.path.join(remotepath, item), os.path.join(dest, item), bulk=False)
             else:
                 self.getfile(os.path.join(remotepath, item), os.path.join(dest, item))
 
+    def get_many(self, items, ignore_nonexisting=False, bulk=None):
+        """
+        Get many files or folders from remote to local.
+
+        If the transport is configured for bulk transfers, or if bulk is True, all the files and
+        folders are transferred through a single tar stream, in which case each local path is the
+        exact destination of the remote file or folder, and SFTP is used if that fails.
+
+        :param items: a list of tuples (remotepath, localpath)
+        :param ignore_nonexisting: if True, skip the remote paths that do not exist.
+        :param bulk: if True, transfer the files through a single tar stream, if False use SFTP.
+            Default = None, which uses the bulk transfer mode the transport was configured with.
+
+        :raise IOError: if a remote path does not exist and ignore_nonexisting is False
+        """
+        bulk_transfer = self._get_bulk_transfer_mode(bulk)
+        if bulk_transfer == BULK_TRANSFER_NONE or any(self.has_magic(remotepath) for remotepath, _ in items):
+            return super(SshTransport, self).get_many(items, ignore_nonexisting=ignore_nonexisting)
+
+        # The destinations written by a failed bulk transfer are removed before falling back to SFTP, which would
+        # otherwise copy the remote folders into the existing local folders instead of onto them
+        existing_localpaths = set(localpath for _, localpath in items if os.path.lexists(localpath))
+        try:
+            retrieved = get_bulk(self, items, bulk_transfer)
+        except BulkTransferError as exception:
+            self.logger.warning("Bulk transfer of {} items failed, falling back to SFTP: {}".format(
+                len(items), exception))
+            for _, localpath in items:
+                if localpath not in existing_localpaths:
+                    _remove_local_path(localpath)
+            return super(SshTransport, self).get_many(items, ignore_nonexisting=ignore_nonexisting)
+
+        if not ignore_nonexisting:
+            for remotepath, _ in items:
+                if remotepath not in retrieved:
+                    raise IOError("The remote path {} does not exist".format(remotepath))
+
+    def _get_parallel_transfer(self):
+        """
+        Return the transfer engine over several SFTP channels, if the transport is configured to use more than one
+
+        :return: a ParallelSftpTransfer or None
+        """
+        if self._transfer_channels <= 1:
+            return None
+        if self._transfer_pool is None:
+            self._transfer_pool = SftpChannelPool(self.sshclient, self._transfer_channels)
+        return ParallelSftpTransfer(self._transfer_pool, logger=self.logger)
+
+    def _get_remote_abspath(self, path):
+        """
+        Return the absolute remote path, since the other SFTP channels do not share the working directory
+
+        :param path: a remote path, absolute or relative to the working directory
+        :return: the absolute path
+        """
+        return os.path.join(self.getcwd(), path)
+
+    def _list_remote_files(self, remotepath, localpath):
+        """
+        List the files in a remote folder recursively, with their sizes, and create the missing local folders
+
+        Each folder is listed with a single request, that also returns the sizes and types of its entries, and only
+        the symbolic links are followed with an additional request.
+
+        :param remotepath: the remote folder
+        :param localpath: the local folder corresponding to the remote one, which must exist
+        :return: a list of tuples (remotepath, localpath, size), with absolute paths
+        """
+        items = []
+        folders = [(self._get_remote_abspath(remotepath), localpath)]
+        while folders:
+            remote_folder, local_folder = folders.pop()
+            for attributes in self.sftp.listdir_attr(remote_folder):
+                this_remote = os.path.join(remote_folder, attributes.filename)
+                this_local = os.path.join(local_folder, attributes.filename)
+                if S_ISLNK(attributes.st_mode):
+                    attributes = self.sftp.stat(this_remote)
+                if S_ISDIR(attributes.st_mode):
+                    # The folder may exist already, like when part of the tree was written by a failed bulk transfer
+                    if not os.path.isdir(this_local):
+                        os.mkdir(this_local)
+                    folders.append((this_remote, this_local))
+                else:
+                    items.append((this_remote, this_local, attributes.st_size))
+        return items
+
+    def _get_bulk_transfer_mode(self, bulk):
+        """
+        Return the bulk transfer mode to use for a transfer
+
+        :param bulk: True to transfer through a tar stream, False to use SFTP or None to use the configured mode
+        :return: one of BULK_TRANSFER_MODES
+        """
+        if bulk is None:
+            return self._bulk_transfer
+        if not bulk:
+            return BULK_TRANSFER_NONE
+        if self._bulk_transfer == BULK_TRANSFER_NONE:
+            return BULK_TRANSFER_TAR
+        return self._bulk_transfer
+
     def get_attribute(self, path):
         """
         Returns the object Fileattribute, specified in aiida.transport
@@ -50,5 +50,245 @@ class TestBasicConnection(unittest.TestCase):
             pass
 
 
+class TestBulkTransfer(unittest.TestCase):
+    """
+    Test the transfer of files through a tar stream, which only requires a transport that can execute commands.
+    """
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.remote = tempfile.mkdtemp()
+        self.local = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.remote, 'folder', 'subfolder'))
+        for name, content in [('file.txt', 'a'), ('folder/file.txt', 'b'), ('folder/subfolder/file.txt', 'c')]:
+            with open(os.path.join(self.remote, name), 'w') as handle:
+                handle.write(content)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.remote)
+        shutil.rmtree(self.local)
+
+    def _read(self, *path):
+        import os
+
+        with open(os.path.join(*path)) as handle:
+            return handle.read()
+
+    def test_get_bulk(self):
+        import os
+        from aiida.transport.bulk import BULK_TRANSFER_TAR, BULK_TRANSFER_TAR_GZ, get_bulk
+
+        for mode in [BULK_TRANSFER_TAR, BULK_TRANSFER_TAR_GZ]:
+            destination = os.path.join(self.local, mode)
+            with LocalTransport() as transport:
+                transport.chdir(self.remote)
+                retrieved = get_bulk(transport, [
+                    ('file.txt', os.path.join(destination, 'renamed.txt')),
+                    (os.path.join(self.remote, 'folder'), os.path.join(destination, 'folder')),
+                    ('missing.txt', os.path.join(destination, 'missing.txt')),
+                ], mode)
+
+            self.assertEqual(retrieved, {'file.txt', os.path.join(self.remote, 'folder')})
+            self.assertEqual(self._read(destination, 'renamed.txt'), 'a')
+            self.assertEqual(self._read(destination, 'folder', 'file.txt'), 'b')
+            self.assertEqual(self._read(destination, 'folder', 'subfolder', 'file.txt'), 'c')
+            self.assertFalse(os.path.exists(os.path.join(destination, 'missing.txt')))
+
+    def test_put_bulk(self):
+        import os
+        from aiida.transport.bulk import BULK_TRANSFER_TAR, BULK_TRANSFER_TAR_GZ, put_bulk
+
+        for mode in [BULK_TRANSFER_TAR, BULK_TRANSFER_TAR_GZ]:
+            with LocalTransport() as transport:
+                put_bulk(transport, os.path.join(self.remote, 'folder'), os.path.join(self.local, mode), mode)
+
+            self.assertEqual(self._read(self.local, mode, 'file.txt'), 'b')
+            self.assertEqual(self._read(self.local, mode, 'subfolder', 'file.txt'), 'c')
+
+    def test_errors(self):
+        import os
+        from aiida.transport.bulk import BulkTransferError, get_bulk, put_bulk
+
+        with LocalTransport() as transport:
+            self.assertEqual(get_bulk(transport, []), set())
+
+            with self.assertRaises(BulkTransferError):
+                get_bulk(transport, [('../file.txt', os.path.join(self.local, 'file.txt'))])
+
+            with self.assertRaises(ValueError):
+                get_bulk(transport, [(os.path.join(self.remote, 'file.txt'), 'file.txt')])
+
+            # The remote folder cannot be created inside a file
+            with self.assertRaises(BulkTransferError):
+                put_bulk(transport, self.local, os.path.join(self.remote, 'file.txt', 'folder'))
+
+
+class TestUploadCache(unittest.TestCase):
+    """
+    Test the content addressed cache of the uploaded files.
+    """
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.local = tempfile.mkdtemp()
+        self.remote = tempfile.mkdtemp()
+        self.cache = os.path.join(self.remote, 'cache')
+        os.mkdir(os.path.join(self.local, 'folder'))
+        for name, content in [('shared.txt', 'shared'), ('other.txt', 'shared'), ('folder/unique.txt', 'unique')]:
+            with open(os.path.join(self.local, name), 'w') as handle:
+                handle.write(content)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.local)
+        shutil.rmtree(self.remote)
+
+    def _upload(self, transport, link_mode, workdir):
+        import os
+        from aiida.transport.upload_cache import UploadCache
+
+        os.mkdir(os.path.join(self.remote, workdir))
+        transport.chdir(os.path.join(self.remote, workdir))
+        upload_cache = UploadCache(transport, self.cache, link_mode=link_mode)
+        upload_cache.add(os.path.join(self.local, 'shared.txt'), 'shared.txt')
+        upload_cache.add(os.path.join(self.local, 'other.txt'), 'sub/other.txt')
+        upload_cache.add(os.path.join(self.local, 'folder'), 'folder')
+        upload_cache.commit()
+        return upload_cache
+
+    def _cached_files(self):
+        import os
+
+        return [os.path.join(dirpath, filename) for dirpath, _, filenames in os.walk(self.cache)
+                for filename in filenames]
+
+    def test_symlink(self):
+        import os
+        from aiida.transport.upload_cache import LINK_SYMLINK
+
+        with LocalTransport() as transport:
+            self._upload(transport, LINK_SYMLINK, 'job1')
+            self._upload(transport, LINK_SYMLINK, 'job2')
+
+        # The identical files are stored once
+        self.assertEqual(len(self._cached_files()), 2)
+        for workdir in ['job1', 'job2']:
+            for name, content in [('shared.txt', 'shared'), ('sub/other.txt', 'shared'),
+                                  ('folder/unique.txt', 'unique')]:
+                path = os.path.join(self.remote, workdir, name)
+                self.assertTrue(os.path.islink(path))
+                with open(path) as handle:
+                    self.assertEqual(handle.read(), content)
+
+    def test_hardlink_clean(self):
+        import os
+        import shutil
+        import time
+        from aiida.transport.upload_cache import LINK_HARDLINK
+
+        with LocalTransport() as transport:
+            upload_cache = self._upload(transport, LINK_HARDLINK, 'job1')
+            self.assertFalse(os.path.islink(os.path.join(self.remote, 'job1', 'shared.txt')))
+            self.assertEqual(len(self._cached_files()), 2)
+
+            # Entries used recently, or still linked, are kept
+            old = time.time() - 10 * 86400
+            for path in self._cached_files():
+                os.utime(path, (old, old))
+            self.assertEqual(upload_cache.clean(5), [])
+            self.assertEqual(upload_cache.clean(30), [])
+
+            transport.chdir(self.remote)
+            shutil.rmtree(os.path.join(self.remote, 'job1'))
+            self.assertEqual(len(upload_cache.clean(5, dry_run=True)), 2)
+            self.assertEqual(len(self._cached_files()), 2)
+            self.assertEqual(len(upload_cache.clean(5)), 2)
+            self.assertEqual(self._cached_files(), [])
+
+
+class TestOperationBatch(unittest.TestCase):
+    """
+    Test the batches of remote operations, executed one at a time or as a single shell script.
+    """
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.remote = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.remote, 'source'))
+        for name in ['a.upf', 'b.upf', 'code.x']:
+            with open(os.path.join(self.remote, 'source', name), 'w') as handle:
+                handle.write(name)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.remote)
+
+    def _check_batch(self, get_batch):
+        import os
+        import stat
+
+        with LocalTransport() as transport:
+            transport.chdir(self.remote)
+            with get_batch(transport) as batch:
+                batch.makedirs('work dir/sub')
+                batch.makedirs('work dir/sub')
+                batch.mkdir('work dir/sub/job')
+                batch.copy(os.path.join(self.remote, 'source', 'code.x'), 'work dir/sub/job/code.x')
+                batch.chmod('work dir/sub/job/code.x', 0o755)
+                batch.copy(os.path.join(self.remote, 'source', '*.upf'), 'work dir/sub/job')
+                batch.copy(os.path.join(self.remote, 'source', '*.missing'), 'work dir/sub/job')
+                batch.symlink(os.path.join(self.remote, 'source', 'a.upf'), 'work dir/sub/job/link.upf')
+                self.assertEqual(len(batch), 8)
+
+            job = os.path.join(self.remote, 'work dir', 'sub', 'job')
+            self.assertEqual(sorted(os.listdir(job)), ['a.upf', 'b.upf', 'code.x', 'link.upf'])
+            self.assertTrue(os.path.islink(os.path.join(job, 'link.upf')))
+            self.assertEqual(stat.S_IMODE(os.stat(os.path.join(job, 'code.x')).st_mode), 0o755)
+
+            # The directory of the job must not exist yet
+            with self.assertRaises(EnvironmentError):
+                with get_batch(transport) as batch:
+                    batch.mkdir('work dir/sub/job')
+
+            with self.assertRaises(ValueError):
+                get_batch(transport).copy('source', '*.upf')
+
+    def test_sequential(self):
+        self._check_batch(lambda transport: transport.batch())
+
+    def test_shell(self):
+        from aiida.transport.batch import ShellOperationBatch
+
+        self._check_batch(ShellOperationBatch)
+
+    def test_shell_bracket_expression(self):
+        """
+        Test that the characters of the bracket expressions of a pattern are only matched and not run by the shell.
+        """
+        import os
+
+        from aiida.transport.batch import ShellOperationBatch
+
+        with LocalTransport() as transport:
+            transport.chdir(self.remote)
+            with ShellOperationBatch(transport) as batch:
+                batch.mkdir('job')
+                batch.copy(os.path.join(self.remote, 'source', '[!c$(touch injected)].upf'), 'job')
+                batch.copy(os.path.join(self.remote, 'source', '[a-c]ode.x'), 'job')
+
+            self.assertEqual(sorted(os.listdir(os.path.join(self.remote, 'job'))), ['a.upf', 'b.upf', 'code.x'])
+            self.assertEqual(sorted(os.listdir(self.remote)), ['job', 'source'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -59,5 +59,137 @@ class TestBasicConnection(unittest.TestCase):
         logging.disable(logging.NOTSET)
 
 
+class TestParallelTransfer(unittest.TestCase):
+    """
+    Test the transfer of files over several SFTP channels.
+    """
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.source = tempfile.mkdtemp()
+        self.destination = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.source, 'folder'))
+        self.contents = {'empty': b'', 'small': os.urandom(1000), os.path.join('folder', 'large'): os.urandom(300000)}
+        for name, content in self.contents.items():
+            with open(os.path.join(self.source, name), 'wb') as handle:
+                handle.write(content)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.source)
+        shutil.rmtree(self.destination)
+
+    def _check_destination(self, folder):
+        import os
+
+        for name, content in self.contents.items():
+            with open(os.path.join(folder, name), 'rb') as handle:
+                self.assertEqual(handle.read(), content)
+
+    def test_ranges(self):
+        """Files larger than the threshold are transferred in ranges, the callback reports their progress."""
+        import os
+        from aiida.transport.parallel import ParallelSftpTransfer, SftpChannelPool
+
+        progress = []
+        with SshTransport(machine='localhost', timeout=30, load_system_host_keys=True,
+                          key_policy='AutoAddPolicy') as transport:
+            pool = SftpChannelPool(transport.sshclient, 3)
+            transfer = ParallelSftpTransfer(pool, chunk_size=65536, threshold=100000)
+            try:
+                os.mkdir(os.path.join(self.destination, 'folder'))
+                statistics = transfer.get(
+                    [(os.path.join(self.source, name), os.path.join(self.destination, name), len(content))
+                     for name, content in self.contents.items()],
+                    callback=lambda transferred, total: progress.append((transferred, total)))
+            finally:
+                pool.close()
+
+        self._check_destination(self.destination)
+        self.assertEqual(sorted(entry.size for entry in statistics), [0, 1000, 300000])
+        self.assertIn((300000, 300000), progress)
+
+    def test_tree(self):
+        """Folders are put and retrieved over several channels."""
+        import os
+
+        with SshTransport(machine='localhost', timeout=30, load_system_host_keys=True,
+                          key_policy='AutoAddPolicy', transfer_channels=4) as transport:
+            remote = os.path.join(self.destination, 'remote')
+            transport.puttree(self.source, remote, bulk=False)
+            transport.gettree(remote, os.path.join(self.destination, 'local'), bulk=False)
+            transport.getfile(os.path.join(remote, 'small'), os.path.join(self.destination, 'small'))
+
+        self._check_destination(os.path.join(self.destination, 'remote'))
+        self._check_destination(os.path.join(self.destination, 'local'))
+        with open(os.path.join(self.destination, 'small'), 'rb') as handle:
+            self.assertEqual(handle.read(), self.contents['small'])
+
+    def test_existing_local_folders(self):
+        """The listing of a remote tree keeps the local folders that exist already."""
+        import os
+
+        local = os.path.join(self.destination, 'local')
+        os.makedirs(os.path.join(local, 'folder'))
+        with SshTransport(machine='localhost', timeout=30, load_system_host_keys=True,
+                          key_policy='AutoAddPolicy', transfer_channels=4) as transport:
+            items = transport._list_remote_files(self.source, local)  # pylint: disable=protected-access
+
+        self.assertEqual(sorted(os.path.relpath(localpath, local) for _, localpath, _ in items),
+                         sorted(self.contents.keys()))
+
+    def test_invalid_channels(self):
+        with self.assertRaises(ValueError):
+            SshTransport(machine='localhost', transfer_channels=0)
+
+
+class TestBulkTransferFallback(unittest.TestCase):
+    """
+    Test that a failed bulk transfer falls back to SFTP, onto the exact local destinations.
+    """
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.source = tempfile.mkdtemp()
+        self.destination = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.source, 'folder'))
+        for name in ['file.txt', os.path.join('folder', 'nested.txt')]:
+            with open(os.path.join(self.source, name), 'w') as handle:
+                handle.write(name)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.source)
+        shutil.rmtree(self.destination)
+
+    @staticmethod
+    def _get_bulk_and_fail(transport, items, mode):
+        """Write the local destinations like a bulk transfer and then fail, like a stream interrupted at the end."""
+        from aiida.transport.bulk import BulkTransferError, get_bulk
+
+        get_bulk(transport, items, mode)
+        raise BulkTransferError('the stream was interrupted')
+
+    def test_fallback(self):
+        import os
+        import mock
+
+        with SshTransport(machine='localhost', timeout=30, load_system_host_keys=True,
+                          key_policy='AutoAddPolicy') as transport:
+            with mock.patch('aiida.transport.plugins.ssh.get_bulk', new=self._get_bulk_and_fail):
+                transport.get_many([(self.source, os.path.join(self.destination, 'many'))], bulk=True)
+                transport.gettree(self.source, os.path.join(self.destination, 'tree'), bulk=True)
+
+        for folder in ['many', 'tree']:
+            self.assertEqual(sorted(os.listdir(os.path.join(self.destination, folder))), ['file.txt', 'folder'])
+            self.assertEqual(os.listdir(os.path.join(self.destination, folder, 'folder')), ['nested.txt'])
+
+
 if __name__ == '__main__':
     unittest.main()
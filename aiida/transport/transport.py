@@ -53,6 +53,7 @@ class Transport(object):
         self._is_open = False
         self._enters = 0
         self._safe_open_interval = DEFAULT_TRANSPORT_INTERVAL
+        self._whoami = None
 
     def __enter__(self):
         """
@@ -95,6 +96,17 @@ class Transport(object):
     def is_open(self):
         return self._is_open
 
+    def is_alive(self):
+        """
+        Check whether the transport is open and its connection is still usable, for example before reusing a
+        transport that has been kept open for a while.
+
+        Plugins that rely on a connection that can be dropped by the other side should override this method.
+
+        :return: True if the transport can be used, False otherwise
+        """
+        return self.is_open
+
     def open(self):
         """
         Opens a local transport channel
@@ -215,6 +227,23 @@ class Transport(object):
         """
         return self._safe_open_interval
 
+    def batch(self):
+        """
+        Return a batch of operations on the remote file system, which are collected and executed together, in
+        order, either with :py:meth:`OperationBatch.execute` or when leaving its context::
+
+            with transport.batch() as batch:
+                batch.makedirs(path)
+                batch.chmod(os.path.join(path, 'code.x'), 0o755)
+
+        By default the operations are executed one at a time with the methods of this transport, transports for
+        which every operation costs a round trip should execute them all at once.
+
+        :return: an instance of :py:class:`aiida.transport.batch.OperationBatch`
+        """
+        from aiida.transport.batch import SequentialOperationBatch
+        return SequentialOperationBatch(self)
+
     def chdir(self, path):
         """
         Change directory to 'path'
@@ -393,6 +422,19 @@ class Transport(object):
         """
         raise NotImplementedError
 
+    def get_many(self, items, ignore_nonexisting=False):
+        """
+        Retrieve many files or folders from remote sources to local destinations.
+        By default they are retrieved one at a time with :py:meth:`get`, transports
+        may implement a more efficient transfer.
+
+        :param items: a list of tuples (remotepath, localpath), where the local paths
+            must be absolute
+        :param ignore_nonexisting: if True, skip the remote paths that do not exist
+        """
+        for remotepath, localpath in items:
+            self.get(remotepath, localpath, ignore_nonexisting=ignore_nonexisting)
+
     def getcwd(self):
         """
         Get working directory
@@ -633,19 +675,22 @@ class Transport(object):
 
     def whoami(self):
         """
-        Get the remote username
+        Get the remote username, which is only retrieved once per transport instance
 
         :return: list of username (str),
                  retval (int),
                  stderr (str)
         """
+        if self._whoami is not None:
+            return self._whoami
 
         command = 'whoami'
         retval, username, stderr = self.exec_command_wait(command)
         if retval == 0:
             if stderr.strip():
                 self.logger.warning("There was nonempty stderr in the whoami " "command: {}".format(stderr))
-            return username.strip()
+            self._whoami = username.strip()
+            return self._whoami
         else:
             self.logger.error("Problem executing whoami. Exit code: {}, stdout: '{}', "
                               "stderr: '{}'".format(retval, username, stderr))
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Content addressed cache of the files uploaded to a computer.
+
+Every file is stored in the cache directory of the computer under the hash of its content, such that a file shared by
+many calculations, like a pseudopotential, is uploaded only once and then linked into the working directory of every
+calculation. The entries are read-only, such that a calculation cannot modify them in place, and the modification time
+of an entry is updated every time it is used, such that the entries that are no longer used can be removed with
+:py:meth:`UploadCache.clean`.
+
+A batch of files is added with :py:meth:`UploadCache.add` and transferred with :py:meth:`UploadCache.commit`, which
+takes two commands executed on the computer plus the upload of the files that are not yet cached.
+"""
+from __future__ import absolute_import
+import collections
+import os
+import posixpath
+import uuid
+
+from aiida.common.utils import escape_for_bash
+
+__all__ = ['LINK_MODES', 'UploadCache', 'get_upload_cache']
+
+#: The ways in which the entries of the cache are linked into the working directories
+LINK_SYMLINK = 'symlink'
+LINK_HARDLINK = 'hardlink'
+LINK_MODES = (LINK_SYMLINK, LINK_HARDLINK)
+
+#: The suffix of the entries of executable files, whose mode differs from the other entries
+_EXECUTABLE_SUFFIX = '.x'
+
+
+def get_upload_cache(computer, transport):
+    """
+    Return the upload cache of a computer, if it is configured
+
+    :param computer: the computer
+    :param transport: an open transport to the computer
+    :return: an UploadCache or None if the computer does not have an upload cache directory
+    """
+    directory = computer.get_upload_cache_directory()
+    if not directory:
+        return None
+
+    return UploadCache(transport, directory.format(username=transport.whoami()),
+                       link_mode=computer.get_upload_cache_link_mode())
+
+
+class UploadCache(object):
+    """
+    The content addressed cache of the files uploaded to a computer, in a directory of the computer.
+    """
+
+    def __init__(self, transport, directory, link_mode=LINK_SYMLINK):
+        """
+        :param transport: an open transport to the computer
+        :param directory: the absolute path of the cache directory on the computer
+        :param link_mode: whether the entries are linked into the working directories with symbolic or hard links.
+            Hard links keep the files of a working directory valid if the entries are removed, but if the cache
+            directory is on a different file system than the working directory the entries are copied instead.
+        """
+        if not posixpath.isabs(directory):
+            raise ValueError('The upload cache directory must be an absolute path: {}'.format(directory))
+        if link_mode not in LINK_MODES:
+            raise ValueError('The link mode must be one of {}'.format(', '.join(LINK_MODES)))
+
+        self._transport = transport
+        self._directory = directory
+        self._link_mode = link_mode
+        self._files = collections.OrderedDict()  # Mapping: {remotepath: (localpath, executable)}
+        self._folders = []
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def add(self, localpath, remotepath, executable=None):
+        """
+        Add a local file or folder to upload to a path relative to the current directory of the transport
+
+        A folder is copied recursively into the remote path, which is created if it does not exist. A file added to
+        the same remote path as a previous file replaces it.
+
+        :param localpath: the absolute local path of a file or folder
+        :param remotepath: the remote path, relative to the current directory of the transport
+        :param executable: whether the remote file should be executable. Default = None, which uses the executable
+            bit of the local files.
+        """
+        if not os.path.isabs(localpath):
+            raise ValueError('The localpath must be an absolute path: {}'.format(localpath))
+
+        if not os.path.isdir(localpath):
+            self._add_file(localpath, remotepath, executable)
+            return
+
+        self._folders.append(remotepath)
+        for dirpath, dirnames, filenames in os.walk(localpath):
+            relpath = os.path.relpath(dirpath, localpath)
+            for dirname in dirnames:
+                self._folders.append(posixpath.normpath(posixpath.join(remotepath, relpath, dirname)))
+            for filename in filenames:
+                self._add_file(os.path.join(dirpath, filename),
+                               posixpath.normpath(posixpath.join(remotepath, relpath, filename)), executable)
+
+    def _add_file(self, localpath, remotepath, executable):
+        if executable is None:
+            executable = os.access(localpath, os.X_OK)
+        self._files.pop(remotepath, None)
+        self._files[remotepath] = (localpath, executable)
+
+    def commit(self):
+        """
+        Upload the files that are not yet in the cache and link all the added files into their remote paths
+
+        :raise IOError: if the files could not be linked, in which case some of the remote paths may not exist
+        """
+        from aiida.common.hashing import make_file_hash
+
+        if not self._files and not self._folders:
+            return
+
+        entries = collections.OrderedDict()  # Mapping: {entry: localpath}
+        links = []
+        for remotepath, (localpath, executable) in self._files.items():
+            entry = make_file_hash(localpath) + (_EXECUTABLE_SUFFIX if executable else '')
+            entries.setdefault(entry, localpath)
+            links.append((self._get_entry_path(entry), remotepath))
+
+        missing = self._get_missing_entries(entries)
+
+        # The files are uploaded to temporary paths, which are renamed atomically when linking, such that a file that
+        # is being uploaded is never seen by another process that uploads or links the same entry
+        script = ['set -e']
+        for entry in missing:
+            temporary = '{}.tmp.{}'.format(self._get_entry_path(entry), uuid.uuid4().hex)
+            self._transport.putfile(entries[entry], temporary)
+            mode = '555' if entry.endswith(_EXECUTABLE_SUFFIX) else '444'
+            script.append('chmod {} {path} && mv -f {path} {}'.format(
+                mode, escape_for_bash(self._get_entry_path(entry)), path=escape_for_bash(temporary)))
+
+        if entries:
+            script.append('touch -c {}'.format(' '.join(escape_for_bash(self._get_entry_path(entry))
+                                                        for entry in entries)))
+
+        for folder in self._folders:
+            script.append('mkdir -p {}'.format(escape_for_bash(folder)))
+
+        for entry_path, remotepath in links:
+            parent = posixpath.dirname(remotepath)
+            if parent:
+                script.append('mkdir -p {}'.format(escape_for_bash(parent)))
+            script.append('rm -f {dst}'.format(dst=escape_for_bash(remotepath)))
+            if self._link_mode == LINK_SYMLINK:
+                script.append('ln -s {src} {dst}'.format(src=escape_for_bash(entry_path),
+                                                        dst=escape_for_bash(remotepath)))
+            else:
+                script.append('ln {src} {dst} 2>/dev/null || cp {src} {dst}'.format(
+                    src=escape_for_bash(entry_path), dst=escape_for_bash(remotepath)))
+
+        self._run_script(script)
+
+        self._transport.logger.debug('Linked {} files from the upload cache {}, of which {} were uploaded'.format(
+            len(links), self._directory, len(missing)))
+        self._files.clear()
+        self._folders = []
+
+    def clean(self, max_age, dry_run=False):
+        """
+        Remove the entries of the cache that were not used for a given number of days
+
+        With hard links, the entries that are still linked into a working directory are kept. The temporary files of
+        uploads that were interrupted are removed as well.
+
+        :param max_age: the number of days after the last use of an entry after which it is removed
+        :param dry_run: if True, only return the entries that would be removed
+        :return: the list of the paths of the entries removed
+        """
+        command = 'if [ -d {directory} ]; then find {directory} -type f -mtime +{age}{links} -print{delete}; fi'.format(
+            directory=escape_for_bash(self._directory), age=int(max_age),
+            links=' -links 1' if self._link_mode == LINK_HARDLINK else '', delete='' if dry_run else ' -delete')
+        retval, stdout, stderr = self._transport.exec_command_wait(command)
+        if retval != 0:
+            raise IOError('Cleaning the upload cache {} failed: {}'.format(self._directory, stderr.strip()))
+        return [line for line in stdout.splitlines() if line]
+
+    def _get_entry_path(self, entry):
+        """
+        Return the remote path of an entry, sharded by the first two characters of its hash
+
+        :param entry: the name of the entry
+        :return: the absolute remote path
+        """
+        return posixpath.join(self._directory, entry[:2], entry[2:])
+
+    def _get_missing_entries(self, entries):
+        """
+        Return the entries that are not in the cache, and create the directories in which they are uploaded
+
+        :param entries: the names of the entries
+        :return: the list of the names of the missing entries
+        """
+        script = ['cd {}'.format(escape_for_bash(self._directory))]
+        script.append('mkdir -p {}'.format(' '.join(sorted(set(entry[:2] for entry in entries)))))
+        for entry in entries:
+            script.append('[ -e {path} ] || echo {entry}'.format(
+                path=posixpath.join(entry[:2], entry[2:]), entry=entry))
+
+        retval, stdout, stderr = self._transport.exec_command_wait(
+            'mkdir -p {} && bash -s'.format(escape_for_bash(self._directory)), stdin='\n'.join(script) + '\n')
+        if retval != 0:
+            raise IOError('Checking the upload cache {} failed: {}'.format(self._directory, stderr.strip()))
+
+        missing = set(stdout.split())
+        return [entry for entry in entries if entry in missing]
+
+    def _run_script(self, script):
+        """
+        Run a script on the computer, in the current directory of the transport
+
+        :param script: the list of lines of the script
+        :raise IOError: if the script failed
+        """
+        retval, _, stderr = self._transport.exec_command_wait('bash -s', stdin='\n'.join(script) + '\n')
+        if retval != 0:
+            raise IOError('Linking the files from the upload cache {} failed: {}'.format(
+                self._directory, stderr.strip()))
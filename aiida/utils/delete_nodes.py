@@ -13,6 +13,9 @@ from __future__ import absolute_import
 from __future__ import print_function
 from six.moves import zip, input
 
+# Number of repository folders after which the progress of their removal is reported
+FOLDER_PROGRESS_INTERVAL = 1000
+
 
 def delete_nodes(pks, follow_calls=False, follow_returns=False, 
                  dry_run=False, force=False, disable_checks=False, verbosity=0):
@@ -20,6 +23,8 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
     Delete nodes by a list of pks
 
     :note: The script will also delete all children calculations generated from the specified nodes.
+        The set of nodes to delete is computed with a single recursive query on the links, after which the nodes,
+        their links and their repository folders are deleted in bulk.
 
     :param pks: a list of the PKs of the nodes to delete
     :param bool follow_calls: Follow calls
@@ -42,6 +47,8 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
     from aiida.orm.calculation import Calculation
     from aiida.orm.data import Data
     from aiida.orm import load_node
+    from aiida.common.folders import RepositoryFolder
+    from aiida.work.persistence import CHECKPOINT_REPOSITORY_SECTION
     from aiida.orm.backend import construct_backend
     from aiida.backends.utils import delete_nodes_and_connections
 
@@ -55,32 +62,20 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
             print("Nothing to delete")
         return
 
-    # The following code is just for the querying of downwards provenance.
-    # Ideally, there should be a module to interface with, but this is the solution for now.
-    # By only dealing with ids, and keeping track of what has been already
-    # visited in the query, there's good performance and no infinite loops.
+    # The closure of the nodes to delete along the followed links is computed by the database in a single
+    # recursive query, which also takes care of loops in the provenance graph.
     link_types_to_follow = [LinkType.CREATE.value, LinkType.INPUT.value]
     if follow_calls:
         link_types_to_follow.append(LinkType.CALL.value)
     if follow_returns:
         link_types_to_follow.append(LinkType.RETURN.value)
 
-    edge_filters = {'type': {'in': link_types_to_follow}}
-
-    # Operational set always includes the recently (in the last iteration added) nodes.
-    operational_set = set().union(set(pks))  # Union to copy the set!
-    pks_set_to_delete = set().union(set(pks))
-    while operational_set:
-        # new_pks_set are the the pks of all nodes that are connected to the operational node set
-        # with the links specified.
-        new_pks_set = set([i for i, in QueryBuilder().append(
-            Node, filters={'id': {'in': operational_set}}).append(
-            Node, project='id', edge_filters=edge_filters).iterall()])
-        # The operational set is only those pks that haven't been yet put into the pks_set_to_delete.
-        operational_set = new_pks_set.difference(pks_set_to_delete)
+    pks_set_to_delete = backend.query_manager.get_outgoing_closure(pks, link_types_to_follow)
 
-        # I add these pks in the pks_set_to_delete with a union
-        pks_set_to_delete = pks_set_to_delete.union(new_pks_set)
+    if not pks_set_to_delete:
+        if verbosity:
+            print("Nothing to delete")
+        return
 
     if verbosity > 0:
         print("I {} delete {} node{}"
@@ -156,11 +151,20 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
             print("Exiting without deleting")
             return
 
-    # Recover the list of folders to delete before actually deleting
-    # the nodes.  I will delete the folders only later, so that if
-    # there is a problem during the deletion of the nodes in
-    # the DB, I don't delete the folders
-    folders = [load_node(_).folder for _ in pks_set_to_delete]
+    # Recover the list of folders to delete before actually deleting the nodes. The folders are derived from the
+    # UUIDs, which are retrieved with a single query, instead of loading every node. I will delete the folders only
+    # later, so that if there is a problem during the deletion of the nodes in the DB, I don't delete the folders
+    uuids = [uuid for uuid, in QueryBuilder().append(
+        Node, filters={'id': {'in': pks_set_to_delete}}, project='uuid').iterall()]
+    folders = [
+        RepositoryFolder(section=section, uuid=uuid)
+        for uuid in uuids
+        for section in (Node._section_name, CHECKPOINT_REPOSITORY_SECTION)  # pylint: disable=protected-access
+    ]
+
+    if verbosity > 0:
+        print("Deleting {} node{} and their links from the database".format(
+            len(pks_set_to_delete), 's' if len(pks_set_to_delete) > 1 else ''))
 
     delete_nodes_and_connections(pks_set_to_delete)
 
@@ -184,6 +188,11 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
 
     # If we are here, we managed to delete the entries from the DB.
     # I can now delete the folders
-    for f in folders:
-        f.erase()
+    if verbosity > 0:
+        print("Deleting the repository folders of {} node{}".format(len(uuids), 's' if len(uuids) > 1 else ''))
+
+    for count, folder in enumerate(folders, start=1):
+        folder.erase()
+        if verbosity > 1 and (count % FOLDER_PROGRESS_INTERVAL == 0 or count == len(folders)):
+            print("   removed {}/{} repository folders".format(count, len(folders)))
 
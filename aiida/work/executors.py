@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Pools of threads on which the blocking operations of the tasks of the processes are run, outside of the event loop.
+
+The transport tasks of the job calculations, like submitting or retrieving a job, spend most of their time waiting for
+the remote computer or the database. Running them directly on the event loop of a runner stalls all the other processes
+of that runner, as well as the heartbeats of the connection to RabbitMQ, for as long as they take. Instead they are run
+on bounded pools of threads and the coroutines yield until they are done::
+
+    @tornado.gen.coroutine
+    def submit_task(executor, transport_queue, authinfo, node):
+        with transport_queue.request_transport(authinfo) as request:
+            transport = yield request
+            yield executor.run_transport_task(authinfo, submit, node.pk, transport)
+
+The same transport is shared by all the tasks that use the same authinfo and its current directory is part of its
+state, so the tasks of the same authinfo are run one at a time, while those of different authinfos run concurrently.
+"""
+from __future__ import absolute_import
+import logging
+
+import tornado.gen
+import tornado.ioloop
+import tornado.locks
+
+__all__ = []
+
+_LOGGER = logging.getLogger(__name__)
+
+#: The interval in seconds at which the lag of the event loop is measured
+DEFAULT_LOOP_LAG_INTERVAL = 1.
+#: The lag of the event loop in seconds above which a warning is logged
+DEFAULT_LOOP_LAG_WARNING = 5.
+
+
+def _release_database_session():
+    """
+    Release the database session of the current thread, such that the nodes loaded by a task are not kept in memory and
+    the connection is returned to the pool of the engine. Only the SQLAlchemy backend keeps such a session per thread.
+    """
+    from aiida.backends import settings
+    from aiida.backends.profile import BACKEND_SQLA
+
+    if settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+        if session is not None:
+            session.close()
+
+
+def _run_in_thread(function, args, kwargs):
+    """
+    Call a function in a thread of a pool and release the database session of the thread afterwards
+
+    :param function: the function
+    :param args: the positional arguments of the function
+    :param kwargs: the keyword arguments of the function
+    :return: the return value of the function
+    """
+    try:
+        return function(*args, **kwargs)
+    finally:
+        _release_database_session()
+
+
+class _Pool(object):
+    """A pool of threads, or the event loop itself if its size is zero, with the number of tasks it ran."""
+
+    def __init__(self, name, size):
+        """
+        :param name: the name of the pool
+        :param size: the maximum number of threads, zero to run the tasks directly
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if size < 0:
+            raise ValueError('The size of the {} pool cannot be negative'.format(name))
+
+        self._size = size
+        self._executor = ThreadPoolExecutor(max_workers=size) if size > 0 else None
+        self._pending = 0
+        self._completed = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    @tornado.gen.coroutine
+    def run(self, function, *args, **kwargs):
+        """
+        Run a function in a thread of the pool
+
+        :param function: the function
+        :return: the return value of the function
+        """
+        self._pending += 1
+        try:
+            if self._executor is None:
+                result = function(*args, **kwargs)
+            else:
+                result = yield self._executor.submit(_run_in_thread, function, args, kwargs)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+        raise tornado.gen.Return(result)
+
+    def get_statistics(self):
+        return {'size': self._size, 'pending': self._pending, 'completed': self._completed}
+
+    def close(self):
+        """Let the running tasks finish, without waiting for them, and refuse new ones."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+class TaskExecutor(object):
+    """
+    A pool of threads for the transport operations and one for the database operations of the tasks of the processes.
+
+    A pool of size zero runs its tasks directly on the event loop, which is what the runners that are not daemon workers
+    do. Since a task run in a thread cannot use the nodes loaded in the thread of the event loop, with the SQLAlchemy
+    backend, it should be passed their pks and load them from the database, and the thread of the event loop sees their
+    modifications the next time they are read.
+    """
+
+    def __init__(self, transport_pool_size=0, database_pool_size=0):
+        """
+        :param transport_pool_size: the number of threads that run the tasks that use a transport
+        :param database_pool_size: the number of threads that run the tasks that only use the database
+        """
+        self._transport_pool = _Pool('transport', transport_pool_size)
+        self._database_pool = _Pool('database', database_pool_size)
+        self._transport_locks = {}  # Mapping: {authinfo id: Lock}
+        self._transport_tasks = {}  # Mapping: {authinfo id: number of tasks running or waiting for the lock}
+        self._transport_waits = 0
+
+    @property
+    def transport_pool_size(self):
+        return self._transport_pool.size
+
+    @property
+    def database_pool_size(self):
+        return self._database_pool.size
+
+    @tornado.gen.coroutine
+    def run_transport_task(self, authinfo, function, *args, **kwargs):
+        """
+        Run a function that uses the transport of an authinfo in the transport pool, once the previous tasks of the same
+        authinfo are done
+
+        :param authinfo: the authinfo of the transport
+        :param function: the function
+        :return: the return value of the function
+        """
+        lock = self._transport_locks.setdefault(authinfo.id, tornado.locks.Lock())
+
+        if self._transport_tasks.get(authinfo.id, 0) > 0:
+            self._transport_waits += 1
+
+        self._transport_tasks[authinfo.id] = self._transport_tasks.get(authinfo.id, 0) + 1
+        try:
+            with (yield lock.acquire()):
+                result = yield self._transport_pool.run(function, *args, **kwargs)
+        finally:
+            self._transport_tasks[authinfo.id] -= 1
+
+        raise tornado.gen.Return(result)
+
+    @tornado.gen.coroutine
+    def run_database_task(self, function, *args, **kwargs):
+        """
+        Run a function that only uses the database in the database pool
+
+        :param function: the function
+        :return: the return value of the function
+        """
+        result = yield self._database_pool.run(function, *args, **kwargs)
+        raise tornado.gen.Return(result)
+
+    def get_statistics(self):
+        """
+        Get the statistics of the pools, which is a dictionary with the following keys:
+
+            * transport: the size of the transport pool, the number of its tasks that are pending and completed
+            * database: the size of the database pool, the number of its tasks that are pending and completed
+            * transport_waits: the number of transport tasks that had to wait for another one of the same authinfo
+
+        The pending tasks are both those that are running and those that wait for a thread.
+
+        :return: dictionary with the statistics
+        """
+        return {
+            'transport': self._transport_pool.get_statistics(),
+            'database': self._database_pool.get_statistics(),
+            'transport_waits': self._transport_waits,
+        }
+
+    def close(self):
+        """Close the pools, letting the tasks that are running finish."""
+        self._transport_pool.close()
+        self._database_pool.close()
+
+
+class LoopLagMonitor(object):
+    """
+    Measure how late the event loop runs the callbacks, which is the time for which it was blocked by another callback.
+
+    A callback is scheduled at a fixed interval and the difference between the time at which it is run and the time at
+    which it was scheduled is the lag of the loop. A warning is logged when the lag exceeds a threshold.
+    """
+
+    def __init__(self, loop=None, interval=DEFAULT_LOOP_LAG_INTERVAL, warning_threshold=DEFAULT_LOOP_LAG_WARNING):
+        """
+        :param loop: the event loop to monitor, will use tornado.ioloop.IOLoop.current() if not supplied
+        :param interval: the interval in seconds between two measures of the lag
+        :param warning_threshold: the lag in seconds above which a warning is logged
+        """
+        self._loop = loop if loop is not None else tornado.ioloop.IOLoop.current()
+        self._interval = interval
+        self._warning_threshold = warning_threshold
+        self._handle = None
+        self.reset_statistics()
+
+    def is_running(self):
+        return self._handle is not None
+
+    def start(self):
+        """Start measuring the lag of the loop."""
+        if self._handle is None:
+            self._schedule()
+
+    def stop(self):
+        """Stop measuring the lag of the loop."""
+        if self._handle is not None:
+            self._loop.remove_timeout(self._handle)
+            self._handle = None
+
+    def reset_statistics(self):
+        """Forget the lags measured until now."""
+        self._samples = 0
+        self._total = 0.
+        self._last = 0.
+        self._max = 0.
+
+    def get_statistics(self):
+        """
+        Get the statistics of the lag of the loop since the last reset, which is a dictionary with the following keys:
+
+            * samples: the number of times the lag was measured
+            * last: the last lag in seconds
+            * mean: the mean lag in seconds
+            * max: the maximum lag in seconds
+
+        :return: dictionary with the statistics
+        """
+        return {
+            'samples': self._samples,
+            'last': self._last,
+            'mean': self._total / self._samples if self._samples else 0.,
+            'max': self._max,
+        }
+
+    def _schedule(self):
+        deadline = self._loop.time() + self._interval
+        self._handle = self._loop.call_at(deadline, self._measure, deadline)
+
+    def _measure(self, deadline):
+        """
+        Record the lag of the callback scheduled at the given deadline and schedule the next one
+
+        :param deadline: the time at which the callback should have run, according to the clock of the loop
+        """
+        lag = max(self._loop.time() - deadline, 0.)
+
+        self._samples += 1
+        self._total += lag
+        self._last = lag
+        self._max = max(self._max, lag)
+
+        if lag > self._warning_threshold:
+            _LOGGER.warning('the event loop was blocked for %.1f seconds', lag)
+
+        self._schedule()
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Module containing utilities and classes relating to job calculations running on a computer."""
+from __future__ import absolute_import
+import contextlib
+import logging
+import time
+
+import six
+import tornado.concurrent
+import tornado.gen
+
+__all__ = ['JobsList', 'JobManager']
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JobsList(object):
+    """
+    A list of submitted jobs on a machine connected to through an authinfo.
+
+    Instead of querying the scheduler once for every job calculation, clients register their interest in the state of
+    a job by requesting an update, which is given back as a future. At most once every minimum poll interval, as
+    configured on the computer, the scheduler is asked for the state of all jobs in one go and the result is used to
+    resolve all the futures that were requested up to that point. This way the number of calls to the scheduler is
+    independent of the number of active job calculations.
+    """
+
+    def __init__(self, authinfo, transport_queue, last_updated=None, executor=None):
+        """
+        :param authinfo: the authinfo used to connect to the computer
+        :param transport_queue: the TransportQueue from which to request a Transport
+        :param last_updated: optional timestamp, as returned by time.time(), of the last time the jobs were updated
+        :param executor: optional TaskExecutor on which the scheduler is queried, by default it is queried on the loop
+        """
+        if last_updated is not None and not isinstance(last_updated, float):
+            raise TypeError('last_updated has to be a float or None, got {}'.format(type(last_updated)))
+
+        self._authinfo = authinfo
+        self._transport_queue = transport_queue
+        self._executor = executor
+        self._loop = transport_queue.loop()
+
+        self._jobs_cache = {}
+        self._job_update_requests = {}  # Mapping: {job_id: Future}
+        self._last_updated = last_updated
+        self._update_handle = None
+
+    @property
+    def last_updated(self):
+        """
+        Get the timestamp of the last time the job states were retrieved from the scheduler
+
+        :return: the timestamp as returned by time.time() or None if the jobs were never updated
+        """
+        return self._last_updated
+
+    def get_minimum_update_interval(self):
+        """
+        Get the minimum interval that should be respected between two consecutive queries of the scheduler
+
+        :return: the minimum interval in seconds
+        """
+        return self._authinfo.computer.get_minimum_job_poll_interval()
+
+    @tornado.gen.coroutine
+    def _get_jobs_from_scheduler(self, job_ids):
+        """
+        Get the current jobs list from the scheduler with a single call
+
+        :param job_ids: the ids of the jobs to query for, in case the scheduler cannot query by user
+        :return: a dictionary mapping the job id onto its JobInfo
+        """
+        with self._transport_queue.request_transport(self._authinfo) as request:
+            transport = yield request
+
+            scheduler = self._authinfo.computer.get_scheduler()
+            scheduler.set_transport(transport)
+
+            kwargs = {'as_dict': True}
+            if scheduler.get_feature('can_query_by_user'):
+                kwargs['user'] = '$USER'
+            else:
+                # In general schedulers can either query by user or by jobs, but not both
+                # (see also docs of the Scheduler class)
+                kwargs['jobs'] = [six.text_type(job_id) for job_id in job_ids]
+
+            try:
+                if self._executor is None:
+                    scheduler_response = scheduler.getJobs(**kwargs)
+                else:
+                    scheduler_response = yield self._executor.run_transport_task(
+                        self._authinfo, scheduler.getJobs, **kwargs)
+            finally:
+                # Also a failed query counts as an update, such that the minimum interval is respected when retrying
+                self._last_updated = time.time()
+
+            _LOGGER.info('AuthInfo<%s>: retrieved the state of %d jobs', self._authinfo.id, len(scheduler_response))
+
+            raise tornado.gen.Return(dict(scheduler_response))
+
+    @tornado.gen.coroutine
+    def _update_job_info(self):
+        """
+        Update all the requested job information from the scheduler and resolve the outstanding update requests
+
+        The futures of the requests are resolved with the JobInfo of the corresponding job, or with None if the job
+        was not returned by the scheduler. If the scheduler could not be queried, the exception is set on all futures.
+        """
+        # Take the current requests: requests made while the scheduler is being queried will be served in the next
+        # update, as the information that is being retrieved may already be outdated for them
+        update_requests = self._job_update_requests
+        self._job_update_requests = {}
+
+        if not any(not future.done() for future in update_requests.values()):
+            return
+
+        try:
+            self._jobs_cache = yield self._get_jobs_from_scheduler(list(update_requests.keys()))
+        except Exception as exception:  # pylint: disable=broad-except
+            _LOGGER.warning('AuthInfo<%s>: failed to retrieve the jobs from the scheduler: %s', self._authinfo.id,
+                            exception)
+            for future in update_requests.values():
+                if not future.done():
+                    future.set_exception(exception)
+        else:
+            for job_id, future in update_requests.items():
+                if not future.done():
+                    future.set_result(self._jobs_cache.get(job_id, None))
+
+    @contextlib.contextmanager
+    def request_job_info_update(self, job_id):
+        """
+        Request an update of the job information for a given job id. The client will be given back a future that can
+        be yielded to get the JobInfo once the scheduler has been polled::
+
+            @tornado.gen.coroutine
+            def update_task(jobs_list, job_id):
+                with jobs_list.request_job_info_update(job_id) as request:
+                    job_info = yield request
+
+        :param job_id: the job identifier
+        :return: a future that can be yielded to give the JobInfo, which will be None if the job was not found
+        """
+        future = self._job_update_requests.setdefault(job_id, tornado.concurrent.Future())
+        self._ensure_updating()
+
+        yield future
+
+    def _ensure_updating(self):
+        """Ensure that an update of the job information is scheduled, if it is not scheduled already."""
+        if self._update_handle is not None:
+            return
+
+        @tornado.gen.coroutine
+        def updating():
+            """Perform the update and reschedule it if there are requests that came in in the meantime."""
+            try:
+                yield self._update_job_info()
+            finally:
+                if self._update_requests_outstanding():
+                    self._update_handle = self._loop.call_later(self._get_next_update_delay(), updating)
+                else:
+                    self._update_handle = None
+
+        self._update_handle = self._loop.call_later(self._get_next_update_delay(), updating)
+
+    def _get_next_update_delay(self):
+        """
+        Calculate when the next update of the job information should occur, respecting the minimum update interval
+
+        :return: the delay in seconds
+        """
+        if self.last_updated is None:
+            return 0.
+
+        elapsed = time.time() - self.last_updated
+        return max(self.get_minimum_update_interval() - elapsed, 0.)
+
+    def _update_requests_outstanding(self):
+        """Return whether there are any update requests that have not yet been resolved."""
+        return any(not future.done() for future in self._job_update_requests.values())
+
+
+class JobManager(object):
+    """
+    A manager for the job calculations that are running on the computers connected to through authinfos.
+
+    For each authinfo, a single JobsList is kept such that the state of all the jobs of a given user on a given
+    computer is retrieved from the scheduler with a single call.
+    """
+
+    def __init__(self, transport_queue, executor=None):
+        """
+        :param transport_queue: the TransportQueue from which to request a Transport
+        :param executor: optional TaskExecutor on which the schedulers are queried, by default they are queried on the
+            loop
+        """
+        self._transport_queue = transport_queue
+        self._executor = executor
+        self._job_lists = {}
+
+    @property
+    def transport_queue(self):
+        """Return the transport queue used by this job manager to request transports."""
+        return self._transport_queue
+
+    def get_jobs_list(self, authinfo):
+        """
+        Get or create the jobs list for the given authinfo
+
+        :param authinfo: the authinfo
+        :return: a JobsList instance
+        """
+        if authinfo.id not in self._job_lists:
+            self._job_lists[authinfo.id] = JobsList(authinfo, self._transport_queue, executor=self._executor)
+
+        return self._job_lists[authinfo.id]
+
+    @contextlib.contextmanager
+    def request_job_info_update(self, authinfo, job_id):
+        """
+        Request an update of the job information of the job with the given id on the computer of the given authinfo::
+
+            @tornado.gen.coroutine
+            def update_task(job_manager, authinfo, job_id):
+                with job_manager.request_job_info_update(authinfo, job_id) as request:
+                    job_info = yield request
+
+        :param authinfo: the authinfo used to connect to the computer
+        :param job_id: the job identifier
+        :return: a future that can be yielded to give the JobInfo, which will be None if the job was not found
+        """
+        with self.get_jobs_list(authinfo).request_job_info_update(job_id) as request:
+            yield request
@@ -47,18 +47,32 @@ TRANSPORT_TASK_MAXIMUM_ATTEMTPS = 5
 logger = logging.getLogger(__name__)
 
 
+def _call_on_node(function, pk, *args):
+    """
+    Call an execmanager function on a job calculation loaded in the current thread, which may be a thread of the pools
+    of the TaskExecutor that cannot use the node loaded in the thread of the event loop
+
+    :param function: the execmanager function, which takes the node as its first argument
+    :param pk: the pk of the job calculation
+    :return: the return value of the function
+    """
+    from aiida.orm import load_node
+    return function(load_node(pk), *args)
+
+
 @coroutine
-def task_submit_job(node, transport_queue, calc_info, script_filename, cancel_flag):
+def task_submit_job(node, transport_queue, executor, calc_info, script_filename, cancel_flag):
     """
     Transport task that will attempt to submit a job calculation
 
     The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
-    If all retries fail, the task will raise a TransportTaskException
+    function is run in the transport pool of the executor, wrapped in the exponential_backoff_retry coroutine, which,
+    in case of a caught exception, will retry after an interval that increases exponentially with the number of
+    retries, for a maximum number of retries. If all retries fail, the task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
     :param transport_queue: the TransportQueue from which to request a Transport
+    :param executor: the TaskExecutor on which the blocking operations are run
     :param calc_info: the calculation info datastructure returned by `JobCalculation._presubmit`
     :param script_filename: the job launch script returned by `JobCalculation._presubmit`
     :param cancel_flag: the cancelled flag that will be queried to determine whether the task was cancelled
@@ -80,7 +94,9 @@ def task_submit_job(node, transport_queue, calc_info, script_filename, cancel_fl
                 raise plumpy.CancelledError('task_submit_job for calculation<{}> cancelled'.format(node.pk))
 
             logger.info('submitting calculation<{}>'.format(node.pk))
-            raise Return(execmanager.submit_calculation(node, transport, calc_info, script_filename))
+            result = yield executor.run_transport_task(authinfo, _call_on_node, execmanager.submit_calculation,
+                                                       node.pk, transport, calc_info, script_filename)
+            raise Return(result)
 
     state_pending = calc_states.SUBMITTING
     state_success = calc_states.WITHSCHEDULER
@@ -105,17 +121,20 @@ def task_submit_job(node, transport_queue, calc_info, script_filename, cancel_fl
 
 
 @coroutine
-def task_update_job(node, transport_queue, cancel_flag):
+def task_update_job(node, job_manager, executor, cancel_flag):
     """
     Transport task that will attempt to update the scheduler state of a job calculation
 
-    The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
+    The task will first request an update of the job information from the job manager, which will poll the scheduler
+    for all the jobs of the same authinfo at once. If the job is done, a transport is requested from the queue to
+    retrieve the detailed job information. The relevant execmanager function is run in the transport pool of the
+    executor, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will retry after
+    an interval that increases exponentially with the number of retries, for a maximum number of retries.
     If all retries fail, the task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
-    :param transport_queue: the TransportQueue from which to request a Transport
+    :param job_manager: the JobManager from which to request the job information and transports
+    :param executor: the TaskExecutor on which the blocking operations are run
     :param cancel_flag: the cancelled flag that will be queried to determine whether the task was cancelled
     :raises: Return if the tasks was successfully completed
     :raises: TransportTaskException if after the maximum number of retries the transport task still excepted
@@ -124,10 +143,24 @@ def task_update_job(node, transport_queue, cancel_flag):
     max_attempts = TRANSPORT_TASK_MAXIMUM_ATTEMTPS
 
     authinfo = node.get_computer().get_authinfo(node.get_user())
+    job_id = node.get_job_id()
 
     @coroutine
     def do_update():
-        with transport_queue.request_transport(authinfo) as request:
+        with job_manager.request_job_info_update(authinfo, job_id) as update_request:
+            job_info = yield update_request
+
+        # It may have taken time to get the job info, check if we've been cancelled
+        if cancel_flag.is_cancelled:
+            raise plumpy.CancelledError('task_update_job for calculation<{}> cancelled'.format(node.pk))
+
+        if job_info is not None and job_info.job_state != JOB_STATES.DONE:
+            yield executor.run_database_task(_call_on_node, execmanager.update_job_calc_from_job_info, node.pk,
+                                             job_info)
+            raise Return(False)
+
+        # The job is done, so we need a transport to retrieve the detailed job information
+        with job_manager.transport_queue.request_transport(authinfo) as request:
             transport = yield request
 
             # It may have taken time to get the transport, check if we've been cancelled
@@ -135,7 +168,9 @@ def task_update_job(node, transport_queue, cancel_flag):
                 raise plumpy.CancelledError('task_update_job for calculation<{}> cancelled'.format(node.pk))
 
             logger.info('updating calculation<{}>'.format(node.pk))
-            raise Return(execmanager.update_calculation(node, transport))
+            result = yield executor.run_transport_task(authinfo, _call_on_node, execmanager.update_calculation,
+                                                       node.pk, transport, job_info)
+            raise Return(result)
 
     state_success = calc_states.COMPUTED
 
@@ -155,17 +190,19 @@ def task_update_job(node, transport_queue, cancel_flag):
 
 
 @coroutine
-def task_retrieve_job(node, transport_queue, retrieved_temporary_folder, cancel_flag):
+def task_retrieve_job(node, transport_queue, executor, retrieved_temporary_folder, cancel_flag):
     """
     Transport task that will attempt to retrieve all files of a completed job calculation
 
     The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
-    If all retries fail, the task will raise a TransportTaskException
+    function is run in the transport pool of the executor, wrapped in the exponential_backoff_retry coroutine, which,
+    in case of a caught exception, will retry after an interval that increases exponentially with the number of
+    retries, for a maximum number of retries. If all retries fail, the task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
     :param transport_queue: the TransportQueue from which to request a Transport
+    :param executor: the TaskExecutor on which the blocking operations are run
+    :param retrieved_temporary_folder: the absolute path of the local folder in which the temporary files are retrieved
     :param cancel_flag: the cancelled flag that will be queried to determine whether the task was cancelled
     :raises: Return if the tasks was successfully completed
     :raises: TransportTaskException if after the maximum number of retries the transport task still excepted
@@ -185,7 +222,9 @@ def task_retrieve_job(node, transport_queue, retrieved_temporary_folder, cancel_
                 raise plumpy.CancelledError('task_retrieve_job for calculation<{}> cancelled'.format(node.pk))
 
             logger.info('retrieving calculation<{}>'.format(node.pk))
-            raise Return(execmanager.retrieve_calculation(node, transport, retrieved_temporary_folder))
+            result = yield executor.run_transport_task(authinfo, _call_on_node, execmanager.retrieve_calculation,
+                                                       node.pk, transport, retrieved_temporary_folder)
+            raise Return(result)
 
     state_pending = calc_states.RETRIEVING
 
@@ -208,17 +247,18 @@ def task_retrieve_job(node, transport_queue, retrieved_temporary_folder, cancel_
 
 
 @coroutine
-def task_kill_job(node, transport_queue, cancel_flag):
+def task_kill_job(node, transport_queue, executor, cancel_flag):
     """
     Transport task that will attempt to kill a job calculation
 
     The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
-    If all retries fail, the task will raise a TransportTaskException
+    function is run in the transport pool of the executor, wrapped in the exponential_backoff_retry coroutine, which,
+    in case of a caught exception, will retry after an interval that increases exponentially with the number of
+    retries, for a maximum number of retries. If all retries fail, the task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
     :param transport_queue: the TransportQueue from which to request a Transport
+    :param executor: the TaskExecutor on which the blocking operations are run
     :param cancel_flag: the cancelled flag that will be queried to determine whether the task was cancelled
     :raises: Return if the tasks was successfully completed
     :raises: TransportTaskException if after the maximum number of retries the transport task still excepted
@@ -242,7 +282,9 @@ def task_kill_job(node, transport_queue, cancel_flag):
                 raise plumpy.CancelledError('task_kill_job for calculation<{}> cancelled'.format(node.pk))
 
             logger.info('killing calculation<{}>'.format(node.pk))
-            raise Return(execmanager.kill_calculation(node, transport))
+            result = yield executor.run_transport_task(authinfo, _call_on_node, execmanager.kill_calculation, node.pk,
+                                                       transport)
+            raise Return(result)
 
     try:
         result = yield exponential_backoff_retry(do_kill, initial_interval, max_attempts, logger=node.logger)
@@ -277,6 +319,8 @@ class Waiting(plumpy.Waiting):
 
         calculation = self.process.calc
         transport_queue = self.process.runner.transport
+        job_manager = self.process.runner.job_manager
+        executor = self.process.runner.executor
 
         if isinstance(self.data, tuple):
             command = self.data[0]
@@ -289,21 +333,21 @@ class Waiting(plumpy.Waiting):
         try:
 
             if command == SUBMIT_COMMAND:
-                yield self._launch_task(task_submit_job, calculation, transport_queue, *args)
+                yield self._launch_task(task_submit_job, calculation, transport_queue, executor, *args)
                 raise Return(self.scheduler_update())
 
             elif self.data == UPDATE_COMMAND:
                 job_done = False
 
                 while not job_done:
-                    job_done = yield self._launch_task(task_update_job, calculation, transport_queue)
+                    job_done = yield self._launch_task(task_update_job, calculation, job_manager, executor)
 
                 raise Return(self.retrieve())
 
             elif self.data == RETRIEVE_COMMAND:
                 # Create a temporary folder that has to be deleted by JobProcess.retrieved after successful parsing
                 temp_folder = tempfile.mkdtemp()
-                yield self._launch_task(task_retrieve_job, calculation, transport_queue, temp_folder)
+                yield self._launch_task(task_retrieve_job, calculation, transport_queue, executor, temp_folder)
                 raise Return(self.retrieved(temp_folder))
 
             else:
@@ -313,7 +357,7 @@ class Waiting(plumpy.Waiting):
             raise plumpy.PauseInterruption('Pausing after failed transport task: {}'.format(exception))
         except plumpy.KillInterruption:
             exc_info = sys.exc_info()
-            yield self._launch_task(task_kill_job, calculation, transport_queue)
+            yield self._launch_task(task_kill_job, calculation, transport_queue, executor)
             self._killing.set_result(True)
             six.reraise(*exc_info)
         except Return:
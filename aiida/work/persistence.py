@@ -18,17 +18,34 @@
 ###########################################################################
 """Definition of AiiDA's process persister and the necessary object loaders."""
 from __future__ import absolute_import
+import bz2
 import logging
+import os
+import tempfile
 import traceback
+import zlib
+
 import yaml
+from six.moves import cPickle as pickle
 
 import plumpy
 
-__all__ = ['ObjectLoader', 'get_object_loader']
+__all__ = ['ObjectLoader', 'get_object_loader', 'CheckpointSerializer', 'YamlCheckpointSerializer',
+           'PickleCheckpointSerializer', 'get_checkpoint_serializer']
 
 LOGGER = logging.getLogger(__name__)
 OBJECT_LOADER = None
 
+CHECKPOINT_REPOSITORY_SECTION = 'checkpoint'
+CHECKPOINT_FILENAME_PREFIX = 'checkpoint'
+
+# Mapping of compression name onto the functions to compress and decompress a bytes string
+CHECKPOINT_COMPRESSIONS = {
+    'none': (lambda data: data, lambda data: data),
+    'zlib': (zlib.compress, zlib.decompress),
+    'bz2': (bz2.compress, bz2.decompress),
+}
+
 
 def get_object_loader():
     """
@@ -43,12 +60,148 @@ def get_object_loader():
     return OBJECT_LOADER
 
 
+class CheckpointSerializer(object):
+    """
+    Base class for the serializers that convert a process checkpoint bundle to a bytes string and back.
+
+    A serializer is identified by its name, which is recorded in the filename of a stored checkpoint, such that a
+    checkpoint can always be loaded, regardless of the serializer that is configured at the time of loading.
+    """
+
+    name = None
+
+    def __init__(self, compression='zlib'):
+        """
+        :param compression: the name of the compression to apply to the serialized bundle, see CHECKPOINT_COMPRESSIONS
+        """
+        if compression not in CHECKPOINT_COMPRESSIONS:
+            raise ValueError('unknown checkpoint compression {}, valid options are: {}'.format(
+                compression, ', '.join(sorted(CHECKPOINT_COMPRESSIONS.keys()))))
+
+        self._compression = compression
+        self._compress, self._decompress = CHECKPOINT_COMPRESSIONS[compression]
+
+    @property
+    def compression(self):
+        """Return the name of the compression used by this serializer."""
+        return self._compression
+
+    @property
+    def filename(self):
+        """Return the filename under which a checkpoint written by this serializer is stored."""
+        return '{}.{}.{}'.format(CHECKPOINT_FILENAME_PREFIX, self.name, self.compression)
+
+    def dumps(self, bundle):
+        """
+        Serialize and compress a bundle
+
+        :param bundle: the :class:`plumpy.Bundle` to serialize
+        :return: the serialized bundle
+        :rtype: bytes
+        """
+        return self._compress(self._serialize(bundle))
+
+    def loads(self, data):
+        """
+        Decompress and deserialize a bundle
+
+        :param data: the bytes string returned by `dumps`
+        :return: the :class:`plumpy.Bundle`
+        """
+        return self._deserialize(self._decompress(data))
+
+    def _serialize(self, bundle):
+        raise NotImplementedError
+
+    def _deserialize(self, data):
+        raise NotImplementedError
+
+
+class YamlCheckpointSerializer(CheckpointSerializer):
+    """Serializer that dumps the bundle to YAML, which is the format used for the legacy checkpoints."""
+
+    name = 'yaml'
+
+    def _serialize(self, bundle):
+        return yaml.dump(bundle).encode('utf-8')
+
+    def _deserialize(self, data):
+        return yaml.load(data.decode('utf-8'))
+
+
+class PickleCheckpointSerializer(CheckpointSerializer):
+    """Serializer that dumps the bundle with the binary pickle protocol, which is much faster than YAML."""
+
+    name = 'pickle'
+
+    # The highest protocol that can be read by both python 2 and python 3
+    PROTOCOL = 2
+
+    def _serialize(self, bundle):
+        return pickle.dumps(bundle, protocol=self.PROTOCOL)
+
+    def _deserialize(self, data):
+        return pickle.loads(data)
+
+
+CHECKPOINT_SERIALIZERS = {serializer.name: serializer for serializer in [
+    YamlCheckpointSerializer,
+    PickleCheckpointSerializer,
+]}
+
+
+def get_checkpoint_serializer(name='pickle', compression='zlib'):
+    """
+    Get a checkpoint serializer instance
+
+    :param name: the name of the serializer, see CHECKPOINT_SERIALIZERS
+    :param compression: the name of the compression, see CHECKPOINT_COMPRESSIONS
+    :return: a :class:`CheckpointSerializer` instance
+    :raises: ValueError if the serializer or compression does not exist
+    """
+    try:
+        serializer_class = CHECKPOINT_SERIALIZERS[name]
+    except KeyError:
+        raise ValueError('unknown checkpoint serializer {}, valid options are: {}'.format(
+            name, ', '.join(sorted(CHECKPOINT_SERIALIZERS.keys()))))
+
+    return serializer_class(compression=compression)
+
+
+def get_checkpoint_folder(calculation):
+    """
+    Get the repository folder in which the checkpoint of the process of the given calculation is stored
+
+    :param calculation: the calculation node of the process
+    :return: a :class:`aiida.common.folders.RepositoryFolder`
+    """
+    from aiida.common.folders import RepositoryFolder
+    return RepositoryFolder(section=CHECKPOINT_REPOSITORY_SECTION, uuid=calculation.uuid)
+
+
 class AiiDAPersister(plumpy.Persister):
     """
     This node is responsible to taking saved process instance states and
-    persisting them to the database.
+    persisting them to the repository.
+
+    The checkpoints are serialized with a configurable serializer and stored in a dedicated section of the file
+    repository, instead of in the attributes of the calculation node. Checkpoints that were stored by older versions
+    as YAML in the node attributes can still be loaded and are migrated to the new format upon loading.
     """
 
+    def __init__(self, serializer=None):
+        """
+        :param serializer: the :class:`CheckpointSerializer` to use when saving checkpoints, by default a pickle
+            serializer with zlib compression
+        """
+        super(AiiDAPersister, self).__init__()
+        self._serializer = serializer if serializer is not None else get_checkpoint_serializer()
+
+    @property
+    def serializer(self):
+        """Return the serializer used to save checkpoints."""
+        return self._serializer
+
     def save_checkpoint(self, process, tag=None):
         """
         Persist a Process instance
@@ -69,11 +222,38 @@ class AiiDAPersister(plumpy.Persister):
             raise plumpy.PersistenceError("Failed to create a bundle for '{}':{}".format(
                 process, traceback.format_exc()))
         else:
-            calc = process.calc
-            calc.set_checkpoint(yaml.dump(bundle))
+            self._write_checkpoint(process.calc, bundle)
 
         return bundle
 
+    def _write_checkpoint(self, calculation, bundle):
+        """
+        Serialize the bundle and write it to the checkpoint folder of the calculation, replacing any existing one
+
+        The serialized bundle is first written to a temporary file that is then moved into place, such that a crash
+        while writing cannot corrupt the previous checkpoint.
+
+        :param calculation: the calculation node of the process
+        :param bundle: the :class:`plumpy.Bundle` to store
+        """
+        folder = get_checkpoint_folder(calculation)
+        folder.create()
+
+        filename = self._serializer.filename
+        handle, temporary_path = tempfile.mkstemp(dir=folder.abspath, prefix='.{}'.format(filename))
+        with os.fdopen(handle, 'wb') as temporary_file:
+            temporary_file.write(self._serializer.dumps(bundle))
+
+        os.rename(temporary_path, folder.get_abs_path(filename))
+
+        # Remove checkpoints that were written with another serializer and any legacy checkpoint in the attributes
+        for other_filename in folder.get_content_list('{}.*'.format(CHECKPOINT_FILENAME_PREFIX)):
+            if other_filename != filename:
+                folder.remove_path(other_filename)
+
+        if calculation.checkpoint is not None:
+            calculation.del_checkpoint()
+
     def load_checkpoint(self, pid, tag=None):
         """
         Load a process from a persisted checkpoint by its process id
@@ -90,12 +270,31 @@ class AiiDAPersister(plumpy.Persister):
             raise NotImplementedError('Checkpoint tags not supported yet')
 
         calculation = load_node(pid)
+        folder = get_checkpoint_folder(calculation)
+
+        filenames = folder.get_content_list('{}.*'.format(CHECKPOINT_FILENAME_PREFIX)) if folder.exists() else []
+
+        if filenames:
+            filename = filenames[0]
+            try:
+                _, name, compression = filename.split('.')
+                serializer = get_checkpoint_serializer(name, compression)
+            except ValueError:
+                raise plumpy.PersistenceError('Calculation<{}> has a checkpoint in an unknown format: {}'.format(
+                    calculation.pk, filename))
+
+            with folder.open(filename, 'rb') as handle:
+                return serializer.loads(handle.read())
+
         checkpoint = calculation.checkpoint
 
         if checkpoint is None:
             raise plumpy.PersistenceError('Calculation<{}> does not have a saved checkpoint'.format(calculation.pk))
 
+        # This is a legacy checkpoint stored as YAML in the attributes: migrate it to the repository
         bundle = yaml.load(checkpoint)
+        self._write_checkpoint(calculation, bundle)
+
         return bundle
 
     def get_checkpoints(self):
@@ -130,6 +329,10 @@ class AiiDAPersister(plumpy.Persister):
         calc = load_node(pid)
         calc.del_checkpoint()
 
+        folder = get_checkpoint_folder(calc)
+        if folder.exists():
+            folder.erase()
+
     def delete_process_checkpoints(self, pid):
         """
         Delete all persisted checkpoints related to the given process id
@@ -18,7 +18,9 @@ import tornado.ioloop
 import plumpy
 
 from aiida.orm import load_node, load_workflow
+from . import executors
 from . import futures
+from . import job_calcs
 from . import persistence
 from . import rmq
 from . import transports
@@ -82,11 +84,17 @@ class Runner(object):
                  loop=None,
                  rmq_submit=False,
                  enable_persistence=True,
-                 persister=None):
+                 persister=None,
+                 transport_idle_timeout=0.,
+                 transport_pool_size=0,
+                 database_pool_size=0):
         self._loop = loop if loop is not None else tornado.ioloop.IOLoop()
         self._poll_interval = poll_interval
         self._rmq_submit = rmq_submit
-        self._transport = transports.TransportQueue(self._loop)
+        self._executor = executors.TaskExecutor(transport_pool_size, database_pool_size)
+        self._loop_monitor = executors.LoopLagMonitor(self._loop)
+        self._transport = transports.TransportQueue(self._loop, idle_timeout=transport_idle_timeout)
+        self._job_manager = job_calcs.JobManager(self._transport, executor=self._executor)
 
         if enable_persistence:
             self._persister = persister if persister is not None else persistence.AiiDAPersister()
@@ -103,7 +111,10 @@ class Runner(object):
             'rmq_config': rmq_config,
             'poll_interval': poll_interval,
             'rmq_submit': rmq_submit,
-            'enable_persistence': enable_persistence
+            'enable_persistence': enable_persistence,
+            'transport_idle_timeout': transport_idle_timeout,
+            'transport_pool_size': transport_pool_size,
+            'database_pool_size': database_pool_size
         }
 
     def __enter__(self):
@@ -124,6 +135,18 @@ class Runner(object):
     def transport(self):
         return self._transport
 
+    @property
+    def job_manager(self):
+        return self._job_manager
+
+    @property
+    def executor(self):
+        return self._executor
+
+    @property
+    def loop_monitor(self):
+        return self._loop_monitor
+
     @property
     def persister(self):
         return self._persister
@@ -149,10 +172,16 @@ class Runner(object):
             return self._loop.run_sync(lambda: future)
 
     def close(self):
-        """Close the runner by stopping the loop and disconnecting the RmqConnector if it has one."""
+        """
+        Close the runner by stopping the loop, closing the transports that are kept alive and the pools of threads
+        and disconnecting the RmqConnector if it has one.
+        """
         assert not self._closed
 
         self.stop()
+        self._loop_monitor.stop()
+        self._transport.close()
+        self._executor.close()
 
         if self._rmq_connector is not None:
             self._rmq_connector.disconnect()
@@ -11,6 +11,7 @@
 from __future__ import absolute_import
 from collections import namedtuple
 import contextlib
+import functools
 import logging
 import traceback
 import tornado.gen
@@ -29,6 +30,7 @@ class TransportRequest(object):
         super(TransportRequest, self).__init__()
         self.future = tornado.concurrent.Future()
         self.count = 0
+        self.close_callback_handle = None
 
 
 class TransportQueue(object):
@@ -41,20 +43,90 @@ class TransportQueue(object):
     it will open the transport and give it to all the clients that asked for it
     up to that point.  This way opening of transports (a costly operation) can
     be minimised.
+
+    Once the last client is done with a transport, it is kept open for the idle
+    timeout, such that requests coming in within that time can reuse the open
+    connection instead of opening a new one.  Before an idle transport is handed
+    out again it is checked to still be alive, and if it is not, a new one is
+    opened transparently.
     """
     AuthInfoEntry = namedtuple('AuthInfoEntry', ['authinfo', 'transport', 'callbacks', 'callback_handle'])
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, idle_timeout=0.):
         """
         :param loop: The event loop to use, will use tornado.ioloop.IOLoop.current() if not supplied
+        :param idle_timeout: The number of seconds to keep a transport open after the last client is done with it,
+            a value of zero means that the transport is closed immediately
         """
         self._loop = loop if loop is not None else tornado.ioloop.IOLoop.current()
+        self._idle_timeout = idle_timeout
         self._transport_requests = {}
+        self._statistics = {'opens': 0, 'hits': 0, 'waits': 0, 'reconnects': 0}
 
     def loop(self):
         """ Get the loop being used by this transport queue """
         return self._loop
 
+    @property
+    def idle_timeout(self):
+        """ Get the number of seconds an unused transport is kept open """
+        return self._idle_timeout
+
+    def get_statistics(self):
+        """
+        Get the statistics of this transport queue, which is a dictionary with the following keys:
+
+            * opens: the number of transports that were opened
+            * hits: the number of requests that were served with a transport that was already open
+            * waits: the number of requests that had to wait for a transport to be opened
+            * reconnects: the number of idle transports that were found dead and had to be reopened
+
+        :return: dictionary with the statistics
+        """
+        return dict(self._statistics)
+
+    def close(self):
+        """ Close all idle transports that are being kept alive """
+        for authinfo_id, transport_request in list(self._transport_requests.items()):
+            if transport_request.count == 0 and transport_request.close_callback_handle is not None:
+                self._loop.remove_timeout(transport_request.close_callback_handle)
+                self._close_transport(authinfo_id)
+
+    def _close_transport(self, authinfo_id):
+        """ Close the open transport of the given authinfo and remove the request """
+        transport_request = self._transport_requests.pop(authinfo_id)
+        transport = transport_request.future.result()
+        _LOGGER.debug('Transport request closing transport for authinfo<%s>', authinfo_id)
+        try:
+            transport.close()
+        except Exception as exception:  # pylint: disable=broad-except
+            _LOGGER.warning('exception occurred while trying to close transport:\n %s', exception)
+
+    def _get_idle_transport_request(self, authinfo):
+        """
+        Return the request of the given authinfo if it holds an open transport that is still alive. If the transport
+        is found to be dead, it is discarded such that a new one will be opened.
+
+        :param authinfo: the authinfo
+        :return: the TransportRequest or None
+        """
+        transport_request = self._transport_requests.get(authinfo.id, None)
+
+        if transport_request is None or transport_request.close_callback_handle is None:
+            return transport_request
+
+        # The transport is idle, so it is no longer scheduled to be closed now that it is going to be used again
+        self._loop.remove_timeout(transport_request.close_callback_handle)
+        transport_request.close_callback_handle = None
+
+        if not transport_request.future.result().is_alive():
+            _LOGGER.info('Idle transport for %s is no longer alive, reconnecting', authinfo)
+            self._statistics['reconnects'] += 1
+            self._close_transport(authinfo.id)
+            return None
+
+        return transport_request
+
     @contextlib.contextmanager
     def request_transport(self, authinfo):
         """
@@ -71,7 +143,7 @@ class TransportQueue(object):
         :param authinfo: The authinfo to be used to get transport
         :return: A future that can be yielded to give the transport
         """
-        transport_request = self._transport_requests.get(authinfo.id, None)
+        transport_request = self._get_idle_transport_request(authinfo)
 
         open_callback_handle = None
         if transport_request is None:
@@ -87,6 +159,7 @@ class TransportQueue(object):
                     # The user still wants the transport so open it
                     _LOGGER.debug('Transport request opening transport for %s', authinfo)
                     try:
+                        self._statistics['opens'] += 1
                         transport.open()
                     except Exception as exception:  # pylint: disable=broad-except
                         _LOGGER.error('exception occurred while trying to open transport:\n %s', exception)
@@ -97,6 +170,11 @@ class TransportQueue(object):
             # Save the handle so that we can cancel the callback if the user no longer wants it
             open_callback_handle = self._loop.call_later(safe_open_interval, do_open)
 
+        if transport_request.future.done():
+            self._statistics['hits'] += 1
+        else:
+            self._statistics['waits'] += 1
+
         try:
             transport_request.count += 1
             yield transport_request.future
@@ -112,9 +190,15 @@ class TransportQueue(object):
             # Check if there are no longer any users that want the transport
             if transport_request.count == 0:
                 if transport_request.future.done():
-                    _LOGGER.debug('Transport request closing transport for %s', authinfo)
-                    transport_request.future.result().close()
-                elif open_callback_handle is not None:
-                    self._loop.remove_timeout(open_callback_handle)
-
-                del self._transport_requests[authinfo.id]
+                    if transport_request.future.exception() is not None:
+                        del self._transport_requests[authinfo.id]
+                    elif self._idle_timeout > 0:
+                        _LOGGER.debug('Transport request keeping transport for %s alive', authinfo)
+                        transport_request.close_callback_handle = self._loop.call_later(
+                            self._idle_timeout, functools.partial(self._close_transport, authinfo.id))
+                    else:
+                        self._close_transport(authinfo.id)
+                else:
+                    if open_callback_handle is not None:
+                        self._loop.remove_timeout(open_callback_handle)
+                    del self._transport_requests[authinfo.id]
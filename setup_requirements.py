@@ -49,6 +49,7 @@ install_requires = [
     'pathlib2; python_version<"3.5"',
     'singledispatch>=3.4.0.3; python_version<"3.5"',
     'enum34==1.1.6; python_version<"3.5"',
+    'futures==3.2.0; python_version<"3"',
 ]
 
 extras_require = {
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the reading of the attributes of stored nodes in the SQLAlchemy backend with the different read consistency
+modes, reporting the time and the number of queries for each mode.
+
+Run with `verdi run` or as a script with an AiiDA profile configured that uses the SQLAlchemy backend, for example::
+
+    python utils/benchmarks/attribute_reads.py --nodes 1000 --keys 100
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, default=100, show_default=True, help='Number of nodes to read.')
+@click.option('-k', '--keys', type=int, default=100, show_default=True, help='Number of attributes per node.')
+def benchmark_attribute_reads(nodes, keys):
+    """Time the reading of every attribute of many stored nodes, one attribute at a time, in each mode."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.backends.settings import BACKEND
+    from aiida.backends.profile import BACKEND_SQLA
+
+    if BACKEND != BACKEND_SQLA:
+        raise click.ClickException('this benchmark requires a profile with the SQLAlchemy backend')
+
+    from sqlalchemy import event
+    from aiida.backends.sqlalchemy import get_scoped_session
+    from aiida.common.setup import NODE_READ_CONSISTENCY_MODES
+    from aiida.orm.data.parameter import ParameterData
+    from aiida.orm.implementation.sqlalchemy.node import node_read_consistency
+    from aiida.orm.utils import load_node, store_many
+
+    attributes = {'key_{}'.format(index): index for index in range(keys)}
+    pks = [node.pk for node in store_many([ParameterData(dict=attributes) for _ in range(nodes)])]
+
+    queries = []
+
+    def count_query(*args):  # pylint: disable=unused-argument
+        queries.append(None)
+
+    engine = get_scoped_session().get_bind()
+    event.listen(engine, 'before_cursor_execute', count_query)
+
+    click.echo('{:>12} {:>12} {:>12}'.format('mode', 'time [s]', 'queries'))
+
+    try:
+        for mode in NODE_READ_CONSISTENCY_MODES:
+            loaded = [load_node(pk) for pk in pks]
+            del queries[:]
+
+            with node_read_consistency(mode):
+                start = time.time()
+                for node in loaded:
+                    for key in attributes:
+                        node.get_attr(key)
+                elapsed = time.time() - start
+
+            click.echo('{:>12} {:>12.3f} {:>12}'.format(mode, elapsed, len(queries)))
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_query)
+
+
+if __name__ == '__main__':
+    benchmark_attribute_reads()  # pylint: disable=no-value-for-parameter
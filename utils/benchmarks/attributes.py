@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the writing of node attributes to the attribute table of the Django backend, comparing the creation of one
+model instance per (sub)value, as was done previously, with the bulk insert of serialized rows for many nodes at once.
+
+Run with `verdi run` or as a script with an AiiDA profile configured that uses the Django backend, for example::
+
+    python utils/benchmarks/attributes.py --nodes 100 --keys 200
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, default=100, show_default=True, help='Number of nodes to write.')
+@click.option('-k', '--keys', type=int, default=100, show_default=True, help='Number of attributes per node.')
+def benchmark_attributes(nodes, keys):
+    """Time the writing of the attributes of many nodes and report the number of rows written per second."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.backends.settings import BACKEND
+    from aiida.backends.profile import BACKEND_DJANGO
+
+    if BACKEND != BACKEND_DJANGO:
+        raise click.ClickException('this benchmark requires a profile with the Django backend')
+
+    from django.db import transaction
+    from aiida.backends.djsite.db.models import DbAttribute
+    from aiida.orm.node import Node
+
+    # A mix of scalars and nested values, each key of the form `key_{index}`
+    attributes = {}
+    for index in range(keys):
+        value = [index, float(index), 'value {}'.format(index), {'index': index}] if index % 4 == 0 else index
+        attributes['key_{}'.format(index)] = value
+
+    rows_per_node = sum(len(DbAttribute.serialize_value(key, value)) for key, value in attributes.items())
+    node_pks = [Node().store().pk for _ in range(nodes)]
+
+    def write_per_instance():
+        with transaction.atomic():
+            for pk in node_pks:
+                to_store = DbAttribute.reset_values_for_node(pk, attributes, return_not_store=True)
+                DbAttribute.objects.filter(dbnode_id=pk).delete()
+                DbAttribute.objects.bulk_create(to_store)
+
+    def write_bulk():
+        with transaction.atomic():
+            DbAttribute.reset_values_for_nodes({pk: attributes for pk in node_pks})
+
+    click.echo('{:>16} {:>12} {:>16}'.format('method', 'time [s]', 'rows/s'))
+
+    for name, method in [('per instance', write_per_instance), ('bulk', write_bulk)]:
+        start = time.time()
+        method()
+        elapsed = time.time() - start
+        click.echo('{:>16} {:>12.3f} {:>16.0f}'.format(name, elapsed, nodes * rows_per_node / elapsed))
+
+
+if __name__ == '__main__':
+    benchmark_attributes()  # pylint: disable=no-value-for-parameter
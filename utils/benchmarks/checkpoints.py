@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the time and size of saving and loading process checkpoints with the various checkpoint serializers.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/checkpoints.py --context-size 10000 --repetitions 20
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import timeit
+
+import click
+
+
+@click.command()
+@click.option('-c', '--context-size', type=int, default=10000, show_default=True,
+              help='Number of entries in the synthetic context of the process.')
+@click.option('-r', '--repetitions', type=int, default=10, show_default=True,
+              help='Number of times each save and load is repeated.')
+def benchmark_checkpoints(context_size, repetitions):
+    """Compare the legacy YAML checkpoints with the binary, compressed checkpoints on save and load."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.work import runners
+    from aiida.work.persistence import AiiDAPersister, get_checkpoint_serializer
+    from aiida.work.test_utils import DummyProcess
+
+    runners.set_runner(None)
+    process = DummyProcess()
+
+    # Add a large payload to the saved state, similar to a work chain with a large context
+    payload = {'key_{}'.format(index): [float(index)] * 10 for index in range(context_size)}
+    process.save_instance_state = _with_payload(process.save_instance_state, payload)
+
+    click.echo('{:<10} {:<12} {:>12} {:>12} {:>14}'.format('serializer', 'compression', 'save [ms]', 'load [ms]',
+                                                           'size [bytes]'))
+
+    for name, compression in [('yaml', 'none'), ('pickle', 'none'), ('pickle', 'zlib'), ('pickle', 'bz2')]:
+        serializer = get_checkpoint_serializer(name, compression)
+        persister = AiiDAPersister(serializer=serializer)
+
+        time_save = timeit.timeit(lambda: persister.save_checkpoint(process), number=repetitions) / repetitions
+        time_load = timeit.timeit(lambda: persister.load_checkpoint(process.pid), number=repetitions) / repetitions
+        size = len(serializer.dumps(persister.load_checkpoint(process.pid)))
+
+        click.echo('{:<10} {:<12} {:>12.2f} {:>12.2f} {:>14}'.format(name, compression, time_save * 1000,
+                                                                     time_load * 1000, size))
+
+    AiiDAPersister().delete_checkpoint(process.pid)
+
+
+def _with_payload(save_instance_state, payload):
+    """Wrap the save_instance_state method of a process such that the payload is added to the saved state."""
+
+    def wrapped(out_state, save_context):
+        save_instance_state(out_state, save_context)
+        out_state['benchmark_payload'] = payload
+
+    return wrapped
+
+
+if __name__ == '__main__':
+    benchmark_checkpoints()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the deletion of a provenance graph with `delete_nodes`: a chain of calculations, each of which creates a
+number of output nodes, with the first output of every calculation being the input of the next one.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/delete_nodes.py --depth 100 --outputs 10
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-d', '--depth', type=int, default=100, show_default=True, help='Number of calculations in the chain.')
+@click.option('-o', '--outputs', type=int, default=10, show_default=True, help='Number of outputs per calculation.')
+def benchmark_delete_nodes(depth, outputs):
+    """Time the deletion of all the nodes that descend from the root of a chain of calculations."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.common.links import LinkType
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.data.parameter import ParameterData
+    from aiida.orm.utils import store_many
+    from aiida.utils.delete_nodes import delete_nodes
+
+    root = ParameterData(dict={}).store()
+    parent = root
+    for index in range(depth):
+        calculation = Calculation()
+        calculation.add_link_from(parent, label='input', link_type=LinkType.INPUT)
+        created = [ParameterData(dict={'calculation': index, 'output': output}) for output in range(outputs)]
+        for output, node in enumerate(created):
+            node.add_link_from(calculation, label='output_{}'.format(output), link_type=LinkType.CREATE)
+        store_many([calculation] + created)
+        parent = created[0]
+
+    start = time.time()
+    delete_nodes([root.pk], force=True, verbosity=1)
+    elapsed = time.time() - start
+
+    number = 1 + depth * (outputs + 1)
+    click.echo('deleted {} nodes in {:.3f} s ({:.1f} nodes/s)'.format(number, elapsed, number / elapsed))
+
+
+if __name__ == '__main__':
+    benchmark_delete_nodes()  # pylint: disable=no-value-for-parameter
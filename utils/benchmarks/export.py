@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the export of a calculation with many output nodes to a tar and a zip archive, reporting the throughput and
+the peak memory of the process.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/export.py --nodes 10000
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, default=10000, show_default=True, help='Number of output nodes to export.')
+def benchmark_export(nodes):
+    """Time the export of a calculation and its outputs."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.common.links import LinkType
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.data.parameter import ParameterData
+    from aiida.orm.importexport import export, export_zip
+    from aiida.orm.utils import store_many
+
+    calculation = Calculation().store()
+    outputs = [ParameterData(dict={'index': index, 'values': [index] * 10}) for index in range(nodes)]
+    for index, node in enumerate(outputs):
+        node.add_link_from(calculation, label='output_{}'.format(index), link_type=LinkType.CREATE)
+    store_many(outputs)
+
+    folder = tempfile.mkdtemp()
+    try:
+        for name, function in [('export.tar.gz', export), ('export.zip', export_zip)]:
+            outfile = os.path.join(folder, name)
+            start = time.time()
+            function([calculation], outfile=outfile, silent=True)
+            elapsed = time.time() - start
+            megabytes = os.path.getsize(outfile) / 1024. / 1024.
+            click.echo('{:>14}: {:>10.1f} nodes/s {:>8.2f} MB/s'.format(name, (nodes + 1) / elapsed, megabytes / elapsed))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    # On Linux the maximum resident set size is reported in kilobytes
+    click.echo('peak memory: {:.1f} MB'.format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.))
+
+
+if __name__ == '__main__':
+    benchmark_export()  # pylint: disable=no-value-for-parameter
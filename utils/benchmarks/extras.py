@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the tagging of many nodes with an extra, comparing `set_extra` on each node with `set_extra_for_nodes`, and
+the setting of many extras on a node, comparing `set_extra` for each extra with `set_extras_many`.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/extras.py --nodes 1000 --keys 100
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, default=1000, show_default=True, help='Number of nodes to tag.')
+@click.option('-k', '--keys', type=int, default=100, show_default=True, help='Number of extras to set on a node.')
+def benchmark_extras(nodes, keys):
+    """Time the setting of extras one at a time and in bulk."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.orm.node import Node
+    from aiida.orm.utils import store_many, set_extra_for_nodes
+
+    stored = store_many([Node() for _ in range(nodes)])
+    extras = {'key_{}'.format(index): index for index in range(keys)}
+
+    def timed(function):
+        start = time.time()
+        function()
+        return time.time() - start
+
+    def tag_one_by_one():
+        for node in stored:
+            node.set_extra('tag', 'one_by_one')
+
+    def set_one_by_one():
+        for key, value in extras.items():
+            stored[0].set_extra(key, value)
+
+    click.echo('{:>32} {:>12} {:>12}'.format('operation', 'single [s]', 'bulk [s]'))
+    click.echo('{:>32} {:>12.3f} {:>12.3f}'.format(
+        'tag {} nodes'.format(nodes), timed(tag_one_by_one),
+        timed(lambda: set_extra_for_nodes([node.pk for node in stored], 'tag', 'bulk'))))
+    click.echo('{:>32} {:>12.3f} {:>12.3f}'.format(
+        'set {} extras on a node'.format(keys), timed(set_one_by_one),
+        timed(lambda: stored[1].set_extras_many(extras))))
+
+
+if __name__ == '__main__':
+    benchmark_extras()  # pylint: disable=no-value-for-parameter
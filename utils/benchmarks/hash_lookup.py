@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the lookup of equivalent nodes for caching through the indexed hash column of the node table, compared to
+the lookup through the `_aiida_hash` extra that was used previously.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/hash_lookup.py --nodes 1000 --nodes 10000 --repetitions 50
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import timeit
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, multiple=True, default=[100, 1000, 10000], show_default=True,
+              help='Total numbers of stored nodes at which the lookup is timed. Can be specified multiple times.')
+@click.option('-r', '--repetitions', type=int, default=20, show_default=True,
+              help='Number of times each lookup is repeated.')
+def benchmark_hash_lookup(nodes, repetitions):
+    """Time the lookup of a node by its hash as a function of the number of stored nodes."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.orm.data.int import Int
+    from aiida.orm.querybuilder import QueryBuilder
+
+    def lookup_column(hash_):
+        return QueryBuilder().append(Int, filters={'node_hash': hash_}, project=['id'], subclassing=False).first()
+
+    def lookup_extra(hash_):
+        return QueryBuilder().append(
+            Int, filters={'extras._aiida_hash': hash_}, project=['id'], subclassing=False).first()
+
+    click.echo('{:>10} {:>16} {:>16}'.format('nodes', 'column [ms]', 'extra [ms]'))
+
+    stored = QueryBuilder().append(Int, subclassing=False).count()
+    value = 0
+
+    for target in sorted(nodes):
+        while stored < target:
+            value += 1
+            Int(value).store()
+            stored += 1
+
+        hash_ = Int(value).get_hash()
+
+        time_column = timeit.timeit(lambda: lookup_column(hash_), number=repetitions) / repetitions
+        time_extra = timeit.timeit(lambda: lookup_extra(hash_), number=repetitions) / repetitions
+
+        click.echo('{:>10} {:>16.3f} {:>16.3f}'.format(stored, time_column * 1000, time_extra * 1000))
+
+
+if __name__ == '__main__':
+    benchmark_hash_lookup()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the import of an archive of a calculation with many output nodes, for different numbers of threads moving
+the repository folders, reporting the throughput and the peak memory of the process.
+
+The nodes are exported once and deleted from the database before every import.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/import.py --nodes 10000 --workers 1 --workers 4
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, default=10000, show_default=True, help='Number of output nodes to import.')
+@click.option(
+    '-W', '--workers', type=int, multiple=True, default=[1, 4], show_default=True, help='Numbers of threads to try.')
+def benchmark_import(nodes, workers):
+    """Time the import of a calculation and its outputs."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.common.links import LinkType
+    from aiida.orm import load_node
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.data.parameter import ParameterData
+    from aiida.orm.importexport import export, import_data
+    from aiida.orm.utils import store_many
+    from aiida.utils.delete_nodes import delete_nodes
+
+    calculation = Calculation().store()
+    outputs = [ParameterData(dict={'index': index, 'values': [index] * 10}) for index in range(nodes)]
+    for index, node in enumerate(outputs):
+        node.add_link_from(calculation, label='output_{}'.format(index), link_type=LinkType.CREATE)
+    store_many(outputs)
+    calculation_uuid = calculation.uuid
+
+    folder = tempfile.mkdtemp()
+    try:
+        outfile = os.path.join(folder, 'export.tar.gz')
+        export([calculation], outfile=outfile, silent=True)
+
+        for number_of_workers in workers:
+            delete_nodes([load_node(calculation_uuid).pk], force=True)
+            start = time.time()
+            import_data(outfile, silent=True, workers=number_of_workers)
+            elapsed = time.time() - start
+            click.echo('{:>3} workers: {:>10.1f} nodes/s'.format(number_of_workers, (nodes + 1) / elapsed))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    # On Linux the maximum resident set size is reported in kilobytes
+    click.echo('peak memory: {:.1f} MB'.format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.))
+
+
+if __name__ == '__main__':
+    benchmark_import()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the repeated execution of the same QueryBuilder query with and without the query cache, reporting the time
+per query and the statistics of the cache.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/querybuilder_cache.py --repetitions 1000
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-r', '--repetitions', type=int, default=1000, show_default=True, help='Number of times to query.')
+def benchmark_query_cache(repetitions):
+    """Time the repeated execution of a query listing the calculations."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.querybuilder import QueryBuilder
+    from aiida.orm.querycache import get_query_cache
+
+    query = QueryBuilder().append(Calculation, project=['id', 'ctime', 'type', 'label'], tag='calculation')
+    query.order_by({'calculation': [{'ctime': 'desc'}]}).limit(100)
+
+    for use_cache in (False, True):
+        start = time.time()
+        for _ in range(repetitions):
+            query.all(use_cache=use_cache)
+        elapsed = time.time() - start
+        click.echo('use_cache={!s:<5}: {:>10.1f} us/query'.format(use_cache, elapsed / repetitions * 1e6))
+
+    click.echo('cache statistics: {}'.format(get_query_cache().get_statistics()))
+
+
+if __name__ == '__main__':
+    benchmark_query_cache()  # pylint: disable=no-value-for-parameter
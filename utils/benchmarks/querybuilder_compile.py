@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the lookup of the outputs of many nodes, one node at a time, building a QueryBuilder for every node versus
+executing a compiled query with a placeholder for the pk of the node. The time spent to build the queries is reported
+separately from the total time.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/querybuilder_compile.py --nodes 1000
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, default=1000, show_default=True, help='Number of nodes to look up.')
+def benchmark_compile(nodes):
+    """Time the lookup of the outputs of calculations."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.backends.settings import BACKEND
+    from aiida.common.links import LinkType
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.data.parameter import ParameterData
+    from aiida.orm.querybuilder import QueryBuilder, Placeholder
+    from aiida.orm.utils import store_many
+
+    calculations = [Calculation() for _ in range(nodes)]
+    outputs = []
+    for calculation in calculations:
+        output = ParameterData(dict={})
+        output.add_link_from(calculation, label='output_parameters', link_type=LinkType.CREATE)
+        outputs.append(output)
+    store_many(calculations + outputs)
+    pks = [calculation.pk for calculation in calculations]
+
+    def get_query(pk):
+        query = QueryBuilder()
+        query.append(Calculation, filters={'id': pk}, tag='calculation')
+        query.append(ParameterData, output_of='calculation', edge_filters={'label': 'output_parameters'},
+                     project=['id', 'uuid'])
+        return query
+
+    click.echo('backend: {}'.format(BACKEND))
+
+    build_time = 0.
+    start = time.time()
+    for pk in pks:
+        query = get_query(pk)
+        start_build = time.time()
+        query.get_query()
+        build_time += time.time() - start_build
+        query.all()
+    elapsed = time.time() - start
+    click.echo('QueryBuilder:  {:>8.1f} us/query, of which {:>8.1f} us/query building'.format(
+        elapsed / nodes * 1e6, build_time / nodes * 1e6))
+
+    start = time.time()
+    compiled = get_query(Placeholder('pk')).compile()
+    for pk in pks:
+        compiled.execute(pk=pk)
+    elapsed = time.time() - start
+    click.echo('CompiledQuery: {:>8.1f} us/query'.format(elapsed / nodes * 1e6))
+
+
+if __name__ == '__main__':
+    benchmark_compile()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the iteration over the results of a QueryBuilder with `iterall`, for a projection of plain columns and of
+whole entities, reporting the throughput and the peak memory of the process after every pass.
+
+Since the results are streamed through a server-side cursor, the peak memory should not grow with the number of rows.
+The benchmark runs against the backend of the loaded profile, so run it once for a Django and once for a SQLAlchemy
+profile to compare the two, for example::
+
+    python utils/benchmarks/querybuilder_iterall.py --nodes 100000 --batch-size 1000
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import resource
+import time
+
+import click
+
+
+def get_peak_memory():
+    """Return the peak resident set size of the process in MB (on Linux it is reported in kilobytes)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, default=0, show_default=True, help='Number of nodes to create first.')
+@click.option('-b', '--batch-size', type=int, default=1000, show_default=True, help='Batch size of the cursor.')
+def benchmark_iterall(nodes, batch_size):
+    """Time the iteration over all the nodes in the database."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.backends.settings import BACKEND
+    from aiida.orm import Node
+    from aiida.orm.data.parameter import ParameterData
+    from aiida.orm.querybuilder import QueryBuilder
+    from aiida.orm.utils import store_many
+
+    for offset in range(0, nodes, batch_size):
+        store_many([ParameterData(dict={'index': index}) for index in range(offset, min(offset + batch_size, nodes))])
+
+    click.echo('backend: {}'.format(BACKEND))
+    click.echo('peak memory before iterating: {:.1f} MB'.format(get_peak_memory()))
+
+    for project in (['id', 'uuid', 'ctime'], ['id', 'attributes'], ['*']):
+        query = QueryBuilder().append(Node, project=project)
+        start = time.time()
+        count = 0
+        for _ in query.iterall(batch_size=batch_size):
+            count += 1
+        elapsed = time.time() - start
+        click.echo('{:<20} {:>10} rows {:>12.1f} rows/s  peak memory: {:.1f} MB'.format(
+            ','.join(project), count, count / elapsed if elapsed else float('inf'), get_peak_memory()))
+
+
+if __name__ == '__main__':
+    benchmark_iterall()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the storing of many output nodes of a calculation with `store_many`, compared to storing them one by one.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/store_many.py --nodes 100 --nodes 1000
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-n', '--nodes', type=int, multiple=True, default=[100, 1000], show_default=True,
+              help='Numbers of output nodes to store. Can be specified multiple times.')
+def benchmark_store_many(nodes):
+    """Time the storing of the output nodes of a calculation and report the number of nodes stored per second."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.common.links import LinkType
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.data.parameter import ParameterData
+    from aiida.orm.utils import store_many
+
+    def create_outputs(number):
+        calculation = Calculation().store()
+        outputs = [ParameterData(dict={'index': index, 'values': [index] * 10}) for index in range(number)]
+        for index, node in enumerate(outputs):
+            node.add_link_from(calculation, label='output_{}'.format(index), link_type=LinkType.CREATE)
+        return outputs
+
+    def store_one_by_one(outputs):
+        for node in outputs:
+            node.store()
+
+    click.echo('{:>10} {:>22} {:>22}'.format('nodes', 'store [nodes/s]', 'store_many [nodes/s]'))
+
+    for number in nodes:
+        rates = []
+        for method in [store_one_by_one, store_many]:
+            outputs = create_outputs(number)
+            start = time.time()
+            method(outputs)
+            rates.append(number / (time.time() - start))
+
+        click.echo('{:>10} {:>22.1f} {:>22.1f}'.format(number, *rates))
+
+
+if __name__ == '__main__':
+    benchmark_store_many()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the construction of StructureData nodes with many sites and their conversion to other formats.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/structures.py --sites 1000 --sites 10000 --sites 100000
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import timeit
+
+import click
+
+
+@click.command()
+@click.option('-s', '--sites', type=int, multiple=True, default=[1000, 10000, 100000], show_default=True,
+              help='Number of sites of the benchmarked structures. Can be specified multiple times.')
+@click.option('--max-append-sites', type=int, default=10000, show_default=True,
+              help='Only time the construction through append_atom for structures up to this number of sites.')
+def benchmark_structures(sites, max_append_sites):
+    """Time the creation of structures site by site and in bulk, and the conversion to ASE, pymatgen and XYZ."""
+    import numpy
+
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.orm.data.structure import StructureData, has_ase, has_pymatgen
+
+    click.echo('{:>8} {:>14} {:>14} {:>14} {:>14} {:>14} {:>14}'.format(
+        'sites', 'append [s]', 'arrays [s]', 'formula [s]', 'xyz [s]', 'ase [s]', 'pymatgen [s]'))
+
+    for num_sites in sorted(sites):
+        size = num_sites ** (1. / 3.) * 2.
+        cell = [[size, 0., 0.], [0., size, 0.], [0., 0., size]]
+        symbols = ['Si', 'Ge', 'O', 'O'] * (num_sites // 4) + ['Si'] * (num_sites % 4)
+        positions = numpy.random.rand(num_sites, 3) * size
+
+        def append_atoms():
+            structure = StructureData(cell=cell)
+            for symbol, position in zip(symbols, positions):
+                structure.append_atom(symbols=symbol, position=position)
+
+        def from_arrays():
+            structure = StructureData(cell=cell)
+            structure.set_sites_from_arrays(symbols, positions)
+            return structure
+
+        structure = from_arrays()
+
+        timings = [
+            _time(append_atoms) if num_sites <= max_append_sites else None,
+            _time(from_arrays),
+            _time(structure.get_formula),
+            _time(structure._prepare_xyz),  # pylint: disable=protected-access
+            _time(structure.get_ase) if has_ase() else None,
+            _time(structure.get_pymatgen_structure) if has_pymatgen() else None,
+        ]
+
+        click.echo('{:>8} '.format(num_sites) + ' '.join(
+            '{:>14}'.format('-') if timing is None else '{:>14.3f}'.format(timing) for timing in timings))
+
+
+def _time(function):
+    """Return the time in seconds it takes to call the function once."""
+    return timeit.timeit(function, number=1)
+
+
+if __name__ == '__main__':
+    benchmark_structures()  # pylint: disable=no-value-for-parameter
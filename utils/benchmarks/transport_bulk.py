@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the transfer of a folder with many small files to and from a computer, one file at a time over SFTP versus
+through a tar stream, uncompressed and compressed. The files are written in a temporary folder in the work directory
+of the computer, which is removed at the end.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/transport_bulk.py --computer localhost --files 1000
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import click
+
+
+@click.command()
+@click.option('-c', '--computer', 'computer_name', type=str, required=True, help='Name of the computer.')
+@click.option('-n', '--files', type=int, default=1000, show_default=True, help='Number of files to transfer.')
+@click.option('-s', '--size', type=int, default=1024, show_default=True, help='Size of each file in bytes.')
+def benchmark_transport_bulk(computer_name, files, size):
+    """Time the transfer of a folder with many small files."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from aiida.orm import Computer
+    from aiida.transport.bulk import BULK_TRANSFER_TAR, BULK_TRANSFER_TAR_GZ, get_bulk, put_bulk
+
+    computer = Computer.get(computer_name)
+    local = tempfile.mkdtemp()
+    source = os.path.join(local, 'source')
+    for index in range(files):
+        subfolder = os.path.join(source, str(index % 10))
+        if not os.path.isdir(subfolder):
+            os.makedirs(subfolder)
+        with open(os.path.join(subfolder, 'file_{}.txt'.format(index)), 'w') as handle:
+            handle.write('x' * size)
+
+    with computer.get_transport() as transport:
+        remote = os.path.join(computer.get_workdir().format(username=transport.whoami()), uuid.uuid4().hex)
+        click.echo('transport: {}, {} files of {} bytes'.format(computer.get_transport_type(), files, size))
+
+        try:
+            start = time.time()
+            transport.puttree(source, os.path.join(remote, 'sftp'), bulk=False)
+            put_time = time.time() - start
+            start = time.time()
+            transport.gettree(os.path.join(remote, 'sftp'), os.path.join(local, 'sftp'), bulk=False)
+            get_time = time.time() - start
+            click.echo('{:<8} put: {:>8.2f} s, get: {:>8.2f} s'.format('sftp', put_time, get_time))
+
+            for mode in [BULK_TRANSFER_TAR, BULK_TRANSFER_TAR_GZ]:
+                start = time.time()
+                put_bulk(transport, source, os.path.join(remote, mode), mode)
+                put_time = time.time() - start
+                start = time.time()
+                get_bulk(transport, [(os.path.join(remote, mode), os.path.join(local, mode))], mode)
+                get_time = time.time() - start
+                click.echo('{:<8} put: {:>8.2f} s, get: {:>8.2f} s'.format(mode, put_time, get_time))
+        finally:
+            transport.rmtree(remote)
+            shutil.rmtree(local)
+
+
+if __name__ == '__main__':
+    benchmark_transport_bulk()  # pylint: disable=no-value-for-parameter
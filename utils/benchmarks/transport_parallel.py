@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark the transfer of a large file and of a folder with many small files over SSH, with a single SFTP channel
+versus several channels. The machine must accept SSH connections with the system host keys, by default the local SSH
+server is used. The files are written in a temporary folder on the machine, which is removed at the end.
+
+Run as a script, for example::
+
+    python utils/benchmarks/transport_parallel.py --machine localhost --size 1024 --files 1000 --channels 1 4 8
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import click
+
+
+@click.command()
+@click.option('-m', '--machine', type=str, default='localhost', show_default=True, help='Machine to connect to.')
+@click.option('-s', '--size', type=int, default=1024, show_default=True, help='Size of the large file in MB.')
+@click.option('-n', '--files', type=int, default=1000, show_default=True, help='Number of small files.')
+@click.option('-c', '--channels', type=int, multiple=True, help='Numbers of channels to compare.')
+def benchmark_transport_parallel(machine, size, files, channels):
+    """Time the transfer of a large file and of many small files."""
+    from aiida.transport.plugins.ssh import SshTransport
+
+    local = tempfile.mkdtemp()
+    source = os.path.join(local, 'source')
+    os.mkdir(source)
+    large = os.path.join(local, 'large')
+    with open(large, 'wb') as handle:
+        for _ in range(size):
+            handle.write(os.urandom(1024 * 1024))
+    for index in range(files):
+        with open(os.path.join(source, 'file_{}.txt'.format(index)), 'w') as handle:
+            handle.write('x' * 1024)
+
+    try:
+        for number in channels or (1, 4, 8):
+            with SshTransport(machine=machine, load_system_host_keys=True, key_policy='AutoAddPolicy',
+                              transfer_channels=number) as transport:
+                remote = os.path.join(transport.getcwd(), 'benchmark_{}'.format(uuid.uuid4().hex))
+                transport.mkdir(remote)
+                try:
+                    start = time.time()
+                    transport.putfile(large, os.path.join(remote, 'large'))
+                    put_time = time.time() - start
+                    start = time.time()
+                    transport.getfile(os.path.join(remote, 'large'), os.path.join(local, 'large_{}'.format(number)))
+                    get_time = time.time() - start
+                    click.echo('{:>2} channels, large file: put {:>8.1f} MB/s, get {:>8.1f} MB/s'.format(
+                        number, size / put_time, size / get_time))
+
+                    start = time.time()
+                    transport.puttree(source, os.path.join(remote, 'source'), bulk=False)
+                    put_time = time.time() - start
+                    start = time.time()
+                    transport.gettree(os.path.join(remote, 'source'), os.path.join(local, 'source_{}'.format(number)),
+                                      bulk=False)
+                    get_time = time.time() - start
+                    click.echo('{:>2} channels, small files: put {:>8.2f} s, get {:>8.2f} s'.format(
+                        number, put_time, get_time))
+                finally:
+                    transport.rmtree(remote)
+    finally:
+        shutil.rmtree(local)
+
+
+if __name__ == '__main__':
+    benchmark_transport_parallel()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark `verdi work report` on a tree of work calculations, where every work calculation calls a number of others
+and records a number of log messages.
+
+Run with `verdi run` or as a script with an AiiDA profile configured, for example::
+
+    python utils/benchmarks/work_report.py --depth 3 --width 10 --messages 5
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import time
+
+import click
+
+
+@click.command()
+@click.option('-d', '--depth', type=int, default=3, show_default=True, help='Depth of the call tree.')
+@click.option('-w', '--width', type=int, default=10, show_default=True, help='Calls made by each work calculation.')
+@click.option('-m', '--messages', type=int, default=5, show_default=True, help='Messages per work calculation.')
+def benchmark_work_report(depth, width, messages):
+    """Time the report of the root of a tree of work calculations."""
+    from aiida.backends.utils import load_dbenv, is_dbenv_loaded
+
+    if not is_dbenv_loaded():
+        load_dbenv()
+
+    from click.testing import CliRunner
+    from aiida.cmdline.commands.cmd_work import work_report
+    from aiida.common.links import LinkType
+    from aiida.common.log import LOG_LEVEL_REPORT
+    from aiida.orm.calculation.work import WorkCalculation
+
+    def create_tree(level):
+        node = WorkCalculation().store()
+        for index in range(messages):
+            node.logger.log(LOG_LEVEL_REPORT, 'message {} at level {}'.format(index, level))
+        if level < depth:
+            for _ in range(width):
+                create_tree(level + 1).add_link_from(node, link_type=LinkType.CALL)
+        return node
+
+    root = create_tree(0)
+    number = sum(width**level for level in range(depth + 1))
+
+    start = time.time()
+    result = CliRunner().invoke(work_report, [str(root.pk)])
+    elapsed = time.time() - start
+
+    if result.exception is not None:
+        raise result.exception
+
+    click.echo('reported {} messages of {} work calculations in {:.3f} s'.format(
+        len(result.output.splitlines()), number, elapsed))
+
+
+if __name__ == '__main__':
+    benchmark_work_report()  # pylint: disable=no-value-for-parameter